@@ -0,0 +1,26 @@
+"""CPU performance benchmarks for the production pipeline.
+
+Self-contained: inputs (video, tiny ONNX models, selector) are synthesized by
+:mod:`benchmarks.fixtures`, so a run needs only the core install — no GPU, no
+model weights. Each benchmark writes a JSON report meant to be kept per commit
+and diffed (``--baseline``) to catch regressions.
+
+- :mod:`benchmarks.inference_chain` — ``field_detect`` through ``render`` via
+  ``PipelineRunner``: frames/s, peak RSS and cProfile hot spots per step.
+- :mod:`benchmarks.selector_features` — the ball selector's feature builder
+  vs its per-frame reference (frames/s + bit-identity check).
+- :mod:`benchmarks.band_stabilizer` — ``PyramidBandStabilizer`` vs
+  ``BandStabilizer``: shift error on synthetic wind and per-frame latency.
+- :mod:`benchmarks.camera_planner` — ``upsample_track`` + ``plan_camera`` on a
+  full-game track vs their per-frame references (bit-identity check).
+- :mod:`benchmarks.worker_api` — the master's ``/api/work`` endpoints under N
+  simulated workers over in-process httpx: p50/p99 latency per endpoint.
+- :mod:`benchmarks.annotation_server` — a phone review session replayed
+  against the annotation server, uncached vs packet index + thumbnail store +
+  ETags: p50/p99 per endpoint and the 304 count.
+- :mod:`benchmarks.segment_discovery` — finding unlabeled/untiled segments on
+  a synthetic share: filesystem probes vs the segment status table.
+- :mod:`benchmarks.stream_tile` — mass tiling of synthetic panorama segments
+  via temp JPEG frames + loose tiles vs in-memory decode-to-pack: frames/s
+  and bytes written.
+"""
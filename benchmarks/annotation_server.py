@@ -0,0 +1,266 @@
+"""Benchmark: replay a phone review session against the annotation server.
+
+Builds ``--packets`` synthetic tracking-loss packets (``--frames`` 640x640 JPEG
+crops each), then replays one reviewer's session through the real FastAPI app
+over ``httpx.ASGITransport``. The reviewer polls the packet list and stats,
+opens each packet, fetches every crop, submits results in batches, opens the
+exclusions page (every thumbnail on it), then revisits everything once more.
+Like a browser, the client remembers ETags and sends ``If-None-Match``.
+
+The session runs twice on fresh copies of the packets: ``before`` with
+``annotation_server.CACHE_ENABLED = False`` (rescan + reparse per request,
+thumbnails rendered inline) and ``after`` with the packet index, thumbnail
+store and ETags on. Reports p50/p99 per endpoint and the 304 count.
+
+``--log`` replays a recorded session instead: JSON lines of
+``{"method": "GET", "path": "/api/...", "json": {...}}`` against a copy of
+``--packets-dir``.
+
+Example:
+    uv run python -m benchmarks.annotation_server
+    uv run python -m benchmarks.annotation_server --packets 30 --frames 100 \
+        --out annotation_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import cv2
+import httpx
+import numpy as np
+
+import training.annotation_server as server
+
+BASE_URL = "http://localhost:8642"
+
+
+def write_packets(root: Path, packets: int, frames: int, seed: int = 0) -> None:
+    """``packets`` tracking-loss packets of ``frames`` crops each, some reviewed."""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(40, 200, (640, 640, 3), dtype=np.uint8)
+    for p in range(packets):
+        pdir = root / f"tracking_loss_{p:03d}"
+        pdir.mkdir(parents=True)
+        entries = []
+        for i in range(frames):
+            crop = np.roll(base, 7 * i + 31 * p, axis=1)
+            cv2.imwrite(str(pdir / f"crop_{i:04d}.jpg"), crop)
+            entries.append(
+                {
+                    "frame_idx": i,
+                    "crop_file": f"crop_{i:04d}.jpg",
+                    "context": {
+                        "game_id": f"game_{p % 5}",
+                        "time_secs": 30 * i,
+                        "pct_through": i / frames,
+                        "row": 1,
+                        "col": i % 7,
+                    },
+                    "model_detection": {"x": 320 + i % 50, "y": 300 - i % 40},
+                }
+            )
+        (pdir / "manifest.json").write_text(json.dumps({"frames": entries}, indent=2))
+        if p % 2:  # half the packets arrive already reviewed
+            actions = ("confirm", "not_game_ball", "skip")
+            results = [
+                {
+                    "frame_idx": i,
+                    "action": actions[i % 3],
+                    "duration_ms": 900,
+                    **({"warmup": True} if i < 3 else {}),
+                }
+                for i in range(frames)
+            ]
+            (pdir / "annotation_results.json").write_text(json.dumps(results))
+
+
+def synthetic_session(packet_ids: list[str], frames: int, batch: int = 10) -> list:
+    """The reviewer's request log (the thumbnail URLs come from /api/exclusions)."""
+    log: list[dict] = []
+    for _visit in range(2):
+        log.append({"method": "GET", "path": "/api/packets"})
+        log.append({"method": "GET", "path": "/api/stats"})
+        for pid in packet_ids:
+            log.append({"method": "GET", "path": f"/api/packets/{pid}"})
+            pending = []
+            for i in range(frames):
+                log.append({"method": "GET", "path": f"/api/packets/{pid}/crops/{i}"})
+                pending.append(
+                    {
+                        "frame_idx": i,
+                        "action": "not_game_ball" if i % 5 == 0 else "confirm",
+                        "duration_ms": 800,
+                        "warmup": i < 3,
+                    }
+                )
+                if len(pending) == batch:
+                    log.append(
+                        {
+                            "method": "POST",
+                            "path": f"/api/packets/{pid}/results",
+                            "json": {"results": pending},
+                        }
+                    )
+                    pending = []
+                    log.append({"method": "GET", "path": "/api/packets"})
+            log.append({"method": "GET", "path": "/api/stats"})
+        log.append({"method": "GET", "path": "/api/exclusions", "thumbs": True})
+    return log
+
+
+def _endpoint(method: str, path: str) -> str:
+    """``/api/packets/x/crops/3?bx=1`` -> ``GET /api/packets/{id}/crops/{n}``."""
+    path = path.split("?", 1)[0]
+    path = re.sub(r"/api/packets/[^/]+", "/api/packets/{id}", path)
+    return f"{method} " + re.sub(r"/\d+$", "/{n}", path)
+
+
+async def _replay(root: Path, log: list[dict]) -> dict:
+    server.REVIEW_PACKETS_DIR = root
+    timings: dict[str, list[float]] = defaultdict(list)
+    etags: dict[str, str] = {}
+    not_modified = 0
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=server.app), base_url=BASE_URL
+    ) as client:
+
+        async def call(method: str, path: str, body: dict | None = None):
+            nonlocal not_modified
+            headers = {"if-none-match": etags[path]} if path in etags else {}
+            t0 = time.perf_counter()
+            resp = await client.request(method, path, json=body, headers=headers)
+            timings[_endpoint(method, path)].append((time.perf_counter() - t0) * 1000.0)
+            if resp.status_code == 304:
+                not_modified += 1
+            elif resp.status_code >= 400:
+                raise RuntimeError(f"{method} {path}: HTTP {resp.status_code}")
+            if "etag" in resp.headers:
+                etags[path] = resp.headers["etag"]
+            return resp
+
+        t0 = time.perf_counter()
+        exclusions: dict | None = None
+        for req in log:
+            resp = await call(req["method"], req["path"], req.get("json"))
+            if not req.get("thumbs"):
+                continue
+            if resp.status_code == 200:
+                exclusions = resp.json()
+            groups = (exclusions or {}).get("warmup_ranges", []) + (
+                exclusions or {}
+            ).get("static_balls", [])
+            for group in groups:
+                for sample in group["samples"]:
+                    await call("GET", sample["thumb_url"])
+        wall = time.perf_counter() - t0
+
+    all_ms = [t for v in timings.values() for t in v]
+    return {
+        "requests": len(all_ms),
+        "not_modified": not_modified,
+        "wall_s": round(wall, 3),
+        "all": _stats(all_ms),
+        "endpoints": {k: _stats(v) for k, v in sorted(timings.items())},
+    }
+
+
+def _stats(ms: list[float]) -> dict:
+    a = np.asarray(ms)
+    return {
+        "requests": len(ms),
+        "p50_ms": round(float(np.percentile(a, 50)), 3),
+        "p99_ms": round(float(np.percentile(a, 99)), 3),
+    }
+
+
+def run_benchmark(
+    packets: int = 20,
+    frames: int = 100,
+    *,
+    log: list[dict] | None = None,
+    packets_dir: Path | None = None,
+) -> dict:
+    saved = server.REVIEW_PACKETS_DIR, server.CACHE_ENABLED
+    report: dict = {"packets": packets, "frames": frames}
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "source"
+        if packets_dir is not None:
+            shutil.copytree(packets_dir, source)
+        else:
+            write_packets(source, packets, frames)
+        if log is None:
+            ids = sorted(p.name for p in source.iterdir() if p.is_dir())
+            log = synthetic_session(ids, frames)
+        try:
+            for mode, enabled in (("before", False), ("after", True)):
+                root = Path(tmp) / mode
+                shutil.copytree(source, root)
+                server.CACHE_ENABLED = enabled
+                report[mode] = asyncio.run(_replay(root, log))
+        finally:
+            server.REVIEW_PACKETS_DIR, server.CACHE_ENABLED = saved
+            server._PACKET_INDEXES.clear()
+            for cache in server._THUMB_CACHES.values():
+                cache.shutdown()
+            server._THUMB_CACHES.clear()
+    before, after = report["before"]["all"], report["after"]["all"]
+    report["speedup"] = {
+        "p50": round(before["p50_ms"] / max(after["p50_ms"], 1e-9), 1),
+        "p99": round(before["p99_ms"] / max(after["p99_ms"], 1e-9), 1),
+        "wall": round(
+            report["before"]["wall_s"] / max(report["after"]["wall_s"], 1e-9), 1
+        ),
+    }
+    return report
+
+
+def format_table(report: dict) -> str:
+    names = sorted(report["after"]["endpoints"])
+    lines = [f"{'endpoint':44s} {'before p50/p99 ms':>20s} {'after p50/p99 ms':>20s}"]
+    for name in names + ["all"]:
+        b = report["before"]["endpoints"].get(name) or report["before"]["all"]
+        a = report["after"]["endpoints"].get(name) or report["after"]["all"]
+        lines.append(
+            f"{name:44s} {b['p50_ms']:9.2f}/{b['p99_ms']:<9.2f} "
+            f"{a['p50_ms']:9.2f}/{a['p99_ms']:<9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--packets", type=int, default=20)
+    ap.add_argument("--frames", type=int, default=100, help="crops per packet")
+    ap.add_argument("--log", type=Path, default=None, help="recorded session (JSONL)")
+    ap.add_argument(
+        "--packets-dir", type=Path, default=None, help="packets for --log (copied)"
+    )
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+    if args.log and not args.packets_dir:
+        ap.error("--log needs --packets-dir")
+
+    log = None
+    if args.log:
+        log = [json.loads(line) for line in args.log.read_text().splitlines() if line]
+    report = run_benchmark(
+        args.packets, args.frames, log=log, packets_dir=args.packets_dir
+    )
+    print(format_table(report))
+    print(json.dumps(report["speedup"]))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
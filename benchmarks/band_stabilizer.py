@@ -0,0 +1,181 @@
+"""Accuracy + latency harness: ``PyramidBandStabilizer`` vs ``BandStabilizer``.
+
+A synthetic field band (grass texture, field lines, ad boards) is translated
+by a known per-frame wind trajectory — calm stretches, slow sway and gusts of
+up to ``--amplitude`` band px — with sensor noise and a few moving "players"
+(local motion the L/C/R median has to reject). Both estimators see the same
+frames; the report gives each one's error against the true shift, the
+pyramid estimator's disagreement with the current one, how many frames it
+skipped as motionless, and per-frame ``estimate`` latency.
+
+Example:
+    uv run python -m benchmarks.band_stabilizer --frames 1200
+    uv run python -m benchmarks.band_stabilizer --width 3840 --height 1400 \
+        --amplitude 60 --out stab_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from video_grouper.inference.iso_warp import BandStabilizer, PyramidBandStabilizer
+
+
+def synthetic_band(width: int = 1920, height: int = 866, seed: int = 0) -> np.ndarray:
+    """A grayscale band with field-like texture: smooth grass noise, mowing
+    stripes, white lines and a bright ad-board strip along the top."""
+    import cv2  # noqa: PLC0415
+
+    rng = np.random.default_rng(seed)
+    grass = cv2.GaussianBlur(
+        rng.normal(0.0, 1.0, (height, width)).astype(np.float32), (0, 0), 2.0
+    )
+    img = 90.0 + 25.0 * grass / max(float(grass.std()), 1e-6)
+    stripe = ((np.arange(width) // 96) % 2).astype(np.float32) * 12.0
+    img += stripe[None, :]
+    for x in range(width // 10, width, width // 5):
+        img[:, x : x + 3] += 110.0
+    for y in (height // 5, height // 2, 4 * height // 5):
+        img[y : y + 3, :] += 110.0
+    img[: height // 12] = 40.0 + 150.0 * (rng.random((height // 12, width)) > 0.5)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def wind_trajectory(
+    n_frames: int, amplitude: float = 40.0, seed: int = 0
+) -> np.ndarray:
+    """``(n, 2)`` true (dx, dy) per frame: calm, slow sway, then gusts."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_frames, dtype=np.float64)
+    sway = np.column_stack([np.sin(t / 47.0), 0.5 * np.sin(t / 31.0 + 1.0)]) * (
+        0.25 * amplitude
+    )
+    gust = np.zeros((n_frames, 2))
+    for start in rng.integers(0, max(1, n_frames - 30), size=max(1, n_frames // 200)):
+        length = int(rng.integers(10, 40))
+        bump = np.sin(np.linspace(0.0, np.pi, length))[:, None]
+        seg = gust[start : start + length]
+        seg += bump[: len(seg)] * rng.uniform(-amplitude, amplitude, 2) * 0.75
+    traj = sway + gust
+    traj[: n_frames // 5] = 0.0  # calm opening stretch (the anchor era)
+    return np.clip(traj, -amplitude, amplitude)
+
+
+def _frame(band: np.ndarray, dx: float, dy: float, rng, t: int) -> np.ndarray:
+    import cv2  # noqa: PLC0415
+
+    h, w = band.shape
+    m = np.float32([[1, 0, dx], [0, 1, dy]])
+    img = cv2.warpAffine(band, m, (w, h), flags=cv2.INTER_LINEAR, borderValue=0)
+    noisy = img.astype(np.int16) + rng.integers(-4, 5, img.shape, dtype=np.int16)
+    img = np.clip(noisy, 0, 255).astype(np.uint8)
+    for k in range(6):  # players: dark blobs running across the band
+        cx = int((w * (k + 1) / 7 + 9.0 * t * (1 if k % 2 else -1)) % w)
+        cy = int(h * (0.3 + 0.1 * k))
+        cv2.circle(img, (cx, cy), max(4, h // 60), 30, -1)
+    return img
+
+
+def _errors(est: np.ndarray, truth: np.ndarray) -> dict:
+    err = np.linalg.norm(est - truth, axis=1)
+    return {
+        "mean_px": round(float(err.mean()), 3),
+        "p95_px": round(float(np.percentile(err, 95)), 3),
+        "max_px": round(float(err.max()), 3),
+    }
+
+
+def _latency(ms: list[float]) -> dict:
+    a = np.asarray(ms)
+    return {
+        "median_ms": round(float(np.median(a)), 3),
+        "p95_ms": round(float(np.percentile(a, 95)), 3),
+        "mean_ms": round(float(a.mean()), 3),
+    }
+
+
+def run_benchmark(
+    n_frames: int = 600,
+    width: int = 1920,
+    height: int = 866,
+    amplitude: float = 40.0,
+    min_motion: float = 0.25,
+    seed: int = 0,
+) -> dict:
+    band = synthetic_band(width, height, seed)
+    truth = wind_trajectory(n_frames, amplitude, seed)
+    rng = np.random.default_rng(seed + 1)
+    frames = [
+        _frame(band, float(dx), float(dy), rng, t) for t, (dx, dy) in enumerate(truth)
+    ]
+
+    report: dict = {
+        "frames": n_frames,
+        "band": [height, width],
+        "amplitude_px": amplitude,
+    }
+    shifts: dict[str, np.ndarray] = {}
+    for name, stab in (
+        ("current", BandStabilizer()),
+        ("pyramid", PyramidBandStabilizer(min_motion=min_motion)),
+    ):
+        stab.estimate(band)  # the unshifted band is the anchor
+        est, ms = [], []
+        for img in frames:
+            t0 = time.perf_counter()
+            est.append(stab.estimate(img))
+            ms.append((time.perf_counter() - t0) * 1e3)
+        shifts[name] = np.asarray(est)
+        report[name] = {
+            "error_vs_truth": _errors(shifts[name], truth),
+            "latency": _latency(ms),
+        }
+        if isinstance(stab, PyramidBandStabilizer):
+            report[name]["skipped_frac"] = round(stab.skipped / max(1, stab.frames), 3)
+    report["pyramid_vs_current"] = _errors(shifts["pyramid"], shifts["current"])
+    report["speedup"] = round(
+        report["current"]["latency"]["mean_ms"]
+        / max(1e-9, report["pyramid"]["latency"]["mean_ms"]),
+        1,
+    )
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--frames", type=int, default=600)
+    ap.add_argument("--width", type=int, default=1920, help="band width (px)")
+    ap.add_argument("--height", type=int, default=866, help="band height (px)")
+    ap.add_argument(
+        "--amplitude", type=float, default=40.0, help="max wind excursion (band px)"
+    )
+    ap.add_argument(
+        "--min-motion",
+        type=float,
+        default=0.25,
+        help="PyramidBandStabilizer skip threshold (band px; 0 = never skip)",
+    )
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+
+    report = run_benchmark(
+        args.frames,
+        args.width,
+        args.height,
+        args.amplitude,
+        args.min_motion,
+        args.seed,
+    )
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Benchmark: array-based ``plan_camera`` / ``upsample_track`` vs the per-frame loops.
+
+The planner's recurrences (velocity EMA, zoom ease, error-adaptive pan) now run
+as plain-float passes with the separable terms on whole arrays, and upsampling
+is one ``np.interp`` per axis. The per-frame implementations they replaced are
+kept here verbatim as the reference: the benchmark times both on a full-game
+track (two halves + a halftime break, ball detections at a stride, short
+detection gaps) and checks the outputs are bit-identical.
+
+Example:
+    uv run python -m benchmarks.camera_planner
+    uv run python -m benchmarks.camera_planner --fps 25 --minutes 100 --stride 4 \
+        --out planner_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from video_grouper.inference.camera_planner import (
+    PlannerConfig,
+    plan_camera,
+    upsample_track,
+)
+
+SRC_W, SRC_H = 7680, 2160
+
+
+def plan_camera_per_frame(
+    trajectory: list[tuple[float, float] | None],
+    *,
+    src_w: int,
+    src_h: int,
+    depth01: list[float | None] | None = None,
+    config: PlannerConfig | None = None,
+) -> list[tuple[float, float, float]]:
+    """The pre-array ``plan_camera``: one Python iteration per output frame."""
+    cfg = config or PlannerConfig()
+    n = len(trajectory)
+    out: list[tuple[float, float, float]] = []
+    if n == 0:
+        return out
+
+    # seed on the first known position (or frame centre)
+    first = next((p for p in trajectory if p is not None), None)
+    cx, cy = (
+        (float(first[0]), float(first[1]))
+        if first is not None
+        else (src_w / 2.0, src_h / 2.0)
+    )
+    hfov = cfg.zoom_base_deg * cfg.zoom_scale
+    vx = vy = 0.0
+    prev: tuple[float, float] | None = None
+    slow_run = 0
+
+    for t in range(n):
+        p = trajectory[t]
+        if p is not None:
+            x, y = float(p[0]), float(p[1])
+            if prev is not None:
+                vx = cfg.velocity_ema * (x - prev[0]) + (1 - cfg.velocity_ema) * vx
+                vy = cfg.velocity_ema * (y - prev[1]) + (1 - cfg.velocity_ema) * vy
+            prev = (x, y)
+            speed = float(np.hypot(vx, vy))
+            slow = speed / (src_w / 180.0) < cfg.deadball_speed_degf
+            slow_run = slow_run + 1 if slow else 0
+
+            # ---- zoom target: calibrated curve, then dead-ball override ----
+            d = 0.5
+            if depth01 is not None:
+                dv = depth01[t]
+                if dv is not None:
+                    d = float(dv)
+            speed_degf = speed / (src_w / 180.0)
+            target_hfov = cfg.zoom_base_deg + (
+                min(speed_degf / cfg.zoom_speed_norm_degf, 1.0)
+                * cfg.zoom_speed_gain_deg
+            )
+            target_hfov += d * cfg.zoom_depth_gain_deg
+            target_hfov = float(
+                np.clip(target_hfov, cfg.zoom_min_deg, cfg.zoom_max_deg)
+            )
+            target_hfov *= cfg.zoom_scale
+            if slow_run >= cfg.deadball_frames:
+                target_hfov = max(target_hfov, cfg.deadball_hfov_deg)
+
+            # ---- pan target: ball + capped velocity lead room ----
+            view_w_px = src_w * (hfov / 180.0)  # approx px width of the view
+            lead_cap = cfg.max_lead_room_fraction * view_w_px
+            tx = x + float(np.clip(vx * cfg.lead_frames, -lead_cap, lead_cap))
+            ty = y + float(np.clip(vy * cfg.lead_frames, -lead_cap, lead_cap))
+
+            # error-adaptive follow: steady on target, responsive when far behind
+            err = float(np.hypot(tx - cx, ty - cy))
+            resp = min(1.0, err / max(view_w_px / 2.0, 1.0))
+            a_pan = cfg.pan_smoothing_min + resp * (
+                cfg.pan_smoothing_max - cfg.pan_smoothing_min
+            )
+            cx += a_pan * (tx - cx)
+            cy += cfg.pitch_smoothing * (ty - cy)
+        else:
+            # no information at all: hold bearing, ease to the widest view. Reset
+            # the velocity/prev state: upsample_track emits None across a wide
+            # blanked gap (e.g. halftime), and without this the first real frame
+            # after the gap reads the whole-break displacement (x - prev[0]) as a
+            # single frame's velocity and lurches the lead term to its cap.
+            prev = None
+            vx = vy = 0.0
+            target_hfov = cfg.missing_hfov_deg
+        hfov += cfg.zoom_smoothing * (target_hfov - hfov)
+        out.append((float(cx), float(cy), float(hfov)))
+    return out
+
+
+def upsample_track_per_frame(
+    track: dict[int, tuple[float, float]],
+    ef: list[int],
+    g_start: int,
+    g_end: int,
+    *,
+    max_gap: int = 24,
+) -> list[tuple[float, float] | None]:
+    """The pre-array ``upsample_track``: one ``np.interp`` pair per frame."""
+    pts = sorted((ef[i], xy) for i, xy in track.items() if 0 <= i < len(ef))
+    out: list[tuple[float, float] | None] = [None] * (g_end - g_start)
+    if not pts:
+        return out
+    gs = np.asarray([g for g, _ in pts], int)
+    xs = np.asarray([xy[0] for _, xy in pts], float)
+    ys = np.asarray([xy[1] for _, xy in pts], float)
+    lo, hi = int(gs[0]), int(gs[-1])
+    for g in range(max(g_start, lo), min(g_end, hi + 1)):
+        x = float(np.interp(g, gs, xs))
+        y = float(np.interp(g, gs, ys))
+        out[g - g_start] = (x, y)
+    # blank the interiors of wide grid gaps (exclusive: endpoints stay tracked)
+    for k in range(1, len(gs)):
+        if int(gs[k]) - int(gs[k - 1]) > max_gap:
+            for g in range(int(gs[k - 1]) + 1, int(gs[k])):
+                if g_start <= g < g_end:
+                    out[g - g_start] = None
+    return out
+
+
+def synthetic_game(
+    fps: float = 25.0, minutes: float = 100.0, stride: int = 4, seed: int = 0
+) -> tuple[dict[int, tuple[float, float]], list[int], int]:
+    """A stride-``stride`` ball track over a full game: two halves separated by a
+    halftime grid gap, ~3% of samples untracked, a random-walk ball with
+    sprints and dead-ball holds. Returns ``(track, ef, n_source_frames)``."""
+    rng = np.random.default_rng(seed)
+    n_src = int(fps * 60.0 * minutes)
+    half = n_src * 9 // 20
+    ef = list(range(0, half, stride)) + list(range(n_src - half, n_src, stride))
+    pos = np.array([SRC_W / 2.0, SRC_H / 2.0])
+    vel = np.zeros(2)
+    hold = 0
+    track: dict[int, tuple[float, float]] = {}
+    for i in range(len(ef)):
+        if hold:
+            hold -= 1
+            vel[:] = 0.0
+        elif rng.random() < 0.002:
+            hold = int(rng.integers(20, 120))  # restart / keeper hold
+        else:
+            vel = 0.9 * vel + rng.normal(0.0, 6.0, 2) * stride
+            pos = np.clip(pos + vel, (200.0, 500.0), (SRC_W - 200.0, SRC_H - 100.0))
+        if rng.random() > 0.03:
+            track[i] = (round(float(pos[0]), 1), round(float(pos[1]), 1))
+    return track, ef, n_src
+
+
+def _depth(traj: list[tuple[float, float] | None]) -> list[float | None]:
+    return [None if p is None else min(max(p[1] / SRC_H, 0.0), 1.0) for p in traj]
+
+
+def run_benchmark(
+    fps: float = 25.0,
+    minutes: float = 100.0,
+    stride: int = 4,
+    seed: int = 0,
+    reference: bool = True,
+) -> dict:
+    track, ef, n_src = synthetic_game(fps, minutes, stride, seed)
+    cfg = PlannerConfig(fps=fps)
+
+    t0 = time.perf_counter()
+    traj = upsample_track(track, ef, 0, n_src)
+    t_up = time.perf_counter() - t0
+    depth = _depth(traj)
+    t0 = time.perf_counter()
+    plan = plan_camera(traj, src_w=SRC_W, src_h=SRC_H, depth01=depth, config=cfg)
+    t_plan = time.perf_counter() - t0
+    report: dict = {
+        "frames": n_src,
+        "tracked_samples": len(track),
+        "array": {
+            "upsample_s": round(t_up, 3),
+            "plan_s": round(t_plan, 3),
+            "plan_frames_per_s": round(n_src / t_plan),
+        },
+    }
+    if reference:
+        t0 = time.perf_counter()
+        ref_traj = upsample_track_per_frame(track, ef, 0, n_src)
+        r_up = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        ref_plan = plan_camera_per_frame(
+            ref_traj, src_w=SRC_W, src_h=SRC_H, depth01=depth, config=cfg
+        )
+        r_plan = time.perf_counter() - t0
+        report["per_frame"] = {
+            "upsample_s": round(r_up, 3),
+            "plan_s": round(r_plan, 3),
+            "plan_frames_per_s": round(n_src / r_plan),
+            "upsample_identical": ref_traj == traj,
+            "plan_identical": ref_plan == plan,
+        }
+        report["speedup"] = {
+            "upsample": round(r_up / max(t_up, 1e-9), 1),
+            "plan": round(r_plan / max(t_plan, 1e-9), 1),
+        }
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--fps", type=float, default=25.0)
+    ap.add_argument("--minutes", type=float, default=100.0, help="game length")
+    ap.add_argument("--stride", type=int, default=4, help="detection stride")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument(
+        "--no-reference", action="store_true", help="skip the per-frame reference"
+    )
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+
+    report = run_benchmark(
+        args.fps, args.minutes, args.stride, args.seed, not args.no_reference
+    )
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
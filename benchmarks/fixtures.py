@@ -0,0 +1,346 @@
+"""Synthetic inputs for the CPU benchmarks: a short game video + tiny models.
+
+Everything is generated on the fly so the suite runs on a clean checkout with
+no GPU, no Git LFS weights and no ``onnx`` package:
+
+- :func:`write_synthetic_video` — a green trapezoid pitch (the 10-point
+  :data:`POLY` outline scaled to the requested size) with a white ball on a
+  smooth path, a handful of dark "players" and an AAC track carrying two
+  whistle-band tone bursts, so every decode path the chain uses (video seek,
+  full decode, audio) sees realistic work.
+- :func:`write_field_model` / :func:`write_ball_model` /
+  :func:`write_person_model` — ONNX graphs with the production models' I/O
+  contracts but a handful of ops each. They are serialized by the minimal
+  protobuf writer below (ONNX is just a protobuf message; the ``onnx`` package
+  is a training-only extra).
+- :func:`write_selector_npz` — a small random ``selector_net_npz/1``.
+
+The models are deliberately cheap: the benchmark measures the pipeline
+plumbing, decode, band warp, selection and render around inference, which is
+where CPU regressions land. Inference cost itself scales with the real model.
+"""
+
+from __future__ import annotations
+
+import struct
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+
+# 10-point field outline at 1920x1080 (near sideline 0-4 left->right, far
+# sideline 5-9 right->left) — same layout the field keypoint model emits.
+POLY = [
+    [100.0, 1000.0],
+    [500.0, 1010.0],
+    [960.0, 1015.0],
+    [1420.0, 1010.0],
+    [1820.0, 1000.0],
+    [1600.0, 300.0],
+    [1280.0, 295.0],
+    [960.0, 290.0],
+    [640.0, 295.0],
+    [320.0, 300.0],
+]
+POLY_W, POLY_H = 1920, 1080
+
+# Person-model letterbox canvas (phase_detector.persons).
+PERSON_CANVAS = 1280
+
+
+def scaled_polygon(width: int, height: int) -> np.ndarray:
+    """:data:`POLY` scaled to a ``width`` x ``height`` frame."""
+    return np.asarray(POLY, float) * [width / POLY_W, height / POLY_H]
+
+
+def ball_path(n_frames: int, width: int, height: int) -> np.ndarray:
+    """``(n_frames, 2)`` ball centre per frame: a slow Lissajous inside the pitch."""
+    t = np.arange(n_frames, dtype=float)
+    cx = width * (0.5 + 0.3 * np.sin(t / 37.0))
+    cy = height * (0.62 + 0.18 * np.sin(t / 23.0 + 1.0))
+    return np.column_stack([cx, cy])
+
+
+def write_synthetic_video(
+    path: Path,
+    *,
+    width: int = 1280,
+    height: int = 720,
+    fps: int = 20,
+    seconds: float = 10.0,
+    seed: int = 0,
+) -> int:
+    """Encode the synthetic game to ``path`` (H.264 + AAC); returns the frame count."""
+    import av  # noqa: PLC0415
+    import cv2  # noqa: PLC0415
+
+    n_frames = int(round(seconds * fps))
+    rng = np.random.default_rng(seed)
+    poly = scaled_polygon(width, height).astype(np.int32)
+    background = np.full((height, width, 3), (90, 100, 110), np.uint8)
+    cv2.fillPoly(background, [poly], (40, 140, 40))
+    players = rng.uniform((0.2, 0.45), (0.8, 0.85), size=(10, 2)) * (width, height)
+    drift = rng.normal(0.0, 0.6, size=(10, 2))
+    ball = ball_path(n_frames, width, height)
+    radius = max(3, width // 200)
+
+    sr = 44_100
+    with av.open(str(path), mode="w") as out:
+        vs = out.add_stream("libx264", rate=fps)
+        vs.width, vs.height, vs.pix_fmt = width, height, "yuv420p"
+        vs.options = {"preset": "ultrafast", "crf": "28"}
+        aus = out.add_stream("aac", rate=sr)
+        aus.layout = "mono"
+        for i in range(n_frames):
+            img = background.copy()
+            for px, py in players + drift * i:
+                x, y = int(px), int(py)
+                cv2.rectangle(img, (x - 6, y - 30), (x + 6, y), (30, 30, 160), -1)
+            bx, by = ball[i]
+            cv2.circle(img, (int(bx), int(by)), radius, (255, 255, 255), -1)
+            frame = av.VideoFrame.from_ndarray(img, format="bgr24")
+            out.mux(vs.encode(frame))
+        out.mux(vs.encode())
+
+        # Low noise + two 4.3 kHz bursts (the whistle band phase_detect listens in).
+        t = np.arange(int(seconds * sr)) / sr
+        audio = rng.normal(0.0, 0.01, t.size)
+        for start in (seconds * 0.25, seconds * 0.75):
+            on = (t >= start) & (t < start + 0.6)
+            audio[on] += 0.5 * np.sin(2 * np.pi * 4300.0 * t[on])
+        audio = audio.astype(np.float32)
+        chunk = 1024
+        for k, s in enumerate(range(0, audio.size, chunk)):
+            af = av.AudioFrame.from_ndarray(
+                audio[None, s : s + chunk], format="flt", layout="mono"
+            )
+            af.sample_rate = sr
+            af.pts = k * chunk
+            af.time_base = Fraction(1, sr)
+            out.mux(aus.encode(af))
+        out.mux(aus.encode())
+    return n_frames
+
+
+# ---------------------------------------------------------------------------
+# Minimal ONNX (protobuf) writer
+# ---------------------------------------------------------------------------
+
+_FLOAT, _INT64, _FLOAT16 = 1, 7, 10
+_ATTR_FLOAT, _ATTR_INT, _ATTR_INTS = 1, 2, 7
+_NP_DTYPES = {_FLOAT: np.float32, _INT64: np.int64, _FLOAT16: np.float16}
+
+
+def _varint(n: int) -> bytes:
+    n &= (1 << 64) - 1  # int64 fields encode negatives as 10-byte two's complement
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(b | 0x80)
+        else:
+            out.append(b)
+            return bytes(out)
+
+
+def _int(field: int, n: int) -> bytes:
+    return _varint(field << 3) + _varint(n)
+
+
+def _bytes(field: int, data: bytes | str) -> bytes:
+    if isinstance(data, str):
+        data = data.encode()
+    return _varint(field << 3 | 2) + _varint(len(data)) + data
+
+
+def _float(field: int, x: float) -> bytes:
+    return _varint(field << 3 | 5) + struct.pack("<f", x)
+
+
+def _tensor(name: str, arr: np.ndarray, dtype: int = _FLOAT) -> bytes:
+    arr = np.ascontiguousarray(arr, dtype=_NP_DTYPES[dtype])
+    dims = b"".join(_int(1, d) for d in arr.shape)
+    return dims + _int(2, dtype) + _bytes(8, name) + _bytes(9, arr.tobytes())
+
+
+def _attr(name: str, value: float | int | list[int]) -> bytes:
+    if isinstance(value, list):
+        body = b"".join(_int(8, v) for v in value) + _int(20, _ATTR_INTS)
+    elif isinstance(value, float):
+        body = _float(2, value) + _int(20, _ATTR_FLOAT)
+    else:
+        body = _int(3, value) + _int(20, _ATTR_INT)
+    return _bytes(1, name) + body
+
+
+def _node(op: str, inputs: list[str], outputs: list[str], **attrs) -> bytes:
+    return (
+        b"".join(_bytes(1, i) for i in inputs)
+        + b"".join(_bytes(2, o) for o in outputs)
+        + _bytes(3, f"{op}_{outputs[0]}")
+        + _bytes(4, op)
+        + b"".join(_bytes(5, _attr(k, v)) for k, v in attrs.items())
+    )
+
+
+def _value_info(name: str, shape: list[int | str], dtype: int = _FLOAT) -> bytes:
+    dims = b"".join(
+        _bytes(1, _bytes(2, d) if isinstance(d, str) else _int(1, d)) for d in shape
+    )
+    tensor_type = _int(1, dtype) + _bytes(2, dims)
+    return _bytes(1, name) + _bytes(2, _bytes(1, tensor_type))
+
+
+def _write_model(
+    path: Path,
+    nodes: list[bytes],
+    initializers: list[bytes],
+    inputs: list[bytes],
+    outputs: list[bytes],
+    opset: int = 13,
+) -> None:
+    graph = (
+        b"".join(_bytes(1, n) for n in nodes)
+        + _bytes(2, path.stem)
+        + b"".join(_bytes(5, t) for t in initializers)
+        + b"".join(_bytes(11, v) for v in inputs)
+        + b"".join(_bytes(12, v) for v in outputs)
+    )
+    model = (
+        _int(1, 8)  # ir_version
+        + _bytes(2, "soccer-cam-benchmarks")
+        + _bytes(7, graph)
+        + _bytes(8, _bytes(1, "") + _int(2, opset))
+    )
+    Path(path).write_bytes(model)
+
+
+def _zero_from(input_name: str, dtype: int = _FLOAT) -> tuple[list[bytes], list[bytes]]:
+    """Nodes + initializers computing a float32 scalar 0 that depends on the input.
+
+    Keeps the constant-output models honest: the runtime must still ingest the
+    input tensor (and cannot fold the whole graph away).
+    """
+    nodes = [_node("ReduceMean", [input_name], ["mean"], keepdims=0)]
+    src = "mean"
+    if dtype != _FLOAT:
+        nodes.append(_node("Cast", ["mean"], ["mean_f"], to=_FLOAT))
+        src = "mean_f"
+    nodes.append(_node("Mul", [src, "zero"], ["dep"]))
+    return nodes, [_tensor("zero", np.zeros((), np.float32))]
+
+
+def write_field_model(path: Path, width: int, height: int) -> None:
+    """Field keypoint model: fp16 ``(1,3,384,768)`` in -> the scaled :data:`POLY`.
+
+    Outputs ``kpts (1,10,2)`` in model-input pixels and ``scores (1,10)``.
+    """
+    from video_grouper.inference.field_detector import INPUT_H, INPUT_W  # noqa: PLC0415
+
+    kpts = scaled_polygon(width, height) * [INPUT_W / width, INPUT_H / height]
+    nodes, inits = _zero_from("images", _FLOAT16)
+    nodes += [
+        _node("Add", ["kpts_const", "dep"], ["kpts"]),
+        _node("Add", ["scores_const", "dep"], ["scores"]),
+    ]
+    inits += [
+        _tensor("kpts_const", kpts[None].astype(np.float32)),
+        _tensor("scores_const", np.full((1, 10), 0.9, np.float32)),
+    ]
+    _write_model(
+        path,
+        nodes,
+        inits,
+        [_value_info("images", [1, 3, INPUT_H, INPUT_W], _FLOAT16)],
+        [_value_info("kpts", [1, 10, 2]), _value_info("scores", [1, 10])],
+    )
+
+
+def write_ball_model(path: Path, gain: float = 20.0, level: float = 0.7) -> None:
+    """Fully-conv heatmap detector: ``(1,3,H,W)`` gray stack -> sigmoid ``(1,1,H,W)``.
+
+    One 3x3 conv over the newest frame of the stack: the heatmap is
+    ``sigmoid(gain * (local_mean - level))``, i.e. it fires on bright blobs.
+    """
+    w = np.zeros((1, 3, 3, 3), np.float32)
+    w[0, 2] = gain / 9.0
+    nodes = [
+        _node("Conv", ["input", "w", "b"], ["logits"], pads=[1, 1, 1, 1]),
+        _node("Sigmoid", ["logits"], ["heatmap"]),
+    ]
+    _write_model(
+        path,
+        nodes,
+        [_tensor("w", w), _tensor("b", np.array([-gain * level], np.float32))],
+        [_value_info("input", [1, 3, "h", "w"])],
+        [_value_info("heatmap", [1, 1, "h", "w"])],
+    )
+
+
+def write_person_model(
+    path: Path, boxes: np.ndarray, pad_bytes: int = 1_100_000
+) -> None:
+    """Person detector: ``(1,3,1280,1280)`` -> fixed ``(1,N,6)`` detections.
+
+    ``boxes`` are ``(x1, y1, x2, y2)`` rows in letterbox-canvas pixels.
+    ``phase_detector`` treats a model file under 1 MB as an un-pulled LFS
+    pointer, so an unused ``pad_bytes`` initializer keeps the file above that.
+    """
+    boxes = np.asarray(boxes, np.float32).reshape(-1, 4)
+    dets = np.concatenate(
+        [boxes, np.full((len(boxes), 1), 0.8), np.zeros((len(boxes), 1))], axis=1
+    )
+    nodes, inits = _zero_from("images")
+    nodes.append(_node("Add", ["dets_const", "dep"], ["output0"]))
+    inits += [
+        _tensor("dets_const", dets[None].astype(np.float32)),
+        _tensor("pad", np.zeros(pad_bytes // 4, np.float32)),
+    ]
+    _write_model(
+        path,
+        nodes,
+        inits,
+        [_value_info("images", [1, 3, PERSON_CANVAS, PERSON_CANVAS])],
+        [_value_info("output0", [1, len(boxes), 6])],
+    )
+
+
+def person_boxes(width: int, height: int, n: int = 12, seed: int = 0) -> np.ndarray:
+    """``n`` standing-person boxes on the pitch, in letterbox-canvas pixels."""
+    rng = np.random.default_rng(seed)
+    r = min(PERSON_CANVAS / height, PERSON_CANVAS / width)
+    top = (PERSON_CANVAS - round(height * r)) // 2
+    left = (PERSON_CANVAS - round(width * r)) // 2
+    feet = rng.uniform((0.25, 0.5), (0.75, 0.85), size=(n, 2)) * (width, height)
+    x, y = feet[:, 0] * r + left, feet[:, 1] * r + top
+    return np.column_stack([x - 6 * r, y - 30 * r, x + 6 * r, y])
+
+
+def write_selector_npz(path: Path, hidden: int = 16, emb: int = 8, seed: int = 0):
+    """A random ``selector_net_npz/1`` over every current feature."""
+    from video_grouper.inference.ball_selector import FEATURE_NAMES  # noqa: PLC0415
+
+    rng = np.random.default_rng(seed)
+    n = len(FEATURE_NAMES)
+
+    def w(*shape):
+        return rng.normal(scale=0.3, size=shape).astype(np.float32)
+
+    np.savez(
+        path,
+        schema="selector_net_npz/1",
+        w0=w(hidden, n),
+        b0=np.zeros(hidden, np.float32),
+        w1=w(hidden, hidden),
+        b1=np.zeros(hidden, np.float32),
+        w2=w(emb, hidden),
+        b2=np.zeros(emb, np.float32),
+        head_w=w(1, emb),
+        head_b=np.zeros(1, np.float32),
+        none_w=w(1, 2 * emb),
+        none_b=np.full(1, -2.0, np.float32),
+        temperature=np.float32(1.0),
+        keep=np.ones(n, bool),
+        feature_names=np.array(FEATURE_NAMES),
+    )
@@ -0,0 +1,433 @@
+"""CPU benchmark of the production inference chain through ``PipelineRunner``.
+
+Runs ``field_detect -> phase_detect -> ball_detect -> ball_select ->
+plan_camera -> render`` on a synthetic game (see :mod:`benchmarks.fixtures`)
+with tiny ONNX models on ``CPUExecutionProvider``, and records per step:
+
+- wall seconds and source frames/s (every step is normalized by the SOURCE
+  frame count, so the numbers compare across steps and video lengths);
+- peak RSS while the step ran (psutil sampler; ``null`` without psutil);
+- cProfile hot spots — the top functions by self time.
+
+The steps offload their heavy work with ``asyncio.to_thread``; cProfile only
+sees the thread that enabled it, so the runner installs a default executor
+that profiles every job it runs and merges the per-job stats per step.
+
+The report is plain JSON with stable keys and repo-relative function names, so
+two runs diff cleanly; ``--baseline`` compares against an earlier report and
+flags steps whose frames/s dropped by more than ``--tolerance``.
+
+Example:
+    uv run python -m benchmarks.inference_chain --out bench.json
+    uv run python -m benchmarks.inference_chain --seconds 30 --width 1920 \
+        --height 1080 --baseline bench.json --fail-on-regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import platform
+import pstats
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from benchmarks import fixtures
+
+try:
+    import psutil
+except ImportError:  # optional (the "metrics" extra)
+    psutil = None
+
+SCHEMA = "inference_chain_benchmark/1"
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CHAIN = (
+    "field_detect",
+    "phase_detect",
+    "ball_detect",
+    "ball_select",
+    "plan_camera",
+    "render",
+)
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+
+class _ProfilingExecutor(ThreadPoolExecutor):
+    """Default executor that runs every submitted job under its own cProfile."""
+
+    def __init__(self):
+        super().__init__(max_workers=4, thread_name_prefix="bench")
+        self.profiles: list[cProfile.Profile] = []
+
+    def submit(self, fn, /, *args, **kwargs):
+        prof = cProfile.Profile()
+        self.profiles.append(prof)
+
+        def call():
+            prof.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                prof.disable()
+
+        return super().submit(call)
+
+
+class _RssSampler:
+    """Background thread tracking this process's peak RSS."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.start_bytes = self.peak_bytes = _rss()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes or 0, _rss() or 0)
+
+    def __enter__(self):
+        if psutil is not None:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        self.peak_bytes = max(self.peak_bytes or 0, _rss() or 0) or None
+
+
+def _rss() -> int | None:
+    return psutil.Process().memory_info().rss if psutil is not None else None
+
+
+def _mb(n: int | None) -> float | None:
+    return round(n / 2**20, 1) if n is not None else None
+
+
+def _func_name(key: tuple[str, int, str]) -> str:
+    """``path:line(name)`` with the repo / site-packages prefix stripped."""
+    path, line, name = key
+    if path == "~":  # builtins: "{method 'run' of ...}"
+        return name
+    p = Path(path)
+    try:
+        path = p.resolve().relative_to(REPO_ROOT).as_posix()
+    except ValueError:
+        parts = p.parts
+        if "site-packages" in parts:
+            path = "/".join(parts[parts.index("site-packages") + 1 :])
+        else:
+            path = p.name
+    return f"{path}:{line}({name})"
+
+
+def hot_spots(profiles: list[cProfile.Profile], top: int) -> list[dict]:
+    """Merge ``profiles``; return the ``top`` functions by self time."""
+    stats: pstats.Stats | None = None
+    for prof in profiles:
+        prof.create_stats()
+        if not prof.stats:
+            continue
+        if stats is None:
+            stats = pstats.Stats(prof)
+        else:
+            stats.add(prof)
+    if stats is None:
+        return []
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)
+    return [
+        {
+            "function": _func_name(key),
+            "ncalls": nc,
+            "tottime": round(tt, 4),
+            "cumtime": round(ct, 4),
+        }
+        for key, (_cc, nc, tt, ct, _callers) in rows[:top]
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Profiled pipeline run
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class StepReport:
+    step: str
+    seconds: float
+    frames_per_s: float
+    peak_rss_mb: float | None
+    rss_delta_mb: float | None
+    hot_spots: list[dict] = field(default_factory=list)
+
+
+def _profiling_runner_cls():
+    from video_grouper.pipeline.runner import PipelineRunner  # noqa: PLC0415
+
+    class ProfilingRunner(PipelineRunner):
+        """PipelineRunner that measures each step it executes."""
+
+        def __init__(self, specs, n_frames: int, top: int):
+            super().__init__(specs, runtime="service")
+            self.n_frames = n_frames
+            self.top = top
+            self.reports: list[StepReport] = []
+
+        async def _run_step(self, step, manifest, ctx) -> bool:
+            executor = _ProfilingExecutor()
+            asyncio.get_running_loop().set_default_executor(executor)
+            try:
+                with _RssSampler() as rss:
+                    t0 = time.perf_counter()
+                    ok = await super()._run_step(step, manifest, ctx)
+                    dt = time.perf_counter() - t0
+            finally:
+                executor.shutdown(wait=True)
+            self.reports.append(
+                StepReport(
+                    step=step.name,
+                    seconds=round(dt, 3),
+                    frames_per_s=round(self.n_frames / dt, 1) if dt > 0 else 0.0,
+                    peak_rss_mb=_mb(rss.peak_bytes),
+                    rss_delta_mb=_mb(rss.peak_bytes - rss.start_bytes)
+                    if rss.peak_bytes is not None and rss.start_bytes is not None
+                    else None,
+                    hot_spots=hot_spots(executor.profiles, self.top),
+                )
+            )
+            return ok
+
+    return ProfilingRunner
+
+
+def chain_specs(models: dict[str, Path], width: int, height: int) -> list:
+    """The production chain, every step pinned to CPU."""
+    from video_grouper.pipeline.base import StepSpec  # noqa: PLC0415
+
+    config = {
+        "field_detect": {"model_path": str(models["field"]), "device": "cpu"},
+        "phase_detect": {
+            "model_path": str(models["person"]),
+            "phase_step_seconds": 1.0,
+        },
+        "ball_detect": {"model_path": str(models["ball"]), "device": "cpu"},
+        "ball_select": {"select_model_path": str(models["selector"])},
+        "plan_camera": {},
+        "render": {"render_output_width": width, "render_output_height": height},
+    }
+    return [StepSpec(name, name, config[name]) for name in CHAIN]
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run_benchmark(
+    *,
+    width: int = 1280,
+    height: int = 720,
+    fps: int = 20,
+    seconds: float = 10.0,
+    render_width: int = 960,
+    render_height: int = 540,
+    top: int = 15,
+    work_dir: Path | None = None,
+) -> dict:
+    """Generate the inputs, run the chain once, return the report dict."""
+    import onnxruntime as ort  # noqa: PLC0415
+
+    import video_grouper.pipeline.register_steps  # noqa: F401, PLC0415
+    from video_grouper.pipeline.base import StepContext  # noqa: PLC0415
+
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        root = Path(tmp)
+        group = root / "group"
+        group.mkdir()
+        video = group / "combined.mp4"
+        t0 = time.perf_counter()
+        n_frames = fixtures.write_synthetic_video(
+            video, width=width, height=height, fps=fps, seconds=seconds
+        )
+        models = {
+            "field": root / "field.onnx",
+            "ball": root / "ball.onnx",
+            "person": root / "person.onnx",
+            "selector": root / "selector.npz",
+        }
+        fixtures.write_field_model(models["field"], width, height)
+        fixtures.write_ball_model(models["ball"])
+        fixtures.write_person_model(
+            models["person"], fixtures.person_boxes(width, height)
+        )
+        fixtures.write_selector_npz(models["selector"])
+        setup_s = time.perf_counter() - t0
+
+        runner = _profiling_runner_cls()(
+            chain_specs(models, render_width, render_height), n_frames, top
+        )
+        ctx = StepContext(group_dir=group, team_name=None, storage_path=root)
+        t0 = time.perf_counter()
+        result = asyncio.run(runner.run(str(video), str(group / "render.mp4"), ctx))
+        total_s = time.perf_counter() - t0
+
+    steps = [asdict(r) for r in runner.reports]
+    return {
+        "schema": SCHEMA,
+        "commit": _git_commit(),
+        "platform": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "system": platform.system(),
+            "cpu_count": os.cpu_count(),
+            "onnxruntime": ort.__version__,
+        },
+        "video": {
+            "width": width,
+            "height": height,
+            "fps": fps,
+            "frames": n_frames,
+            "render": [render_width, render_height],
+        },
+        "status": result.status,
+        "error": result.error,
+        "setup_seconds": round(setup_s, 3),
+        "total": {
+            "seconds": round(total_s, 3),
+            "frames_per_s": round(n_frames / total_s, 1) if total_s > 0 else 0.0,
+            "peak_rss_mb": max(
+                (s["peak_rss_mb"] for s in steps if s["peak_rss_mb"] is not None),
+                default=None,
+            ),
+        },
+        "steps": steps,
+    }
+
+
+def compare_reports(baseline: dict, current: dict, tolerance: float = 0.15) -> dict:
+    """Per-step frames/s + peak-RSS deltas of ``current`` vs ``baseline``.
+
+    A step regresses when its frames/s falls by more than ``tolerance``
+    (fractional). Steps missing from either report are skipped.
+    """
+    base = {s["step"]: s for s in baseline.get("steps", [])}
+    rows, regressions = [], []
+    for s in current.get("steps", []):
+        b = base.get(s["step"])
+        if b is None or not b["frames_per_s"]:
+            continue
+        ratio = s["frames_per_s"] / b["frames_per_s"]
+        rss = (
+            round(s["peak_rss_mb"] - b["peak_rss_mb"], 1)
+            if s["peak_rss_mb"] is not None and b["peak_rss_mb"] is not None
+            else None
+        )
+        rows.append(
+            {
+                "step": s["step"],
+                "baseline_fps": b["frames_per_s"],
+                "fps": s["frames_per_s"],
+                "ratio": round(ratio, 3),
+                "peak_rss_delta_mb": rss,
+            }
+        )
+        if ratio < 1.0 - tolerance:
+            regressions.append(s["step"])
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "commit": current.get("commit"),
+        "tolerance": tolerance,
+        "steps": rows,
+        "regressions": regressions,
+    }
+
+
+def _print_summary(report: dict, comparison: dict | None) -> None:
+    print(
+        f"{report['video']['width']}x{report['video']['height']} "
+        f"{report['video']['frames']} frames — status {report['status']}"
+    )
+    ratios = {r["step"]: r["ratio"] for r in (comparison or {}).get("steps", [])}
+    for s in report["steps"]:
+        line = f"  {s['step']:<13} {s['seconds']:8.2f}s {s['frames_per_s']:9.1f} fps"
+        if s["peak_rss_mb"] is not None:
+            line += f" {s['peak_rss_mb']:8.1f} MB"
+        if s["step"] in ratios:
+            line += f"  x{ratios[s['step']]:.2f} vs baseline"
+        print(line)
+        for h in s["hot_spots"][:3]:
+            print(f"      {h['tottime']:8.3f}s  {h['function']}")
+    if comparison and comparison["regressions"]:
+        print("REGRESSED: " + ", ".join(comparison["regressions"]))
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--width", type=int, default=1280)
+    ap.add_argument("--height", type=int, default=720)
+    ap.add_argument("--fps", type=int, default=20)
+    # phase_detect samples from t=2s to duration-1s: keep clips >= 4s.
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--render-width", type=int, default=960)
+    ap.add_argument("--render-height", type=int, default=540)
+    ap.add_argument("--top", type=int, default=15, help="hot spots kept per step")
+    ap.add_argument("--work-dir", type=Path, default=None)
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    ap.add_argument("--baseline", type=Path, default=None, help="earlier report")
+    ap.add_argument("--tolerance", type=float, default=0.15)
+    ap.add_argument("--fail-on-regression", action="store_true")
+    args = ap.parse_args(argv)
+
+    report = run_benchmark(
+        width=args.width,
+        height=args.height,
+        fps=args.fps,
+        seconds=args.seconds,
+        render_width=args.render_width,
+        render_height=args.render_height,
+        top=args.top,
+        work_dir=args.work_dir,
+    )
+    comparison = None
+    if args.baseline:
+        comparison = compare_reports(
+            json.loads(args.baseline.read_text()), report, args.tolerance
+        )
+        report["comparison"] = comparison
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2) + "\n")
+    _print_summary(report, comparison)
+    if report["status"] != "complete":
+        print(f"pipeline {report['status']}: {report['error']}", file=sys.stderr)
+        return 1
+    if args.fail_on_regression and comparison and comparison["regressions"]:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
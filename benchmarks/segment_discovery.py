@@ -0,0 +1,208 @@
+"""Benchmark: work discovery from the segment status table vs filesystem probes.
+
+Builds a synthetic share: ``--games`` game directories of ``--segments``
+``[F][0@0]`` segment videos each (empty files), with label files for some
+segments and tiles for others. Then it finds the segments that still need
+labeling and tiling three ways:
+
+- ``probe``: the pre-table discovery, kept here verbatim as the reference —
+  ``rglob`` each game's video dir, then one glob per segment into the label
+  or tile directory.
+- ``reconcile``: re-deriving the status table from disk on a fresh database
+  (one listing per game per output directory), then querying it.
+- ``query``: ``segment_status.discover`` against the populated table — the
+  steady state on the server. Games that still need a stage are re-checked
+  in that stage's output directory (workers on other machines only write to
+  disk); finished games cost the index query alone. Workers off the server
+  keep the table in memory and pay ``reconcile`` on each discovery.
+
+All three must return the same segments.
+
+Example:
+    uv run python -m benchmarks.segment_discovery
+    uv run python -m benchmarks.segment_discovery --games 100 --segments 60 \
+        --out discovery_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob as glob_mod
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from training.data_prep.segment_status import discover, open_status_db, reconcile
+
+STAGES = ("labeled", "tiled")
+
+
+def build_tree(
+    root: Path,
+    games: int,
+    segments: int,
+    *,
+    labeled: float = 0.6,
+    tiled: float = 0.7,
+    files_per_segment: int = 3,
+    seed: int = 0,
+) -> dict[str, Path]:
+    """The synthetic share; returns game_id -> video dir."""
+    rng = random.Random(seed)
+    video_root = root / "video"
+    labels_dir = root / "labels_640_ext"
+    tiles_dir = root / "tiles_640"
+    game_dirs = {}
+    for g in range(games):
+        game_id = f"team{g % 7}__2025.{1 + g % 12:02d}.{1 + g % 28:02d}_vs_opp{g}"
+        vdir = video_root / f"team{g % 7}" / game_id
+        (vdir / "sub").mkdir(parents=True)
+        (labels_dir / game_id).mkdir(parents=True)
+        (tiles_dir / game_id).mkdir(parents=True)
+        for s in range(segments):
+            start = s * 300
+            stem = (
+                f"{start // 3600:02d}.{start // 60 % 60:02d}.{start % 60:02d}"
+                f"-{s:04d}[F][0@0][{g}]"
+            )
+            # Half the segments sit one directory down, as on the cameras.
+            (vdir / ("sub" if s % 2 else "") / f"{stem}.mp4").touch()
+            (vdir / f"{stem[:-9]}[R][0@0].mp4").touch()  # not an [F] segment
+            for frame in range(files_per_segment):
+                if rng.random() < labeled:
+                    name = f"{stem}_frame_{frame * 4:06d}_r1_c{frame % 7}.txt"
+                    (labels_dir / game_id / name).touch()
+            if rng.random() < tiled:
+                for frame in range(files_per_segment):
+                    for c in range(3):
+                        name = f"{stem}_frame_{frame * 4:06d}_r0_c{c}.jpg"
+                        (tiles_dir / game_id / name).touch()
+        game_dirs[game_id] = vdir
+    return game_dirs
+
+
+def probe_discovery(
+    game_dirs: dict[str, Path], labels_dir: Path, tiles_dir: Path
+) -> dict[str, list[tuple[str, str]]]:
+    """The filesystem probes ``find_unlabeled_segments`` /
+    ``find_untiled_segments`` ran before the status table."""
+    unlabeled, untiled = [], []
+    for game_id, video_src in game_dirs.items():
+        video_dir = Path(video_src)
+        if not video_dir.exists():
+            continue
+        label_dir = Path(labels_dir) / game_id
+        tile_dir = Path(tiles_dir) / game_id
+        segments = sorted([p for p in video_dir.rglob("*.mp4") if "[F][0@0]" in p.name])
+        for seg in segments:
+            escaped = glob_mod.escape(seg.stem)
+            if not (
+                label_dir.exists() and list(label_dir.glob(f"{escaped}_frame_*.txt"))
+            ):
+                unlabeled.append((game_id, seg.stem))
+        segments = sorted([p for p in video_dir.rglob("*.mp4") if "[F][0@0]" in p.name])
+        for seg in segments:
+            escaped = glob_mod.escape(seg.stem)
+            if not (
+                tile_dir.exists()
+                and list(tile_dir.glob(f"{escaped}_frame_000000_r0_c0.jpg"))
+            ):
+                untiled.append((game_id, seg.stem))
+    return {"labeled": sorted(unlabeled), "tiled": sorted(untiled)}
+
+
+def _query(conn, game_dirs, dirs) -> dict[str, list[tuple[str, str]]]:
+    return {
+        stage: sorted((g, s) for g, s, _v in discover(conn, stage, game_dirs, **dirs))
+        for stage in STAGES
+    }
+
+
+def run_benchmark(
+    games: int = 500,
+    segments: int = 60,
+    *,
+    files_per_segment: int = 3,
+    repeats: int = 3,
+    work_dir: Path | None = None,
+) -> dict:
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        root = Path(tmp)
+        t0 = time.perf_counter()
+        game_dirs = build_tree(
+            root, games, segments, files_per_segment=files_per_segment
+        )
+        build_s = time.perf_counter() - t0
+        dirs = {
+            "labels_dir": root / "labels_640_ext",
+            "tiles_dirs": [root / "tiles_640"],
+        }
+
+        t0 = time.perf_counter()
+        expected = probe_discovery(game_dirs, dirs["labels_dir"], root / "tiles_640")
+        probe_s = time.perf_counter() - t0
+
+        conn = open_status_db(root / "segment_status.db")
+        t0 = time.perf_counter()
+        reconcile(conn, game_dirs, **dirs)
+        reconciled = _query(conn, game_dirs, dirs)
+        reconcile_s = time.perf_counter() - t0
+
+        query_times = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            queried = _query(conn, game_dirs, dirs)
+            query_times.append(time.perf_counter() - t0)
+        conn.close()
+
+    if reconciled != expected or queried != expected:
+        raise AssertionError("status-table discovery disagrees with the probes")
+    query_s = min(query_times)
+    return {
+        "games": games,
+        "segments_per_game": segments,
+        "needing": {stage: len(v) for stage, v in expected.items()},
+        "build_tree_s": round(build_s, 3),
+        "probe_s": round(probe_s, 4),
+        "reconcile_s": round(reconcile_s, 4),
+        "query_s": round(query_s, 4),
+        "speedup": {
+            "query_vs_probe": round(probe_s / max(query_s, 1e-9), 1),
+            "reconcile_vs_probe": round(probe_s / max(reconcile_s, 1e-9), 1),
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--games", type=int, default=500)
+    ap.add_argument("--segments", type=int, default=60, help="segments per game")
+    ap.add_argument(
+        "--files-per-segment",
+        type=int,
+        default=3,
+        help="labelled/tiled frames per done segment",
+    )
+    ap.add_argument("--repeats", type=int, default=3, help="query repeats (best of)")
+    ap.add_argument(
+        "--work-dir", type=Path, default=None, help="where to build the tree"
+    )
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+
+    report = run_benchmark(
+        args.games,
+        args.segments,
+        files_per_segment=args.files_per_segment,
+        repeats=args.repeats,
+        work_dir=args.work_dir,
+    )
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
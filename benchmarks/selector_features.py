@@ -0,0 +1,284 @@
+"""Microbenchmark: ``ball_selector.build_features`` vs the per-frame loop.
+
+``build_features`` is columnar (flat per-candidate arrays + padded ``[T, Kmax]``
+blocks for the pairwise and t±1/t±2 terms). The per-frame implementation it
+replaced is kept here verbatim as :func:`build_features_per_frame`; the
+benchmark times both on the same candidates, reports frames/s, and checks the
+features are bit-identical.
+
+Candidates come from a recorded ``candidates/1`` / ``candidates/2`` artifact
+(``detections.json`` + the game's ``field_polygon.json``) or, by default, a
+synthetic stream on the :data:`benchmarks.fixtures.POLY` field.
+
+Example:
+    uv run python -m benchmarks.selector_features --frames 30000
+    uv run python -m benchmarks.selector_features \
+        --candidates G:/games/x/detections.json \
+        --polygon G:/games/x/field_polygon.json --out sel_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks import fixtures
+from video_grouper.inference.ball_selector import (
+    _CONT_CAP_M,
+    _CONT_CAP_MPF,
+    _N_DEPTH_BANDS,
+    FEATURE_NAMES,
+    build_features,
+)
+from video_grouper.inference.ball_tracker import Candidate, static_persistence
+from video_grouper.inference.world_geometry import (
+    FieldGeometry,
+    build_field_geometry,
+)
+
+
+def _signed_infield_per_point(geom: FieldGeometry, xy: np.ndarray) -> np.ndarray:
+    import cv2  # noqa: PLC0415
+
+    if geom.polygon is None:
+        return np.zeros(len(xy))
+    poly = geom.polygon.reshape(-1, 1, 2).astype(np.float32)
+    d = np.array(
+        [cv2.pointPolygonTest(poly, (float(x), float(y)), True) for x, y in xy]
+    )
+    return np.clip(d / 1000.0, -1.0, 1.0)
+
+
+def build_features_per_frame(
+    frames: list[list],
+    geom: FieldGeometry,
+    top_k: int = 24,
+    ef: list[int] | None = None,
+) -> list[np.ndarray]:
+    """The pre-columnar ``build_features``: one Python iteration per frame."""
+    n = len(frames)
+    xy = [np.asarray([(c.x, c.y) for c in cs], float).reshape(-1, 2) for cs in frames]
+    world = [geom.image_to_world(p) if len(p) else np.zeros((0, 2)) for p in xy]
+    scores = [np.asarray([c.score for c in cs], float) for cs in frames]
+    sizes = [
+        np.asarray([c.size_px if c.size_px is not None else 0.0 for c in cs], float)
+        for cs in frames
+    ]
+    pers = static_persistence(world, cell_m=2.0)
+    expected = [
+        geom.expected_ball_diameter_px(p) if len(p) else np.zeros(0) for p in xy
+    ]
+
+    all_exp = np.concatenate([e for e in expected if len(e)]) if n else np.zeros(0)
+    all_sc = np.concatenate([s for s in scores if len(s)]) if n else np.zeros(0)
+    edges = (
+        np.quantile(all_exp, np.linspace(0, 1, _N_DEPTH_BANDS + 1)[1:-1])
+        if len(all_exp)
+        else np.zeros(_N_DEPTH_BANDS - 1)
+    )
+    band_of = lambda e: np.searchsorted(edges, e)  # noqa: E731
+    band_scores = [
+        np.sort(all_sc[band_of(all_exp) == b]) for b in range(_N_DEPTH_BANDS)
+    ]
+
+    def _cont(t: int, off: int) -> np.ndarray:
+        k = len(world[t])
+        u = t + off
+        if k == 0:
+            return np.zeros(0)
+        cap = _CONT_CAP_MPF if ef is not None else _CONT_CAP_M
+        if not (0 <= u < n) or len(world[u]) == 0:
+            d = np.full(k, cap)
+        else:
+            diff = world[t][:, None, :] - world[u][None, :, :]
+            d = np.sqrt((diff**2).sum(-1)).min(axis=1)
+            if ef is not None:
+                d = d / max(abs(int(ef[u]) - int(ef[t])), 1)
+            d = np.minimum(d, cap)
+        return np.log1p(d) / np.log1p(cap)
+
+    out: list[np.ndarray] = []
+    for t in range(n):
+        k = len(frames[t])
+        if k == 0:
+            out.append(np.zeros((0, len(FEATURE_NAMES)), np.float32))
+            continue
+        sc = scores[t]
+        order = np.argsort(-sc, kind="stable")
+        rank = np.empty(k, int)
+        rank[order] = np.arange(k)
+        pct_frame = 1.0 - rank / max(k - 1, 1)
+        bands = np.atleast_1d(band_of(expected[t]))
+        pct_depth = np.array(
+            [
+                np.searchsorted(band_scores[b], s) / max(len(band_scores[b]), 1)
+                for b, s in zip(bands.tolist(), sc.tolist(), strict=True)
+            ]
+        )
+        exp_d = np.maximum(expected[t], 1e-6)
+        size_ratio = np.where(sizes[t] > 0, sizes[t] / exp_d, 0.0)
+        if k > 1:
+            diff = world[t][:, None, :] - world[t][None, :, :]
+            dm = np.sqrt((diff**2).sum(-1))
+            np.fill_diagonal(dm, np.inf)
+            dens = (dm <= 5.0).sum(axis=1) / top_k
+        else:
+            dens = np.zeros(k)
+        cols = [
+            sc,
+            rank / max(top_k - 1, 1),
+            pct_frame,
+            pct_depth,
+            np.clip(size_ratio, 0.0, 8.0),
+            pers[t],
+            _signed_infield_per_point(geom, xy[t]),
+            expected[t] / 20.0,
+            np.full(k, k / top_k),
+            _cont(t, +1),
+            _cont(t, -1),
+            _cont(t, +2),
+            _cont(t, -2),
+            dens,
+        ]
+        out.append(np.stack(cols, axis=1).astype(np.float32))
+    return out
+
+
+def synthetic_candidates(
+    n_frames: int, max_cands: int = 24, stride: int = 4, seed: int = 0
+) -> tuple[list[list[Candidate]], list[int], np.ndarray]:
+    """A moving ball + static distractors + clutter on the fixture field.
+
+    Candidate counts vary per frame (including empty frames), a third of the
+    rows carry no size (candidates/1) and coordinates are rounded to 0.1 px
+    like the detect artifact, so the two statics repeat exactly.
+    """
+    rng = np.random.default_rng(seed)
+    poly = np.asarray(fixtures.POLY, float)
+    lo, hi = poly.min(axis=0), poly.max(axis=0)
+    statics = rng.uniform(lo, hi, size=(2, 2))
+    ball = fixtures.ball_path(n_frames, fixtures.POLY_W, fixtures.POLY_H)
+    frames: list[list[Candidate]] = []
+    for t in range(n_frames):
+        if rng.random() < 0.02:
+            frames.append([])
+            continue
+        k = int(rng.integers(1, max_cands + 1))
+        pts = [ball[t]]
+        pts += list(statics[: max(0, k - 1)])
+        pts += list(rng.uniform(lo, hi, size=(max(0, k - len(pts)), 2)))
+        frames.append(
+            [
+                Candidate(
+                    round(float(x), 1),
+                    round(float(y), 1),
+                    float(rng.uniform(0.1, 1.0)),
+                    float(rng.uniform(3.0, 20.0)) if rng.random() < 0.67 else None,
+                )
+                for x, y in pts
+            ]
+        )
+    return frames, list(range(0, n_frames * stride, stride)), poly
+
+
+def load_candidates(
+    candidates_path: Path, polygon_path: Path
+) -> tuple[list[list[Candidate]], list[int], np.ndarray]:
+    """A recorded ``candidates/1|2`` artifact -> (frames, ef, polygon)."""
+    from video_grouper.pipeline.steps.ball_select import (  # noqa: PLC0415
+        _rows_to_candidates,
+    )
+
+    art = json.loads(Path(candidates_path).read_text())
+    by_g = {int(g): rows for g, rows in art["frames"].items()}
+    ef = sorted(by_g)
+    polygon = np.asarray(json.loads(Path(polygon_path).read_text())["polygon"], float)
+    return [_rows_to_candidates(by_g[g]) for g in ef], ef, polygon
+
+
+def features_identical(a: list[np.ndarray], b: list[np.ndarray]) -> bool:
+    """Bit-for-bit equality (NaN-aware) of two per-frame feature lists."""
+    return len(a) == len(b) and all(
+        x.shape == y.shape and x.tobytes() == y.tobytes()
+        for x, y in zip(a, b, strict=True)
+    )
+
+
+def run_benchmark(
+    frames: list[list[Candidate]],
+    ef: list[int],
+    polygon: np.ndarray,
+    reference_frames: int | None = None,
+) -> dict:
+    geom = build_field_geometry(polygon)
+    if not geom.valid:
+        raise ValueError("polygon does not fit a field homography")
+    n = len(frames)
+
+    t0 = time.perf_counter()
+    feats = build_features(frames, geom, ef=ef)
+    dt = time.perf_counter() - t0
+    report: dict = {
+        "frames": n,
+        "candidates": sum(len(f) for f in frames),
+        "columnar": {"seconds": round(dt, 3), "frames_per_s": round(n / dt)},
+    }
+    m = n if reference_frames is None else min(reference_frames, n)
+    if m:
+        sub, sub_ef = frames[:m], ef[:m]
+        t0 = time.perf_counter()
+        ref = build_features_per_frame(sub, geom, ef=sub_ef)
+        ref_dt = time.perf_counter() - t0
+        same = features_identical(
+            feats if m == n else build_features(sub, geom, ef=sub_ef), ref
+        )
+        report["per_frame"] = {
+            "frames": m,
+            "seconds": round(ref_dt, 3),
+            "frames_per_s": round(m / ref_dt),
+            "bit_identical": same,
+        }
+        report["speedup"] = round(
+            report["columnar"]["frames_per_s"]
+            / max(1, report["per_frame"]["frames_per_s"]),
+            1,
+        )
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--candidates", type=Path, default=None, help="detections.json")
+    ap.add_argument("--polygon", type=Path, default=None, help="field_polygon.json")
+    ap.add_argument("--frames", type=int, default=20_000, help="synthetic frames")
+    ap.add_argument("--max-cands", type=int, default=24)
+    ap.add_argument(
+        "--reference-frames",
+        type=int,
+        default=None,
+        help="prefix run through the per-frame reference (default: all; 0 = skip)",
+    )
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+
+    if args.candidates:
+        if not args.polygon:
+            ap.error("--candidates needs --polygon")
+        frames, ef, polygon = load_candidates(args.candidates, args.polygon)
+    else:
+        frames, ef, polygon = synthetic_candidates(
+            args.frames, args.max_cands, seed=args.seed
+        )
+    report = run_benchmark(frames, ef, polygon, args.reference_frames)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Benchmark: mass_tile's temp-JPEG tiling vs in-memory decode-to-pack.
+
+Encodes a synthetic panorama (:func:`benchmarks.fixtures.write_synthetic_video`
+at ``--width`` x ``--height``) as ``--segments`` segment videos, then takes
+them to tile packs two ways:
+
+- ``classic``: what ``mass_tile.tile_game`` + ``manifest pack`` do, kept here
+  verbatim as the reference — ``extract_frames`` to a temp dir of JPEG
+  frames, ``tile_frame`` on each into loose tile JPEGs, the temp dir removed,
+  then the loose tiles read back into a segment pack (``write_segment_pack``).
+  Segments run one after another, as in ``tile_game``.
+- ``stream``: ``stream_tile.tile_segments`` — decode, frame-diff and tile in
+  memory, encode each tile once, write the pack directly; segments in
+  parallel up to ``--cpu-budget``.
+
+Reported per path: sampled frames/s, tiles, and bytes written to disk (temp
+frames, loose tiles and packs for ``classic``; packs only for ``stream``).
+Both must sample the same frames and produce the same tile count.
+
+The fixture pitch is mostly static, so the frame-diff filter would drop
+nearly every frame; ``--diff-threshold`` defaults to 0 to tile every sampled
+frame.
+
+Example:
+    uv run python -m benchmarks.stream_tile
+    uv run python -m benchmarks.stream_tile --segments 4 --cpu-budget 8 \
+        --seconds 20 --out stream_tile_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks import fixtures
+from training.data_prep.extract_frames import extract_frames
+from training.data_prep.pack_scheduler import write_segment_pack
+from training.data_prep.stream_tile import (
+    DEFAULT_ENCODE_THREADS,
+    segment_workers,
+    tile_segments,
+)
+from training.data_prep.tile_frames import tile_frame
+
+FRAME_INTERVAL = 4  # mass_tile.FRAME_INTERVAL
+TILE_COLS, TILE_ROWS, TILE_SIZE = 7, 3, 640
+
+
+def _dir_bytes(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def classic_segment(
+    video: Path, tiles_dir: Path, pack_path: Path, diff_threshold: float
+) -> dict:
+    """One segment through the pre-streaming path, with the bytes it wrote."""
+    segment_id = video.stem
+    frames_dir = video.parent / f"_frames_{segment_id}"
+    n_frames = extract_frames(
+        video,
+        frames_dir,
+        diff_threshold=diff_threshold,
+        frame_interval=FRAME_INTERVAL,
+    )
+    frame_bytes = _dir_bytes(frames_dir)
+
+    tiles = []
+    for frame_path in sorted(frames_dir.rglob("*.jpg")):
+        tiles += tile_frame(
+            frame_path, tiles_dir, cols=TILE_COLS, rows=TILE_ROWS, tile_size=TILE_SIZE
+        )
+    if frames_dir.exists():
+        shutil.rmtree(frames_dir)
+    tile_bytes = sum(t.stat().st_size for t in tiles)
+
+    # manifest pack: read the loose tiles back into the segment pack.
+    file_list = []
+    for t in tiles:
+        stem = t.stem  # <segment>_frame_NNNNNN_rR_cC
+        fidx = int(stem.rsplit("_frame_", 1)[1][:6])
+        r, c = (int(x[1:]) for x in stem.rsplit("_", 2)[1:])
+        file_list.append((t, fidx, r, c))
+    file_list.sort(key=lambda item: item[1:])
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        layout = write_segment_pack(file_list, pack_path, pool)
+    return {
+        "frames": n_frames,
+        "tiles": len(layout),
+        "bytes": {
+            "temp_frames": frame_bytes,
+            "loose_tiles": tile_bytes,
+            "pack": pack_path.stat().st_size,
+        },
+    }
+
+
+def run_benchmark(
+    *,
+    segments: int = 2,
+    width: int = 4096,
+    height: int = 1800,
+    seconds: float = 6.0,
+    fps: int = 20,
+    diff_threshold: float = 0.0,
+    cpu_budget: int | None = None,
+    encode_threads: int = DEFAULT_ENCODE_THREADS,
+    work_dir: Path | None = None,
+) -> dict:
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        root = Path(tmp)
+        video_dir = root / "video"
+        video_dir.mkdir()
+        first = video_dir / "00.00.00-00.05.00[F][0@0][0].mp4"
+        fixtures.write_synthetic_video(
+            first, width=width, height=height, fps=fps, seconds=seconds
+        )
+        videos = [first]
+        for i in range(1, segments):
+            copy = video_dir / f"00.{5 * i:02d}.00-00.{5 * i + 5:02d}.00[F][0@0][0].mp4"
+            shutil.copyfile(first, copy)
+            videos.append(copy)
+
+        classic_dir = root / "classic"
+        (classic_dir / "packs").mkdir(parents=True)
+        t0 = time.perf_counter()
+        classic = [
+            classic_segment(
+                v,
+                classic_dir / "tiles",
+                classic_dir / "packs" / f"{v.stem}.pack",
+                diff_threshold,
+            )
+            for v in videos
+        ]
+        classic_s = time.perf_counter() - t0
+
+        stream_dir = root / "stream"
+        workers = segment_workers(cpu_budget, encode_threads, len(videos))
+        t0 = time.perf_counter()
+        stream = list(
+            tile_segments(
+                [(v, stream_dir / f"{v.stem}.pack") for v in videos],
+                workers=workers,
+                frame_interval=FRAME_INTERVAL,
+                diff_threshold=diff_threshold,
+                cols=TILE_COLS,
+                rows=TILE_ROWS,
+                tile_size=TILE_SIZE,
+                encode_threads=encode_threads,
+            )
+        )
+        stream_s = time.perf_counter() - t0
+
+    frames = sum(s["frames"] for s in classic)
+    tiles = sum(s["tiles"] for s in classic)
+    if frames != sum(s["frames"] for s in stream) or tiles != sum(
+        s["tiles"] for s in stream
+    ):
+        raise AssertionError("stream tiling sampled different frames than classic")
+    classic_bytes = {
+        k: sum(s["bytes"][k] for s in classic)
+        for k in ("temp_frames", "loose_tiles", "pack")
+    }
+    stream_bytes = sum(s["pack_size"] for s in stream)
+    return {
+        "video": {
+            "segments": segments,
+            "width": width,
+            "height": height,
+            "frames_per_segment": int(round(seconds * fps)),
+        },
+        "sampled_frames": frames,
+        "tiles": tiles,
+        "cpu_budget": cpu_budget or os.cpu_count(),
+        "classic": {
+            "seconds": round(classic_s, 3),
+            "frames_per_s": round(frames / classic_s, 2),
+            "bytes_written": classic_bytes | {"total": sum(classic_bytes.values())},
+        },
+        "stream": {
+            "segment_workers": workers,
+            "encode_threads": encode_threads,
+            "seconds": round(stream_s, 3),
+            "frames_per_s": round(frames / stream_s, 2),
+            "bytes_written": {"pack": stream_bytes, "total": stream_bytes},
+        },
+        "speedup": round(classic_s / max(stream_s, 1e-9), 2),
+        "bytes_ratio": round(sum(classic_bytes.values()) / max(stream_bytes, 1), 2),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--segments", type=int, default=2)
+    ap.add_argument("--width", type=int, default=4096)
+    ap.add_argument("--height", type=int, default=1800)
+    ap.add_argument("--seconds", type=float, default=6.0, help="per segment")
+    ap.add_argument("--fps", type=int, default=20)
+    ap.add_argument("--diff-threshold", type=float, default=0.0)
+    ap.add_argument("--cpu-budget", type=int, default=None, help="cores (default: all)")
+    ap.add_argument("--encode-threads", type=int, default=DEFAULT_ENCODE_THREADS)
+    ap.add_argument(
+        "--work-dir", type=Path, default=None, help="where to write the videos"
+    )
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+
+    report = run_benchmark(
+        segments=args.segments,
+        width=args.width,
+        height=args.height,
+        seconds=args.seconds,
+        fps=args.fps,
+        diff_threshold=args.diff_threshold,
+        cpu_budget=args.cpu_budget,
+        encode_threads=args.encode_threads,
+        work_dir=args.work_dir,
+    )
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark: the master's worker API under a simulated heartbeat-heavy fleet.
+
+Mounts the real master app (``create_app(node_role="master")``) behind
+``httpx.ASGITransport`` — same handlers and middleware as production, no
+sockets — and drives ``--workers`` concurrent simulated workers. Each one
+registers, claims a task, sends ``--heartbeats`` heartbeats and completes it,
+then polls an empty queue once. Reports p50/p99 latency per endpoint, overall
+requests/s, and the registry's size on disk.
+
+Example:
+    uv run python -m benchmarks.worker_api
+    uv run python -m benchmarks.worker_api --workers 500 --heartbeats 40 \
+        --out worker_api_bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from video_grouper.utils.config import TTTConfig
+from video_grouper.web.auth_server import create_app
+from video_grouper.web.worker_api import enqueue_task
+from video_grouper.web.worker_registry import (
+    close_registry,
+    get_registry,
+    registry_db_path,
+)
+
+MASTER_URL = "http://localhost:8765"
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    node_id: str,
+    heartbeats: int,
+    timings: dict[str, list[float]],
+) -> None:
+    async def call(endpoint: str, method: str, url: str, **kw) -> httpx.Response:
+        t0 = time.perf_counter()
+        resp = await client.request(method, url, **kw)
+        timings[endpoint].append((time.perf_counter() - t0) * 1000.0)
+        if resp.status_code >= 400:
+            raise RuntimeError(f"{endpoint}: HTTP {resp.status_code} {resp.text}")
+        return resp
+
+    token = (
+        await call(
+            "register",
+            "POST",
+            "/api/work/register",
+            json={"node_id": node_id, "capabilities": ["combine"]},
+        )
+    ).json()["token"]
+    auth = {"authorization": f"Bearer {token}"}
+    offer = await call("next", "GET", "/api/work/next", headers=auth)
+    task_id = offer.json()["task_id"]
+    for _ in range(heartbeats):
+        await call("heartbeat", "POST", f"/api/work/{task_id}/heartbeat", headers=auth)
+        await asyncio.sleep(0)
+    await call(
+        "complete",
+        "POST",
+        f"/api/work/{task_id}/complete",
+        headers=auth,
+        json={"outputs": {"node": node_id}},
+    )
+    await call("next", "GET", "/api/work/next", headers=auth)  # 204: queue drained
+
+
+def _stats(ms: list[float]) -> dict:
+    a = np.asarray(ms)
+    return {
+        "requests": len(ms),
+        "p50_ms": round(float(np.percentile(a, 50)), 3),
+        "p99_ms": round(float(np.percentile(a, 99)), 3),
+        "max_ms": round(float(a.max()), 3),
+    }
+
+
+async def _drive(storage: Path, workers: int, heartbeats: int) -> dict:
+    app = create_app(TTTConfig(), str(storage), node_role="master")
+    for _ in range(workers):
+        enqueue_task(storage, "combine", {})
+    timings: dict[str, list[float]] = defaultdict(list)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url=MASTER_URL,
+        headers={"origin": MASTER_URL},  # auth_server's same-origin check
+        timeout=60.0,
+    ) as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(
+            *(_worker(client, f"w{i:04d}", heartbeats, timings) for i in range(workers))
+        )
+        wall = time.perf_counter() - t0
+    get_registry(storage).flush()
+    total = sum(len(v) for v in timings.values())
+    return {
+        "workers": workers,
+        "heartbeats_per_worker": heartbeats,
+        "wall_s": round(wall, 3),
+        "requests_per_s": round(total / wall, 1),
+        "all": _stats([t for v in timings.values() for t in v]),
+        "endpoints": {k: _stats(v) for k, v in sorted(timings.items())},
+        "registry_bytes": sum(
+            p.stat().st_size
+            for p in registry_db_path(storage).parent.glob("registry.db*")
+        ),
+    }
+
+
+def run_benchmark(
+    workers: int = 200, heartbeats: int = 20, work_dir: Path | None = None
+) -> dict:
+    if work_dir is not None:
+        return asyncio.run(_drive(Path(work_dir), workers, heartbeats))
+    with tempfile.TemporaryDirectory() as tmp:
+        report = asyncio.run(_drive(Path(tmp), workers, heartbeats))
+        close_registry(tmp)  # release the db before the dir goes
+        return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--workers", type=int, default=200, help="simulated workers")
+    ap.add_argument(
+        "--heartbeats", type=int, default=20, help="heartbeats per worker's task"
+    )
+    ap.add_argument(
+        "--work-dir", type=Path, default=None, help="keep the registry here"
+    )
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+
+    report = run_benchmark(args.workers, args.heartbeats, args.work_dir)
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Annotation server caches: packet index, thumbnail store, ETag/304."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+from concurrent.futures import Future
+
+import cv2
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import training.annotation_server as server
+from training.annotation_cache import (
+    PacketIndex,
+    ThumbnailCache,
+    etag_matches,
+    make_etag,
+)
+
+
+# Real filesystem on tmp_path + real httpx (the benchmark's ASGI client);
+# override conftest's mocks.
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_httpx():
+    yield
+
+
+def _packet(root, name, frames=3, results=None):
+    pdir = root / name
+    pdir.mkdir(parents=True)
+    entries = []
+    for i in range(frames):
+        cv2.imwrite(str(pdir / f"c{i}.jpg"), np.full((64, 64, 3), 40 * i, np.uint8))
+        entries.append(
+            {
+                "frame_idx": i,
+                "crop_file": f"c{i}.jpg",
+                "context": {"game_id": "g1", "time_secs": 30 * i},
+                "model_detection": {"x": 320, "y": 320},
+            }
+        )
+    (pdir / "manifest.json").write_text(json.dumps({"frames": entries}))
+    if results is not None:
+        (pdir / "annotation_results.json").write_text(json.dumps(results))
+    return pdir
+
+
+def _touch_later(path, text):
+    """Rewrite ``path`` with a strictly newer mtime (coarse-clock safe)."""
+    st = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_index_reuses_parses_until_a_file_changes(tmp_path):
+    pdir = _packet(tmp_path, "p1", results=[])
+    (tmp_path / "not_a_packet").mkdir()
+    index = PacketIndex(tmp_path)
+
+    first = index.get("p1")
+    assert first.results == [] and first.frame(2)["crop_file"] == "c2.jpg"
+    again = index.get("p1")
+    assert again.manifest is first.manifest and again.etag == first.etag
+    assert [e.packet_id for e in index.entries()] == ["p1"]
+
+    _touch_later(pdir / "annotation_results.json", json.dumps([{"frame_idx": 0}]))
+    changed = index.get("p1")
+    assert changed.results == [{"frame_idx": 0}]
+    assert changed.manifest is first.manifest  # only the results file reparsed
+    assert changed.etag != first.etag
+
+    (pdir / "manifest.json").unlink()
+    assert index.get("p1") is None
+
+
+def test_index_listing_follows_the_root_directory(tmp_path):
+    index = PacketIndex(tmp_path)
+    assert index.packet_ids() == []
+    _packet(tmp_path, "p2")
+    os.utime(tmp_path, ns=(0, tmp_path.stat().st_mtime_ns + 1_000_000_000))
+    assert index.packet_ids() == ["p2"]
+
+
+def test_disabled_index_reparses_every_call(tmp_path):
+    _packet(tmp_path, "p1")
+    index = PacketIndex(tmp_path, enabled=False)
+    assert index.get("p1").manifest is not index.get("p1").manifest
+
+
+def test_etag_matching():
+    tag = make_etag("a", (1, 2))
+    assert tag.startswith('W/"') and tag == make_etag("a", (1, 2))
+    assert etag_matches(tag, tag)
+    assert etag_matches(f'"other", {tag.removeprefix("W/")}', tag)
+    assert etag_matches("*", tag)
+    assert not etag_matches(None, tag) and not etag_matches('"other"', tag)
+
+
+def test_thumbnails_render_once_and_follow_the_source(tmp_path):
+    src = tmp_path / "crop.jpg"
+    src.write_bytes(b"v1")
+    cache = ThumbnailCache(tmp_path / "_thumbs", max_workers=2)
+    calls = []
+    gate = threading.Event()
+
+    def render():
+        gate.wait(5)
+        calls.append(threading.current_thread().name)
+        return b"thumb-" + src.read_bytes()
+
+    async def fetch_twice(key):
+        tasks = [asyncio.create_task(cache.get(key, render)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(*tasks)
+
+    key = cache.key(src, "arrow80:1,2")
+    assert asyncio.run(fetch_twice(key)) == [b"thumb-v1", b"thumb-v1"]
+    assert len(calls) == 1 and calls[0].startswith("thumbs")
+    assert cache.path_for(key).read_bytes() == b"thumb-v1"
+    assert asyncio.run(cache.get(key, render)) == b"thumb-v1"  # from disk
+    assert len(calls) == 1
+
+    assert cache.key(src, "arrow80:9,9") != key
+    _touch_later(src, "v2")
+    key2 = cache.key(src, "arrow80:1,2")
+    assert key2 != key
+    assert asyncio.run(cache.get(key2, render)) == b"thumb-v2"
+    assert cache.key(tmp_path / "gone.jpg", "x") is None
+    cache.shutdown()
+
+
+def test_thumbnail_render_that_finishes_instantly_does_not_deadlock(tmp_path):
+    class InlinePool:  # the render is done before add_done_callback runs
+        def submit(self, fn, *args):
+            fut = Future()
+            fut.set_result(fn(*args))
+            return fut
+
+        def shutdown(self, wait=True):
+            pass
+
+    cache = ThumbnailCache(tmp_path / "_thumbs")
+    cache._pool.shutdown()
+    cache._pool = InlinePool()
+
+    async def fetch_many():
+        return [await cache.get(f"{i:04x}", lambda: b"jpg") for i in range(50)]
+
+    results = []
+    worker = threading.Thread(
+        target=lambda: results.append(asyncio.run(fetch_many())), daemon=True
+    )
+    worker.start()
+    worker.join(10)
+    assert not worker.is_alive(), "ThumbnailCache.get deadlocked"
+    assert results == [[b"jpg"] * 50] and cache._inflight == {}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "REVIEW_PACKETS_DIR", tmp_path)
+    yield TestClient(server.app)
+    for cache in server._THUMB_CACHES.values():
+        cache.shutdown()
+    server._THUMB_CACHES.clear()
+    server._PACKET_INDEXES.clear()
+
+
+def test_server_answers_revalidation_with_304(client, tmp_path):
+    _packet(tmp_path, "tracking_loss_001", results=[])
+    for url in (
+        "/api/packets",
+        "/api/packets/tracking_loss_001",
+        "/api/packets/tracking_loss_001/crops/1",
+        "/api/packets/tracking_loss_001/thumb/1?bx=100&by=200",
+        "/api/stats",
+        "/api/exclusions",
+    ):
+        first = client.get(url)
+        assert first.status_code == 200, url
+        again = client.get(url, headers={"if-none-match": first.headers["etag"]})
+        assert again.status_code == 304, url
+        assert again.content == b""
+
+    thumbs = list((tmp_path / "_thumbs").rglob("*.jpg"))
+    assert len(thumbs) == 1
+
+
+def test_submitting_results_changes_the_etag(client, tmp_path):
+    _packet(tmp_path, "tracking_loss_001")
+    listing = client.get("/api/packets")
+    resp = client.post(
+        "/api/packets/tracking_loss_001/results",
+        json={"results": [{"frame_idx": 0, "action": "confirm", "warmup": True}]},
+    )
+    assert resp.json()["status"] == "partial"
+
+    fresh = client.get(
+        "/api/packets", headers={"if-none-match": listing.headers["etag"]}
+    )
+    assert fresh.status_code == 200
+    assert fresh.json()[0]["reviewed_count"] == 1
+    samples = client.get("/api/exclusions").json()["warmup_ranges"][0]["samples"]
+    assert samples[0]["frame_idx"] == 0
+
+
+def test_cache_disabled_sends_no_etags(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "CACHE_ENABLED", False)
+    _packet(tmp_path, "tracking_loss_001")
+    resp = client.get("/api/packets/tracking_loss_001/thumb/0")
+    assert resp.status_code == 200 and "etag" not in resp.headers
+    assert not (tmp_path / "_thumbs").exists()
+    assert client.get("/api/packets", headers={"if-none-match": "*"}).status_code == 200
+
+
+def test_session_benchmark_reports_both_modes():
+    from benchmarks.annotation_server import run_benchmark
+
+    report = run_benchmark(packets=2, frames=12)
+    assert report["before"]["requests"] == report["after"]["requests"]
+    assert report["before"]["not_modified"] == 0
+    assert report["after"]["not_modified"] > 0
+    assert "GET /api/packets/{id}/thumb/{n}" in report["after"]["endpoints"]
+    assert server.CACHE_ENABLED and not server._THUMB_CACHES
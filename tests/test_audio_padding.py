@@ -355,6 +355,47 @@ def test_detect_video_decode_corruption_flags_only_corrupt(tmp_path):
     assert entry["corrupt_start_seconds"] < entry["video_seconds"]
 
 
+def test_detect_video_decode_corruption_caches_verdicts(tmp_path, monkeypatch):
+    """Verdicts persist next to the segments: a repeat scan decodes nothing,
+    and changed bytes invalidate only that segment's verdict."""
+    from video_grouper.utils import ffmpeg_utils
+    from video_grouper.utils.decode_verdicts import (
+        VERDICTS_FILENAME,
+        cached_corrupt_starts,
+        is_verified_clean,
+    )
+
+    clean = tmp_path / "clean.mp4"
+    corrupt = tmp_path / "corrupt.mp4"
+    _write_decodable_clip(clean, video_seconds=20.0)
+    _write_decodable_clip(corrupt, video_seconds=20.0)
+    _corrupt_mid_file(corrupt)
+
+    # Parallel first pass (one segment per worker).
+    first = detect_video_decode_corruption([str(clean), str(corrupt)], max_workers=2)
+    assert (tmp_path / VERDICTS_FILENAME).exists()
+    assert is_verified_clean(str(clean))
+    assert not is_verified_clean(str(corrupt))
+    assert list(cached_corrupt_starts([str(clean), str(corrupt)])) == [str(corrupt)]
+
+    probed = []
+    real_probe = ffmpeg_utils._probe_segment
+
+    def _counting_probe(path, window_seconds):
+        probed.append(path)
+        return real_probe(path, window_seconds)
+
+    monkeypatch.setattr(ffmpeg_utils, "_probe_segment", _counting_probe)
+    again = detect_video_decode_corruption([str(clean), str(corrupt)], max_workers=1)
+    assert probed == []
+    assert again == first
+
+    # Re-written bytes no longer match the fingerprint, so only that one is probed.
+    _write_decodable_clip(clean, video_seconds=10.0)
+    detect_video_decode_corruption([str(clean), str(corrupt)], max_workers=1)
+    assert probed == [str(clean)]
+
+
 @pytest.mark.asyncio
 async def test_combine_degrades_corrupt_segment(tmp_path):
     """Combining a corrupt segment cuts the dead video region instead of muxing
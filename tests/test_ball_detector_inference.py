@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import numpy as np
+import pytest
 
 from video_grouper.inference.ball_detector import (
     _pad8,
@@ -10,7 +11,9 @@ from video_grouper.inference.ball_detector import (
     infer_band,
 )
 from video_grouper.inference.iso_warp import (
+    BandStabilizer,
     CropIsoWarp,
+    PyramidBandStabilizer,
     band_mask,
     expand_polygon,
     far_margin_polygon,
@@ -223,6 +226,11 @@ def _textured_band(h=200, w=800, seed=3):
     return np.clip(img, 0, 255).astype(np.uint8)
 
 
+_STABILIZERS = pytest.mark.parametrize(
+    "stab_cls", [BandStabilizer, PyramidBandStabilizer], ids=["current", "pyramid"]
+)
+
+
 def _shift_img(img, dx, dy):
     import cv2
 
@@ -232,25 +240,23 @@ def _shift_img(img, dx, dy):
     )
 
 
-def test_band_stabilizer_first_frame_is_anchor():
-    from video_grouper.inference.iso_warp import BandStabilizer
-
-    stab = BandStabilizer()
+@_STABILIZERS
+def test_band_stabilizer_first_frame_is_anchor(stab_cls):
+    stab = stab_cls()
     img = _textured_band()
     out = stab.align(img)
     assert stab.last == (0.0, 0.0)
     np.testing.assert_array_equal(out, img)
 
 
-def test_band_stabilizer_estimates_and_undoes_known_shift():
+@_STABILIZERS
+def test_band_stabilizer_estimates_and_undoes_known_shift(stab_cls):
     """A wind gust = translated content: estimate ~= the true shift, and align
     warps the content back onto the anchor (EXP-DIST-57)."""
-    from video_grouper.inference.iso_warp import BandStabilizer
-
     img = _textured_band()
     dx, dy = 9.0, -6.0
     shifted = _shift_img(img, dx, dy)
-    stab = BandStabilizer()
+    stab = stab_cls()
     stab.align(img)  # anchor
     aligned = stab.align(shifted)
     edx, edy = stab.last
@@ -264,17 +270,16 @@ def test_band_stabilizer_estimates_and_undoes_known_shift():
     assert abs(probe.last[0]) < 0.75 and abs(probe.last[1]) < 0.75
 
 
-def test_band_stabilizer_coordinate_mapping():
+@_STABILIZERS
+def test_band_stabilizer_coordinate_mapping(stab_cls):
     """A raw-frame point maps into the aligned band as band_coords - last, and an
     aligned detection maps back as + last — the convention every call site uses."""
-    from video_grouper.inference.iso_warp import BandStabilizer
-
     img = _textured_band()
     px, py = 400, 100
     img[py - 2 : py + 3, px - 2 : px + 3] = 255  # bright dot = "the ball"
     dx, dy = 12.0, 5.0
     shifted = _shift_img(img, dx, dy)  # ball now at (px+dx, py+dy) on the raw frame
-    stab = BandStabilizer()
+    stab = stab_cls()
     stab.align(img)
     aligned = stab.align(shifted)
     edx, edy = stab.last
@@ -286,12 +291,11 @@ def test_band_stabilizer_coordinate_mapping():
     assert win.max() >= 250
 
 
-def test_band_stabilizer_flat_frame_keeps_previous_shift():
+@_STABILIZERS
+def test_band_stabilizer_flat_frame_keeps_previous_shift(stab_cls):
     """No usable correlation (flat frame) -> keep the last shift, don't snap to 0."""
-    from video_grouper.inference.iso_warp import BandStabilizer
-
     img = _textured_band()
-    stab = BandStabilizer()
+    stab = stab_cls()
     stab.align(img)
     stab.align(_shift_img(img, 8.0, 3.0))
     prev = stab.last
@@ -300,12 +304,13 @@ def test_band_stabilizer_flat_frame_keeps_previous_shift():
     assert stab.last == prev
 
 
-def test_dewarp_mask_gray_stabilized_pulls_content_back():
+@_STABILIZERS
+def test_dewarp_mask_gray_stabilized_pulls_content_back(stab_cls):
     """dewarp_mask_gray with a stabilizer masks AFTER alignment, so content that
     wind pushed toward the mask edge is pulled back before zeroing."""
     import cv2
 
-    from video_grouper.inference.iso_warp import BandStabilizer, dewarp_mask_gray
+    from video_grouper.inference.iso_warp import dewarp_mask_gray
 
     poly = np.array(
         [
@@ -329,7 +334,7 @@ def test_dewarp_mask_gray_stabilized_pulls_content_back():
     frame = (rng.random((1080, 1920, 3)) * 80 + 60).astype(np.uint8)
     for x in range(100, 1920, 160):
         frame[:, x : x + 4] = 220
-    stab = BandStabilizer()
+    stab = stab_cls()
     ref = dewarp_mask_gray(frame, warp, mask, stab)
     shifted = _shift_img(frame, 10.0, 0.0)
     out = dewarp_mask_gray(shifted, warp, mask, stab)
@@ -340,6 +345,40 @@ def test_dewarp_mask_gray_stabilized_pulls_content_back():
     assert float(diff.mean()) < 6.0
 
 
+def test_pyramid_stabilizer_skips_motionless_frames():
+    """Frames whose coarse shift hasn't moved past min_motion keep ``last``
+    without the refinement pass; a real move is still measured."""
+    img = _textured_band()
+    stab = PyramidBandStabilizer(min_motion=0.5)
+    stab.align(img)
+    shifted = _shift_img(img, 7.0, 2.0)
+    stab.align(shifted)
+    first = stab.last
+    assert stab.skipped == 0
+    stab.align(shifted)
+    stab.align(shifted)
+    assert stab.skipped == 2 and stab.last == first
+    stab.align(_shift_img(img, -5.0, 4.0))
+    assert stab.skipped == 2
+    assert abs(stab.last[0] + 5.0) < 1.0 and abs(stab.last[1] - 4.0) < 1.0
+    stab.reset()
+    stab.align(shifted)  # new anchor
+    assert stab.last == (0.0, 0.0)
+
+
+def test_band_stabilizer_benchmark_accuracy():
+    """The harness' synthetic wind run: the pyramid estimator tracks the true
+    shift (and the current estimator) to well under a band pixel."""
+    from benchmarks.band_stabilizer import run_benchmark
+
+    r = run_benchmark(n_frames=150, amplitude=20.0)
+    assert r["current"]["error_vs_truth"]["mean_px"] < 0.5
+    assert r["pyramid"]["error_vs_truth"]["mean_px"] < 0.5
+    assert r["pyramid"]["error_vs_truth"]["max_px"] < 2.0
+    assert r["pyramid_vs_current"]["mean_px"] < 0.5
+    assert 0.0 < r["pyramid"]["skipped_frac"] < 1.0
+
+
 def test_training_dewarp_wrapper_accepts_stabilizer():
     """Every training CLI imports heatmap_dataset._dewarp_mask_gray, not the
     product function — the wrapper must pass the stabilizer through (the wind
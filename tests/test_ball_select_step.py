@@ -49,15 +49,17 @@ def _write_selector_npz(path, n_features):
     )
 
 
-def _write_candidates(path, stride=4, n=25):
+def _write_candidates(path, stride=4, n=25, schema="candidates/1"):
     frames = {}
     for i in range(n):
         g = i * stride
         ball = [400.0 + 15.0 * i, 700.0, 0.5]
         static = [1200.0, 650.0, 0.9]
+        if schema == "candidates/2":
+            ball, static = ball + [9.0], static + [12.0]
         frames[str(g)] = [ball, static]
     art = {
-        "schema": "candidates/1",
+        "schema": schema,
         "stride": stride,
         "src_w": 1920,
         "src_h": 1080,
@@ -88,6 +90,17 @@ def test_select_writes_dense_trajectory(tmp_path):
     assert on_ball >= 0.8 * len(xs)
 
 
+def test_select_accepts_candidates2_rows(tmp_path):
+    det = tmp_path / "detections.json"
+    _write_candidates(det, schema="candidates/2")  # what ball_detect writes
+    poly = tmp_path / "field.json"
+    poly.write_text(json.dumps({"polygon": POLY}))
+    net = tmp_path / "sel.npz"
+    _write_selector_npz(net, len(FEATURE_NAMES))
+    cfg = BallSelectStepConfig(select_model_path=str(net))
+    assert _run_selection(str(det), str(poly), str(tmp_path / "t.json"), cfg) > 0
+
+
 def test_select_rejects_wrong_schema(tmp_path):
     det = tmp_path / "detections.json"
     det.write_text(json.dumps({"schema": "nope", "frames": {}}))
@@ -161,3 +161,23 @@ def test_load_selector_rejects_reordered_feature_schema(tmp_path):
     _save_net(p, net, feature_names=np.asarray(tuple(reversed(FEATURE_NAMES))))
     with pytest.raises(ValueError, match="feature schema|drift|re-export"):
         load_selector(p)
+
+
+@pytest.mark.parametrize("window", [3, 1024])
+@pytest.mark.parametrize("use_ef", [True, False])
+def test_build_features_matches_per_frame_reference(window, use_ef):
+    from benchmarks.selector_features import (
+        build_features_per_frame,
+        features_identical,
+        synthetic_candidates,
+    )
+    from video_grouper.inference.ball_selector import build_features
+    from video_grouper.inference.world_geometry import build_field_geometry
+
+    frames, ef, poly = synthetic_candidates(300, seed=3)
+    frames[0] = frames[-1] = []  # empty frames at the stream edges
+    geom = build_field_geometry(poly)
+    ef = ef if use_ef else None
+    got = build_features(frames, geom, ef=ef, window=window)
+    assert features_identical(got, build_features_per_frame(frames, geom, ef=ef))
+    assert got[0].shape == (0, len(FEATURE_NAMES))
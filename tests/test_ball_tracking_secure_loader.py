@@ -17,6 +17,7 @@ from video_grouper.ball_tracking.secure_loader import (
     SecureLoader,
     SecureLoaderError,
 )
+from video_grouper.inference.session_pool import get_session_pool
 
 
 # Disable root-level autouse fixtures.
@@ -35,6 +36,14 @@ def mock_ffmpeg():
     yield None
 
 
+@pytest.fixture(autouse=True)
+def empty_session_pool():
+    """Sessions are process-wide; start and leave every test with none."""
+    get_session_pool().clear()
+    yield
+    get_session_pool().clear()
+
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -204,6 +213,47 @@ class TestAcquireHappyPath:
             MODEL_KEY, channel="beta", pipeline_version="2.0.0"
         )
 
+    def test_reacquire_reuses_pooled_session_without_download(self, monkeypatch):
+        priv, pub_hex = _gen_keypair()
+        content_key = b"\x42" * 32
+        artifact = _build_artifact(b"pooled", content_key)
+        license_response = _build_license_response(priv, artifact, content_key)
+        fake_session_class = _fake_session_factory(monkeypatch)
+
+        ttt = _make_ttt_client(license_response)
+        http = _make_http_client(artifact)
+        loader = SecureLoader(ttt, [pub_hex], http_client=http)
+
+        first = loader.acquire(MODEL_KEY)
+        second = loader.acquire(MODEL_KEY)
+
+        assert second.session is first.session
+        # The license is re-verified every time; the artifact is not re-fetched.
+        assert ttt.acquire_model_license.call_count == 2
+        http.get.assert_called_once()
+        fake_session_class.assert_called_once()
+
+    def test_republished_artifact_builds_a_new_session(self, monkeypatch):
+        priv, pub_hex = _gen_keypair()
+        content_key = b"\x42" * 32
+        fake_session_class = _fake_session_factory(monkeypatch)
+
+        for plaintext in (b"weights-a", b"weights-b"):
+            artifact = _build_artifact(plaintext, content_key)
+            license_response = _build_license_response(priv, artifact, content_key)
+            loader = SecureLoader(
+                _make_ttt_client(license_response),
+                [pub_hex],
+                http_client=_make_http_client(artifact),
+            )
+            loader.acquire(MODEL_KEY)
+
+        # A different artifact_sha256 in the license never matches the pooled one.
+        assert [c.args[0] for c in fake_session_class.call_args_list] == [
+            b"weights-a",
+            b"weights-b",
+        ]
+
 
 # ---------------------------------------------------------------------------
 # License verification failures
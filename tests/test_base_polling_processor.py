@@ -0,0 +1,96 @@
+"""Tests for PollingProcessor's adaptive scheduling (backoff + wake-ups)."""
+
+import asyncio
+
+import pytest
+
+from video_grouper.task_processors.base_polling_processor import (
+    _WAKE_SUBSCRIBERS,
+    PollingProcessor,
+    signal_wakeup,
+)
+
+
+class StubPoller(PollingProcessor):
+    max_backoff_multiplier = 4.0
+    wake_topics = ("stub_topic",)
+
+    def __init__(self, results, poll_interval=60):
+        super().__init__("/tmp", None, poll_interval)
+        self.results = list(results)
+        self.calls = 0
+
+    async def discover_work(self):
+        self.calls += 1
+        if not self.results:
+            return None
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.mark.asyncio
+async def test_idle_polls_back_off_to_cap():
+    poller = StubPoller([False, False, False, False])
+    assert poller.current_interval() == 60
+    expected = [120, 240, 240, 240]
+    for want in expected:
+        await poller._poll_once()
+        assert poller.current_interval() == want
+
+
+@pytest.mark.asyncio
+async def test_productive_poll_resets_backoff():
+    poller = StubPoller([False, False, True, False, None])
+    await poller._poll_once()
+    await poller._poll_once()
+    assert poller.current_interval() == 240
+    await poller._poll_once()
+    assert poller.current_interval() == 60
+    await poller._poll_once()
+    await poller._poll_once()  # None (no signal) counts as productive
+    assert poller.current_interval() == 60
+
+
+@pytest.mark.asyncio
+async def test_default_multiplier_keeps_fixed_cadence():
+    class FixedPoller(StubPoller):
+        max_backoff_multiplier = 1.0
+
+    poller = FixedPoller([False, False, False])
+    for _ in range(3):
+        await poller._poll_once()
+    assert poller.current_interval() == 60
+
+
+@pytest.mark.asyncio
+async def test_error_is_logged_and_counted_as_productive():
+    poller = StubPoller([False, RuntimeError("boom")])
+    await poller._poll_once()
+    await poller._poll_once()
+    stats = poller.poll_stats()
+    assert stats["polls"] == 2
+    assert stats["idle_streak"] == 0
+    assert stats["avg_poll_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_signal_wakeup_cuts_sleep_short_and_resets_backoff():
+    poller = StubPoller([False] * 10, poll_interval=3600)
+    await poller.start()
+    try:
+        await asyncio.sleep(0.05)
+        assert poller.calls == 1
+        assert poller._idle_streak == 1
+
+        assert signal_wakeup("stub_topic") == 1
+        await asyncio.sleep(0.05)
+        assert poller.calls == 2
+        stats = poller.poll_stats()
+        assert stats["wakeups"] == 1
+        assert stats["last_wake_reason"] == "stub_topic"
+    finally:
+        await poller.stop()
+    assert poller not in _WAKE_SUBSCRIBERS.get("stub_topic", set())
+    assert signal_wakeup("stub_topic") == 0
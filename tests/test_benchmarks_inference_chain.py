@@ -0,0 +1,72 @@
+"""The CPU inference-chain benchmark: runs end to end and compares reports."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.inference_chain import CHAIN, REPO_ROOT, compare_reports
+
+
+# --- Real filesystem + PyAV on tmp_path; override conftest's mocks ---
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+def _run(*argv):
+    # A subprocess: conftest stubs onnxruntime in this interpreter.
+    return subprocess.run(
+        [sys.executable, "-m", "benchmarks.inference_chain", *argv],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+
+
+def test_chain_runs_and_reports_every_step(tmp_path):
+    out = tmp_path / "bench.json"
+    argv = ["--width", "640", "--height", "360", "--seconds", "4"]
+    argv += ["--render-width", "320", "--render-height", "180", "--top", "5"]
+    argv += ["--work-dir", str(tmp_path)]
+    proc = _run(*argv, "--out", str(out))
+    assert proc.returncode == 0, proc.stderr[-2000:]
+
+    report = json.loads(out.read_text())
+    assert report["status"] == "complete"
+    assert report["video"]["frames"] == 80
+    assert [s["step"] for s in report["steps"]] == list(CHAIN)
+    for s in report["steps"]:
+        assert s["seconds"] > 0 and s["frames_per_s"] > 0
+        assert 0 < len(s["hot_spots"]) <= 5
+    # ball_detect's profile is collected from its worker thread.
+    detect = next(s for s in report["steps"] if s["step"] == "ball_detect")
+    assert any("ball_detector.py" in h["function"] for h in detect["hot_spots"])
+
+    # A rerun against that report: per-step ratios, no spurious regression
+    # at a tolerance well above timing noise.
+    proc = _run(*argv, "--baseline", str(out), "--tolerance", "0.9")
+    assert proc.returncode == 0 and "vs baseline" in proc.stdout
+    assert "REGRESSED" not in proc.stdout
+
+
+def _report(**fps):
+    return {
+        "commit": "abc",
+        "steps": [
+            {"step": k, "frames_per_s": v, "peak_rss_mb": 100.0} for k, v in fps.items()
+        ],
+    }
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    base = _report(ball_detect=100.0, render=50.0, plan_camera=1000.0)
+    cur = _report(ball_detect=80.0, render=47.0, ball_select=10.0)
+    cmp = compare_reports(base, cur, tolerance=0.1)
+    assert cmp["regressions"] == ["ball_detect"]
+    assert [r["step"] for r in cmp["steps"]] == ["ball_detect", "render"]
+    assert cmp["steps"][0]["ratio"] == 0.8
@@ -6,6 +6,7 @@ feel: bounded lag with lead room, incremental zoom, dead-ball widening, and
 hold-and-widen only when there is NO information at all."""
 
 import numpy as np
+import pytest
 
 from training.world_model.camera_planner import (
     PlannerConfig,
@@ -96,3 +97,72 @@ def test_upsample_track_blanks_wide_gaps():
     assert out[16] == (180.0, 50.0)
     assert all(out[g] is None for g in range(17, 3016))  # the break is blank
     assert out[3016] == (2000.0, 60.0)
+
+
+def _random_trajectory(n, seed, p_gap=0.01):
+    rng = np.random.default_rng(seed)
+    traj, pos, gap = [], np.array([W / 2, H / 2]), 0
+    for _ in range(n):
+        pos = np.clip(pos + rng.normal(0.0, 25.0, 2), 0.0, (W, H))
+        if gap:
+            gap -= 1
+            traj.append(None)
+        elif rng.random() < p_gap:
+            gap = int(rng.integers(1, 60))
+            traj.append(None)
+        elif rng.random() < 0.05:
+            traj.append(traj[-1] if traj and traj[-1] is not None else tuple(pos))
+        else:
+            traj.append((float(pos[0]), float(pos[1])))
+    return traj
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_plan_camera_matches_per_frame_reference(seed):
+    """Golden output: the array planner is bit-identical to the per-frame loop
+    (gaps, leading misses, dead-ball holds, partial depth, non-default config)."""
+    from benchmarks.camera_planner import plan_camera_per_frame
+
+    traj = [None] * 7 + _random_trajectory(3000, seed)
+    traj[500:700] = [(4000.0, 900.0)] * 200  # dead-ball hold
+    rng = np.random.default_rng(seed)
+    depth = [None if rng.random() < 0.1 else float(rng.random()) for _ in traj]
+    for kwargs in (
+        {},
+        {"depth01": depth},
+        {"depth01": depth, "config": PlannerConfig(fps=25.0, lead_frames=12.0)},
+    ):
+        got = plan_camera(traj, src_w=W, src_h=H, **kwargs)
+        ref = plan_camera_per_frame(traj, src_w=W, src_h=H, **kwargs)
+        assert got == ref
+
+
+def test_plan_camera_edge_cases_match_reference():
+    from benchmarks.camera_planner import plan_camera_per_frame
+
+    for traj in ([], [None] * 50, [(10.0, 20.0)], [None, (5.0, 5.0), None]):
+        assert plan_camera(traj, src_w=W, src_h=H) == plan_camera_per_frame(
+            traj, src_w=W, src_h=H
+        )
+
+
+@pytest.mark.parametrize(
+    ("g_start", "g_end", "max_gap"), [(0, 4000, 24), (130, 2950, 24), (0, 4000, 7)]
+)
+def test_upsample_track_matches_per_frame_reference(g_start, g_end, max_gap):
+    from benchmarks.camera_planner import upsample_track_per_frame
+
+    rng = np.random.default_rng(5)
+    ef = sorted(
+        set(range(100, 1500, 4)) | set(range(2300, 3800, 8)) | {1502, 1503, 1530}
+    )
+    track = {
+        i: (float(rng.uniform(0, W)), float(rng.uniform(0, H)))
+        for i in range(len(ef) + 3)  # a few indices past ef: ignored
+        if rng.random() > 0.1
+    }
+    got = upsample_track(track, ef, g_start, g_end, max_gap=max_gap)
+    ref = upsample_track_per_frame(track, ef, g_start, g_end, max_gap=max_gap)
+    assert got == ref
+    # a window entirely outside the tracked span
+    assert upsample_track(track, ef, 5000, 5100) == [None] * 100
@@ -1212,6 +1212,8 @@ class TestReconciliationPass:
         dp.add_work.assert_called_once()
         queued = dp.add_work.call_args[0][0]
         assert queued.file_path.endswith("partial.dav")
+        # Re-queued, not downloaded: kept out of the listing cache.
+        assert not poller.listing_cache.is_unchanged(cam_file)
 
     @pytest.mark.asyncio
     async def test_reconcile_skipped_when_queue_busy(
@@ -1247,6 +1249,175 @@ class TestReconciliationPass:
         assert mock_camera.get_file_list.await_count == first_count + 1
 
 
+class TestListingCache:
+    """The persisted listing cache turns each poll into a diff against what
+    the poller already acted on."""
+
+    @staticmethod
+    def _recent_file(path="/cached.dav", minutes_ago=30, size=3_000_000):
+        start = datetime.now() - timedelta(minutes=minutes_ago)
+        return {
+            "path": path,
+            "startTime": start.strftime("%Y-%m-%d %H:%M:%S"),
+            "endTime": (start + timedelta(minutes=5)).strftime("%Y-%m-%d %H:%M:%S"),
+            "size": size,
+        }
+
+    @pytest.mark.asyncio
+    @patch("video_grouper.task_processors.camera_poller.DirectoryState")
+    @patch("video_grouper.task_processors.camera_poller.find_group_directory")
+    async def test_unchanged_listing_skips_grouping(
+        self,
+        mock_find_group,
+        mock_dir_state_cls,
+        temp_storage,
+        mock_config,
+        mock_camera,
+    ):
+        group_dir = os.path.join(temp_storage, "2026.06.20-10.00.00")
+        mock_find_group.return_value = group_dir
+        mock_camera.get_file_list.return_value = [self._recent_file()]
+        known = RecordingFile(
+            start_time=datetime.now() - timedelta(minutes=30),
+            end_time=datetime.now() - timedelta(minutes=25),
+            file_path=os.path.join(group_dir, "cached.dav"),
+            status="pending",
+        )
+        ds = Mock()
+        ds.is_file_in_state = Mock(return_value=False)
+        ds.get_file_by_path = Mock(return_value=None)
+        ds.add_file = AsyncMock()
+        mock_dir_state_cls.return_value = ds
+
+        poller = _make_poller(temp_storage, mock_config, mock_camera)
+        poller.download_processor.add_work = AsyncMock()
+
+        await poller._sync_files_from_camera()
+        assert mock_find_group.call_count == 1
+        poller.download_processor.add_work.assert_awaited_once()
+
+        # Queued but not downloaded yet: the next poll still looks it up.
+        ds.is_file_in_state.return_value = True
+        ds.get_file_by_path.return_value = known
+        await poller._sync_files_from_camera()
+        assert mock_find_group.call_count == 2
+        assert not poller.listing_cache.is_unchanged(self._recent_file())
+
+        known.status = "downloaded"
+        await poller._sync_files_from_camera()
+        assert mock_find_group.call_count == 3
+        assert poller._last_poll_found_files is True
+
+        await poller._sync_files_from_camera()
+        assert mock_find_group.call_count == 3
+        assert poller._last_poll_found_files is False
+
+        # A fresh poller (restart) reads the same cache from disk.
+        restarted = _make_poller(temp_storage, mock_config, mock_camera)
+        assert restarted.listing_cache.is_unchanged(self._recent_file())
+
+    @pytest.mark.asyncio
+    async def test_listing_without_cached_entries_forces_reconcile(
+        self, temp_storage, mock_config, mock_camera
+    ):
+        """A window whose cached recordings all vanished reads as a reformat."""
+        poller = _make_poller(temp_storage, mock_config, mock_camera)
+        poller.listing_cache.record(self._recent_file(), "/local/cached.dav")
+        poller._last_reconcile_time = datetime.now()
+        assert not poller._should_reconcile()
+
+        mock_camera.get_file_list.return_value = []
+        await poller._sync_files_from_camera()
+
+        assert poller._reformat_suspected
+        assert len(poller.listing_cache) == 0
+        assert poller._should_reconcile()
+
+    @pytest.mark.asyncio
+    @patch("video_grouper.task_processors.camera_poller.DirectoryState")
+    @patch("video_grouper.task_processors.camera_poller.find_group_directory")
+    async def test_reformat_detected_after_post_settle_caching(
+        self,
+        mock_find_group,
+        mock_dir_state_cls,
+        temp_storage,
+        mock_config,
+        mock_camera,
+    ):
+        """An entry is cached only once its download settles, after the HWM
+        has already moved to its end; it still counts as expected."""
+        group_dir = os.path.join(temp_storage, "2026.06.20-10.00.00")
+        mock_find_group.return_value = group_dir
+        listed = self._recent_file()
+        mock_camera.get_file_list.return_value = [listed]
+        known = RecordingFile(
+            start_time=datetime.now() - timedelta(minutes=30),
+            end_time=datetime.now() - timedelta(minutes=25),
+            file_path=os.path.join(group_dir, "cached.dav"),
+            status="pending",
+        )
+        ds = Mock()
+        ds.is_file_in_state = Mock(return_value=False)
+        ds.get_file_by_path = Mock(return_value=None)
+        ds.add_file = AsyncMock()
+        mock_dir_state_cls.return_value = ds
+
+        poller = _make_poller(temp_storage, mock_config, mock_camera)
+        poller.download_processor.add_work = AsyncMock()
+
+        # Poll 1 queues the file and moves the HWM to its end.
+        await poller._sync_files_from_camera()
+        assert len(poller.listing_cache) == 0
+
+        # Poll 2 sees it again (the window overlaps by a minute), now
+        # downloaded, and caches it -- it starts before this window.
+        ds.is_file_in_state.return_value = True
+        ds.get_file_by_path.return_value = known
+        known.status = "downloaded"
+        await poller._sync_files_from_camera()
+        assert poller.listing_cache.is_unchanged(listed)
+        assert not poller._reformat_suspected
+
+        # The card is swapped: only a fresh recording is listed.
+        fresh = self._recent_file(path="/fresh.dav", minutes_ago=2)
+        mock_camera.get_file_list.return_value = [fresh]
+        ds.is_file_in_state.return_value = False
+        ds.get_file_by_path.return_value = None
+        await poller._sync_files_from_camera()
+
+        assert poller._reformat_suspected
+        assert not poller.listing_cache.is_unchanged(listed)
+
+    def test_still_recording_segment_not_a_reformat(self, temp_storage):
+        """The segment that was open at the last poll gets a new path once
+        it closes; matching on startTime keeps that from tripping detection."""
+        from video_grouper.utils.camera_listing_cache import CameraListingCache
+
+        cache = CameraListingCache(temp_storage, "default")
+        open_segment = self._recent_file(path="/open.dav")
+        cache.record(open_segment, "/local/open.dav")
+        closed = dict(open_segment, path="/closed.dav")
+
+        now = datetime.now()
+        assert not cache.suspect_reformat([closed], now - timedelta(hours=1))
+        assert cache.suspect_reformat([], now - timedelta(hours=1))
+
+    @pytest.mark.asyncio
+    async def test_reconcile_schedule_persists_across_restart(
+        self, temp_storage, mock_config, mock_camera
+    ):
+        mock_camera.get_file_list = AsyncMock(return_value=[])
+        poller = CameraPoller(
+            temp_storage, mock_config, mock_camera, _idle_download_processor()
+        )
+        await poller._reconcile_files_from_camera()
+
+        restarted = CameraPoller(
+            temp_storage, mock_config, mock_camera, _idle_download_processor()
+        )
+        assert not restarted._should_reconcile()
+
+
 class TestOpenConnectedSession:
     """An open-ended (never-closed) connected session must not blanket-skip
     historical recordings as home footage."""
@@ -0,0 +1,302 @@
+"""Tests for the distributed job queue: API-owned job index + rename fallback."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import uvicorn
+from fastapi.testclient import TestClient
+
+import training.distributed.jobs as jobs
+from training.distributed.job_store import JobStore
+from training.pipeline import api
+from training.pipeline.client import PipelineClient
+from training.pipeline.queue import WorkQueue
+from training.pipeline.registry import GameRegistry
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+# Real filesystem on tmp_path; override conftest's os.path mocks.
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+def _init_api(tmp_path: Path) -> None:
+    server = tmp_path / "server"
+    queue = WorkQueue(server / "work_queue.db")
+    registry = GameRegistry(server / "registry.db")
+    api.init_app(queue, registry)
+    queue.close()
+    registry.close()
+
+
+def _close_job_store() -> None:
+    if api._job_store is not None:
+        api._job_store.close()
+        api._job_store = None
+
+
+@pytest.fixture
+def api_client(tmp_path):
+    """A PipelineClient talking to an in-process Pipeline API."""
+    _init_api(tmp_path)
+    client = PipelineClient("http://testserver")
+    client._client = TestClient(api.app)
+    yield client
+    _close_job_store()
+
+
+@pytest.fixture
+def queue_dir(tmp_path, monkeypatch, api_client):
+    """Point jobs.py at tmp_path, with the job index behind ``api_client``."""
+    queue = tmp_path / "queue"
+    monkeypatch.setattr(jobs, "JOBS_DIR", queue)
+    for name in ("pending", "active", "done", "failed"):
+        monkeypatch.setattr(jobs, name.upper(), queue / name)
+    monkeypatch.setattr(jobs, "JOBS_API", "http://testserver")
+    monkeypatch.setattr(jobs, "_CLIENT", api_client)
+    monkeypatch.setattr(jobs, "_COMPLETED", [])
+    yield queue
+
+
+def _submit(n, **fields):
+    return [
+        jobs.submit_job(
+            jobs.make_job(fields.get("type", "tile"), segment=f"s{i}", **fields)
+        )
+        for i in range(n)
+    ]
+
+
+def _unreachable() -> PipelineClient:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # closed again: nothing listens here
+    return PipelineClient(f"http://127.0.0.1:{port}")
+
+
+def test_claims_follow_priority_and_capabilities(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    store.submit("07_tile_1", {"type": "tile", "priority": 7, "requires": []})
+    store.submit("03_label_1", {"type": "label", "priority": 3, "requires": ["gpu"]})
+    store.submit(
+        "01_train_1", {"type": "train", "priority": 1, "requires": ["gpu", "big"]}
+    )
+
+    assert store.claim("h:1", [])[0] == "07_tile_1"
+    job_id, job = store.claim("h:1", ["gpu"])
+    assert job_id == "03_label_1" and job["claimed_at"] > 0
+    assert job["claimed_by"] == "h"
+    assert store.claim("h:1", ["gpu"]) is None  # the train job needs "big" too
+    assert store.claim("h:1", ["big", "gpu", "cpu"])[0] == "01_train_1"
+    store.close()
+
+
+def test_expired_leases_return_to_pending(tmp_path):
+    store = JobStore(tmp_path / "jobs.db", lease_s=0.05)
+    store.submit("05_tile_1", {"type": "tile", "priority": 5})
+    assert store.claim("crashed:1")[0] == "05_tile_1"
+    assert store.renew("05_tile_1", "crashed:1")
+
+    assert store.claim("other:2") is None  # lease still live
+    time.sleep(0.1)
+    assert store.claim("other:2")[0] == "05_tile_1"
+    assert not store.renew("05_tile_1", "crashed:1")
+    # A completion from the lost lease is dropped.
+    assert store.complete("crashed:1", [("05_tile_1", {"late": True}, 0.0)]) == 0
+    assert store.jobs("active")[0]["claimed_by"] == "other"
+    store.close()
+
+
+def test_completions_ride_on_the_next_claim(tmp_path):
+    store = JobStore(tmp_path / "jobs.db")
+    store.submit_many(
+        [(f"05_tile_{i}", {"type": "tile", "priority": 5}) for i in range(3)]
+    )
+    first, _ = store.claim("w:1")
+    second, _ = store.claim("w:1", completed=[(first, {"hostname": "h"}, 1.0)])
+    (done,) = store.jobs("done")
+    assert done["result"] == {"hostname": "h"}
+    assert store.fail(second, "boom") and not store.fail("missing", "boom")
+    assert store.jobs("failed")[0]["error"] == "boom"
+    store.clean(retry_failed=True)
+    assert store.jobs("done") == [] and len(store.jobs("pending")) == 2
+    store.close()
+
+
+def test_jobs_api_uses_the_index(queue_dir, tmp_path):
+    paths = _submit(2, type="label", requires=["gpu"], game_id="g")
+    assert not (queue_dir / "pending").exists()  # no job files written
+    assert (tmp_path / "server" / "jobs.db").exists()  # next to work_queue.db
+    assert jobs._job_exists("label", game_id="g", segment="s1")
+    assert not jobs._job_exists("label", game_id="g", segment="s9")
+
+    job, ref = jobs.claim_job(["gpu"])
+    assert ref == paths[0].stem and job["segment"] == "s0"
+    with jobs.hold_lease(ref, every_s=0.01):
+        time.sleep(0.05)
+    jobs.complete_job(ref, {"hostname": "h"})
+    assert len(jobs.get_status()["active"]) == 1  # buffered, not sent yet
+    jobs.flush_jobs()
+    status = jobs.get_status()
+    assert [len(status[k]) for k in ("pending", "active", "done", "failed")] == [
+        1,
+        0,
+        1,
+        0,
+    ]
+    assert status["done"][0]["result"] == {"hostname": "h"}
+
+
+def test_completion_is_sent_with_the_next_claim(queue_dir):
+    _submit(2)
+    _job, first = jobs.claim_job([])
+    jobs.complete_job(first)
+    _job, second = jobs.claim_job([])
+    assert jobs._COMPLETED == []
+    (done,) = jobs.get_status()["done"]
+    assert done["segment"] == "s0"
+    jobs.fail_job(second, "boom")
+    assert jobs.get_status()["failed"][0]["error"] == "boom"
+
+
+def test_legacy_job_files_are_still_claimed(queue_dir, monkeypatch, api_client):
+    monkeypatch.setattr(jobs, "_CLIENT", None)
+    monkeypatch.setattr(jobs, "JOBS_API", "")
+    (path,) = _submit(1)
+    assert path.exists()
+    monkeypatch.setattr(jobs, "JOBS_API", "http://testserver")
+    monkeypatch.setattr(jobs, "_CLIENT", api_client)
+
+    job, ref = jobs.claim_job([])  # index is empty -> rename protocol
+    assert isinstance(ref, Path) and ref.parent == queue_dir / "active"
+    assert job["claimed_by"]
+    jobs.complete_job(ref, {"ok": True})
+    assert (queue_dir / "done" / path.name).exists()
+    assert jobs.get_status()["done"][0]["result"] == {"ok": True}
+
+
+def test_unreachable_api_falls_back_to_job_files(queue_dir, monkeypatch):
+    monkeypatch.setattr(jobs, "_CLIENT", _unreachable())
+    (path,) = _submit(1)
+    assert path.exists()
+    job, ref = jobs.claim_job([])
+    assert ref == queue_dir / "active" / path.name
+
+
+def test_buffered_completions_wait_for_the_api(queue_dir, monkeypatch):
+    _submit(1)
+    _job, ref = jobs.claim_job([])
+    reachable = jobs._CLIENT
+    monkeypatch.setattr(jobs, "_CLIENT", _unreachable())
+    jobs.complete_job(ref)
+    jobs.flush_jobs()
+    assert [c["id"] for c in jobs._COMPLETED] == [ref]  # kept, not dropped
+    with pytest.raises(RuntimeError, match=ref):
+        jobs.fail_job(ref, "boom")
+
+    monkeypatch.setattr(jobs, "_CLIENT", reachable)
+    jobs.flush_jobs()
+    assert jobs._COMPLETED == []
+    assert len(jobs.get_status()["done"]) == 1
+
+
+CLAIM_LOOP = textwrap.dedent(
+    """
+    import json, sys, time
+    from pathlib import Path
+    import training.distributed.jobs as jobs
+
+    go = Path(sys.argv[1])
+    while not go.exists():
+        time.sleep(0.005)
+    claimed = []
+    while (got := jobs.claim_job(["gpu"])) is not None:
+        job, ref = got
+        claimed.append(job["segment"])
+        jobs.complete_job(ref, {"pid": 0})
+    jobs.flush_jobs()
+    print(json.dumps(claimed))
+    """
+)
+
+
+@pytest.fixture
+def api_server(tmp_path):
+    """A real Pipeline API on a free localhost port: its URL."""
+    _init_api(tmp_path)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(api.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started and time.time() < deadline:
+        time.sleep(0.01)
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join(timeout=10)
+    _close_job_store()
+
+
+@pytest.mark.parametrize("backend", ["api", "files"])
+def test_concurrent_workers_claim_each_job_once(tmp_path, backend, request):
+    env = os.environ | {
+        "JOBS_DIR": str(tmp_path / "queue"),
+        "JOBS_API": request.getfixturevalue("api_server") if backend == "api" else "",
+        "PYTHONPATH": str(REPO_ROOT),
+    }
+    submit = "import training.distributed.jobs as j\n" + "\n".join(
+        f"j.submit_job(j.make_job('tile', requires={req!r}, segment='s{i}'))"
+        for i, req in enumerate([[], ["gpu"]] * 40)
+    )
+    subprocess.run([sys.executable, "-c", submit], env=env, check=True, cwd=REPO_ROOT)
+    assert (tmp_path / "queue" / "pending").exists() == (backend == "files")
+
+    go = tmp_path / "go"
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", CLAIM_LOOP, str(go)],
+            env=env,
+            cwd=REPO_ROOT,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for _ in range(4)
+    ]
+    time.sleep(0.5)
+    go.touch()
+    claimed = []
+    for p in procs:
+        out, _ = p.communicate(timeout=120)
+        assert p.returncode == 0
+        claimed += json.loads(out.strip().splitlines()[-1])
+
+    assert sorted(claimed) == sorted(f"s{i}" for i in range(80))
+    env_check = (
+        "import json, training.distributed.jobs as j\n"
+        "print(json.dumps({k: len(v) for k, v in j.get_status().items()}))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", env_check],
+        env=env,
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert json.loads(out) == {"pending": 0, "active": 0, "done": 80, "failed": 0}
@@ -1,5 +1,6 @@
 """Tests for the DownloadProcessor."""
 
+import asyncio
 import os
 import tempfile
 from datetime import datetime
@@ -477,3 +478,34 @@ class TestDownloadProcessor:
 
         key = processor.get_item_key(recording_file)
         assert key == "recording:/test/path/test.dav"
+
+    @pytest.mark.asyncio
+    async def test_incremental_append_runs_in_background(
+        self, temp_storage, mock_config, mock_camera
+    ):
+        """The incremental-combine append is scheduled, not awaited inline."""
+        processor = DownloadProcessor(temp_storage, mock_config, mock_camera, Mock())
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_append(group_dir, output):
+            started.set()
+            await release.wait()
+
+        with patch(
+            "video_grouper.task_processors.download_processor.append_downloaded_segments",
+            side_effect=slow_append,
+        ) as append:
+            processor._schedule_incremental_append("/g")
+            assert not processor._append_tasks  # config flag off
+
+            mock_config.processing.incremental_combine = True
+            processor._schedule_incremental_append("/g")
+            assert len(processor._append_tasks) == 1
+            await started.wait()
+            release.set()
+            await asyncio.gather(*processor._append_tasks)
+            await asyncio.sleep(0)
+
+        append.assert_called_once()
+        assert not processor._append_tasks
@@ -5,7 +5,12 @@ import json
 import numpy as np
 import pytest
 
-from training.data_prep.heatmap_dataset import HeatmapCropDataset, gaussian_heatmap
+from training.data_prep.crop_pack import PackedCrops, pack_crop_store
+from training.data_prep.heatmap_dataset import (
+    HeatmapCropDataset,
+    cached_gaussian_heatmap,
+    gaussian_heatmap,
+)
 from training.train_v4_heatmap import require_positive_depth
 
 # torch MUST be imported at collection time: conftest's autouse mock_file_system
@@ -70,6 +75,92 @@ def test_sigma_none_without_summary_defaults_to_4(tmp_path):
     assert HeatmapCropDataset(store, "train").sigma == 4.0
 
 
+@pytest.mark.parametrize("cx,cy,sigma", [(30, 20, 4.0), (12.3, 50.7, 1.5), (-3, 70, 8)])
+def test_cached_gaussian_matches_reference(cx, cy, sigma):
+    ref = gaussian_heatmap(64, 80, cx, cy, sigma)
+    got = cached_gaussian_heatmap(64, 80, cx, cy, sigma)
+    assert got.dtype == np.float32 and got.shape == (64, 80)
+    np.testing.assert_allclose(got, ref, rtol=1e-6, atol=1e-7)
+    got[0, 0] = 5.0  # a fresh array: mutating it must not poison the cache
+    assert cached_gaussian_heatmap(64, 80, cx, cy, sigma)[0, 0] == ref[0, 0]
+
+
+def _mk_crop_store(tmp_path, n=4, crop=16):
+    (tmp_path / "crops").mkdir()
+    rng = np.random.default_rng(0)
+    items = []
+    for k in range(n):
+        np.save(
+            tmp_path / "crops" / f"c{k}.npy",
+            rng.integers(0, 256, (3, crop, crop), dtype=np.uint8),
+        )
+        pos = k % 2 == 0
+        items.append(
+            {
+                "file": f"c{k}.npy",
+                "x": 5.0 + k if pos else None,
+                "y": 7.0 if pos else None,
+                "split": "val" if k == n - 1 else "train",
+                **({"depth": 0.25} if pos else {}),
+            }
+        )
+    index = {"summary": {"crop": crop, "sigma": 2.0}, "items": items}
+    (tmp_path / "index.json").write_text(json.dumps(index))
+    return tmp_path
+
+
+def test_packed_store_matches_per_file_crops(tmp_path):
+    store = _mk_crop_store(tmp_path)
+    info = pack_crop_store(store)
+    assert info.n == 4 and info.channels == 3 and info.crop == 16
+
+    pack = PackedCrops(info.path)
+    assert list(pack.rows("train")) == [0, 1, 2]
+    assert np.isnan(pack.labels["x"][1]) and pack.labels["depth"][0] == 0.25
+
+    for split in ("train", "val"):
+        loose = HeatmapCropDataset(store, split, packed=False)
+        packed = HeatmapCropDataset(store, split)
+        assert loose.pack_path is None and packed.pack_path == info.path
+        assert packed.index_sha == info.index_sha
+        for i in range(len(loose)):
+            np.testing.assert_array_equal(packed._load_stack(i), loose._load_stack(i))
+
+
+def test_pack_is_pinned_to_index_sha(tmp_path):
+    store = _mk_crop_store(tmp_path)
+    pack_crop_store(store)
+    assert HeatmapCropDataset(store, "train").pack_path is not None
+
+    # A mutator appends a crop: new index sha, so the old pack is never served.
+    data = json.loads((store / "index.json").read_text())
+    np.save(store / "crops" / "extra.npy", np.zeros((3, 16, 16), np.uint8))
+    data["items"].append({"file": "extra.npy", "x": None, "y": None, "split": "train"})
+    (store / "index.json").write_text(json.dumps(data))
+    ds = HeatmapCropDataset(store, "train")
+    assert ds.pack_path is None and len(ds) == 4
+
+    # packed=True builds the pack for the new snapshot on construction.
+    ds = HeatmapCropDataset(store, "train", packed=True)
+    assert ds.pack_path is not None
+    assert not ds._load_stack(3).any()
+    # The explicit old version still resolves to its own, still-valid pack.
+    assert HeatmapCropDataset(store, "train", index_version=1).pack_path is not None
+
+
+def test_packed_dataset_pickles_without_memmap(tmp_path):
+    import pickle
+
+    store = _mk_crop_store(tmp_path)
+    pack_crop_store(store)
+    ds = HeatmapCropDataset(store, "train")
+    ds._load_stack(0)
+    assert ds._pack is not None
+    clone = pickle.loads(pickle.dumps(ds))
+    assert clone._pack is None
+    np.testing.assert_array_equal(clone._load_stack(0), ds._load_stack(0))
+
+
 def test_require_positive_depth_rejects_partial_store():
     # Partial coverage is the dangerous case: the store LOOKS depth-ready.
     items = [
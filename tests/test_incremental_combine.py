@@ -0,0 +1,198 @@
+"""Real-media tests for the incremental (append-as-downloaded) combine.
+
+Like tests/test_audio_padding.py these encode tiny real mp4 clips and OVERRIDE
+conftest's autouse PyAV / filesystem mocks: the point is that an output built
+one segment at a time is the same game the one-shot combine produces.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from video_grouper.models import DirectoryState, RecordingFile
+from video_grouper.utils import incremental_combine
+from video_grouper.utils.ffmpeg_utils import combine_videos
+from video_grouper.utils.incremental_combine import (
+    INCREMENTAL_SUFFIX,
+    append_downloaded_segments,
+    discard_incremental_combine,
+    finalize_incremental_combine,
+)
+
+
+# --- Override conftest's autouse mocks for this module (use real PyAV/IO) ---
+@pytest.fixture(autouse=True)
+def mock_ffmpeg():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_httpx():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _clear_registry():
+    incremental_combine._ACTIVE.clear()
+    yield
+    incremental_combine._ACTIVE.clear()
+
+
+def _write_clip(path, seconds, fps=10, rate=16000):
+    import av
+    import numpy as np
+
+    with av.open(str(path), "w", format="mp4") as container:
+        vstream = container.add_stream("mpeg4", rate=fps)
+        vstream.width = 64
+        vstream.height = 64
+        vstream.pix_fmt = "yuv420p"
+        astream = container.add_stream("aac", rate=rate)
+        for i in range(int(round(seconds * fps))):
+            img = np.full((64, 64, 3), i % 255, dtype=np.uint8)
+            frame = av.VideoFrame.from_ndarray(img, format="rgb24").reformat(
+                format="yuv420p"
+            )
+            frame.pts = i
+            for pkt in vstream.encode(frame):
+                container.mux(pkt)
+        for pkt in vstream.encode(None):
+            container.mux(pkt)
+        total = int(round(seconds * rate))
+        written = 0
+        while written < total:
+            n = min(1024, total - written)
+            aframe = av.AudioFrame.from_ndarray(
+                np.zeros((2, n), dtype="float32"), format="fltp", layout="stereo"
+            )
+            aframe.sample_rate = rate
+            for pkt in astream.encode(aframe):
+                container.mux(pkt)
+            written += n
+        for pkt in astream.encode(None):
+            container.mux(pkt)
+
+
+def _frame_count(path):
+    import av
+
+    with av.open(str(path)) as container:
+        return sum(1 for _ in container.decode(video=0))
+
+
+async def _make_group(tmp_path, n=3, seconds=2.0):
+    group_dir = tmp_path / "2026.05.01-10.00.00"
+    group_dir.mkdir()
+    dir_state = DirectoryState(str(group_dir))
+    start = datetime(2026, 5, 1, 10, 0, 0)
+    paths = []
+    for i in range(n):
+        path = str(group_dir / f"seg{i}.mp4")
+        _write_clip(path, seconds)
+        rf = RecordingFile(
+            start_time=start + timedelta(minutes=5 * i),
+            end_time=start + timedelta(minutes=5 * (i + 1)),
+            file_path=path,
+            metadata={"path": f"/cam/seg{i}.mp4"},
+        )
+        await dir_state.add_file(path, rf)
+        paths.append(path)
+    return str(group_dir), paths
+
+
+async def _mark_downloaded(group_dir, path):
+    await DirectoryState(group_dir).update_file_state(path, status="downloaded")
+
+
+@pytest.mark.asyncio
+async def test_incremental_matches_one_shot_combine(tmp_path):
+    group_dir, paths = await _make_group(tmp_path)
+    output = os.path.join(group_dir, "combined.mp4")
+
+    for path in paths:
+        await _mark_downloaded(group_dir, path)
+        await append_downloaded_segments(group_dir, output)
+
+    assert incremental_combine._ACTIVE[group_dir].appended == paths
+    assert os.path.exists(output + INCREMENTAL_SUFFIX)
+    assert await finalize_incremental_combine(group_dir, paths, output)
+    assert not os.path.exists(output + INCREMENTAL_SUFFIX)
+
+    reference = tmp_path / "reference.mp4"
+    assert await combine_videos(paths, str(reference))
+    assert _frame_count(output) == _frame_count(reference) == 60
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_download_waits_for_gap(tmp_path):
+    group_dir, paths = await _make_group(tmp_path)
+    output = os.path.join(group_dir, "combined.mp4")
+
+    await _mark_downloaded(group_dir, paths[1])
+    await append_downloaded_segments(group_dir, output)
+    assert incremental_combine._ACTIVE[group_dir].appended == []
+
+    await _mark_downloaded(group_dir, paths[0])
+    await append_downloaded_segments(group_dir, output)
+    assert incremental_combine._ACTIVE[group_dir].appended == paths[:2]
+
+    # The last segment is appended by finalize itself.
+    assert await finalize_incremental_combine(group_dir, paths, output)
+    assert _frame_count(output) == 60
+
+
+@pytest.mark.asyncio
+async def test_mismatched_segment_list_falls_back(tmp_path):
+    group_dir, paths = await _make_group(tmp_path)
+    output = os.path.join(group_dir, "combined.mp4")
+    for path in paths[:2]:
+        await _mark_downloaded(group_dir, path)
+    await append_downloaded_segments(group_dir, output)
+
+    assert not await finalize_incremental_combine(group_dir, paths[1:], output)
+    assert not os.path.exists(output)
+    assert not os.path.exists(output + INCREMENTAL_SUFFIX)
+    # The closed combiner stays registered so a late download cannot start a
+    # second one on the same temp file while CombineTask runs the fallback.
+    assert incremental_combine._ACTIVE[group_dir].closed
+
+    await _mark_downloaded(group_dir, paths[2])
+    await append_downloaded_segments(group_dir, output)
+    assert not os.path.exists(output + INCREMENTAL_SUFFIX)
+
+
+@pytest.mark.asyncio
+async def test_append_is_refused_while_finalizing(tmp_path):
+    group_dir, paths = await _make_group(tmp_path)
+    output = os.path.join(group_dir, "combined.mp4")
+    await _mark_downloaded(group_dir, paths[0])
+    await append_downloaded_segments(group_dir, output)
+    combiner = incremental_combine._ACTIVE[group_dir]
+    combiner.finalizing = True
+
+    await _mark_downloaded(group_dir, paths[1])
+    await append_downloaded_segments(group_dir, output)
+    assert incremental_combine._ACTIVE[group_dir] is combiner
+    assert combiner.appended == paths[:1]
+
+
+@pytest.mark.asyncio
+async def test_no_combiner_and_discard(tmp_path):
+    group_dir, paths = await _make_group(tmp_path)
+    output = os.path.join(group_dir, "combined.mp4")
+    assert not await finalize_incremental_combine(group_dir, paths, output)
+
+    await _mark_downloaded(group_dir, paths[0])
+    await append_downloaded_segments(group_dir, output)
+    await discard_incremental_combine(group_dir)
+    assert not os.path.exists(output + INCREMENTAL_SUFFIX)
+
+    await _mark_downloaded(group_dir, paths[1])
+    await append_downloaded_segments(group_dir, output)
+    assert not os.path.exists(output + INCREMENTAL_SUFFIX)
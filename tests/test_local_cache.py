@@ -0,0 +1,167 @@
+"""Tests for the worker's content-addressed TaskIO input cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from training.tasks.io import local_inventory
+from training.tasks.local_cache import CACHE_DIRNAME, LocalCache, get_cache
+
+
+# --- Real filesystem on tmp_path; override conftest's mocks ---
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture
+def server(tmp_path):
+    root = tmp_path / "server"
+    root.mkdir()
+    for name, size in (("a.pack", 100), ("b.pack", 200), ("c.pack", 300)):
+        (root / name).write_bytes(name.encode()[:1] * size)
+    return root
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = LocalCache(tmp_path / "work" / CACHE_DIRNAME, max_bytes=10_000)
+    yield c
+    c.close()
+
+
+def test_miss_then_hit_links_same_bytes(cache, server, tmp_path):
+    task1 = tmp_path / "work" / "g1" / "tile_packs" / "a.pack"
+    task2 = tmp_path / "work" / "g1b" / "a.pack"
+    assert cache.fetch(server / "a.pack", task1, game_id="g1") is False
+    assert cache.fetch(server / "a.pack", task2, game_id="g1") is True
+    assert task1.read_bytes() == task2.read_bytes() == b"a" * 100
+    assert os.stat(task1).st_ino == os.stat(task2).st_ino  # hard links
+
+    s = cache.stats()
+    assert (s["hits"], s["misses"], s["bytes_hit"], s["bytes_pulled"]) == (
+        1,
+        1,
+        100,
+        100,
+    )
+    assert s["hit_rate"] == 0.5 and s["entries"] == 1 and s["bytes"] == 100
+
+
+def test_copy_mode_is_independent(cache, server, tmp_path):
+    dest = tmp_path / "task" / "manifest.db"
+    cache.fetch(server / "a.pack", dest, link=False)
+    cache.fetch(server / "a.pack", dest, link=False)
+    dest.write_bytes(b"modified by task")
+    again = tmp_path / "task2" / "manifest.db"
+    assert cache.fetch(server / "a.pack", again) is True
+    assert again.read_bytes() == b"a" * 100
+
+
+def test_changed_server_file_is_a_new_object(cache, server, tmp_path):
+    src = server / "a.pack"
+    cache.fetch(src, tmp_path / "t1" / "a.pack")
+    src.write_bytes(b"z" * 150)
+    st = src.stat()
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    dest = tmp_path / "t2" / "a.pack"
+    assert cache.fetch(src, dest) is False
+    assert dest.read_bytes() == b"z" * 150
+    # The superseded version was dropped.
+    assert cache.stats()["entries"] == 1 and cache.stats()["bytes"] == 150
+
+
+def test_lru_eviction_keeps_recent(server, tmp_path):
+    cache = LocalCache(tmp_path / "c", max_bytes=450)
+    try:
+        cache.fetch(server / "a.pack", tmp_path / "t" / "a")
+        cache.fetch(server / "b.pack", tmp_path / "t" / "b")
+        cache.fetch(server / "a.pack", tmp_path / "t" / "a2")  # a is now MRU
+        cache.fetch(server / "c.pack", tmp_path / "t" / "c")
+        s = cache.stats()
+        assert s["bytes"] <= 450 and s["evictions"] == 1
+        assert cache.fetch(server / "a.pack", tmp_path / "t" / "a3") is True
+        assert cache.fetch(server / "b.pack", tmp_path / "t" / "b2") is False
+        # Files linked into task dirs survive eviction of the cache's copy.
+        assert (tmp_path / "t" / "b").read_bytes() == b"b" * 200
+    finally:
+        cache.close()
+
+
+def test_corrupt_object_is_refetched(cache, server, tmp_path):
+    cache.fetch(server / "b.pack", tmp_path / "t" / "b")
+    obj = next(p for p in cache.objects.rglob("*") if p.is_file())
+    with open(obj, "r+b") as f:
+        f.truncate(10)
+    dest = tmp_path / "t2" / "b"
+    assert cache.fetch(server / "b.pack", dest) is False
+    assert dest.read_bytes() == b"b" * 200
+
+
+def test_object_modified_through_a_link_is_refetched(cache, server, tmp_path):
+    dest = tmp_path / "t" / "a"
+    cache.fetch(server / "a.pack", dest)
+    with open(dest, "r+b") as f:  # same size, written in place via the link
+        f.write(b"x" * 100)
+    again = tmp_path / "t2" / "a"
+    assert cache.fetch(server / "a.pack", again) is False
+    assert again.read_bytes() == b"a" * 100
+
+
+def test_object_that_cannot_be_unlinked_keeps_its_entry(server, tmp_path, monkeypatch):
+    cache = LocalCache(tmp_path / "c", max_bytes=250)
+    unlink = Path.unlink
+
+    def held_open(self, *args, **kwargs):
+        if self.name.endswith(".tmp") or cache.objects not in self.parents:
+            return unlink(self, *args, **kwargs)
+        raise PermissionError("in use by another process")
+
+    try:
+        cache.fetch(server / "a.pack", tmp_path / "t" / "a")
+        monkeypatch.setattr(Path, "unlink", held_open)
+        cache.fetch(server / "b.pack", tmp_path / "t" / "b")
+        s = cache.stats()
+        # Over budget, but the object still on disk is still indexed.
+        assert s["evictions"] == 0 and s["entries"] == 2 and s["bytes"] == 300
+        monkeypatch.setattr(Path, "unlink", unlink)
+        assert cache.evict() == 1 and cache.stats()["bytes"] == 200
+        assert sum(1 for p in cache.objects.rglob("*") if p.is_file()) == 1
+    finally:
+        cache.close()
+
+
+def test_qa_pack_pulls_go_through_the_cache(cache, server, tmp_path):
+    from training.tasks.sonnet_qa import _pull_selective_packs
+
+    def task_io(name):
+        return SimpleNamespace(
+            game_id="g1",
+            cache=cache,
+            local_packs=tmp_path / name / "g1" / "tile_packs",
+            ensure_server_packs=lambda names: server,
+        )
+
+    packs = {"D:/games/g1/tile_packs/a.pack", "D:/games/g1/tile_packs/b.pack"}
+    first, second = task_io("w1"), task_io("w2")
+    _pull_selective_packs(first, packs | {"D:/games/g1/tile_packs/gone.pack"})
+    _pull_selective_packs(second, packs)
+    assert (second.local_packs / "b.pack").read_bytes() == b"b" * 200
+    s = cache.stats()
+    assert (s["misses"], s["hits"]) == (2, 2)
+    assert cache.inventory() == {"g1": 300}
+
+
+def test_inventory_feeds_local_inventory(server, tmp_path):
+    work = tmp_path / "work"
+    cache = get_cache(work, max_gb=1)
+    assert get_cache(work) is cache
+    cache.fetch(server / "a.pack", work / "g1" / "tile_packs" / "a.pack", game_id="g1")
+    cache.fetch(server / "c.pack", tmp_path / "elsewhere" / "c", game_id="g2")
+    assert cache.inventory() == {"g1": 100, "g2": 300}
+    # Everything the cache keeps, whether or not a work dir still links it.
+    assert local_inventory(work) == {"g1": 100, "g2": 300}
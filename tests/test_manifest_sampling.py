@@ -0,0 +1,166 @@
+"""Tests for the SQL tile sampler behind ``ManifestDataset.get_img_files``."""
+
+from __future__ import annotations
+
+import pytest
+
+from training.data_prep import manifest as M
+from training.data_prep import manifest_sampling as S
+
+
+# --- Override conftest's autouse filesystem mock (pack_segment verifies sizes) ---
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+SEGS = ("18.00.00-18.05.00", "18.05.00-18.10.00")
+LABELED = [
+    (SEGS[0], 8, 1, 1),
+    (SEGS[0], 8, 1, 2),  # adjacent positives must not be each other's negatives
+    (SEGS[1], 0, 2, 0),
+    (SEGS[1], 4, 0, 3),  # excluded row
+]
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    game_id = "g1"
+    tiles_dir = tmp_path / "tiles"
+    game_dir = tiles_dir / game_id
+    game_dir.mkdir(parents=True)
+    for seg in SEGS:
+        for frame in range(0, 24, 4):
+            for row in range(3):
+                for col in range(4):
+                    stem = S.tile_stem(seg, frame, row, col)
+                    (game_dir / f"{stem}.jpg").write_bytes(stem.encode())
+    db = tmp_path / "manifest.db"
+    conn = M.open_db(db, create=True)
+    M.catalog_game_tiles(conn, game_id, game_dir)
+    M.pack_game(conn, game_id, tiles_dir, tmp_path / "packs")
+    rows = [
+        (game_id, S.tile_stem(*k), 0, 0.5, 0.5, 0.1, 0.1, "test", None) for k in LABELED
+    ]
+    rows.append((game_id, S.tile_stem(*LABELED[0]), 0, 0.2, 0.3, 0.1, 0.1, "t", None))
+    rows.append((game_id, "not_a_tile_stem", 0, 0.5, 0.5, 0.1, 0.1, "test", None))
+    M.bulk_insert_labels(conn, rows)
+    conn.commit()
+    yield db, conn, game_id
+    conn.close()
+
+
+def _key(stem):
+    m = S.TILE_RE.match(stem)
+    return (m.group(1), int(m.group(2)), int(m.group(3)), int(m.group(4)))
+
+
+def test_migration_backfills_parsed_label_keys(manifest):
+    _, conn, _ = manifest
+    assert S.migrate_sampling_schema(conn) == len(LABELED) + 2
+    assert S.migrate_sampling_schema(conn) == 0
+    parsed = conn.execute(
+        "SELECT tile_stem, segment, frame_idx, row, col FROM labels"
+    ).fetchall()
+    for stem, *key in parsed:
+        if stem == "not_a_tile_stem":
+            assert key[1] == -1
+        else:
+            assert tuple(key) == _key(stem)
+
+
+def test_positives_and_hard_negatives_match_rules(manifest):
+    _, conn, game_id = manifest
+    S.migrate_sampling_schema(conn)
+    sample = S.sample_game(
+        conn, game_id, neg_ratio=100.0, hard_neg_ratio=1.0, seed=0, exclude_rows={0}
+    )
+    pos = {_key(p[0]) for p in sample.positives}
+    assert pos == set(LABELED[:3])
+    dets = {_key(p[0]): p[4] for p in sample.positives}
+    assert len(dets[LABELED[0]]) == 2
+
+    expected_hard = set()
+    for seg, f, r, c in pos:
+        cands = [(seg, f, r + dr, c + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)]
+        cands += [(seg, f - 4, r, c), (seg, f + 4, r, c)]
+        for k in cands:
+            if 1 <= k[2] < 3 and 0 <= k[3] < 4 and 0 <= k[1] < 24 and k not in pos:
+                expected_hard.add(k)
+    assert {_key(n[0]) for n in sample.negatives} == expected_hard
+    assert sample.n_hard == len(expected_hard) and sample.n_random == 0
+
+    for stem, pf, po, ps in sample.negatives:
+        assert M.read_tile_bytes(conn, game_id, *_key(stem)) == stem.encode()
+        with open(pf, "rb") as f:
+            f.seek(po)
+            assert f.read(ps) == stem.encode()
+
+
+def test_ratios_and_seed_determinism(manifest):
+    _, conn, game_id = manifest
+    S.migrate_sampling_schema(conn)
+    kw = {"neg_ratio": 4.0, "hard_neg_ratio": 0.5, "exclude_rows": {0}}
+    a = S.sample_game(conn, game_id, seed=1, **kw)
+    b = S.sample_game(conn, game_id, seed=1, **kw)
+    c = S.sample_game(conn, game_id, seed=2, **kw)
+    assert a == b and a.negatives != c.negatives
+    assert a.n_hard == 6 and a.n_random == 6
+    keys = [_key(n[0]) for n in a.negatives]
+    assert len(set(keys)) == len(keys)
+    assert not set(keys) & {_key(p[0]) for p in a.positives}
+    assert all(k[2] != 0 for k in keys)
+
+
+def test_build_samples_requires_the_migration(manifest, tmp_path):
+    db, conn, game_id = manifest
+    kw = {"neg_ratio": 2.0, "hard_neg_ratio": 0.5, "seed": 3}
+    with pytest.raises(RuntimeError, match="manifest_sampling migrate"):
+        S.build_samples(db, [game_id], cache_dir=tmp_path / "cache", **kw)
+    assert "frame_idx" not in {r[1] for r in conn.execute("PRAGMA table_info(labels)")}
+
+    # An index from before pack_file was covered is rebuilt by the migration.
+    conn.execute(
+        "CREATE INDEX idx_tiles_packed ON tiles(game_id, row, pack_offset, pack_size) "
+        "WHERE pack_offset IS NOT NULL"
+    )
+    S.main(["migrate", "--db", str(db)])
+    assert S.build_samples(db, [game_id], cache_dir=tmp_path / "cache", **kw)
+
+
+def test_build_samples_caches_until_manifest_changes(manifest, tmp_path, monkeypatch):
+    db, conn, game_id = manifest
+    S.migrate_sampling_schema(conn)
+    cache_dir = tmp_path / "cache"
+    kw = {"neg_ratio": 2.0, "hard_neg_ratio": 0.5, "seed": 3, "exclude_rows": {0}}
+    first = S.build_samples(db, [game_id], cache_dir=cache_dir, **kw)
+    assert len(list(cache_dir.glob("samples_*.json"))) == 1
+
+    calls = []
+    real = S.sample_game
+    monkeypatch.setattr(
+        S, "sample_game", lambda *a, **k: calls.append(1) or real(*a, **k)
+    )
+    again = S.build_samples(db, [game_id], cache_dir=cache_dir, **kw)
+    assert not calls
+    assert [tuple(n) for n in again[game_id].negatives] == first[game_id].negatives
+    assert len(again[game_id].positives) == len(first[game_id].positives)
+
+    # Different params -> new key; new label -> new key.
+    S.build_samples(db, [game_id], cache_dir=cache_dir, **{**kw, "seed": 4})
+    assert len(calls) == 1
+    M.upsert_label(conn, game_id, S.tile_stem(SEGS[0], 20, 2, 3), 0, 0.5, 0.5, 0.1, 0.1)
+    conn.commit()
+    updated = S.build_samples(db, [game_id], cache_dir=cache_dir, **kw)
+    assert len(calls) == 2
+    assert len(updated[game_id].positives) == len(first[game_id].positives) + 1
+
+    # Tiles re-pointed at another pack (same offsets) -> new key, new paths.
+    conn.execute(
+        "UPDATE tiles SET pack_file = pack_file || '.new' WHERE game_id = ?",
+        (game_id,),
+    )
+    conn.commit()
+    repacked = S.build_samples(db, [game_id], cache_dir=cache_dir, **kw)
+    assert len(calls) == 3
+    assert all(n[1].endswith(".new") for n in repacked[game_id].negatives)
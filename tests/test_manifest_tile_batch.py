@@ -0,0 +1,91 @@
+"""Tests for the set-based ``manifest.read_tiles_batch`` reader.
+
+Builds a tiny manifest + real pack files on tmp_path through the same
+``catalog_game_tiles`` / ``pack_segment`` path production uses.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from training.data_prep import manifest as M
+
+
+# --- Override conftest's autouse filesystem mock (pack_segment verifies sizes) ---
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+def _tile_bytes(seg: str, frame: int, row: int, col: int) -> bytes:
+    return f"{seg}|{frame}|{row}|{col}|".encode() * (1 + (frame + col) % 5)
+
+
+@pytest.fixture
+def packed_game(tmp_path):
+    """One game, two segments; seg A packed, seg B left as loose files."""
+    game_id = "g1"
+    tiles_dir = tmp_path / "tiles"
+    game_dir = tiles_dir / game_id
+    game_dir.mkdir(parents=True)
+    keys = []
+    for seg in ("18.00.00-18.05.00", "18.05.00-18.10.00"):
+        for frame in (0, 4, 8):
+            for row in range(2):
+                for col in range(3):
+                    stem = f"{seg}_frame_{frame:06d}_r{row}_c{col}"
+                    (game_dir / f"{stem}.jpg").write_bytes(
+                        _tile_bytes(seg, frame, row, col)
+                    )
+                    keys.append((seg, frame, row, col))
+    conn = M.open_db(tmp_path / "manifest.db", create=True)
+    M.catalog_game_tiles(conn, game_id, game_dir)
+    M.pack_segment(conn, game_id, "18.00.00-18.05.00", tiles_dir, tmp_path / "packs")
+    yield conn, game_id, keys
+    conn.close()
+
+
+def test_batch_matches_single_tile_reads(packed_game):
+    conn, game_id, keys = packed_game
+    out = M.read_tiles_batch(conn, game_id, list(reversed(keys)))
+
+    assert len(out) == len(keys)
+    assert {k for k, _ in out} == set(keys)
+    for key, data in out:
+        assert data == _tile_bytes(*key)
+        assert data == M.read_tile_bytes(conn, game_id, *key)
+
+
+def test_batch_sorted_loose_then_pack_offset(packed_game):
+    conn, game_id, keys = packed_game
+    out = M.read_tiles_batch(conn, game_id, keys)
+    segs = [k[0] for k, _ in out]
+    # Loose (unpacked) tiles sort first, then packed tiles in pack order.
+    assert segs == sorted(segs, key=lambda s: s != "18.05.00-18.10.00")
+    packed = [k for k, _ in out if k[0] == "18.00.00-18.05.00"]
+    assert packed == sorted(packed, key=lambda k: (k[1], k[2], k[3]))
+
+
+def test_batch_skips_missing_and_keeps_duplicates(packed_game):
+    conn, game_id, keys = packed_game
+    wanted = [keys[0], ("nope", 0, 0, 0), keys[0], keys[1]]
+    out = M.read_tiles_batch(conn, game_id, wanted)
+    assert [k for k, _ in out] == [keys[0], keys[0], keys[1]]
+
+
+def test_batch_spans_many_lookup_chunks(packed_game, monkeypatch):
+    conn, game_id, keys = packed_game
+    monkeypatch.setattr(M, "_BATCH_LOOKUP_CHUNK", 5)
+    monkeypatch.setattr(M, "_COALESCE_GAP", 0)
+    out = M.read_tiles_batch(conn, game_id, keys)
+    assert sorted(k for k, _ in out) == sorted(keys)
+    assert all(data == _tile_bytes(*k) for k, data in out)
+
+
+def test_coalesce_ranges():
+    gap = M._COALESCE_GAP
+    assert M._coalesce_ranges([(0, 10), (10, 5), (15 + gap, 1), (10**9, 4)]) == [
+        (0, 16 + gap),
+        (10**9, 4),
+    ]
+    assert M._coalesce_ranges([(0, 100), (20, 10)]) == [(0, 100)]
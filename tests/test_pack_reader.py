@@ -0,0 +1,106 @@
+"""Tests for the mmap pack reader pool + pluggable tile decoders."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from training.data_prep.pack_reader import (
+    PackIOStats,
+    PackReaderPool,
+    get_decoder,
+    read_and_decode,
+)
+
+
+def _jpeg(value: int) -> bytes:
+    img = np.full((16, 24, 3), value, np.uint8)
+    ok, enc = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 95])
+    assert ok
+    return enc.tobytes()
+
+
+@pytest.fixture
+def packs(tmp_path):
+    """Three packs of two JPEG tiles each -> {pack: [(offset, size, value)]}."""
+    out = {}
+    for p in range(3):
+        path = tmp_path / f"seg{p}.pack"
+        entries, blob = [], b""
+        for value in (40 * p + 10, 40 * p + 30):
+            data = _jpeg(value)
+            entries.append((len(blob), len(data), value))
+            blob += data
+        path.write_bytes(blob)
+        out[str(path)] = entries
+    return out
+
+
+def test_read_is_zero_copy_view(packs):
+    pool = PackReaderPool()
+    pack, entries = next(iter(packs.items()))
+    offset, size, _ = entries[1]
+    view = pool.read(pack, offset, size)
+    assert isinstance(view, memoryview) and view.readonly
+    with open(pack, "rb") as f:
+        f.seek(offset)
+        assert view.tobytes() == f.read(size)
+    view.release()
+    pool.close()
+
+
+def test_lru_bounds_open_mappings(packs):
+    resolved = []
+
+    def _resolve(p):
+        resolved.append(p)
+        return p
+
+    pool = PackReaderPool(max_open=2, resolve=_resolve)
+    names = list(packs)
+    for name in names + [names[2], names[0]]:
+        pool.read(name, 0, 4).release()
+        assert len(pool) <= 2
+    # names[2] was still mapped on its second use; names[0] had been evicted.
+    assert resolved == names + [names[0]]
+    pool.close()
+    assert len(pool) == 0
+
+
+def test_read_rejects_out_of_range(packs):
+    pool = PackReaderPool()
+    pack, entries = next(iter(packs.items()))
+    end = entries[-1][0] + entries[-1][1]
+    with pytest.raises(ValueError, match="outside pack"):
+        pool.read(pack, end - 2, 10)
+    pool.close()
+
+
+@pytest.mark.parametrize("decoder", ["cv2", "pil"])
+def test_decoders_agree_and_record_stats(packs, decoder):
+    pool = PackReaderPool()
+    stats = PackIOStats()
+    dec = get_decoder(decoder)
+    for pack, entries in packs.items():
+        for offset, size, value in entries:
+            im = read_and_decode(pool, dec, pack, offset, size, stats)
+            assert im.shape == (16, 24, 3)
+            assert abs(int(im.mean()) - value) <= 2
+    s = stats.snapshot(reset=True)
+    assert s["tiles"] == 6 and s["read_s"] >= 0 and s["decode_s"] > 0
+    assert stats.snapshot()["tiles"] == 0
+    pool.close()
+
+
+def test_corrupt_tile_decodes_to_none(tmp_path):
+    pack = tmp_path / "bad.pack"
+    pack.write_bytes(b"\x00" * 64)
+    pool = PackReaderPool()
+    assert read_and_decode(pool, get_decoder("cv2"), str(pack), 0, 64) is None
+    pool.close()
+
+
+def test_unknown_decoder():
+    with pytest.raises(ValueError, match="unknown decoder"):
+        get_decoder("nvjpeg")
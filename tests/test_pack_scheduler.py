@@ -0,0 +1,178 @@
+"""Tests for the parallel, resumable segment pack scheduler."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from training.data_prep import manifest as M
+from training.data_prep import pack_scheduler as P
+
+
+# --- Override conftest's autouse filesystem mock (packing verifies sizes) ---
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+GAMES = ("g1", "g2")
+SEGS = ("18.00.00-18.05.00", "18.05.00-18.10.00", "18.10.00-18.15.00")
+
+
+def _tile_bytes(game, seg, frame, row, col) -> bytes:
+    return f"{game}|{seg}|{frame}|{row}|{col}|".encode() * (1 + (frame + col) % 4)
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    tiles_dir = tmp_path / "tiles"
+    conn = M.open_db(tmp_path / "manifest.db", create=True)
+    for game in GAMES:
+        game_dir = tiles_dir / game
+        game_dir.mkdir(parents=True)
+        for seg in SEGS:
+            for frame in (0, 4, 8):
+                for row in range(2):
+                    for col in range(3):
+                        stem = f"{seg}_frame_{frame:06d}_r{row}_c{col}"
+                        (game_dir / f"{stem}.jpg").write_bytes(
+                            _tile_bytes(game, seg, frame, row, col)
+                        )
+        M.catalog_game_tiles(conn, game, game_dir)
+    yield conn, tiles_dir, tmp_path / "packs"
+    conn.close()
+
+
+def _assert_packed(conn, game):
+    rows = conn.execute(
+        "SELECT segment, frame_idx, row, col, pack_file FROM tiles WHERE game_id=?",
+        (game,),
+    ).fetchall()
+    assert rows and all(r[4] for r in rows)
+    for seg, frame, row, col, _ in rows:
+        assert M.read_tile_bytes(conn, game, seg, frame, row, col) == _tile_bytes(
+            game, seg, frame, row, col
+        )
+
+
+def test_packs_all_games_and_journals(catalog):
+    conn, tiles_dir, pack_dir = catalog
+    stats = P.PackScheduler(conn, tiles_dir, pack_dir, delete_loose=True).run(
+        list(GAMES)
+    )
+    assert stats["segments"] == len(GAMES) * len(SEGS)
+    assert stats["tiles_packed"] == stats["loose_deleted"] == 2 * 3 * 18
+    for game in GAMES:
+        _assert_packed(conn, game)
+        assert not list((tiles_dir / game).glob("*.jpg"))
+    assert not list(pack_dir.rglob("*.partial"))
+    states = P.PackJournal(pack_dir / P.JOURNAL_NAME).load()
+    assert len(states) == 6 and {r["state"] for r in states.values()} == {"cleaned"}
+
+
+def test_pack_all_games_uses_scheduler(catalog):
+    conn, tiles_dir, pack_dir = catalog
+    M.pack_all_games(conn, tiles_dir, pack_dir, games=["g2"], segments_per_device=3)
+    _assert_packed(conn, "g2")
+    assert conn.execute(
+        "SELECT COUNT(*) FROM tiles WHERE game_id='g1' AND pack_file IS NOT NULL"
+    ).fetchone() == (0,)
+
+
+def test_failed_segment_resumes_alone(catalog, monkeypatch):
+    conn, tiles_dir, pack_dir = catalog
+    real = P.write_segment_pack
+    calls = []
+
+    def _flaky(file_list, pack_path, *a, **k):
+        calls.append(pack_path.name)
+        if pack_path.parent.name == "g1" and pack_path.stem == SEGS[1]:
+            raise OSError("disk hiccup")
+        return real(file_list, pack_path, *a, **k)
+
+    monkeypatch.setattr(P, "write_segment_pack", _flaky)
+    with pytest.raises(RuntimeError, match=f"g1/{SEGS[1]}"):
+        P.PackScheduler(conn, tiles_dir, pack_dir).run(list(GAMES))
+    assert len(calls) == 6
+
+    calls.clear()
+    monkeypatch.setattr(P, "write_segment_pack", real)
+    sched = P.PackScheduler(conn, tiles_dir, pack_dir)
+    assert sched.pending_segments(list(GAMES)) == [("g1", SEGS[1])]
+    assert sched.run(list(GAMES))["segments"] == 1
+    _assert_packed(conn, "g1")
+
+
+def test_resumes_interrupted_cleanup(catalog):
+    conn, tiles_dir, pack_dir = catalog
+    P.PackScheduler(conn, tiles_dir, pack_dir).run(["g1"])
+    assert list((tiles_dir / "g1").glob("*.jpg"))
+
+    # Packs are committed (journal says "packed"); only cleanup is left.
+    stats = P.PackScheduler(conn, tiles_dir, pack_dir, delete_loose=True).run(["g1"])
+    assert stats["segments"] == 0 and stats["loose_deleted"] == 54
+    assert not list((tiles_dir / "g1").glob("*.jpg"))
+    lines = (pack_dir / P.JOURNAL_NAME).read_text().splitlines()
+    assert [json.loads(x)["state"] for x in lines].count("cleaned") == 3
+
+
+def test_stale_packed_record_keeps_retiled_loose_tiles(catalog, monkeypatch):
+    conn, tiles_dir, pack_dir = catalog
+    P.PackScheduler(conn, tiles_dir, pack_dir).run(["g1"])
+    # Re-tiled and re-cataloged: pack_file is NULL again, but the journal
+    # still says "packed". If the repack fails, the loose tiles are the only copy.
+    M.catalog_game_tiles(conn, "g1", tiles_dir / "g1")
+
+    def _fail(*a, **k):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(P, "write_segment_pack", _fail)
+    with pytest.raises(RuntimeError):
+        P.PackScheduler(conn, tiles_dir, pack_dir, delete_loose=True).run(["g1"])
+    assert len(list((tiles_dir / "g1").glob("*.jpg"))) == 54
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_segments_per_device_limit(catalog, monkeypatch, limit):
+    conn, tiles_dir, pack_dir = catalog
+    real = P.write_segment_pack
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    def _slow(*a, **k):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        try:
+            return real(*a, **k)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    monkeypatch.setattr(P, "write_segment_pack", _slow)
+    P.PackScheduler(conn, tiles_dir, pack_dir, segments_per_device=limit).run(
+        list(GAMES)
+    )
+    # tmp_path is a single device, so every segment shares one limit.
+    assert peak[0] == limit
+
+
+def test_write_segment_pack_failure_leaves_no_pack(tmp_path):
+    good = tmp_path / "a.jpg"
+    good.write_bytes(b"abc")
+    pack = tmp_path / "seg.pack"
+    with ThreadPoolExecutor(2) as pool:
+        with pytest.raises(FileNotFoundError):
+            P.write_segment_pack(
+                [(good, 0, 0, 0), (tmp_path / "missing.jpg", 0, 0, 1)], pack, pool
+            )
+        assert not pack.exists() and not list(tmp_path.glob("*.partial"))
+
+        layout = P.write_segment_pack([(good, 0, 0, 0), (good, 4, 0, 0)], pack, pool)
+    assert layout == [(0, 0, 0, 0, 3), (4, 0, 0, 3, 3)]
+    assert pack.read_bytes() == b"abcabc"
@@ -150,6 +150,47 @@ async def test_detect_step_local_path(tmp_path, monkeypatch):
     assert captured["polygon_len"] == 10
 
 
+@pytest.mark.asyncio
+async def test_detect_step_quantized_loads_gated_int8(tmp_path, monkeypatch):
+    from video_grouper.inference import quantized as Q
+
+    fp32 = tmp_path / "m.onnx"
+    fp32.write_bytes(b"fp32")
+    Q.int8_path(fp32).write_bytes(b"int8")
+    metrics = {"recall": 0.9, "precision": 0.9}
+    Q.gate_path(fp32).write_text(
+        json.dumps(
+            {
+                "version": Q.GATE_VERSION,
+                "fp32": {"sha256": Q.file_sha256(fp32)},
+                "int8": {"sha256": Q.file_sha256(Q.int8_path(fp32))},
+                "metrics": {"fp32": metrics, "int8": metrics},
+            }
+        )
+    )
+    loaded = []
+    monkeypatch.setattr(
+        "video_grouper.pipeline.steps.ball_detect.create_session",
+        lambda model_path, use_gpu=False: loaded.append(str(model_path)) or object(),
+    )
+    monkeypatch.setattr(
+        "video_grouper.pipeline.steps.ball_detect.detect_video_candidates",
+        lambda *a, **kw: (
+            {},
+            {"src_w": 1920, "src_h": 1080, "fps": 20.0, "n_frames": 0},
+        ),
+    )
+    manifest = PipelineManifest.load_or_init(
+        tmp_path, str(tmp_path / "game.mp4"), str(tmp_path / "out.mp4")
+    )
+    poly_path = tmp_path / "field.json"
+    poly_path.write_text(json.dumps({"polygon": POLY}), encoding="utf-8")
+    manifest.put("field_polygon_path", str(poly_path))
+    step = create_step("ball_detect", {"model_path": str(fp32), "quantized": True})
+    assert await step.run(manifest, _ctx(tmp_path)) is True
+    assert loaded == [str(Q.int8_path(fp32))]
+
+
 @pytest.mark.asyncio
 async def test_detect_step_requires_field_polygon(tmp_path):
     manifest = PipelineManifest.load_or_init(
@@ -0,0 +1,260 @@
+"""INT8 model selection (video_grouper.inference.quantized) and the offline
+quantize tool's data/scoring helpers (training.cli.quantize_models)."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from training.cli import quantize_models as QM
+from training.data_prep import manifest as M
+from video_grouper.inference import quantized as Q
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CPU = ["CPUExecutionProvider"]
+
+
+# Real filesystem on tmp_path; override conftest's os.path mocks.
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+def _write_pair(tmp_path, fp32_rec=0.90, int8_rec=0.89, int8_prec=0.85):
+    fp32 = tmp_path / "det.onnx"
+    fp32.write_bytes(b"fp32 weights")
+    Q.int8_path(fp32).write_bytes(b"int8 weights")
+    gate = {
+        "version": Q.GATE_VERSION,
+        "fp32": {"file": fp32.name, "sha256": Q.file_sha256(fp32)},
+        "int8": {"sha256": Q.file_sha256(Q.int8_path(fp32))},
+        "metrics": {
+            "fp32": {"recall": fp32_rec, "precision": 0.86},
+            "int8": {"recall": int8_rec, "precision": int8_prec},
+        },
+    }
+    Q.gate_path(fp32).write_text(json.dumps(gate))
+    return fp32
+
+
+def test_variant_paths_sit_next_to_the_model():
+    assert Q.int8_path("m/det.onnx") == Path("m/det.int8.onnx")
+    assert Q.gate_path("m/det.onnx") == Path("m/det.int8.gate.json")
+
+
+def test_selects_int8_when_gate_passes_on_cpu(tmp_path):
+    fp32 = _write_pair(tmp_path)
+    path, why = Q.select_model_path(fp32, providers=CPU, available=CPU)
+    assert path == Q.int8_path(fp32) and why.startswith("INT8")
+
+
+def test_accelerated_provider_keeps_fp32(tmp_path):
+    fp32 = _write_pair(tmp_path)
+    path, why = Q.select_model_path(
+        fp32,
+        providers=["DmlExecutionProvider", "CPUExecutionProvider"],
+        available=["DmlExecutionProvider", "CPUExecutionProvider"],
+    )
+    assert path == fp32 and "DmlExecutionProvider" in why
+    # Requested but not installed -> the session is CPU-only after all.
+    path, _ = Q.select_model_path(
+        fp32, providers=["DmlExecutionProvider", "CPUExecutionProvider"], available=CPU
+    )
+    assert path == Q.int8_path(fp32)
+
+
+def test_gate_outside_tolerance_keeps_fp32(tmp_path):
+    fp32 = _write_pair(tmp_path, int8_prec=0.80)
+    path, why = Q.select_model_path(fp32, tolerance=0.02, available=CPU)
+    assert path == fp32 and "precision drops 0.060" in why
+    path, _ = Q.select_model_path(fp32, tolerance=0.1, available=CPU)
+    assert path == Q.int8_path(fp32)
+
+
+def test_stale_or_missing_gate_keeps_fp32(tmp_path):
+    fp32 = _write_pair(tmp_path)
+    fp32.write_bytes(b"retrained fp32 weights")
+    path, why = Q.select_model_path(fp32, available=CPU)
+    assert path == fp32 and "different FP32" in why
+
+    fp32 = _write_pair(tmp_path)
+    Q.int8_path(fp32).write_bytes(b"requantized")
+    assert Q.select_model_path(fp32, available=CPU)[0] == fp32
+
+    Q.gate_path(fp32).write_text("{not json")
+    path, why = Q.select_model_path(fp32, available=CPU)
+    assert path == fp32 and "unreadable gate" in why
+
+    Q.gate_path(fp32).unlink()
+    assert Q.select_model_path(fp32, available=CPU)[0] == fp32
+
+
+def test_gate_failures_reports_each_metric():
+    gate = {
+        "version": Q.GATE_VERSION,
+        "metrics": {"fp32": {"recall": 0.9}, "int8": {"recall": 0.7}},
+    }
+    assert Q.gate_failures(gate, 0.05) == [
+        "recall drops 0.200 > tolerance 0.050",
+        "gate has no precision",
+    ]
+    assert Q.gate_failures({"version": 99}) == ["unsupported gate version 99"]
+
+
+# --- offline tool helpers ---------------------------------------------------
+
+
+def test_split_games_holds_out_whole_games():
+    calib, held = QM.split_games(["c", "a", "b", "d"], None, 0.25)
+    assert (calib, held) == (["a", "b", "c"], ["d"])
+    assert QM.split_games(["a", "b"], ["a"]) == (["b"], ["a"])
+    with pytest.raises(SystemExit):
+        QM.split_games(["a"], None)
+    with pytest.raises(SystemExit):
+        QM.split_games(["a", "b"], ["zz"])
+
+
+def test_matching_is_one_to_one():
+    truth = np.array([[10.0, 10.0], [50.0, 50.0]])
+    pred = np.array([[11.0, 10.0], [10.0, 12.0], [80.0, 80.0]])
+    assert QM.match_points(pred, truth, 4.0) == 1
+    assert QM.match_points(pred[:0], truth, 4.0) == 0
+
+    ref = np.array([[0, 0, 10, 10], [20, 20, 30, 30]], float)
+    pred = np.array([[1, 1, 10, 10], [0, 0, 10, 9], [20, 20, 24, 24]], float)
+    assert QM.match_boxes(pred, ref) == 1
+    assert QM.score_boxes([ref], [ref])["recall"] == 1.0
+
+
+def test_table_has_delta_and_speedup_row():
+    report = {
+        "metrics": {
+            "fp32": {"recall": 0.9, "precision": 0.8, "ms_per_tile": 40.0},
+            "int8": {"recall": 0.89, "precision": 0.81, "ms_per_tile": 16.0},
+        },
+        "speedup": 2.5,
+    }
+    header, fp32, int8, delta = QM.format_table(report).splitlines()
+    assert header.split() == ["recall", "precision", "ms/tile"]
+    assert fp32.split()[0] == "fp32" and int8.split()[0] == "int8"
+    assert delta.split() == ["delta", "-0.0100", "+0.0100", "2.50x"]
+
+
+@pytest.fixture
+def tile_manifest(tmp_path):
+    """Two games of 64x64 JPEG tiles with a bright 'ball' + ball labels."""
+    import cv2
+
+    tiles_dir = tmp_path / "tiles"
+    conn = M.open_db(tmp_path / "manifest.db", create=True)
+    seg = "18.00.00-18.05.00"
+    for game in ("g1", "g2"):
+        game_dir = tiles_dir / game
+        game_dir.mkdir(parents=True)
+        M.upsert_game(conn, game, tile_dir=str(game_dir))
+        for frame in (0, 4, 8):
+            for col in range(2):
+                img = np.full((64, 64, 3), 60, np.uint8)
+                x = 10 + 4 * frame + 20 * col
+                cv2.circle(img, (x, 32), 3, (255, 255, 255), -1)
+                stem = f"{seg}_frame_{frame:06d}_r0_c{col}"
+                cv2.imwrite(str(game_dir / f"{stem}.jpg"), img)
+                if col == 0:
+                    M.upsert_label(
+                        conn, game, stem, 0, x / 64, 32 / 64, 6 / 64, 6 / 64, "test"
+                    )
+        M.catalog_game_tiles(conn, game, game_dir)
+        M.pack_segment(conn, game, seg, tiles_dir, tmp_path / "packs")
+    conn.commit()
+    yield conn, tmp_path
+    conn.close()
+
+
+def test_sample_tiles_mixes_labelled_and_random(tile_manifest):
+    conn, _ = tile_manifest
+    rng = np.random.default_rng(0)
+    picks = QM.sample_tiles(conn, ["g1"], 4, rng, class_id=0, positive_frac=0.5)
+    assert len(picks) == len(set(picks)) == 4
+    labelled = M.get_labeled_stems(conn, "g1")
+    assert sum(QM.tile_stem(k) in labelled for _, k in picks) >= 2
+    assert all(g == "g1" for g, _ in picks)
+
+
+def test_ball_stack_uses_previous_frames_oldest_first(tile_manifest):
+    conn, _ = tile_manifest
+    key = ("18.00.00-18.05.00", 8, 0, 0)
+    stack = QM.ball_stack(conn, "g1", key)
+    assert stack.shape == (3, 64, 64) and stack.dtype == np.float32
+    # The ball moves right 4 px per cataloged frame: brightest column per plane.
+    cols = [int(np.argmax(plane[32])) for plane in stack]
+    assert cols == sorted(cols) and cols[0] < cols[-1]
+    # First cataloged frame: no history, padded with itself.
+    first = QM.ball_stack(conn, "g1", ("18.00.00-18.05.00", 0, 0, 0))
+    assert np.array_equal(first[0], first[2])
+    truth = QM.ball_truth(conn, "g1", key, 0, 64, 64)
+    np.testing.assert_allclose(truth, [[42.0, 32.0]])
+
+
+def test_score_ball_counts_hits_and_false_alarms():
+    class _Sess:
+        def get_inputs(self):
+            return [type("I", (), {"name": "frames"})()]
+
+        def run(self, _outputs, feeds):
+            hm = np.zeros((1, 1) + feeds["frames"].shape[2:], np.float32)
+            hm[0, 0, 20, 30] = 0.9  # hit
+            hm[0, 0, 50, 5] = 0.8  # false alarm
+            return [hm]
+
+    stack = np.zeros((3, 60, 60), np.float32)
+    samples = [(stack, np.array([[31.0, 21.0], [5.0, 5.0]]))]
+    scores, ms = QM.score_ball(_Sess(), samples, thr=0.5, match_px=4.0)
+    assert (scores["recall"], scores["precision"]) == (0.5, 0.5)
+    assert len(ms) == 1
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("onnx") is None,
+    reason="ORT quantization needs the onnx package (training extra)",
+)
+def test_quantize_tool_end_to_end(tile_manifest):
+    _, tmp_path = tile_manifest
+    from benchmarks.fixtures import write_ball_model
+
+    model = tmp_path / "det.onnx"
+    write_ball_model(model)
+    # A subprocess: conftest stubs onnxruntime in this interpreter.
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "training.cli.quantize_models",
+            "ball",
+            "--model",
+            str(model),
+            "--db",
+            str(tmp_path / "manifest.db"),
+            "--heldout-games",
+            "g2",
+            "--calib-tiles",
+            "6",
+            "--heldout-tiles",
+            "6",
+        ],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=300,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert "delta" in proc.stdout
+    gate = json.loads(Q.gate_path(model).read_text())
+    assert gate["held_out"]["games"] == ["g2"]
+    assert gate["int8"]["sha256"] == Q.file_sha256(Q.int8_path(model))
+    assert set(gate["metrics"]) == {"fp32", "int8"}
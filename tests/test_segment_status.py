@@ -0,0 +1,192 @@
+"""Tests for the per-segment status table behind work discovery."""
+
+from __future__ import annotations
+
+import pytest
+
+from training.data_prep import mass_tile
+from training.data_prep.segment_status import (
+    RECONCILED,
+    discover,
+    is_local_db,
+    mark_segment,
+    open_status_db,
+    reconcile,
+    segment_done,
+    segments_needing,
+)
+
+
+# Real filesystem on tmp_path; override conftest's os.path mocks.
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture
+def share(tmp_path):
+    """Two segments for game g1: s1 labeled + tiled on disk, s2 untouched."""
+    vdir = tmp_path / "video" / "g1"
+    (vdir / "sub").mkdir(parents=True)
+    (vdir / "s1[F][0@0].mp4").touch()
+    (vdir / "sub" / "s2[F][0@0].mp4").touch()
+    (vdir / "s1[R][0@0].mp4").touch()
+    labels = tmp_path / "labels" / "g1"
+    tiles = tmp_path / "tiles" / "g1"
+    labels.mkdir(parents=True)
+    tiles.mkdir(parents=True)
+    (labels / "s1[F][0@0]_frame_000004_r1_c2.txt").touch()
+    for c in range(3):
+        (tiles / f"s1[F][0@0]_frame_000000_r0_c{c}.jpg").touch()
+    dirs = {"labels_dir": tmp_path / "labels", "tiles_dirs": [tmp_path / "tiles"]}
+    conn = open_status_db(tmp_path / "segment_status.db")
+    yield {"g1": vdir}, dirs, conn
+    conn.close()
+
+
+def test_reconcile_derives_status_from_disk(share):
+    games, dirs, conn = share
+    totals = reconcile(conn, games, **dirs)
+    assert totals == {"labeled": 1, "tiled": 1, "segments": 2, "games": 1}
+
+    (row,) = segments_needing(conn, "tiled")
+    assert row[:2] == ("g1", "s2[F][0@0]") and row[2].endswith("s2[F][0@0].mp4")
+    assert segment_done(conn, "g1", "s1[F][0@0]", "labeled")
+    version, count = conn.execute(
+        "SELECT tiled_version, tiled_count FROM segment_status WHERE segment = ?",
+        ("s1[F][0@0]",),
+    ).fetchone()
+    assert version == RECONCILED and count == 3
+    assert [r[1] for r in segments_needing(conn, "packed", ["g1"])] == [
+        "s1[F][0@0]",
+        "s2[F][0@0]",
+    ]
+
+
+def test_producers_mark_and_reconcile_keeps_their_version(share, tmp_path):
+    games, dirs, conn = share
+    reconcile(conn, games, **dirs)
+    (tmp_path / "tiles" / "g1" / "s2[F][0@0]_frame_000000_r0_c0.jpg").touch()
+    mark_segment(conn, "g1", "s2[F][0@0]", "tiled", count=1, version="abc123")
+    assert segments_needing(conn, "tiled") == []
+
+    reconcile(conn, games, **dirs)
+    row = conn.execute(
+        "SELECT tiled_version FROM segment_status WHERE segment = 's2[F][0@0]'"
+    ).fetchone()
+    assert row == ("abc123",)
+
+    # Tiles deleted by hand: the reconciler clears the stage again.
+    for p in (tmp_path / "tiles" / "g1").glob("s1*"):
+        p.unlink()
+    reconcile(conn, games, **dirs)
+    assert [r[1] for r in segments_needing(conn, "tiled")] == ["s1[F][0@0]"]
+
+
+def test_discover_rechecks_games_that_still_need_work(share, tmp_path):
+    games, dirs, conn = share
+    assert [r[1] for r in discover(conn, "labeled", games, **dirs)] == ["s2[F][0@0]"]
+    # Labels a worker on another machine left only on disk are picked up.
+    (tmp_path / "labels" / "g1" / "s2[F][0@0]_frame_000000_r0_c0.txt").touch()
+    assert discover(conn, "labeled", games, **dirs) == []
+    # Finished games are answered from the table, not the disk.
+    for p in (tmp_path / "labels" / "g1").iterdir():
+        p.unlink()
+    assert discover(conn, "labeled", games, **dirs) == []
+    # A missing video dir is retried later rather than recorded as empty.
+    assert discover(conn, "labeled", {"g2": tmp_path / "nope"}, **dirs) == []
+    assert "g2" not in {r[0] for r in conn.execute("SELECT game_id FROM status_games")}
+
+
+def test_status_db_on_a_share_stays_in_memory(tmp_path):
+    assert not is_local_db("//server/video/training_data/segment_status.db")
+    assert not is_local_db(r"\\server\video\segment_status.db")
+    assert is_local_db(tmp_path / "segment_status.db")
+    conn = open_status_db("//server/video/training_data/segment_status.db")
+    try:
+        assert conn.execute("PRAGMA database_list").fetchone()[2] == ""
+    finally:
+        conn.close()
+
+
+def test_worker_records_status_only_in_a_local_db(tmp_path, monkeypatch):
+    from training.data_prep import segment_status
+    from training.distributed import worker
+
+    def no_open(path):
+        raise AssertionError(f"opened {path}")
+
+    video = tmp_path / "g1" / "s1[F][0@0].mp4"
+    with monkeypatch.context() as m:
+        m.setattr(segment_status, "open_status_db", no_open)
+        m.setattr(worker, "STATUS_DB", "//server/video/segment_status.db")
+        worker._mark_done("g1", video, "tiled", 3)
+
+    db = tmp_path / "segment_status.db"
+    monkeypatch.setattr(worker, "STATUS_DB", str(db))
+    worker._mark_done("g1", video, "tiled", 3)
+    conn = open_status_db(db)
+    try:
+        assert segment_done(conn, "g1", "s1[F][0@0]", "tiled")
+    finally:
+        conn.close()
+
+
+def test_unknown_stage_is_rejected(share):
+    _games, _dirs, conn = share
+    with pytest.raises(ValueError):
+        segments_needing(conn, "trimmed")
+
+
+def test_mass_tile_selects_games_from_the_status_table(tmp_path, monkeypatch):
+    tiles_dir = tmp_path / "training_data" / "tiles_640"
+    (tiles_dir / "done").mkdir(parents=True)
+    (tiles_dir / "done" / "a_frame_000000_r0_c0.jpg").touch()
+    monkeypatch.setattr(mass_tile, "LEGACY_TILES_DIR", tmp_path / "missing")
+    games = [
+        {"game_id": g, "path": str(tmp_path / g), "video_source": "segments"}
+        | {"segments": ["a.mp4"], "corrected_video": None}
+        for g in ("done", "todo")
+    ]
+    conn = open_status_db(tmp_path / "training_data" / "segment_status.db")
+    try:
+        assert mass_tile.games_needing_tiles(conn, games, tiles_dir) == {"todo": ["a"]}
+        assert mass_tile.game_already_tiled(games[0], tiles_dir, conn)
+
+        # tile_game skips the tiled segment from the table, no extraction.
+        video = tmp_path / "done" / "a.mp4"
+        result = mass_tile.tile_game(games[0], [video], tiles_dir, conn)
+        assert result == {"game_id": "done", "frames": 0, "tiles": 1}
+    finally:
+        conn.close()
+
+
+def test_mass_tile_counts_a_pack_only_game_as_tiled(tmp_path, monkeypatch, caplog):
+    # Packed with --delete-loose: the tile dir is kept, its files removed.
+    tiles_dir = tmp_path / "training_data" / "tiles_640"
+    (tiles_dir / "packed").mkdir(parents=True)
+    pack_dir = tmp_path / "training_data" / "tile_packs"
+    (pack_dir / "packed").mkdir(parents=True)
+    (pack_dir / "packed" / "a.pack").write_bytes(b"\xff\xd8")
+    monkeypatch.setattr(mass_tile, "LEGACY_TILES_DIR", tmp_path / "missing")
+    game = {"game_id": "packed", "path": str(tmp_path / "packed")}
+    game |= {"video_source": "segments", "segments": ["a.mp4"]}
+    with caplog.at_level("INFO", logger=mass_tile.logger.name):
+        mass_tile.mass_tile(
+            [game], tiles_dir=tiles_dir, pack_dir=pack_dir, dry_run=True
+        )
+    assert "Already tiled: packed" in caplog.text
+
+    conn = open_status_db(tmp_path / "training_data" / "segment_status.db")
+    try:
+        assert segment_done(conn, "packed", "a", "tiled")
+        assert mass_tile.games_needing_tiles(conn, [game], tiles_dir, pack_dir) == {}
+    finally:
+        conn.close()
+
+
+def test_discovery_benchmark_agrees_with_the_probes(tmp_path):
+    from benchmarks.segment_discovery import run_benchmark
+
+    report = run_benchmark(games=4, segments=6, repeats=1, work_dir=tmp_path)
+    assert report["needing"]["tiled"] > 0 and report["query_s"] > 0
@@ -0,0 +1,287 @@
+"""Tests for video_grouper.inference.session_pool."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import psutil
+import pytest
+
+from video_grouper.inference import session_pool as sp
+from video_grouper.inference.session_pool import SessionPool
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+# Real filesystem on tmp_path; override conftest's os.path mocks.
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+class _FakeOrt:
+    """Just enough of the onnxruntime module surface for the pool."""
+
+    __version__ = "1.2.3"
+    GraphOptimizationLevel = SimpleNamespace(ORT_DISABLE_ALL="disable_all")
+
+    def __init__(self, inputs=None, fail_on=None):
+        self.built: list[tuple] = []
+        self.inputs = inputs or [
+            SimpleNamespace(name="input", type="tensor(float)", shape=[1, 3, "h", "w"])
+        ]
+        self.fail_on = fail_on
+
+    class SessionOptions:
+        def __init__(self):
+            self.optimized_model_filepath = ""
+            self.graph_optimization_level = None
+
+    def InferenceSession(self, src, sess_options=None, providers=None):  # noqa: N802
+        if self.fail_on is not None and self.fail_on(src, sess_options):
+            raise RuntimeError("rejected")
+        self.built.append((src, sess_options, list(providers)))
+        if sess_options is not None and sess_options.optimized_model_filepath:
+            Path(sess_options.optimized_model_filepath).write_bytes(b"optimized")
+        fake = self
+
+        class _Session:
+            runs: list[dict] = []
+
+            def get_inputs(self):
+                return fake.inputs
+
+            def get_providers(self):
+                return list(providers)
+
+            def run(self, outputs, feeds):
+                self.runs.append(feeds)
+                return [np.zeros(1)]
+
+        return _Session()
+
+
+CPU = ["CPUExecutionProvider"]
+
+
+def test_same_content_and_providers_share_one_session():
+    ort = _FakeOrt()
+    pool = SessionPool()
+    a = pool.get(b"model-a", CPU, label="a", ort=ort)
+    assert pool.describe(a).startswith("cold: a ")
+    b = pool.get(b"model-a", CPU, label="a", ort=ort)
+    assert a is b and len(ort.built) == 1
+    assert pool.describe(a).startswith("warm: pool hit #1 for a")
+    # Provider list (incl. options) is part of the key.
+    c = pool.get(b"model-a", [("CUDAExecutionProvider", {"device_id": 1})], ort=ort)
+    assert c is not a and len(ort.built) == 2
+    assert pool.describe(object()) is None
+
+
+def test_new_session_runs_one_dummy_batch():
+    ort = _FakeOrt()
+    session = SessionPool().get(b"m", CPU, ort=ort)
+    (feeds,) = session.runs
+    assert feeds["input"].shape == (1, 3, 64, 64)
+    assert feeds["input"].dtype == np.float32 and not feeds["input"].any()
+
+
+def test_unknown_input_dtype_skips_warmup():
+    ort = _FakeOrt(inputs=[SimpleNamespace(name="s", type="tensor(string)", shape=[1])])
+    session = SessionPool().get(b"m", CPU, ort=ort)
+    assert session.runs == []
+
+
+def test_lru_eviction_past_max_sessions():
+    ort = _FakeOrt()
+    pool = SessionPool(max_sessions=2)
+    a = pool.get(b"a", CPU, ort=ort)
+    pool.get(b"b", CPU, ort=ort)
+    pool.get(b"a", CPU, ort=ort)  # touch: b is now least recent
+    pool.get(b"c", CPU, ort=ort)
+    assert len(pool) == 2
+    assert pool.get(b"a", CPU, ort=ort) is a
+    pool.get(b"b", CPU, ort=ort)
+    assert len(ort.built) == 4  # a, b, c, then b rebuilt
+
+
+def test_rss_budget_evicts_down_to_the_newest(monkeypatch):
+    ort = _FakeOrt()
+    pool = SessionPool(max_sessions=8)
+    pool.get(b"a", CPU, ort=ort)
+    pool.get(b"b", CPU, ort=ort)
+    rss = SimpleNamespace(rss=10 << 30)
+    monkeypatch.setattr(
+        psutil, "Process", lambda: SimpleNamespace(memory_info=lambda: rss)
+    )
+    pool.configure(max_sessions=8, rss_budget_mb=1024)
+    assert len(pool) == 0
+    newest = pool.get(b"c", CPU, ort=ort)
+    assert len(pool) == 1 and pool.get(b"c", CPU, ort=ort) is newest
+
+
+def test_rss_budget_is_skipped_without_psutil(monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, "psutil", None)
+    ort = _FakeOrt()
+    pool = SessionPool(max_sessions=8, rss_budget_mb=1)
+    pool.get(b"a", CPU, ort=ort)
+    pool.get(b"b", CPU, ort=ort)
+    assert len(pool) == 2
+    assert "psutil not installed" in caplog.text
+
+
+def test_alias_lookup_follows_eviction():
+    ort = _FakeOrt()
+    pool = SessionPool(max_sessions=1)
+    assert pool.lookup("ttbm:k:1:abc") is None
+    s = pool.get(b"a", CPU, alias="ttbm:k:1:abc", ort=ort)
+    assert pool.lookup("ttbm:k:1:abc") is s
+    pool.get(b"b", CPU, ort=ort)
+    assert pool.lookup("ttbm:k:1:abc") is None
+
+
+def test_path_models_are_keyed_by_content(tmp_path):
+    ort = _FakeOrt()
+    pool = SessionPool()
+    first, copy = tmp_path / "a.onnx", tmp_path / "copy.onnx"
+    first.write_bytes(b"weights")
+    copy.write_bytes(b"weights")
+    s = pool.get(first, CPU, ort=ort)
+    assert pool.get(str(copy), CPU, ort=ort) is s
+    assert ort.built[0][0] == str(first)
+
+
+def test_missing_path_goes_to_ort_unpooled(tmp_path):
+    ort = _FakeOrt()
+    pool = SessionPool()
+    missing = tmp_path / "nope.onnx"
+    pool.get(missing, CPU, ort=ort)
+    pool.get(missing, CPU, ort=ort)
+    assert len(ort.built) == 2 and len(pool) == 0
+    assert ort.built[0] == (str(missing), None, CPU)
+
+
+def test_optimized_model_cache_round_trip(tmp_path):
+    model = tmp_path / "m.onnx"
+    model.write_bytes(b"weights")
+    cache = tmp_path / "cache"
+
+    ort = _FakeOrt()
+    cold = SessionPool(cache_dir=cache)
+    s = cold.get(model, CPU, ort=ort)
+    (written,) = cache.glob("*.onnx")
+    assert "ort1.2.3" in written.name and written.read_bytes() == b"optimized"
+    assert not list(cache.glob("*.tmp"))
+    assert "(model)" in cold.describe(s)
+
+    # A fresh process: loads the serialized graph with optimization disabled.
+    ort2 = _FakeOrt()
+    warm = SessionPool(cache_dir=cache)
+    s2 = warm.get(model, CPU, ort=ort2)
+    (src, opts, _providers) = ort2.built[0]
+    assert src == str(written) and opts.graph_optimization_level == "disable_all"
+    assert "(optimized cache)" in warm.describe(s2)
+
+
+def test_optimized_cache_skips_licensed_bytes_and_compiling_providers(tmp_path):
+    ort = _FakeOrt()
+    pool = SessionPool(cache_dir=tmp_path)
+    pool.get(b"decrypted", CPU, persist_optimized=False, ort=ort)
+    pool.get(b"plain", ["DmlExecutionProvider", "CPUExecutionProvider"], ort=ort)
+    assert list(tmp_path.iterdir()) == []
+    assert all(opts is None for _src, opts, _p in ort.built)
+
+
+def test_directml_sessions_serialize_run():
+    ort = _FakeOrt()
+    pool = SessionPool()
+    assert not isinstance(pool.get(b"m", CPU, ort=ort), sp.SerializedSession)
+
+    dml = pool.get(b"m", ["DmlExecutionProvider", "CPUExecutionProvider"], ort=ort)
+    assert isinstance(dml, sp.SerializedSession)
+    assert pool.describe(dml).startswith("cold: ")
+    assert dml.get_providers()[0] == "DmlExecutionProvider"
+
+    active = []
+    overlapped = threading.Event()
+
+    def slow_run(outputs, feeds):
+        active.append(1)
+        if len(active) > 1:
+            overlapped.set()
+        time.sleep(0.02)
+        active.pop()
+        return [np.zeros(1)]
+
+    dml.session.run = slow_run
+    threads = [threading.Thread(target=dml.run, args=(None, {})) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+    assert not overlapped.is_set()
+
+
+def test_failed_persisting_build_falls_back_to_a_plain_session(tmp_path):
+    ort = _FakeOrt(fail_on=lambda src, opts: opts is not None)
+    pool = SessionPool(cache_dir=tmp_path)
+    session = pool.get(b"m", CPU, ort=ort)
+    assert session is not None and ort.built == [(b"m", None, CPU)]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_prewarm_runs_loaders_in_the_background():
+    ort = _FakeOrt()
+    pool = SessionPool()
+
+    def broken():
+        raise RuntimeError("boom")
+
+    thread = pool.prewarm([broken, lambda: pool.get(b"m", CPU, ort=ort)])
+    thread.join(timeout=10)
+    assert len(pool) == 1
+    assert pool.prewarm([]) is None
+
+
+def test_real_onnxruntime_persists_and_reloads(tmp_path):
+    # A subprocess: conftest stubs onnxruntime in this interpreter.
+    script = textwrap.dedent(
+        f"""
+        from pathlib import Path
+        import numpy as np
+        import onnxruntime as ort
+        from benchmarks.fixtures import write_ball_model
+        from video_grouper.inference.session_pool import SessionPool
+
+        tmp = Path({str(tmp_path)!r})
+        model = tmp / "ball.onnx"
+        write_ball_model(model)
+        x = np.random.default_rng(0).random((1, 3, 32, 48), np.float32)
+        outs = []
+        for _ in range(2):  # two "processes": cold build, then the cached graph
+            pool = SessionPool(cache_dir=tmp / "cache")
+            s = pool.get(model, ["CPUExecutionProvider"], ort=ort)
+            outs.append(s.run(None, {{"input": x}})[0])
+            print(pool.describe(s))
+        assert np.allclose(outs[0], outs[1])
+        assert len(list((tmp / "cache").glob("*.onnx"))) == 1
+        """
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    cold, warm = proc.stdout.strip().splitlines()[-2:]
+    assert cold.startswith("cold:") and "(model)" in cold
+    assert "(optimized cache)" in warm
@@ -0,0 +1,112 @@
+"""Tests for in-memory decode-to-pack tiling (mass_tile --stream)."""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+import pytest
+
+from benchmarks import fixtures
+from training.data_prep import mass_tile
+from training.data_prep.extract_frames import extract_frames
+from training.data_prep.manifest import open_db, read_tile_bytes
+from training.data_prep.segment_status import (
+    open_status_db,
+    reconcile,
+    segment_counts,
+    segment_done,
+)
+from training.data_prep.stream_tile import segment_workers, tile_segment_to_pack
+from training.data_prep.tile_frames import tile_frame
+
+SEGMENT = "00.00.00-00.05.00[F][0@0][0]"
+
+
+# Real filesystem and PyAV; override conftest's mocks.
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_ffmpeg():
+    yield
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    path = tmp_path_factory.mktemp("video") / f"{SEGMENT}.mp4"
+    fixtures.write_synthetic_video(path, width=1400, height=700, seconds=1.0)
+    return path
+
+
+def test_pack_matches_the_temp_jpeg_path(video, tmp_path):
+    frames_dir = tmp_path / "frames"
+    n = extract_frames(video, frames_dir, diff_threshold=0.0, frame_interval=4)
+    loose = {}
+    for frame_path in sorted(frames_dir.glob("*.jpg")):
+        for t in tile_frame(frame_path, tmp_path / "tiles", cols=7, rows=3):
+            loose[t.stem] = cv2.imread(str(t))
+
+    pack = tmp_path / "packs" / f"{SEGMENT}.pack"
+    seg = tile_segment_to_pack(video, pack, frame_interval=4, diff_threshold=0.0)
+    assert seg["frames"] == n == 5 and seg["tiles"] == len(loose) == 5 * 21
+    assert seg["pack_size"] == pack.stat().st_size
+    assert [row[:3] for row in seg["layout"]] == sorted(
+        row[:3] for row in seg["layout"]
+    )
+
+    data = pack.read_bytes()
+    for fidx, r, c, off, size in seg["layout"]:
+        tile = cv2.imdecode(np.frombuffer(data[off : off + size], np.uint8), 1)
+        ref = loose[f"{SEGMENT}_frame_{fidx:06d}_r{r}_c{c}"]
+        assert tile.shape == ref.shape
+        # One JPEG encode instead of two: within JPEG noise of the old tiles.
+        assert np.abs(tile.astype(int) - ref.astype(int)).mean() < 3
+
+
+def test_frame_diff_filter_drops_static_frames(video, tmp_path):
+    seg = tile_segment_to_pack(
+        video, tmp_path / "s.pack", frame_interval=4, diff_threshold=50.0
+    )
+    assert seg["frames"] == 1  # only the first frame of a near-static pitch
+
+
+def test_stream_tile_game_records_packs_and_status(video, tmp_path, monkeypatch):
+    monkeypatch.setattr(mass_tile, "DIFF_THRESHOLD", 0.0)
+    conn = open_db(tmp_path / "manifest.db", create=True)
+    status = open_status_db(tmp_path / "segment_status.db")
+    game = {"game_id": "g1", "needs_flip": False}
+    packs = tmp_path / "tile_packs"
+    try:
+        result = mass_tile.stream_tile_game(game, [video], packs, conn, status)
+        assert result["frames"] == 5 and result["tiles"] == 105
+        tile = read_tile_bytes(conn, "g1", SEGMENT, 4, 2, 6)
+        assert cv2.imdecode(np.frombuffer(tile, np.uint8), 1).shape == (640, 640, 3)
+        assert conn.execute(
+            "SELECT frame_count, tile_count, frame_max FROM segments"
+        ).fetchone() == (5, 105, 16)
+        assert segment_done(status, "g1", SEGMENT, "tiled")
+        assert segment_done(status, "g1", SEGMENT, "packed")
+
+        # Already tiled: nothing decoded on the second run.
+        again = mass_tile.stream_tile_game(game, [video], packs, conn, status)
+        assert again["tiles"] == 0
+
+        # No loose tiles on disk, but the pack keeps the segment tiled.
+        reconcile(
+            status,
+            {"g1": video.parent},
+            tiles_dirs=[tmp_path / "tiles_640"],
+            pack_dir=packs,
+        )
+        assert segment_counts(status, "g1", "tiled") == {SEGMENT: 105}
+    finally:
+        conn.close()
+        status.close()
+
+
+def test_segment_workers_split_the_cpu_budget():
+    assert segment_workers(12, 4, segments=10) == 3
+    assert segment_workers(12, 4, segments=2) == 2
+    assert segment_workers(2, 4, segments=5) == 1
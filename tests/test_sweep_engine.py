@@ -0,0 +1,157 @@
+"""Tests for the shared-memory, process-pool tracker sweep engine."""
+
+from __future__ import annotations
+
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from training.cli import sweep_engine as S
+from training.cli.sweep_tracker import _hits, _score
+from training.world_model.geometry import build_field_geometry
+from training.world_model.reranker import RerankConfig, kalman_smooth, rerank
+from training.world_model.tbd import Candidate
+
+
+# --- Real filesystem + SQLite on tmp_path; override conftest's mocks ---
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+def _polygon():
+    near_x = np.linspace(100.0, 1900.0, 5)
+    far_x = np.linspace(1600.0, 400.0, 5)
+    return np.concatenate(
+        [
+            np.column_stack([near_x, np.full(5, 1000.0)]),
+            np.column_stack([far_x, np.full(5, 200.0)]),
+        ]
+    )
+
+
+def _dump(n=60, stride=4):
+    """A ball rolling across the field plus a bright static distractor."""
+    rng = np.random.default_rng(0)
+    ef = [i * stride for i in range(n)]
+    cands, balls = {}, {}
+    for i, f in enumerate(ef):
+        bx, by = 500.0 + 15.0 * i, 600.0 + 3.0 * i
+        cs = [(1500.0, 900.0, 0.9, 30.0)]  # static distractor
+        if i % 7 != 3:  # occasional misses
+            cs.append((bx + rng.normal(0, 2), by + rng.normal(0, 2), 0.5, None))
+        cands[f] = cs
+        if i % 2 == 0:
+            balls[f + 1] = (bx, by)
+    return {
+        "polygon": _polygon().tolist(),
+        "ef": ef,
+        "gaps": [1] + [stride] * (n - 1),
+        "balls": balls,
+        "far_size_px": 8.0,
+        "stride": stride,
+        "cands": cands,
+    }
+
+
+@pytest.fixture
+def dump():
+    return S.PackedDump.from_dump(_dump())
+
+
+def test_shared_memory_round_trip(dump):
+    shm, meta = dump.to_shared()
+    try:
+        attached, view = S.PackedDump.attach(json.loads(json.dumps(meta)))
+        for name in S.PackedDump._ARRAYS:
+            np.testing.assert_array_equal(getattr(attached, name), getattr(dump, name))
+        ev = S.Evaluator(attached)
+        assert ev.frames[3] == [Candidate(1500.0, 900.0, 0.9, 30.0)]
+        assert ev.frames[0][1].size_px is None
+        del attached, ev
+        view.close()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_matches_serial_sweep_tracker(dump):
+    d = _dump()
+    geom = build_field_geometry(np.asarray(d["polygon"], float))
+    frames = [[Candidate(*c) for c in d["cands"][f]] for f in d["ef"]]
+    cfg = RerankConfig(alpha=1.0, phys_sigma_px=5.0)
+    track = kalman_smooth(rerank(frames, geom, frame_gaps=d["gaps"], config=cfg), geom)
+    det, near, far = _score(
+        track, frames, d["ef"], d["balls"], geom, d["far_size_px"], d["stride"]
+    )
+
+    row = S.Evaluator(dump).evaluate({"alpha": 1.0, "phys_sigma_px": 5.0})
+    assert row["n_gt"] == len(det) == len(d["balls"])
+    assert row["r15_all"] == _hits(det)["R15"]
+    assert row["r15_near"] == _hits(near)["R15"]
+    assert row["r15_far"] == _hits(far)["R15"]
+    assert row["r15_all"] > 0.8  # the static distractor is not selected
+
+
+def test_parse_and_spaces():
+    assert S.parse_param("alpha=0.3,1") == ("alpha", [0.3, 1.0])
+    assert S.parse_param("aerial_min_misses=2,4") == ("aerial_min_misses", [2, 4])
+    assert S.parse_param("kalman=0,1") == ("kalman", [False, True])
+    assert S.parse_param("alpha=0.1:3:log") == ("alpha", (0.1, 3.0, True))
+    with pytest.raises(ValueError, match="unknown param"):
+        S.parse_param("alhpa=1")
+    with pytest.raises(ValueError):
+        S.parse_param("prior=bogus")
+
+    space = dict(S.parse_param(s) for s in ("alpha=0.3,1,3", "prior=none,size"))
+    grid = S.grid_configs(space)
+    assert len(grid) == 6 and {"alpha": 3.0, "prior": "size"} in grid
+    space["phys_sigma_px"] = (0.0, 10.0, False)
+    with pytest.raises(ValueError, match="grid"):
+        S.grid_configs(space)
+    rnd = S.random_configs(space, 10, seed=1)
+    assert rnd == S.random_configs(space, 10, seed=1)
+    assert len({S.config_key(p) for p in rnd}) == 10
+    assert all(0.0 <= p["phys_sigma_px"] <= 10.0 for p in rnd)
+    assert S.halving_rungs(270, 3, 20) == [30, 90, 270]
+
+
+def test_pool_streams_rows_and_resumes(dump, tmp_path):
+    configs = S.grid_configs({"alpha": [0.3, 1.0], "static_w": [0.0, 2.0]})
+    out = tmp_path / "sweep.db"
+    results = S.ResultsTable(out, "synthetic")
+    with S.SweepEngine(dump, results, workers=2) as engine:
+        rows = engine.run_batch(configs)
+    assert [r["params"] for r in rows] == configs
+    serial = S.Evaluator(dump).evaluate(configs[3])
+    assert rows[3]["r15_all"] == serial["r15_all"]
+    assert len(results.done()) == 4
+
+    # A re-run of the same study reuses every recorded row.
+    with S.SweepEngine(dump, results, workers=0) as engine:
+        engine._local.evaluate = None  # would raise if anything were re-run
+        again = engine.run_batch(configs)
+    assert [r["r15_all"] for r in again] == [r["r15_all"] for r in rows]
+    results.close()
+
+
+def test_halving_promotes_top_configs_csv(dump, tmp_path):
+    configs = S.grid_configs({"alpha": [0.1, 0.3, 1.0], "static_w": [0.0, 2.0, 4.0]})
+    out = tmp_path / "sweep.csv"
+    results = S.ResultsTable(out, "synthetic")
+    with S.SweepEngine(dump, results, workers=0) as engine:
+        final = engine.halving(configs, eta=3, min_frames=15)
+    results.close()
+
+    with open(out, newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    by_rung = {}
+    for r in rows:
+        by_rung.setdefault(int(r["rung"]), []).append(int(r["n_frames"]))
+    assert {k: (len(v), set(v)) for k, v in by_rung.items()} == {
+        0: (9, {20}),
+        1: (3, {60}),
+    }
+    assert len(final) == 3 and all(r["n_frames"] == 60 for r in final)
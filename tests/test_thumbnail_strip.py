@@ -0,0 +1,111 @@
+"""Real-media tests for the precomputed thumbnail strip.
+
+Like tests/test_incremental_combine.py these encode a tiny real mp4 and
+OVERRIDE conftest's autouse PyAV / filesystem mocks.
+"""
+
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from video_grouper.utils.ffmpeg_utils import create_screenshot
+from video_grouper.utils.thumbnail_strip import (
+    ThumbnailStrip,
+    build_thumbnail_strip,
+    strip_paths,
+    thumbnail_at,
+)
+
+
+# --- Override conftest's autouse mocks for this module (use real PyAV/IO) ---
+@pytest.fixture(autouse=True)
+def mock_ffmpeg():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_httpx():
+    yield
+
+
+def _write_clip(path, seconds, fps=10, size=(320, 160), gop=10):
+    """A clip with a keyframe every *gop* frames and a per-second gradient
+    (so no frame reads as 'corrupt' to the solid-region check)."""
+    import av
+    import numpy as np
+
+    w, h = size
+    ramp = np.tile(np.linspace(0, 200, w, dtype=np.uint8), (h, 1))
+    with av.open(str(path), "w", format="mp4") as container:
+        vstream = container.add_stream("mpeg4", rate=fps)
+        vstream.width = w
+        vstream.height = h
+        vstream.pix_fmt = "yuv420p"
+        vstream.codec_context.gop_size = gop
+        for i in range(int(round(seconds * fps))):
+            img = np.stack([ramp, ramp, np.full_like(ramp, (i // fps) * 10)], axis=2)
+            frame = av.VideoFrame.from_ndarray(img, format="rgb24").reformat(
+                format="yuv420p"
+            )
+            frame.pts = i
+            for pkt in vstream.encode(frame):
+                container.mux(pkt)
+        for pkt in vstream.encode(None):
+            container.mux(pkt)
+
+
+@pytest.mark.asyncio
+async def test_build_and_lookup(tmp_path):
+    video = tmp_path / "combined.mp4"
+    _write_clip(video, seconds=6)
+
+    assert await build_thumbnail_strip(str(video), interval_seconds=2.0, max_width=160)
+
+    strip = ThumbnailStrip.open(str(video))
+    assert strip is not None
+    assert len(strip) == 3
+    t, jpeg = strip.nearest(4.4)
+    assert t == pytest.approx(4.0)
+    image = Image.open(io.BytesIO(jpeg))
+    assert image.size == (160, 80)
+    assert not any(p.endswith(".tmp") for p in os.listdir(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_stale_strip_is_ignored(tmp_path):
+    video = tmp_path / "combined.mp4"
+    _write_clip(video, seconds=2)
+    assert await build_thumbnail_strip(str(video), interval_seconds=1.0)
+
+    _write_clip(video, seconds=3)  # re-combined: size/mtime change
+    assert ThumbnailStrip.open(str(video)) is None
+    assert thumbnail_at(str(video), 0.0) is None
+
+
+@pytest.mark.asyncio
+async def test_create_screenshot_prefers_strip(tmp_path):
+    video = tmp_path / "combined.mp4"
+    _write_clip(video, seconds=4)
+    assert await build_thumbnail_strip(str(video), interval_seconds=1.0)
+    blob_path, _ = strip_paths(str(video))
+
+    out = tmp_path / "shot.jpg"
+    assert await create_screenshot(
+        str(video), str(out), time_offset="00:00:02", allow_thumbnail=True
+    )
+    assert out.read_bytes() == thumbnail_at(str(video), 2.0)
+
+    # Without a strip the same call decodes the video.
+    os.remove(blob_path)
+    out.unlink()
+    assert await create_screenshot(
+        str(video), str(out), time_offset="00:00:02", allow_thumbnail=True
+    )
+    assert out.exists()
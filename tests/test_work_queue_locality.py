@@ -0,0 +1,115 @@
+"""Tests for data-locality aware claiming in the training WorkQueue."""
+
+from __future__ import annotations
+
+import shutil
+import time
+
+import pytest
+
+from training.pipeline import queue as Q
+from training.tasks.io import local_inventory
+from training.tasks.local_cache import get_cache
+
+
+# --- Real filesystem + SQLite on tmp_path; override conftest's mocks ---
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture
+def q(tmp_path):
+    wq = Q.WorkQueue(tmp_path / "queue.db")
+    yield wq
+    wq.close()
+
+
+def _enqueue(q, game, priority, age=0.0):
+    item_id = q.enqueue("tile", game_id=game, priority=priority)
+    if age:
+        conn = q._get_conn()
+        conn.execute(
+            "UPDATE work_items SET created_at = ? WHERE id = ?",
+            (time.time() - age, item_id),
+        )
+        conn.commit()
+    return item_id
+
+
+def test_priority_order_without_inventory(q):
+    _enqueue(q, "g_low", 50)
+    head = _enqueue(q, "g_high", 20)
+    assert q.claim(["tile"], "w1")["id"] == head
+
+
+def test_prefers_local_game_within_slack(q):
+    _enqueue(q, "g_head", 20)
+    local = _enqueue(q, "g_local", 20 + Q.LOCALITY_PRIORITY_SLACK)
+    q.update_worker_status("w1", local_games={"g_local": 5_000_000_000})
+    item = q.claim(["tile"], "w1")
+    assert item["id"] == local and item["local_bytes"] == 5_000_000_000
+    # Another worker without the game still gets the head of the queue.
+    assert q.claim(["tile"], "w2")["game_id"] == "g_head"
+
+
+def test_priority_gap_beyond_slack_wins(q):
+    head = _enqueue(q, "g_head", 20)
+    _enqueue(q, "g_local", 21 + Q.LOCALITY_PRIORITY_SLACK)
+    q.update_worker_status("w1", local_games={"g_local": 10})
+    assert q.claim(["tile"], "w1")["id"] == head
+
+
+def test_aged_head_is_not_bypassed(q):
+    head = _enqueue(q, "g_head", 20, age=Q.LOCALITY_MAX_WAIT_S + 1)
+    _enqueue(q, "g_local", 20)
+    q.update_worker_status("w1", local_games={"g_local": 10})
+    assert q.claim(["tile"], "w1")["id"] == head
+
+
+def test_stale_or_replaced_inventory_is_ignored(q, monkeypatch):
+    head = _enqueue(q, "g_head", 20)
+    _enqueue(q, "g_local", 25)
+    q.update_worker_status("w1", local_games={"g_local": 10})
+    monkeypatch.setattr(Q, "LOCALITY_TTL_S", -1)
+    assert q.claim(["tile"], "w1")["id"] == head
+
+    monkeypatch.setattr(Q, "LOCALITY_TTL_S", 900)
+    _enqueue(q, "g_other", 20)
+    q.update_worker_status("w1", local_games={})
+    assert q.claim(["tile"], "w1")["game_id"] == "g_other"
+
+
+def test_locality_stats(q):
+    _enqueue(q, "g1", 20)
+    _enqueue(q, "g2", 20)
+    q.update_worker_status("w1", local_games={"g2": 3_000})
+    q.claim(["tile"], "w1")
+    q.claim(["tile"], "w1")
+    stats = q.get_locality_stats()
+    assert stats == {
+        "claims": 2,
+        "local_claims": 1,
+        "local_hit_rate": 0.5,
+        "local_bytes": 3_000,
+    }
+
+
+def test_local_inventory_reports_the_input_cache(tmp_path):
+    server = tmp_path / "server"
+    server.mkdir()
+    (server / "a.pack").write_bytes(b"x" * 100)
+    work = tmp_path / "work"
+    assert local_inventory(work) == {}
+    cache = get_cache(work, max_gb=1)
+    cache.fetch(server / "a.pack", work / "g1" / "tile_packs" / "a.pack", game_id="g1")
+    # TaskIO.cleanup removed the game's work dir; its inputs are still cached.
+    shutil.rmtree(work / "g1")
+    assert local_inventory(work) == {"g1": 100}
+
+
+def test_worker_cache_stats_round_trip(q):
+    q.update_worker_status("w1", cache_stats={"hits": 3, "misses": 1})
+    q.update_worker_status("w1", status="working")  # None keeps the last stats
+    (w,) = q.get_worker_status("w1")
+    assert w["status"] == "working" and w["cache_stats"] == {"hits": 3, "misses": 1}
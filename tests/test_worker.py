@@ -9,7 +9,6 @@ production, no network or sockets involved.
 from __future__ import annotations
 
 import asyncio
-import json
 
 import httpx
 import pytest
@@ -17,6 +16,7 @@ import pytest
 from video_grouper.utils.config import TTTConfig
 from video_grouper.web.auth_server import create_app
 from video_grouper.web.worker_api import enqueue_task
+from video_grouper.web.worker_registry import get_registry
 from video_grouper.worker.__main__ import (
     _heartbeat_loop,
     _poll_once,
@@ -61,8 +61,9 @@ async def test_register_advertises_capabilities(storage):
         token = await _register(client, MASTER_URL, "worker1", ["combine", "trim"])
 
     assert token
-    registry = json.loads((storage / "workers" / "registry.json").read_text())
-    assert registry["workers"]["worker1"]["capabilities"] == ["combine", "trim"]
+    (worker,) = get_registry(storage).list_workers()
+    assert worker["node_id"] == "worker1"
+    assert worker["capabilities"] == ["combine", "trim"]
 
 
 @pytest.mark.asyncio
@@ -87,8 +88,7 @@ async def test_poll_once_claims_runs_completes(storage):
         processed = await _poll_once(client, MASTER_URL, heartbeat_interval=999)
 
     assert processed is True
-    registry = json.loads((storage / "workers" / "registry.json").read_text())
-    task = registry["tasks"][task_id]
+    task = get_registry(storage).get_task(task_id)
     assert task["status"] == "complete"
     assert task["assigned_to"] == "w"
     # The stub runner reports its task type back as the output so we can
@@ -108,8 +108,7 @@ async def test_poll_once_skips_capability_mismatch(storage):
         processed = await _poll_once(client, MASTER_URL, heartbeat_interval=999)
 
     assert processed is False
-    registry = json.loads((storage / "workers" / "registry.json").read_text())
-    assert registry["tasks"][task_id]["status"] == "queued"
+    assert get_registry(storage).get_task(task_id)["status"] == "queued"
 
 
 @pytest.mark.asyncio
@@ -127,8 +126,7 @@ async def test_heartbeat_loop_pings_master_during_long_task(storage):
         claim = await client.get("/api/work/next")
         assert claim.status_code == 200
 
-        before = json.loads((storage / "workers" / "registry.json").read_text())
-        before_hb = before["tasks"][task_id].get("last_heartbeat")
+        before_hb = get_registry(storage).get_task(task_id)["last_heartbeat"]
 
         stop = asyncio.Event()
         hb_task = asyncio.create_task(
@@ -139,8 +137,7 @@ async def test_heartbeat_loop_pings_master_during_long_task(storage):
         stop.set()
         await hb_task
 
-        after = json.loads((storage / "workers" / "registry.json").read_text())
-        after_hb = after["tasks"][task_id]["last_heartbeat"]
+        after_hb = get_registry(storage).get_task(task_id)["last_heartbeat"]
 
     # Master saw a heartbeat that didn't exist before.
     assert before_hb is None
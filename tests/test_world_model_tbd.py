@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import cv2
 import numpy as np
+import pytest
 
 from training.world_model.geometry import (
     _touchline_world_points,
@@ -154,3 +155,42 @@ def test_occlusion_prediction_stays_in_frame_with_decay_and_clamp():
         assert -1.0 <= p.y <= 601.0
     assert not by[31].detected  # deep in occlusion
     assert by[31].x < 1000.0  # decayed to a stop, did not run away
+
+
+def _assert_same_result(new, ref):
+    assert [(p.frame_idx, p.detected) for p in new.points] == [
+        (p.frame_idx, p.detected) for p in ref.points
+    ]
+    for p, q in zip(new.points, ref.points, strict=True):
+        assert p.x == pytest.approx(q.x, abs=1e-9)
+        assert p.y == pytest.approx(q.y, abs=1e-9)
+    assert new.total_logprob == pytest.approx(ref.total_logprob, rel=1e-12)
+
+
+@pytest.mark.parametrize(
+    ("geom_kind", "cfg"),
+    [
+        ("neutral", TBDConfig()),
+        ("valid", TBDConfig(max_candidates_per_frame=5)),
+        (
+            "neutral",
+            TBDConfig(
+                occlusion_decay=0.8,
+                frame_w=3840.0,
+                frame_h=2160.0,
+                teleport_px=300.0,
+                max_speed_px=60.0,
+            ),
+        ),
+    ],
+)
+def test_matches_per_node_reference_decoder(geom_kind, cfg):
+    from training.experiments.tbd_benchmark import run_tbd_per_node, synthetic_stream
+
+    geom = NEUTRAL if geom_kind == "neutral" else _valid_geom()
+    frames = [[], []] + synthetic_stream(300, n_cands=8, seed=3)
+    # Sprinkle total-occlusion frames and ties in the detector score.
+    for t in range(10, 300, 37):
+        frames[t] = []
+    frames[50] = [Candidate(1000.0, 900.0, 0.5), Candidate(1010.0, 900.0, 0.5)]
+    _assert_same_result(run_tbd(frames, geom, cfg), run_tbd_per_node(frames, geom, cfg))
@@ -171,6 +171,31 @@ def test_dashboard_includes_pipeline_status_from_provider(storage):
     assert "backyard" in body and "not connected" in body
 
 
+def test_dashboard_shows_poller_metrics(storage):
+    def provider():
+        return {
+            "queue_sizes": {"download": 0},
+            "pollers": {
+                "CameraPoller[default]": {
+                    "polls": 12,
+                    "wakeups": 3,
+                    "idle_streak": 2,
+                    "interval_seconds": 240.0,
+                    "last_poll_seconds": 0.5,
+                    "avg_poll_seconds": None,
+                }
+            },
+        }
+
+    app = create_app(_ttt_config(), str(storage), status_provider=provider)
+    with TestClient(app, base_url="http://localhost:8765") as c:
+        body = c.get("/").text
+
+    assert "CameraPoller[default]" in body
+    assert ">240s<" in body
+    assert ">0.50s<" in body
+
+
 def test_dashboard_pipeline_section_when_no_status_provider(client):
     resp = client.get("/")
     assert "No live pipeline status available" in resp.text
@@ -413,6 +438,55 @@ class TestReprocessEndpoint:
         assert "current: extreme" in body
 
 
+class TestRecordingThumbnail:
+    """``GET /recordings/{name}/thumbnail.jpg`` serves the precomputed strip."""
+
+    GAME = "2026.05.20-14.30.00"
+
+    def _write_strip(self, storage):
+        game_dir = storage / self.GAME
+        video = game_dir / "combined.mp4"
+        video.write_bytes(b"not really a video")
+        st = video.stat()
+        (game_dir / "combined.thumbs.bin").write_bytes(b"JPEG-AJPEG-B")
+        (game_dir / "combined.thumbs.json").write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "video": "combined.mp4",
+                    "video_size": st.st_size,
+                    "video_mtime_ns": st.st_mtime_ns,
+                    "interval_seconds": 10.0,
+                    "max_width": 800,
+                    "entries": [[0.0, 0, 6], [10.0, 6, 6]],
+                }
+            ),
+            encoding="utf-8",
+        )
+        return video
+
+    def test_serves_nearest_thumbnail(self, storage, client):
+        _write_game(storage, self.GAME, "combined")
+        self._write_strip(storage)
+        r = client.get(f"/recordings/{self.GAME}/thumbnail.jpg", params={"t": 8})
+        assert r.status_code == 200
+        assert r.headers["content-type"] == "image/jpeg"
+        assert r.content == b"JPEG-B"
+        r = client.get(f"/recordings/{self.GAME}/thumbnail.jpg")
+        assert r.content == b"JPEG-A"
+
+    def test_stale_strip_is_404(self, storage, client):
+        _write_game(storage, self.GAME, "combined")
+        video = self._write_strip(storage)
+        video.write_bytes(b"re-combined, different size")
+        r = client.get(f"/recordings/{self.GAME}/thumbnail.jpg")
+        assert r.status_code == 404
+
+    def test_rejects_bad_name(self, client):
+        r = client.get("/recordings/..%2Fetc/thumbnail.jpg")
+        assert r.status_code in (400, 404)
+
+
 # ---------------------------------------------------------------------------
 # Dashboard redirect to /setup/welcome when onboarding isn't done
 # (Phase 2 done-criterion: a fresh shared_data with no config.ini boots
@@ -0,0 +1,181 @@
+"""Tests for the SQLite worker registry behind the worker API."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from video_grouper.web.worker_registry import (
+    MAX_ATTEMPTS,
+    WorkerRegistry,
+    legacy_json_path,
+    registry_db_path,
+    token_sha256,
+)
+
+
+# Real filesystem + real httpx (the load test); override conftest's mocks.
+@pytest.fixture(autouse=True)
+def mock_file_system():
+    yield
+
+
+@pytest.fixture(autouse=True)
+def mock_httpx():
+    yield
+
+
+@pytest.fixture
+def registry(tmp_path):
+    reg = WorkerRegistry(tmp_path, heartbeat_flush_s=3600)
+    yield reg
+    reg.close()
+
+
+def _db_row(tmp_path, sql, *args):
+    conn = sqlite3.connect(registry_db_path(tmp_path))
+    try:
+        return conn.execute(sql, args).fetchone()
+    finally:
+        conn.close()
+
+
+def test_tokens_are_looked_up_by_hash(registry, tmp_path):
+    token = registry.register("w1", ["combine"], "0.1.0")
+    assert registry.node_for_token(token) == "w1"
+    assert registry.node_for_token(token + "x") is None
+    row = _db_row(tmp_path, "SELECT token_sha256 FROM workers WHERE node_id='w1'")
+    assert row == (token_sha256(token),)
+    # Re-registration keeps the token and updates the capabilities.
+    assert registry.register("w1", ["trim"], "0.2.0") == token
+    (worker,) = registry.list_workers()
+    assert worker["capabilities"] == ["trim"] and worker["version"] == "0.2.0"
+
+
+def test_claims_are_fifo_and_capability_filtered(registry):
+    registry.register("cpu", ["combine"], None)
+    registry.register("any", [], None)
+    first = registry.enqueue("ball_tracking", {"n": 1})
+    second = registry.enqueue("combine", {"n": 2})
+    third = registry.enqueue("combine", {"n": 3})
+
+    claimed = registry.claim_next("cpu")
+    assert claimed["task_id"] == second and claimed["payload"] == {"n": 2}
+    # No capabilities advertised = takes anything, oldest first.
+    assert registry.claim_next("any")["task_id"] == first
+    assert registry.claim_next("any")["task_id"] == third
+    assert registry.claim_next("cpu") is None
+    assert registry.get_task(second)["status"] == "in_progress"
+
+
+def test_heartbeats_are_buffered_until_the_flush_interval(registry, tmp_path):
+    registry.register("w", ["combine"], None)
+    task_id = registry.enqueue("combine", {})
+    registry.claim_next("w")
+    assert registry.heartbeat(task_id, "w")
+    assert not registry.heartbeat(task_id, "someone-else")
+    assert not registry.heartbeat("missing", "w")
+
+    # Visible through the registry, not yet written to the database.
+    assert registry.get_task(task_id)["last_heartbeat"] is not None
+    sql = "SELECT last_heartbeat FROM tasks WHERE task_id = ?"
+    assert _db_row(tmp_path, sql, task_id) == (None,)
+
+    registry.heartbeat_flush_s = 0.0
+    registry.heartbeat(task_id, "w")  # past the interval -> one batched write
+    assert _db_row(tmp_path, sql, task_id)[0] is not None
+
+
+def test_close_flushes_pending_heartbeats(tmp_path):
+    reg = WorkerRegistry(tmp_path, heartbeat_flush_s=3600)
+    reg.register("w", [], None)
+    task_id = reg.enqueue("combine", {})
+    reg.claim_next("w")
+    reg.heartbeat(task_id, "w")
+    reg.close()
+
+    reopened = WorkerRegistry(tmp_path)
+    try:
+        assert reopened.get_task(task_id)["last_heartbeat"] is not None
+    finally:
+        reopened.close()
+
+
+def test_failures_requeue_until_attempts_run_out(registry):
+    registry.register("w", [], None)
+    task_id = registry.enqueue("combine", {})
+    for attempt in range(1, MAX_ATTEMPTS):
+        registry.claim_next("w")
+        assert registry.fail(task_id, "w", "boom", retry=True) == {
+            "status": "queued",
+            "attempts": attempt,
+        }
+        assert registry.get_task(task_id)["assigned_to"] is None
+    registry.claim_next("w")
+    assert registry.fail(task_id, "w", "boom", retry=True)["status"] == "error"
+    assert registry.fail(task_id, "other", "boom", retry=True) is None
+    assert registry.complete(task_id, "other", {}) is False
+
+
+def test_json_registry_is_migrated_once(tmp_path):
+    legacy = {
+        "workers": {
+            "w1": {
+                "token": "tok-1",
+                "capabilities": ["combine"],
+                "version": "0.1.0",
+                "registered_at": "2026-04-20T14:30:00+00:00",
+                "last_heartbeat": 100.0,
+            }
+        },
+        "tasks": {
+            "t-new": {"task_type": "combine", "payload": {"a": 1}, "status": "queued"},
+            "t-done": {
+                "task_type": "trim",
+                "status": "complete",
+                "assigned_to": "w1",
+                "outputs": {"out": "x.mp4"},
+                "attempts": 1,
+            },
+            "t-next": {"task_type": "combine", "payload": {}, "status": "queued"},
+        },
+    }
+    src = legacy_json_path(tmp_path)
+    src.parent.mkdir(parents=True)
+    src.write_text(json.dumps(legacy))
+
+    reg = WorkerRegistry(tmp_path)
+    try:
+        assert reg.node_for_token("tok-1") == "w1"
+        assert reg.get_task("t-done")["outputs"] == {"out": "x.mp4"}
+        # Queue order survives the migration.
+        assert reg.claim_next("w1")["task_id"] == "t-new"
+        assert reg.claim_next("w1")["task_id"] == "t-next"
+    finally:
+        reg.close()
+    assert not src.exists()
+    assert src.with_name("registry.json.migrated").exists()
+
+    # A stray registry.json later is not re-imported over live state.
+    src.write_text(json.dumps({"workers": {}, "tasks": {"t-x": {"status": "queued"}}}))
+    reg = WorkerRegistry(tmp_path)
+    try:
+        assert reg.get_task("t-x") is None
+    finally:
+        reg.close()
+
+
+def test_load_benchmark_drives_a_fleet(tmp_path):
+    from benchmarks.worker_api import run_benchmark
+    from video_grouper.web.worker_registry import close_registry, get_registry
+
+    try:
+        report = run_benchmark(workers=12, heartbeats=5, work_dir=tmp_path)
+        assert report["all"]["requests"] == 12 * (5 + 4)
+        assert set(report["endpoints"]) == {"register", "next", "heartbeat", "complete"}
+        assert report["endpoints"]["heartbeat"]["p99_ms"] > 0
+        assert all(w["last_heartbeat"] for w in get_registry(tmp_path).list_workers())
+    finally:
+        close_registry(tmp_path)
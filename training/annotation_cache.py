@@ -0,0 +1,243 @@
+"""Caches behind the annotation server: a review-packet index and a thumbnail store.
+
+``PacketIndex`` keeps every packet's parsed ``manifest.json`` and
+``annotation_results.json`` in memory. Before it is used, each entry is
+revalidated with a ``stat`` of those two files and of the packet directory
+(``(mtime_ns, size)`` signatures), and the packet list with a ``stat`` of the
+packets root. A request therefore costs a handful of stats instead of a
+directory scan plus a JSON parse per packet. The same signatures give the
+HTTP ETags, so a phone polling an unchanged packet gets ``304 Not Modified``.
+
+``ThumbnailCache`` is content-addressed on disk: the key hashes the source
+image's (path, mtime, size) plus the render variant, so an edited crop gets a
+new thumbnail and a stale one is never served. Renders run on a small bounded
+thread pool off the event loop, and concurrent requests for the same
+thumbnail share one render.
+
+Change detection is stat-based rather than inotify: the server runs on the
+Windows training PC, and a few stats per request is cheap next to the parses
+they replace, with no watcher thread to keep alive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+Signature = tuple[int, int] | None
+
+
+def stat_signature(path: Path) -> Signature:
+    """``(mtime_ns, size)`` of ``path``, or None if it doesn't exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def make_etag(*parts: object) -> str:
+    """A weak ETag over ``parts`` (signatures, ids, query parameters)."""
+    digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """RFC 9110 weak comparison of an ``If-None-Match`` header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    want = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == want for t in if_none_match.split(","))
+
+
+def _load_json(path: Path):
+    with open(path) as f:
+        return json.load(f)
+
+
+@dataclass
+class PacketEntry:
+    """One packet's parsed files. Treat ``manifest``/``results`` as read-only:
+    they are shared by every request until the files change."""
+
+    packet_id: str
+    path: Path
+    manifest: dict
+    results: list
+    manifest_sig: Signature
+    results_sig: Signature
+    dir_sig: Signature
+    _frames: dict[int, dict] | None = field(default=None, repr=False)
+
+    def frame(self, frame_idx: int) -> dict | None:
+        """The manifest's ``frames`` entry for ``frame_idx`` (indexed on first use)."""
+        if self._frames is None:
+            self._frames = {f["frame_idx"]: f for f in self.manifest.get("frames", [])}
+        return self._frames.get(frame_idx)
+
+    @property
+    def signature(self) -> tuple:
+        return (self.packet_id, self.manifest_sig, self.results_sig, self.dir_sig)
+
+    @property
+    def etag(self) -> str:
+        return make_etag(self.signature)
+
+
+class PacketIndex:
+    """Stat-validated, in-process index of the packets under ``root``.
+
+    ``enabled=False`` reparses on every call (the pre-index behaviour; the
+    annotation-server benchmark uses it as the baseline).
+    """
+
+    def __init__(self, root: Path, *, enabled: bool = True) -> None:
+        self.root = Path(root)
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: dict[str, PacketEntry] = {}
+        self._listing: tuple[Signature, list[str]] | None = None
+
+    def packet_ids(self) -> list[str]:
+        """Sorted names of the directories under ``root``."""
+        root_sig = stat_signature(self.root)
+        with self._lock:
+            if self.enabled and self._listing and self._listing[0] == root_sig:
+                return self._listing[1]
+        ids = (
+            sorted(e.name for e in os.scandir(self.root) if e.is_dir())
+            if root_sig is not None
+            else []
+        )
+        with self._lock:
+            self._listing = (root_sig, ids)
+        return ids
+
+    def get(self, packet_id: str) -> PacketEntry | None:
+        """The packet's entry, reloading whichever file changed; None if the
+        packet has no ``manifest.json``."""
+        path = self.root / packet_id
+        manifest_path = path / "manifest.json"
+        results_path = path / "annotation_results.json"
+        manifest_sig = stat_signature(manifest_path)
+        if manifest_sig is None:
+            with self._lock:
+                self._entries.pop(packet_id, None)
+            return None
+        results_sig = stat_signature(results_path)
+        dir_sig = stat_signature(path)
+        with self._lock:
+            cached = self._entries.get(packet_id) if self.enabled else None
+        if cached is not None and cached.manifest_sig == manifest_sig:
+            manifest, frames = cached.manifest, cached._frames
+        else:
+            manifest, frames = _load_json(manifest_path), None
+        if cached is not None and cached.results_sig == results_sig:
+            results = cached.results
+        else:
+            results = _load_json(results_path) if results_sig is not None else []
+        entry = PacketEntry(
+            packet_id,
+            path,
+            manifest,
+            results,
+            manifest_sig,
+            results_sig,
+            dir_sig,
+            frames,
+        )
+        with self._lock:
+            self._entries[packet_id] = entry
+        return entry
+
+    def entries(self) -> list[PacketEntry]:
+        """Every packet with a manifest, in name order."""
+        return [e for pid in self.packet_ids() if (e := self.get(pid)) is not None]
+
+    def invalidate(self, packet_id: str | None = None) -> None:
+        """Forget one packet (or everything). For writers whose change might
+        not move the file's mtime/size signature."""
+        with self._lock:
+            if packet_id is None:
+                self._entries.clear()
+                self._listing = None
+            else:
+                self._entries.pop(packet_id, None)
+
+
+class ThumbnailCache:
+    """Content-addressed on-disk thumbnails rendered on a bounded pool."""
+
+    def __init__(
+        self, cache_dir: Path, *, max_workers: int = 2, enabled: bool = True
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="thumbs"
+        )
+        self._lock = threading.Lock()
+        self._inflight: dict[str, Future] = {}
+
+    def key(self, src: Path, variant: str) -> str | None:
+        """Cache key for rendering ``src`` as ``variant``; None if ``src`` is gone."""
+        sig = stat_signature(src)
+        if sig is None:
+            return None
+        ident = f"{Path(src).resolve()}|{sig[0]}|{sig[1]}|{variant}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.jpg"
+
+    async def get(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """The cached JPEG for ``key``, rendering (once) via ``render`` on a miss."""
+        if not self.enabled:
+            return render()  # inline, uncached: the pre-cache baseline
+        try:
+            return self.path_for(key).read_bytes()
+        except OSError:
+            pass
+        with self._lock:
+            fut = self._inflight.get(key)
+            started = fut is None
+            if started:
+                fut = self._pool.submit(self._render_and_store, key, render)
+                self._inflight[key] = fut
+        if started:
+            # Outside the lock: a render that already finished runs the
+            # callback right here, and _forget takes the lock.
+            fut.add_done_callback(lambda f: self._forget(key, f))
+        return await asyncio.wrap_future(fut)
+
+    def _forget(self, key: str, fut: Future) -> None:
+        with self._lock:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    def _render_and_store(self, key: str, render: Callable[[], bytes]) -> bytes:
+        data = render()
+        path = self.path_for(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:  # a read-only share still serves the render
+            logger.warning("thumbnail cache write failed for %s: %s", path, e)
+        return data
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
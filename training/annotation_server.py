@@ -11,6 +11,7 @@ Usage:
 import asyncio
 import json
 import logging
+import os
 import time
 from datetime import UTC, datetime
 from pathlib import Path
@@ -22,6 +23,14 @@ from pydantic import BaseModel
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from training import field_edit_v2  # field-polygon editor mount
+from training.annotation_cache import (
+    PacketEntry,
+    PacketIndex,
+    ThumbnailCache,
+    etag_matches,
+    make_etag,
+    stat_signature,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +38,13 @@ logger = logging.getLogger(__name__)
 REVIEW_PACKETS_DIR = Path("D:/training_data/review_packets")
 LABELS_OUTPUT_DIR = Path("training_data/labels/annotations")
 
+# Packet index, thumbnail store and ETags (training.annotation_cache). False
+# restores the uncached behaviour -- benchmarks.annotation_server's baseline.
+CACHE_ENABLED = True
+THUMB_WORKERS = 2
+_PACKET_INDEXES: dict[tuple[Path, bool], PacketIndex] = {}
+_THUMB_CACHES: dict[tuple[Path, bool], ThumbnailCache] = {}
+
 app = FastAPI(title="Ball Tracking Annotation Server", version="0.1.0")
 app.include_router(field_edit_v2.router)
 
@@ -83,22 +99,53 @@ def _get_packets_dir() -> Path:
     return REVIEW_PACKETS_DIR
 
 
-def _load_manifest(game_id: str) -> dict:
-    """Load manifest.json for a game packet."""
-    manifest_path = _get_packets_dir() / game_id / "manifest.json"
-    if not manifest_path.exists():
+def _packet_index() -> PacketIndex:
+    """The packet index for the current packets dir (see training.annotation_cache)."""
+    root = _get_packets_dir()
+    key = (root, CACHE_ENABLED)
+    if key not in _PACKET_INDEXES:
+        _PACKET_INDEXES[key] = PacketIndex(root, enabled=CACHE_ENABLED)
+    return _PACKET_INDEXES[key]
+
+
+def _thumb_cache() -> ThumbnailCache:
+    """The thumbnail store, ``_thumbs/`` under the packets dir."""
+    root = _get_packets_dir()
+    key = (root, CACHE_ENABLED)
+    if key not in _THUMB_CACHES:
+        _THUMB_CACHES[key] = ThumbnailCache(
+            root / "_thumbs", max_workers=THUMB_WORKERS, enabled=CACHE_ENABLED
+        )
+    return _THUMB_CACHES[key]
+
+
+def _etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag} if CACHE_ENABLED else {}
+
+
+def _not_modified(request: Request, etag: str) -> Response | None:
+    """A 304 if the client's If-None-Match already names ``etag``."""
+    if CACHE_ENABLED and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+
+def _packet_entry(game_id: str) -> PacketEntry:
+    entry = _packet_index().get(game_id)
+    if entry is None:
         raise HTTPException(status_code=404, detail=f"Packet not found: {game_id}")
-    with open(manifest_path) as f:
-        return json.load(f)
+    return entry
+
+
+def _load_manifest(game_id: str) -> dict:
+    """Load manifest.json for a game packet (shared via the index: read-only)."""
+    return _packet_entry(game_id).manifest
 
 
 def _load_results(game_id: str) -> list[dict]:
-    """Load existing annotation results for a game packet."""
-    results_path = _get_packets_dir() / game_id / "annotation_results.json"
-    if not results_path.exists():
-        return []
-    with open(results_path) as f:
-        return json.load(f)
+    """Load existing annotation results for a game packet (read-only)."""
+    entry = _packet_index().get(game_id)
+    return entry.results if entry is not None else []
 
 
 def _save_results(game_id: str, results: list[dict]) -> None:
@@ -106,6 +153,7 @@ def _save_results(game_id: str, results: list[dict]) -> None:
     results_path = _get_packets_dir() / game_id / "annotation_results.json"
     with open(results_path, "w") as f:
         json.dump(results, f, indent=2)
+    _packet_index().invalidate(game_id)
 
 
 def _packet_status(manifest: dict, results: list[dict]) -> str:
@@ -123,71 +171,62 @@ def _packet_status(manifest: dict, results: list[dict]) -> str:
 
 
 @app.get("/api/packets", response_model=list[PacketSummary])
-async def list_packets():
+async def list_packets(request: Request, response: Response):
     """List all available review packets with their status."""
-    packets_dir = _get_packets_dir()
-    summaries = []
-
-    for entry in sorted(packets_dir.iterdir()):
-        if not entry.is_dir():
-            continue
-        manifest_path = entry / "manifest.json"
-        if not manifest_path.exists():
-            continue
-
-        with open(manifest_path) as f:
-            manifest = json.load(f)
-
-        results = _load_results(entry.name)
-        status = _packet_status(manifest, results)
-
-        summaries.append(
-            PacketSummary(
-                game_id=entry.name,
-                frame_count=len(manifest.get("frames", [])),
-                reviewed_count=len(results),
-                status=status,
-            )
+    entries = _packet_index().entries()
+    etag = make_etag("packets", *(e.signature for e in entries))
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+    response.headers.update(_etag_headers(etag))
+
+    return [
+        PacketSummary(
+            game_id=entry.packet_id,
+            frame_count=len(entry.manifest.get("frames", [])),
+            reviewed_count=len(entry.results),
+            status=_packet_status(entry.manifest, entry.results),
         )
-
-    return summaries
+        for entry in entries
+    ]
 
 
 @app.get("/api/packets/{game_id}")
-async def get_packet(game_id: str):
+async def get_packet(game_id: str, request: Request):
     """Get the full manifest for a review packet."""
-    manifest = _load_manifest(game_id)
-    results = _load_results(game_id)
+    entry = _packet_entry(game_id)
+    if (not_modified := _not_modified(request, entry.etag)) is not None:
+        return not_modified
+    manifest, results = entry.manifest, entry.results
 
     reviewed_indices = {r["frame_idx"] for r in results}
 
-    return {
-        **manifest,
-        "reviewed_count": len(results),
-        "status": _packet_status(manifest, results),
-        "reviewed_frames": sorted(reviewed_indices),
-    }
+    return JSONResponse(
+        {
+            **manifest,
+            "reviewed_count": len(results),
+            "status": _packet_status(manifest, results),
+            "reviewed_frames": sorted(reviewed_indices),
+        },
+        headers=_etag_headers(entry.etag),
+    )
 
 
 @app.get("/api/packets/{game_id}/crops/{frame_idx}")
-async def get_crop(game_id: str, frame_idx: int):
+async def get_crop(game_id: str, frame_idx: int, request: Request):
     """Serve a crop image for a specific frame."""
-    manifest = _load_manifest(game_id)
-
-    frame_entry = None
-    for f in manifest.get("frames", []):
-        if f["frame_idx"] == frame_idx:
-            frame_entry = f
-            break
-
+    frame_entry = _packet_entry(game_id).frame(frame_idx)
     if frame_entry is None:
         raise HTTPException(status_code=404, detail=f"Frame {frame_idx} not found")
 
     crop_path = _get_packets_dir() / game_id / frame_entry["crop_file"]
-    if not crop_path.exists():
+    sig = stat_signature(crop_path)
+    if sig is None:
         raise HTTPException(status_code=404, detail="Crop image file not found")
+    etag = make_etag(str(crop_path), sig)
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
 
-    return FileResponse(crop_path, media_type="image/jpeg")
+    return FileResponse(crop_path, media_type="image/jpeg", headers=_etag_headers(etag))
 
 
 @app.post("/api/packets/{game_id}/results")
@@ -244,9 +283,12 @@ async def skip_packet(game_id: str):
 
 
 @app.get("/api/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Get aggregate annotation statistics."""
-    packets_dir = _get_packets_dir()
+    entries = _packet_index().entries()
+    etag = make_etag("stats", *(e.signature for e in entries))
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
 
     total_packets = 0
     total_frames = 0
@@ -254,20 +296,11 @@ async def get_stats():
     action_counts: dict[str, int] = {}
     total_duration_ms = 0
 
-    for entry in sorted(packets_dir.iterdir()):
-        if not entry.is_dir():
-            continue
-        manifest_path = entry / "manifest.json"
-        if not manifest_path.exists():
-            continue
-
-        with open(manifest_path) as f:
-            manifest = json.load(f)
-
+    for entry in entries:
         total_packets += 1
-        total_frames += len(manifest.get("frames", []))
+        total_frames += len(entry.manifest.get("frames", []))
 
-        results = _load_results(entry.name)
+        results = entry.results
         total_reviewed += len(results)
 
         for r in results:
@@ -280,61 +313,61 @@ async def get_stats():
     total_with_opinion = total_reviewed - action_counts.get("skip", 0)
     agreement_rate = confirmed / total_with_opinion if total_with_opinion > 0 else 0.0
 
-    return {
-        "total_packets": total_packets,
-        "total_frames": total_frames,
-        "total_reviewed": total_reviewed,
-        "review_rate": f"{total_reviewed}/{total_frames}"
-        if total_frames > 0
-        else "0/0",
-        "agreement_rate": round(agreement_rate, 3),
-        "action_breakdown": action_counts,
-        "total_review_time_minutes": round(total_duration_ms / 60000, 1),
-        "avg_ms_per_frame": (
-            round(total_duration_ms / total_reviewed) if total_reviewed > 0 else 0
-        ),
-    }
+    return JSONResponse(
+        {
+            "total_packets": total_packets,
+            "total_frames": total_frames,
+            "total_reviewed": total_reviewed,
+            "review_rate": f"{total_reviewed}/{total_frames}"
+            if total_frames > 0
+            else "0/0",
+            "agreement_rate": round(agreement_rate, 3),
+            "action_breakdown": action_counts,
+            "total_review_time_minutes": round(total_duration_ms / 60000, 1),
+            "avg_ms_per_frame": (
+                round(total_duration_ms / total_reviewed) if total_reviewed > 0 else 0
+            ),
+        },
+        headers=_etag_headers(etag),
+    )
 
 
 @app.get("/api/exclusions")
-async def get_exclusions():
+async def get_exclusions(request: Request):
     """Return learned exclusions with sample images for review.
 
     Groups exclusions into:
     - warmup_ranges: per-game time cutoffs with sample crop images
     - static_balls: per-position ball clusters with sample crop images
     """
-    packets_dir = _get_packets_dir()
+    index = _packet_index()
+    packets = [
+        entry
+        for pid in index.packet_ids()
+        if pid.startswith("tracking_loss_")
+        and (entry := index.get(pid)) is not None
+        and entry.results_sig is not None
+    ]
+    etag = make_etag("exclusions", *(e.signature for e in packets))
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+
     warmup_frames: dict[str, list] = {}  # game_id -> list of frame info
     gameover_frames: dict[str, list] = {}  # game_id -> list of frame info
     static_ball_clusters: dict[str, list] = {}  # "game_id/r{row}c{col}" -> list
 
-    for packet_dir in sorted(packets_dir.iterdir()):
-        if not packet_dir.is_dir() or not packet_dir.name.startswith("tracking_loss_"):
-            continue
-
-        manifest_path = packet_dir / "manifest.json"
-        results_path = packet_dir / "annotation_results.json"
-        if not manifest_path.exists() or not results_path.exists():
-            continue
-
-        with open(manifest_path) as f:
-            manifest = json.load(f)
-        with open(results_path) as f:
-            results = json.load(f)
-
-        frame_lookup = {fr["frame_idx"]: fr for fr in manifest["frames"]}
-        results_by_frame = {r["frame_idx"]: r for r in results}
+    for packet in packets:
+        results_by_frame = {r["frame_idx"]: r for r in packet.results}
 
         for frame_idx, result in results_by_frame.items():
-            frame = frame_lookup.get(frame_idx)
+            frame = packet.frame(frame_idx)
             if not frame:
                 continue
 
             ctx = frame.get("context", {})
             game_id = ctx.get("game_id", "")
             action = result.get("action", "")
-            packet_id = packet_dir.name
+            packet_id = packet.packet_id
 
             det = frame.get("model_detection") or {}
             det_x = int(det.get("x", -1))
@@ -420,36 +453,23 @@ async def get_exclusions():
         + sum(s["frame_count"] for s in static_balls)
     )
 
-    return {
-        "warmup_ranges": warmup_ranges,
-        "gameover_ranges": gameover_ranges,
-        "static_balls": static_balls,
-        "total_annotated_exclusions": total_excluded,
-    }
+    return JSONResponse(
+        {
+            "warmup_ranges": warmup_ranges,
+            "gameover_ranges": gameover_ranges,
+            "static_balls": static_balls,
+            "total_annotated_exclusions": total_excluded,
+        },
+        headers=_etag_headers(etag),
+    )
 
 
-@app.get("/api/packets/{game_id}/thumb/{frame_idx}")
-async def get_thumb(game_id: str, frame_idx: int, bx: int = -1, by: int = -1):
-    """Serve an 80x80 thumbnail with an arrow pointing at the ball position."""
+def _render_thumb(crop_path: Path, bx: int, by: int) -> bytes:
+    """An 80x80 JPEG of the crop with an arrow pointing at (bx, by) in crop px."""
     import io
     import math
 
     from PIL import Image, ImageDraw
-    from starlette.responses import Response
-
-    manifest = _load_manifest(game_id)
-
-    frame_entry = None
-    for f in manifest.get("frames", []):
-        if f["frame_idx"] == frame_idx:
-            frame_entry = f
-            break
-    if frame_entry is None:
-        raise HTTPException(status_code=404, detail=f"Frame {frame_idx} not found")
-
-    crop_path = _get_packets_dir() / game_id / frame_entry["crop_file"]
-    if not crop_path.exists():
-        raise HTTPException(status_code=404, detail="Crop image not found")
 
     S = 80
     img = Image.open(crop_path).resize((S, S), Image.LANCZOS)
@@ -498,8 +518,33 @@ async def get_thumb(game_id: str, frame_idx: int, bx: int = -1, by: int = -1):
 
     buf = io.BytesIO()
     img.save(buf, format="JPEG", quality=85)
-    buf.seek(0)
-    return Response(content=buf.getvalue(), media_type="image/jpeg")
+    return buf.getvalue()
+
+
+@app.get("/api/packets/{game_id}/thumb/{frame_idx}")
+async def get_thumb(
+    game_id: str, frame_idx: int, request: Request, bx: int = -1, by: int = -1
+):
+    """Serve an 80x80 thumbnail with an arrow pointing at the ball position.
+
+    Rendered once per (crop file, mtime, size, arrow) into the thumbnail store
+    on the render pool; repeat requests read the stored JPEG or get a 304.
+    """
+    frame_entry = _packet_entry(game_id).frame(frame_idx)
+    if frame_entry is None:
+        raise HTTPException(status_code=404, detail=f"Frame {frame_idx} not found")
+
+    crop_path = _get_packets_dir() / game_id / frame_entry["crop_file"]
+    cache = _thumb_cache()
+    key = cache.key(crop_path, f"arrow80:{bx},{by}")
+    if key is None:
+        raise HTTPException(status_code=404, detail="Crop image not found")
+    etag = f'"{key[:32]}"'
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+
+    jpeg = await cache.get(key, lambda: _render_thumb(crop_path, bx, by))
+    return Response(content=jpeg, media_type="image/jpeg", headers=_etag_headers(etag))
 
 
 @app.get("/api/generate-progress")
@@ -853,20 +898,24 @@ async def root_redirect():
 
 
 @app.get("/api/gap-reviews")
-def get_gap_reviews():
+def get_gap_reviews(request: Request):
     """List all pending gap review packets."""
     packets = []
     if not REVIEW_PACKETS_DIR.exists():
         return packets
 
-    for packet_dir in sorted(REVIEW_PACKETS_DIR.iterdir()):
-        if not packet_dir.is_dir() or packet_dir.name.startswith("_"):
-            continue
-        manifest_path = packet_dir / "manifest.json"
-        if not manifest_path.exists():
-            continue
-        with open(manifest_path) as f:
-            m = json.load(f)
+    index = _packet_index()
+    entries = [
+        entry
+        for pid in index.packet_ids()
+        if not pid.startswith("_") and (entry := index.get(pid)) is not None
+    ]
+    etag = make_etag("gap-reviews", *(e.signature for e in entries))
+    if (not_modified := _not_modified(request, etag)) is not None:
+        return not_modified
+
+    for entry in entries:
+        m = entry.manifest
         # Include packets with gap items OR confirm_game_ball type
         gap_items = [
             i
@@ -877,18 +926,14 @@ def get_gap_reviews():
         if not gap_items and review_type != "confirm_game_ball":
             continue
 
-        results_path = packet_dir / "annotation_results.json"
-        reviewed = 0
-        if results_path.exists():
-            with open(results_path) as f:
-                reviewed = len(json.load(f))
+        reviewed = len(entry.results)
 
         review_type = m.get("review_type", "gap_review")
         all_items = m.get("items", [])
         total = len(all_items)
         packets.append(
             {
-                "packet_id": packet_dir.name,
+                "packet_id": entry.packet_id,
                 "game_id": m.get("game_id", ""),
                 "review_type": review_type,
                 "total_gaps": total,
@@ -901,45 +946,50 @@ def get_gap_reviews():
         )
 
     packets.sort(key=lambda p: p["remaining"], reverse=True)
-    return packets
+    return JSONResponse(packets, headers=_etag_headers(etag))
 
 
 @app.get("/api/gap-reviews/{packet_id}")
-def get_gap_review_detail(packet_id: str):
+def get_gap_review_detail(packet_id: str, request: Request):
     """Get full gap review packet with items and review status."""
-    packet_dir = REVIEW_PACKETS_DIR / packet_id
-    manifest_path = packet_dir / "manifest.json"
-    if not manifest_path.exists():
+    entry = _packet_index().get(packet_id)
+    if entry is None:
         raise HTTPException(404, "Packet not found")
-
-    with open(manifest_path) as f:
-        m = json.load(f)
-
-    # Load existing results
-    results_path = packet_dir / "annotation_results.json"
-    results = []
-    if results_path.exists():
-        with open(results_path) as f:
-            results = json.load(f)
-    reviewed_stems = {r.get("tile_stem") for r in results}
-
-    # All reviewable items (gap reviews + track confirmations)
-    all_items = m.get("items", [])
-    for item in all_items:
+    # The packet dir's signature is part of the ETag, so a tile JPEG cached
+    # into it (has_image) changes the ETag too.
+    if (not_modified := _not_modified(request, entry.etag)) is not None:
+        return not_modified
+    m = entry.manifest
+    reviewed_stems = {r.get("tile_stem") for r in entry.results}
+    with os.scandir(entry.path) as it:
+        jpgs = {e.name for e in it if e.name.endswith(".jpg")}
+
+    # All reviewable items (gap reviews + track confirmations). Copies: the
+    # manifest is shared through the packet index.
+    all_items = []
+    for item in m.get("items", []):
         stem = item.get("tile_stem", "")
-        item["has_image"] = (packet_dir / f"{stem}.jpg").exists()
-        item["reviewed"] = stem in reviewed_stems
+        all_items.append(
+            {
+                **item,
+                "has_image": f"{stem}.jpg" in jpgs,
+                "reviewed": stem in reviewed_stems,
+            }
+        )
 
     unreviewed = [i for i in all_items if not i.get("reviewed")]
 
-    return {
-        **m,
-        "packet_id": packet_id,
-        "items": all_items,
-        "reviewed_count": len(reviewed_stems),
-        "remaining_count": len(unreviewed),
-        "next_item": unreviewed[0] if unreviewed else None,
-    }
+    return JSONResponse(
+        {
+            **m,
+            "packet_id": packet_id,
+            "items": all_items,
+            "reviewed_count": len(reviewed_stems),
+            "remaining_count": len(unreviewed),
+            "next_item": unreviewed[0] if unreviewed else None,
+        },
+        headers=_etag_headers(entry.etag),
+    )
 
 
 @app.get("/api/gap-reviews/{packet_id}/tile/{tile_stem:path}")
@@ -1039,13 +1089,13 @@ def submit_gap_result(packet_id: str, result: dict):
 
     with open(results_path, "w") as f:
         json.dump(results, f, indent=2)
+    _packet_index().invalidate(packet_id)
 
     # Return updated status
-    manifest_path = packet_dir / "manifest.json"
+    entry = _packet_index().get(packet_id)
     total_gaps = 0
-    if manifest_path.exists():
-        with open(manifest_path) as f:
-            m = json.load(f)
+    if entry is not None:
+        m = entry.manifest
         total_gaps = sum(
             1
             for i in m.get("items", [])
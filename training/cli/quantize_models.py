@@ -0,0 +1,505 @@
+"""Static INT8 quantization of the CPU inference models, plus the accuracy gate.
+
+Quantizes the FP32 ball heatmap detector (``ball_detector.infer_band``) or the
+YOLO person model (``phase_detector.player_curve``) with ONNX Runtime's static
+quantizer. It uses the QDQ format, per-channel INT8 weights and UINT8
+activations. Calibration tiles come from the manifest.db packs
+(:func:`training.data_prep.manifest.read_tiles_batch`). The tool then scores
+both models on tiles from HELD-OUT games, times them on the CPU provider,
+prints one table (accuracy delta + speedup), and writes the files the runtime
+reads (:mod:`video_grouper.inference.quantized`):
+
+    <model>.int8.onnx        the quantized model
+    <model>.int8.gate.json   held-out recall/precision of both + file hashes
+
+A step with ``quantized = true`` loads the INT8 file only if that gate is
+within its ``quantized_tolerance`` of FP32.
+
+How each model is scored:
+
+- ``ball``: input is the tile's 3-frame gray stack. Each frame is the same
+  tile position in the previous cataloged frames, oldest first, padded like
+  the runtime pads. Heatmap peaks at ``--thr`` are matched to the manifest's
+  ball labels (``--class-id``); a peak within ``--match-px`` of a label
+  centre is a hit. gray3geo (4-plane) models need per-game band geometry a
+  tile doesn't carry, so they are refused.
+- ``person``: the manifest holds no person labels, so the FP32 model's own
+  detections are the reference (IoU >= 0.5). FP32 scores 1.0/1.0 by
+  construction, and the INT8 numbers are its agreement with FP32.
+
+Needs the training extra (``onnx`` — ORT's quantizer imports it).
+
+    python -m training.cli.quantize_models ball \
+      --model G:/ballresearch/selector/models/ball_detector_hn2.onnx \
+      --db D:/training_data/manifest.db \
+      --heldout-games flash__2024.05.01_vs_RNYFC_away
+    python -m training.cli.quantize_models person \
+      --model video_grouper/models/person.onnx --db D:/training_data/manifest.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+import numpy as np
+
+from training.data_prep import manifest as M
+
+TileKey = tuple[str, int, int, int]  # (segment, frame_idx, row, col)
+
+
+def tile_stem(key: TileKey) -> str:
+    seg, fidx, r, c = key
+    return f"{seg}_frame_{fidx:06d}_r{r}_c{c}"
+
+
+def split_games(
+    games: list[str], heldout: list[str] | None, heldout_frac: float = 0.25
+) -> tuple[list[str], list[str]]:
+    """``(calibration games, held-out games)`` — disjoint by construction.
+
+    Explicit ``heldout`` wins; otherwise the last ``heldout_frac`` of the
+    sorted game ids (at least one) is held out.
+    """
+    games = sorted(set(games))
+    if heldout:
+        held = sorted(set(heldout))
+        missing = set(held) - set(games)
+        if missing:
+            raise SystemExit(f"held-out games not in the manifest: {sorted(missing)}")
+    else:
+        n = max(1, math.ceil(len(games) * heldout_frac))
+        held = games[-n:]
+    calib = [g for g in games if g not in held]
+    if not calib or not held:
+        raise SystemExit(
+            "need at least one calibration and one held-out game "
+            f"(have {len(games)} cataloged game(s))"
+        )
+    return calib, held
+
+
+def sample_tiles(
+    conn: sqlite3.Connection,
+    games: list[str],
+    n: int,
+    rng: np.random.Generator,
+    *,
+    class_id: int | None = None,
+    positive_frac: float = 0.5,
+) -> list[tuple[str, TileKey]]:
+    """``n`` ``(game_id, key)`` tiles, spread over ``games``.
+
+    With ``class_id`` set, ``positive_frac`` of them are tiles carrying a
+    label of that class (so recall is measurable) and the rest are drawn from
+    all cataloged tiles (so precision sees empty grass too).
+    """
+    pool: list[tuple[str, TileKey]] = []
+    for g in games:
+        pool += [
+            (g, (seg, int(f), int(r), int(c)))
+            for seg, f, r, c in conn.execute(
+                "SELECT segment, frame_idx, row, col FROM tiles WHERE game_id=?",
+                (g,),
+            )
+        ]
+    positives: list[tuple[str, TileKey]] = []
+    if class_id is not None:
+        by_stem = {(g, tile_stem(k)): (g, k) for g, k in pool}
+        for g in games:
+            for (stem,) in conn.execute(
+                "SELECT DISTINCT tile_stem FROM labels WHERE game_id=? AND class_id=?",
+                (g, class_id),
+            ):
+                if (g, stem) in by_stem:
+                    positives.append(by_stem[(g, stem)])
+    n_pos = min(len(positives), round(n * positive_frac)) if positives else 0
+    picked = [positives[i] for i in rng.permutation(len(positives))[:n_pos]]
+    chosen = set(picked)
+    rest = [t for t in pool if t not in chosen]
+    picked += [rest[i] for i in rng.permutation(len(rest))[: n - n_pos]]
+    return picked
+
+
+def _decode(data: bytes) -> np.ndarray | None:
+    import cv2
+
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+def _history_keys(conn: sqlite3.Connection, game_id: str, key: TileKey) -> list:
+    """The same tile position in the two previous cataloged frames, oldest first."""
+    seg, fidx, r, c = key
+    prev = conn.execute(
+        "SELECT frame_idx FROM tiles WHERE game_id=? AND segment=? AND row=? "
+        "AND col=? AND frame_idx<? ORDER BY frame_idx DESC LIMIT 2",
+        (game_id, seg, r, c, fidx),
+    ).fetchall()
+    return [(seg, int(f), r, c) for (f,) in reversed(prev)] + [key]
+
+
+def ball_stack(conn: sqlite3.Connection, game_id: str, key: TileKey) -> np.ndarray:
+    """``(3, H, W)`` float32 gray stack ending at ``key`` (runtime padding)."""
+    import cv2
+
+    keys = _history_keys(conn, game_id, key)
+    imgs = {k: _decode(b) for k, b in M.read_tiles_batch(conn, game_id, keys)}
+    grays = [
+        cv2.cvtColor(imgs[k], cv2.COLOR_BGR2GRAY)
+        for k in keys
+        if imgs.get(k) is not None
+    ]
+    if not grays:
+        raise FileNotFoundError(f"tile {game_id}/{tile_stem(key)} unreadable")
+    seq = [grays[0]] * (3 - len(grays)) + grays
+    return np.stack(seq, 0).astype(np.float32) / 255.0
+
+
+def ball_truth(
+    conn: sqlite3.Connection, game_id: str, key: TileKey, class_id: int, w: int, h: int
+) -> np.ndarray:
+    """``(n, 2)`` labelled ball centres of ``class_id`` in tile px."""
+    rows = M.get_labels_for_tile(conn, game_id, tile_stem(key))
+    pts = [(cx * w, cy * h) for cid, cx, cy, _bw, _bh in rows if cid == class_id]
+    return np.asarray(pts, float).reshape(-1, 2)
+
+
+def match_points(pred: np.ndarray, truth: np.ndarray, radius: float) -> int:
+    """True positives: greedy one-to-one nearest matching within ``radius``."""
+    if not len(pred) or not len(truth):
+        return 0
+    d = np.linalg.norm(pred[:, None, :2] - truth[None, :, :2], axis=2)
+    tp = 0
+    for i, j in sorted(np.argwhere(d <= radius), key=lambda ij: d[ij[0], ij[1]]):
+        if np.isfinite(d[i, j]):
+            tp += 1
+            d[i, :] = np.inf
+            d[:, j] = np.inf
+    return tp
+
+
+def _iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of ``(n, 4)`` and ``(m, 4)`` x1y1x2y2 boxes."""
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    inter = np.clip(rb - lt, 0, None).prod(axis=2)
+    area = lambda x: (x[:, 2] - x[:, 0]) * (x[:, 3] - x[:, 1])  # noqa: E731
+    return inter / np.maximum(area(a)[:, None] + area(b)[None, :] - inter, 1e-9)
+
+
+def match_boxes(pred: np.ndarray, ref: np.ndarray, min_iou: float = 0.5) -> int:
+    """True positives: greedy one-to-one highest-IoU matching at ``min_iou``."""
+    if not len(pred) or not len(ref):
+        return 0
+    iou = _iou(np.asarray(pred, float), np.asarray(ref, float))
+    tp = 0
+    for i, j in sorted(np.argwhere(iou >= min_iou), key=lambda ij: -iou[ij[0], ij[1]]):
+        if iou[i, j] >= min_iou:
+            tp += 1
+            iou[i, :] = -1.0
+            iou[:, j] = -1.0
+    return tp
+
+
+@dataclass
+class Scores:
+    tp: int = 0
+    n_pred: int = 0
+    n_true: int = 0
+
+    def add(self, tp: int, n_pred: int, n_true: int) -> None:
+        self.tp += tp
+        self.n_pred += n_pred
+        self.n_true += n_true
+
+    def as_dict(self) -> dict:
+        return {
+            "recall": round(self.tp / self.n_true, 4) if self.n_true else 1.0,
+            "precision": round(self.tp / self.n_pred, 4) if self.n_pred else 1.0,
+            "tp": self.tp,
+            "predictions": self.n_pred,
+            "references": self.n_true,
+        }
+
+
+def _timed_run(sess, feeds: dict, ms: list[float]):
+    t0 = time.perf_counter()
+    out = sess.run(None, feeds)
+    ms.append((time.perf_counter() - t0) * 1e3)
+    return out
+
+
+def score_ball(sess, samples: list, thr: float, match_px: float) -> tuple[dict, list]:
+    """``samples``: ``(stack, truth)`` pairs -> (scores dict, per-tile ms)."""
+    from video_grouper.inference.ball_detector import _pad8, extract_peaks
+
+    name = sess.get_inputs()[0].name
+    scores, ms = Scores(), []
+    for stack, truth in samples:
+        padded, th, tw = _pad8(stack)
+        hm = _timed_run(sess, {name: padded[None]}, ms)[0][0, 0, :th, :tw]
+        peaks = np.asarray(extract_peaks(hm, threshold=thr), float).reshape(-1, 3)
+        scores.add(match_points(peaks[:, :2], truth, match_px), len(peaks), len(truth))
+    return scores.as_dict(), ms
+
+
+def person_boxes(sess, blobs: list, thr: float) -> tuple[list[np.ndarray], list]:
+    """Per-tile ``(n, 4)`` person boxes (canvas px) + per-tile ms."""
+    name = sess.get_inputs()[0].name
+    boxes, ms = [], []
+    for blob in blobs:
+        out = _timed_run(sess, {name: blob}, ms)[0][0]
+        keep = (out[:, 4] >= thr) & (np.round(out[:, 5]) == 0)
+        boxes.append(np.asarray(out[keep, :4], float))
+    return boxes, ms
+
+
+def score_boxes(pred: list[np.ndarray], ref: list[np.ndarray]) -> dict:
+    scores = Scores()
+    for p, r in zip(pred, ref, strict=True):
+        scores.add(match_boxes(p, r), len(p), len(r))
+    return scores.as_dict()
+
+
+def quantize(
+    fp32: Path,
+    out: Path,
+    input_name: str,
+    calib_blobs: list[np.ndarray],
+    *,
+    per_channel: bool = True,
+    method: str = "minmax",
+) -> None:
+    """Write the static-quantized QDQ model for ``fp32`` to ``out``."""
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._it = iter([{input_name: b} for b in calib_blobs])
+
+        def get_next(self):
+            return next(self._it, None)
+
+    methods = {
+        "minmax": CalibrationMethod.MinMax,
+        "entropy": CalibrationMethod.Entropy,
+        "percentile": CalibrationMethod.Percentile,
+    }
+    pre = out.with_name(out.stem + ".pre.onnx")
+    try:
+        # Shape inference + constant folding first: ORT's recommended input.
+        quant_pre_process(str(fp32), str(pre))
+        src = pre
+    except Exception as e:  # noqa: BLE001 — pre-processing is an optimisation
+        print(f"pre-processing skipped ({type(e).__name__}: {e})")
+        src = fp32
+    try:
+        quantize_static(
+            str(src),
+            str(out),
+            _Reader(),
+            quant_format=QuantFormat.QDQ,
+            per_channel=per_channel,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            calibrate_method=methods[method],
+        )
+    finally:
+        pre.unlink(missing_ok=True)
+
+
+def format_table(report: dict) -> str:
+    """One table: FP32 / INT8 rows + the delta row (accuracy delta, speedup)."""
+    m = report["metrics"]
+    lines = [f"{'':<7}{'recall':>9}{'precision':>11}{'ms/tile':>10}"]
+    for name in ("fp32", "int8"):
+        r = m[name]
+        lines.append(
+            f"{name:<7}{r['recall']:>9.4f}{r['precision']:>11.4f}{r['ms_per_tile']:>10.2f}"
+        )
+    d_rec = m["int8"]["recall"] - m["fp32"]["recall"]
+    d_prec = m["int8"]["precision"] - m["fp32"]["precision"]
+    speed = f"{report['speedup']:.2f}x"
+    lines.append(f"{'delta':<7}{d_rec:>+9.4f}{d_prec:>+11.4f}{speed:>10}")
+    return "\n".join(lines)
+
+
+def _cpu_session(path: Path):
+    import onnxruntime as ort
+
+    return ort.InferenceSession(str(path), providers=["CPUExecutionProvider"])
+
+
+def _ball_blobs(conn, picks: list) -> list[np.ndarray]:
+    from video_grouper.inference.ball_detector import _pad8
+
+    return [_pad8(ball_stack(conn, g, k))[0][None] for g, k in picks]
+
+
+def _person_blobs(conn, picks: list) -> list[np.ndarray]:
+    from video_grouper.inference.phase_detector import person_blob
+
+    blobs = []
+    for g, k in picks:
+        ((_key, data),) = M.read_tiles_batch(conn, g, [k])
+        blobs.append(person_blob(_decode(data))[0])
+    return blobs
+
+
+def _latency(ms: list[float]) -> float:
+    # Drop the first run (arena / kernel set-up) when there is more than one.
+    return statistics.median(ms[1:] if len(ms) > 1 else ms)
+
+
+def main(argv: list[str] | None = None) -> None:
+    from video_grouper.inference import quantized as Q
+
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("kind", choices=("ball", "person"))
+    ap.add_argument("--model", type=Path, required=True, help="FP32 .onnx")
+    ap.add_argument("--db", type=Path, default=M.DEFAULT_DB_PATH)
+    ap.add_argument("--games", nargs="+", default=None, help="default: all games")
+    ap.add_argument("--heldout-games", nargs="+", default=None)
+    ap.add_argument("--heldout-frac", type=float, default=0.25)
+    ap.add_argument("--calib-tiles", type=int, default=200)
+    ap.add_argument("--heldout-tiles", type=int, default=400)
+    ap.add_argument(
+        "--calibrate", choices=("minmax", "entropy", "percentile"), default="minmax"
+    )
+    ap.add_argument("--per-tensor", action="store_true", help="per-tensor weights")
+    ap.add_argument("--class-id", type=int, default=0, help="ball label class")
+    ap.add_argument(
+        "--thr",
+        type=float,
+        default=None,
+        help="score threshold (default: ball 0.5, person 0.30 like player_curve)",
+    )
+    ap.add_argument("--match-px", type=float, default=4.0, help="ball hit radius")
+    ap.add_argument(
+        "--tolerance",
+        type=float,
+        default=Q.DEFAULT_TOLERANCE,
+        help="report PASS/FAIL at this tolerance (the runtime applies its own)",
+    )
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    fp32 = args.model
+    out, gate_file = Q.int8_path(fp32), Q.gate_path(fp32)
+    thr = args.thr if args.thr is not None else (0.5 if args.kind == "ball" else 0.30)
+    rng = np.random.default_rng(args.seed)
+    conn = M.open_db(args.db)
+    try:
+        games = args.games or [
+            g["game_id"] for g in M.list_games(conn) if g.get("tiles_cataloged")
+        ]
+        calib_games, held_games = split_games(
+            games, args.heldout_games, args.heldout_frac
+        )
+        print(f"calibration games: {len(calib_games)}  held-out: {held_games}")
+
+        ref_sess = _cpu_session(fp32)
+        input_name = ref_sess.get_inputs()[0].name
+        if args.kind == "ball":
+            ch = ref_sess.get_inputs()[0].shape[1]
+            if ch == 4:
+                raise SystemExit(
+                    "gray3geo (4-plane) detectors need per-game band geometry; "
+                    "tiles can't supply it"
+                )
+            make_blobs = _ball_blobs
+        else:
+            make_blobs = _person_blobs
+
+        calib_picks = sample_tiles(conn, calib_games, args.calib_tiles, rng)
+        calib = make_blobs(conn, calib_picks)
+        print(f"calibrating on {len(calib)} tiles ({args.calibrate})")
+        quantize(
+            fp32,
+            out,
+            input_name,
+            calib,
+            per_channel=not args.per_tensor,
+            method=args.calibrate,
+        )
+        q_sess = _cpu_session(out)
+
+        held_picks = sample_tiles(
+            conn,
+            held_games,
+            args.heldout_tiles,
+            rng,
+            class_id=args.class_id if args.kind == "ball" else None,
+        )
+        if args.kind == "ball":
+            samples = []
+            for g, k in held_picks:
+                stack = ball_stack(conn, g, k)
+                _, h, w = stack.shape
+                samples.append((stack, ball_truth(conn, g, k, args.class_id, w, h)))
+            fp_scores, fp_ms = score_ball(ref_sess, samples, thr, args.match_px)
+            q_scores, q_ms = score_ball(q_sess, samples, thr, args.match_px)
+            reference = f"manifest labels (class {args.class_id})"
+        else:
+            blobs = _person_blobs(conn, held_picks)
+            fp_boxes, fp_ms = person_boxes(ref_sess, blobs, thr)
+            q_boxes, q_ms = person_boxes(q_sess, blobs, thr)
+            fp_scores = score_boxes(fp_boxes, fp_boxes)
+            q_scores = score_boxes(q_boxes, fp_boxes)
+            reference = "FP32 detections (IoU >= 0.5)"
+    finally:
+        conn.close()
+
+    fp_scores["ms_per_tile"] = round(_latency(fp_ms), 3)
+    q_scores["ms_per_tile"] = round(_latency(q_ms), 3)
+    report = {
+        "version": Q.GATE_VERSION,
+        "kind": args.kind,
+        "created_at": datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "fp32": {"file": fp32.name, "sha256": Q.file_sha256(fp32)},
+        "int8": {"file": out.name, "sha256": Q.file_sha256(out)},
+        "quantization": {
+            "format": "QDQ",
+            "weights": "int8 " + ("per-tensor" if args.per_tensor else "per-channel"),
+            "activations": "uint8",
+            "calibration": args.calibrate,
+            "calibration_games": calib_games,
+            "calibration_tiles": len(calib),
+        },
+        "held_out": {
+            "games": held_games,
+            "tiles": len(held_picks),
+            "reference": reference,
+            "threshold": thr,
+        },
+        "metrics": {"fp32": fp_scores, "int8": q_scores},
+        "speedup": round(
+            fp_scores["ms_per_tile"] / max(q_scores["ms_per_tile"], 1e-9), 2
+        ),
+    }
+    gate_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    print(format_table(report))
+    failures = Q.gate_failures(report, args.tolerance)
+    verdict = "PASS" if not failures else "FAIL: " + "; ".join(failures)
+    print(f"gate @ tolerance {args.tolerance:.3f}: {verdict}")
+    print(f"wrote {out}\n      {gate_file}")
+
+
+if __name__ == "__main__":
+    main()
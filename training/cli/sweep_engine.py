@@ -0,0 +1,650 @@
+"""Parallel tracker-config sweep engine over a cached candidate dump.
+
+:mod:`training.cli.sweep_tracker` replays ``rerank`` one config at a time in one
+process — fine for a dozen hand-picked variants, too slow for the hundreds an
+overnight search wants. This engine:
+
+- **packs the dump once into shared memory** as flat NumPy arrays (candidates
+  ``(N, 4)`` = x, y, score, size with NaN for unknown size; per-frame offsets;
+  ``ef``/gaps; GT frame index + position). Workers attach by name and rebuild
+  their ``Candidate`` lists and field geometry ONCE per process — no pickled
+  candidate objects cross the pool per task, only a small params dict.
+- **fans configs out over a process pool** and **streams one row per finished
+  config** into a results table (SQLite or CSV, by the ``--out`` suffix) so a
+  killed overnight run keeps everything it finished; re-running the same
+  study skips rows already present.
+- supports **grid**, **random** and **successive-halving** search. Halving
+  evaluates every sampled config on a short PREFIX of the dump (``rerank`` is a
+  DP over the frame sequence, so a prefix is a faithful smaller problem), keeps
+  the top ``1/eta`` by the objective and re-runs the survivors on ``eta``x more
+  frames, up to the full dump.
+
+Params are ``RerankConfig`` fields plus two replay knobs: ``kalman`` (bool,
+default on — the CV smoother ``sweep_tracker`` applies) and ``prior`` (``none`` /
+``size`` / ``support`` / ``support_dome``, the soft priors from ``sweep_tracker``).
+Specs: ``name=a,b,c`` (choices; grid axes) or ``name=lo:hi[:log]`` (uniform /
+log-uniform range; random and halving only).
+
+    python -m training.cli.sweep_engine --dump G:/ballresearch/distill/cands_spencerport.pkl \
+      --mode halving --samples 243 --eta 3 --workers 12 --out sweep_spc.db \
+      --param alpha=0.1:3:log --param phys_sigma_px=0:10 --param ball_vmax_mpf=1.5:4 \
+      --param size_cont_w=0,2,4,8 --param prior=none,support_dome
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import logging
+import math
+import os
+import pickle
+import random
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, fields, replace
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from training.cli.sweep_tracker import _hits, _prior_size, _prior_support
+
+logger = logging.getLogger(__name__)
+
+REPLAY_PARAMS = {"kalman": True, "prior": "none"}
+PRIORS = ("none", "size", "support", "support_dome")
+METRICS = ("r15_all", "r15_near", "r15_far", "r10_all", "cov")
+RESULT_COLUMNS = (
+    "study",
+    "config_key",
+    "rung",
+    "n_frames",
+    "params",
+    "r5_all",
+    "r10_all",
+    "r15_all",
+    "r15_near",
+    "r15_far",
+    "med_m",
+    "n_gt",
+    "cov",
+    "n_selected",
+    "seconds",
+)
+
+
+# --- Shared-memory dump ---
+
+
+@dataclass
+class PackedDump:
+    """The dump as flat arrays (views into shared memory when attached).
+
+    ``cands[offsets[i]:offsets[i + 1]]`` are frame ``i``'s candidates; ``gt_idx``
+    is each GT ball's nearest dump-frame index (already gated by ``stride``, so
+    unscoreable GT is dropped at pack time, exactly as ``sweep_tracker._score``
+    skips it).
+    """
+
+    cands: np.ndarray  # (N, 4) float64: x, y, score, size_px (NaN = unknown)
+    offsets: np.ndarray  # (F + 1,) int64
+    ef: np.ndarray  # (F,) int64 global frame numbers
+    gaps: np.ndarray  # (F,) int64
+    gt_idx: np.ndarray  # (G,) int64
+    gt_xy: np.ndarray  # (G, 2) float64 source px
+    polygon: np.ndarray  # (K, 2) float64
+    far_px: float
+    stride: int
+
+    _ARRAYS = ("cands", "offsets", "ef", "gaps", "gt_idx", "gt_xy", "polygon")
+
+    @classmethod
+    def from_dump(cls, d: dict) -> PackedDump:
+        ef = [int(f) for f in d["ef"]]
+        rows = [
+            (x, y, s, math.nan if sz is None else sz)
+            for f in ef
+            for (x, y, s, sz) in d["cands"][f]
+        ]
+        counts = [len(d["cands"][f]) for f in ef]
+        ef_arr = np.asarray(ef, np.int64)
+        stride = int(d["stride"])
+        gt_idx, gt_xy = [], []
+        for g in sorted(d["balls"]):
+            k = int(np.searchsorted(ef_arr, g))
+            opts = [j for j in (k - 1, k) if 0 <= j < len(ef_arr)]
+            if not opts:
+                continue
+            i = min(opts, key=lambda j: abs(int(ef_arr[j]) - g))
+            if abs(int(ef_arr[i]) - g) > stride:
+                continue
+            gt_idx.append(i)
+            gt_xy.append(d["balls"][g])
+        return cls(
+            cands=np.asarray(rows, np.float64).reshape(-1, 4),
+            offsets=np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            ef=ef_arr,
+            gaps=np.asarray(d["gaps"], np.int64),
+            gt_idx=np.asarray(gt_idx, np.int64),
+            gt_xy=np.asarray(gt_xy, np.float64).reshape(-1, 2),
+            polygon=np.asarray(d["polygon"], np.float64),
+            far_px=float(d["far_size_px"]),
+            stride=stride,
+        )
+
+    @property
+    def n_frames(self) -> int:
+        return len(self.ef)
+
+    def to_shared(self) -> tuple[shared_memory.SharedMemory, dict]:
+        """Copy the arrays into one shared block; returns (block, attach meta)."""
+        layout, off = {}, 0
+        for name in self._ARRAYS:
+            a = np.ascontiguousarray(getattr(self, name))
+            off = -(-off // 8) * 8
+            layout[name] = (off, a.dtype.str, a.shape)
+            off += a.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(off, 1))
+        for name, (o, dt, shape) in layout.items():
+            view = np.ndarray(shape, dtype=dt, buffer=shm.buf, offset=o)
+            view[...] = getattr(self, name)
+        meta = {
+            "shm": shm.name,
+            "layout": layout,
+            "far_px": self.far_px,
+            "stride": self.stride,
+        }
+        return shm, meta
+
+    @classmethod
+    def attach(cls, meta: dict) -> tuple[PackedDump, shared_memory.SharedMemory]:
+        # Pool workers share the parent's resource tracker, so attaching does not
+        # add a second owner: the block is unlinked once, by the engine.
+        shm = shared_memory.SharedMemory(name=meta["shm"])
+        arrays = {
+            name: np.ndarray(shape, dtype=dt, buffer=shm.buf, offset=o)
+            for name, (o, dt, shape) in meta["layout"].items()
+        }
+        return cls(**arrays, far_px=meta["far_px"], stride=meta["stride"]), shm
+
+
+# --- Per-process evaluation state ---
+
+
+class Evaluator:
+    """Scores params dicts against a :class:`PackedDump` (one per process).
+
+    Candidate lists, geometry, GT world positions and GT size bands are built
+    once; soft priors are built lazily once per kind.
+    """
+
+    def __init__(self, dump: PackedDump):
+        from training.world_model.geometry import build_field_geometry
+        from training.world_model.reranker import RerankConfig
+        from training.world_model.tbd import Candidate
+
+        self.dump = dump
+        self.base = RerankConfig()
+        self.geom = build_field_geometry(dump.polygon)
+        c, o = dump.cands, dump.offsets
+        self.frames = [
+            [
+                Candidate(
+                    x=float(x),
+                    y=float(y),
+                    score=float(s),
+                    size_px=None if math.isnan(sz) else float(sz),
+                )
+                for x, y, s, sz in c[o[i] : o[i + 1]]
+            ]
+            for i in range(dump.n_frames)
+        ]
+        self.gaps = [int(g) for g in dump.gaps]
+        if len(dump.gt_idx):
+            self.gt_world = self.geom.image_to_world(dump.gt_xy)
+            size = self.geom.expected_ball_diameter_px(dump.gt_xy)
+            self.gt_far = np.asarray(size, float) < dump.far_px
+        else:
+            self.gt_world = np.zeros((0, 2))
+            self.gt_far = np.zeros(0, bool)
+        self._priors: dict[str, list[np.ndarray] | None] = {"none": None}
+
+    def _prior(self, kind: str) -> list[np.ndarray] | None:
+        if kind not in self._priors:
+            if kind == "size":
+                pr = _prior_size(self.frames, self.geom, 2.0)
+            elif kind == "support":
+                pr = _prior_support(self.frames, self.geom, 2.0)
+            elif kind == "support_dome":
+                pr = _prior_support(self.frames, self.geom, 2.0, dome_px=400.0)
+            else:
+                raise ValueError(f"unknown prior {kind!r} (expected one of {PRIORS})")
+            self._priors[kind] = pr
+        return self._priors[kind]
+
+    def config(self, params: dict):
+        return replace(
+            self.base, **{k: v for k, v in params.items() if k not in REPLAY_PARAMS}
+        )
+
+    def evaluate(self, params: dict, n_frames: int | None = None) -> dict:
+        """Run rerank (+ Kalman) on the first ``n_frames`` frames and score it."""
+        from training.world_model.reranker import kalman_smooth, rerank
+
+        t0 = time.perf_counter()
+        n = (
+            self.dump.n_frames
+            if n_frames is None
+            else min(n_frames, self.dump.n_frames)
+        )
+        opts = REPLAY_PARAMS | {k: v for k, v in params.items() if k in REPLAY_PARAMS}
+        pr = self._prior(opts["prior"])
+        sel = rerank(
+            self.frames[:n],
+            self.geom,
+            frame_gaps=self.gaps[:n],
+            priors=None if pr is None else pr[:n],
+            config=self.config(params),
+        )
+        track = kalman_smooth(sel, self.geom) if opts["kalman"] else sel
+
+        keep = self.dump.gt_idx < n
+        idx, gt_w, far = self.dump.gt_idx[keep], self.gt_world[keep], self.gt_far[keep]
+        on = np.asarray([int(i) in track for i in idx], bool)
+        err = np.full(len(idx), np.inf)
+        if on.any():
+            pts = np.asarray([track[int(i)] for i in idx[on]], float)
+            err[on] = np.linalg.norm(self.geom.image_to_world(pts) - gt_w[on], axis=1)
+        a = _hits(err[on].tolist())
+        nr = _hits(err[on & ~far].tolist())
+        fr = _hits(err[on & far].tolist())
+        return {
+            "n_frames": n,
+            "r5_all": a["R5"],
+            "r10_all": a["R10"],
+            "r15_all": a["R15"],
+            "r15_near": nr["R15"],
+            "r15_far": fr["R15"],
+            "med_m": a["med"],
+            "n_gt": a["n"],
+            # coverage counts GT the track dropped as misses (R15 does not)
+            "cov": round(float((err <= 15.0).mean()), 3) if len(err) else None,
+            "n_selected": len(sel),
+            "seconds": round(time.perf_counter() - t0, 3),
+        }
+
+
+_worker: dict = {}
+
+
+def _init_worker(meta: dict) -> None:
+    dump, shm = PackedDump.attach(meta)
+    _worker["shm"] = shm  # keep the mapping alive for the views
+    _worker["evaluator"] = Evaluator(dump)
+
+
+def _run_one(params: dict, n_frames: int | None) -> dict:
+    return _worker["evaluator"].evaluate(params, n_frames)
+
+
+# --- Search spaces ---
+
+
+def _coerce(name: str, raw: str):
+    if name == "prior":
+        if raw not in PRIORS:
+            raise ValueError(f"prior must be one of {PRIORS}, got {raw!r}")
+        return raw
+    default = REPLAY_PARAMS.get(name, _config_defaults().get(name))
+    if isinstance(default, bool):
+        if raw.lower() not in ("0", "1", "true", "false"):
+            raise ValueError(f"{name} is a bool, got {raw!r}")
+        return raw.lower() in ("1", "true")
+    if isinstance(default, int):
+        return int(raw)
+    return float(raw)
+
+
+def _config_defaults() -> dict:
+    from training.world_model.reranker import RerankConfig
+
+    return {f.name: f.default for f in fields(RerankConfig)}
+
+
+def parse_param(spec: str) -> tuple[str, list | tuple]:
+    """``name=a,b,c`` -> (name, [choices]); ``name=lo:hi[:log]`` -> (name, range)."""
+    name, _, body = spec.partition("=")
+    name = name.strip()
+    if not body:
+        raise ValueError(f"param spec {spec!r} must be name=values")
+    if name not in REPLAY_PARAMS and name not in _config_defaults():
+        raise ValueError(f"unknown param {name!r} (not a RerankConfig field)")
+    if ":" in body:
+        lo, hi, *rest = body.split(":")
+        log = rest == ["log"]
+        if rest and not log:
+            raise ValueError(f"bad range {body!r}; use lo:hi or lo:hi:log")
+        if isinstance(_config_defaults().get(name), bool) or name in REPLAY_PARAMS:
+            raise ValueError(f"{name} takes choices, not a range")
+        return name, (float(lo), float(hi), log)
+    return name, [_coerce(name, v.strip()) for v in body.split(",")]
+
+
+def grid_configs(space: dict) -> list[dict]:
+    if any(not isinstance(v, list) for v in space.values()):
+        raise ValueError("grid search needs choice lists (name=a,b,c), not ranges")
+    names = sorted(space)
+    return [
+        dict(zip(names, combo, strict=True))
+        for combo in itertools.product(*(space[n] for n in names))
+    ]
+
+
+def random_configs(space: dict, n: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    defaults = _config_defaults()
+    out, seen = [], set()
+    for _ in range(n * 20):
+        if len(out) == n:
+            break
+        p = {}
+        for name in sorted(space):
+            spec = space[name]
+            if isinstance(spec, list):
+                p[name] = rng.choice(spec)
+            else:
+                lo, hi, log = spec
+                v = (
+                    math.exp(rng.uniform(math.log(lo), math.log(hi)))
+                    if log
+                    else rng.uniform(lo, hi)
+                )
+                p[name] = (
+                    int(round(v))
+                    if isinstance(defaults.get(name), int)
+                    else round(v, 4)
+                )
+        key = config_key(p)
+        if key not in seen:
+            seen.add(key)
+            out.append(p)
+    return out
+
+
+def halving_rungs(n_frames: int, eta: int, min_frames: int) -> list[int]:
+    """Frame budgets per rung, growing by ``eta`` up to the full dump."""
+    budgets = [n_frames]
+    while budgets[-1] // eta >= max(min_frames, 1):
+        budgets.append(budgets[-1] // eta)
+    return budgets[::-1]
+
+
+def config_key(params: dict) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+# --- Results sinks ---
+
+
+class ResultsTable:
+    """Append-only results table; SQLite for ``.db``/``.sqlite``, else CSV."""
+
+    def __init__(self, path: Path, study: str):
+        self.path = Path(path)
+        self.study = study
+        self.sqlite = self.path.suffix.lower() in (".db", ".sqlite", ".sqlite3")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.sqlite:
+            self._conn = sqlite3.connect(str(self.path))
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            cols = ", ".join(
+                f"{c} {'TEXT' if c in ('study', 'config_key', 'params') else 'REAL'}"
+                for c in RESULT_COLUMNS
+            )
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS results ({cols})")
+            self._conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_results_key "
+                "ON results(study, config_key, n_frames)"
+            )
+            self._conn.commit()
+        elif not self.path.exists() or self.path.stat().st_size == 0:
+            with open(self.path, "w", newline="", encoding="utf-8") as fh:
+                csv.writer(fh).writerow(RESULT_COLUMNS)
+
+    def done(self) -> dict[tuple[str, int], dict]:
+        """Rows already recorded for this study, keyed by (config_key, n_frames)."""
+        if self.sqlite:
+            cur = self._conn.execute(
+                "SELECT * FROM results WHERE study = ?", (self.study,)
+            )
+            names = [c[0] for c in cur.description]
+            rows = [dict(zip(names, r, strict=True)) for r in cur]
+        else:
+            with open(self.path, newline="", encoding="utf-8") as fh:
+                rows = [r for r in csv.DictReader(fh) if r["study"] == self.study]
+            for r in rows:
+                for k in METRICS:
+                    r[k] = float(r[k]) if r[k] not in ("", None) else None
+        return {(r["config_key"], int(float(r["n_frames"]))): r for r in rows}
+
+    def add(self, rung: int, params: dict, metrics: dict) -> dict:
+        row = {
+            "study": self.study,
+            "config_key": config_key(params),
+            "rung": rung,
+            "params": config_key(params),
+        } | metrics
+        values = [row.get(c) for c in RESULT_COLUMNS]
+        if self.sqlite:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO results ({', '.join(RESULT_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(RESULT_COLUMNS))})",
+                values,
+            )
+            self._conn.commit()
+        else:
+            with open(self.path, "a", newline="", encoding="utf-8") as fh:
+                csv.writer(fh).writerow(["" if v is None else v for v in values])
+        return row
+
+    def close(self) -> None:
+        if self.sqlite:
+            self._conn.close()
+
+
+# --- Engine ---
+
+
+class SweepEngine:
+    """Evaluates batches of configs over a shared dump, streaming results.
+
+    Args:
+        dump: the packed candidate dump.
+        results: where each finished config's row is written.
+        workers: process-pool size; ``0`` evaluates in-process (debugging/tests).
+        metric: objective for ranking (higher is better; ``None`` sorts last).
+    """
+
+    def __init__(
+        self,
+        dump: PackedDump,
+        results: ResultsTable,
+        *,
+        workers: int | None = None,
+        metric: str = "r15_all",
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"metric must be one of {METRICS}")
+        self.dump = dump
+        self.results = results
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.metric = metric
+        self._shm: shared_memory.SharedMemory | None = None
+        self._pool: ProcessPoolExecutor | None = None
+        self._local: Evaluator | None = None
+
+    def __enter__(self) -> SweepEngine:
+        if self.workers > 0:
+            self._shm, meta = self.dump.to_shared()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=(meta,)
+            )
+        else:
+            self._local = Evaluator(self.dump)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+
+    def run_batch(
+        self, configs: list[dict], n_frames: int | None = None, rung: int = 0
+    ) -> list[dict]:
+        """Evaluate ``configs`` at a frame budget; returns rows in input order.
+
+        Rows already in the results table are reused, not re-run. A config
+        whose evaluation raises is logged and omitted.
+        """
+        n = (
+            self.dump.n_frames
+            if n_frames is None
+            else min(n_frames, self.dump.n_frames)
+        )
+        done = self.results.done()
+        rows: dict[str, dict] = {}
+        todo = []
+        for p in configs:
+            prev = done.get((config_key(p), n))
+            if prev is not None:
+                rows[config_key(p)] = prev | {"params": p}
+            else:
+                todo.append(p)
+        if todo:
+            logger.info("rung %d: %d configs on %d frames", rung, len(todo), n)
+        if self._local is not None:
+            for p in todo:
+                rows[config_key(p)] = self._record(
+                    rung, p, lambda p=p: self._local.evaluate(p, n)
+                )
+        else:
+            futures = {self._pool.submit(_run_one, p, n): p for p in todo}
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    p = futures.pop(fut)
+                    rows[config_key(p)] = self._record(rung, p, fut.result)
+        return [rows[config_key(p)] for p in configs if rows.get(config_key(p))]
+
+    def _record(self, rung: int, params: dict, result) -> dict | None:
+        try:
+            metrics = result()
+        except Exception:
+            logger.exception("config failed: %s", config_key(params))
+            return None
+        row = self.results.add(rung, params, metrics)
+        logger.info(
+            "  %s=%s R15 near/far %s/%s (%.1fs) %s",
+            self.metric,
+            row[self.metric],
+            row["r15_near"],
+            row["r15_far"],
+            row["seconds"],
+            row["config_key"],
+        )
+        return row | {"params": params}
+
+    def rank(self, rows: list[dict]) -> list[dict]:
+        return sorted(
+            rows,
+            key=lambda r: (r.get(self.metric) is None, -(r.get(self.metric) or 0.0)),
+        )
+
+    def halving(
+        self, configs: list[dict], *, eta: int = 3, min_frames: int = 200
+    ) -> list[dict]:
+        """Successive halving: all configs on the smallest budget, top 1/eta onward."""
+        if eta < 2:
+            raise ValueError("eta must be >= 2")
+        survivors = list(configs)
+        rows: list[dict] = []
+        for rung, budget in enumerate(
+            halving_rungs(self.dump.n_frames, eta, min_frames)
+        ):
+            rows = self.rank(self.run_batch(survivors, budget, rung))
+            survivors = [r["params"] for r in rows[: max(1, len(rows) // eta)]]
+        return rows
+
+
+def load_dump(path: Path) -> PackedDump:
+    with open(path, "rb") as fh:
+        return PackedDump.from_dump(pickle.load(fh))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--dump", required=True)
+    ap.add_argument("--mode", choices=("grid", "random", "halving"), default="grid")
+    ap.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help="name=a,b,c or name=lo:hi[:log]; repeatable",
+    )
+    ap.add_argument("--samples", type=int, default=64, help="random/halving configs")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--eta", type=int, default=3)
+    ap.add_argument(
+        "--min-frames", type=int, default=200, help="smallest halving frame budget"
+    )
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--metric", choices=METRICS, default="r15_all")
+    ap.add_argument(
+        "--out", required=True, help="results table (.db = SQLite, else CSV)"
+    )
+    ap.add_argument(
+        "--study", default=None, help="study name (defaults to the dump stem)"
+    )
+    ap.add_argument("--top", type=int, default=10)
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+
+    space = dict(parse_param(s) for s in args.param)
+    if args.mode == "grid":
+        configs = grid_configs(space)
+    else:
+        configs = random_configs(space, args.samples, args.seed)
+    dump = load_dump(Path(args.dump))
+    print(
+        f"{len(dump.cands)} cands / {dump.n_frames} frames / {len(dump.gt_idx)} GT; "
+        f"{len(configs)} configs ({args.mode})"
+    )
+    results = ResultsTable(Path(args.out), args.study or Path(args.dump).stem)
+    try:
+        with SweepEngine(
+            dump, results, workers=args.workers, metric=args.metric
+        ) as engine:
+            if args.mode == "halving":
+                rows = engine.halving(configs, eta=args.eta, min_frames=args.min_frames)
+            else:
+                rows = engine.rank(engine.run_batch(configs))
+    finally:
+        results.close()
+    print(
+        f"\ntop {args.top} by {args.metric} ({rows[0]['n_frames'] if rows else 0} frames):"
+    )
+    for r in rows[: args.top]:
+        print(
+            f"  {args.metric} {r[args.metric]}  near {r['r15_near']}  "
+            f"far {r['r15_far']}  med {r['med_m']}  {r['config_key']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,9 @@ Includes a **score-argmax (no tracker)** reference: pick the highest-score candi
 continuity. If that beats the full tracker, the tracker is actively hurting.
 
     python -m training.cli.sweep_tracker --dump G:/ballresearch/distill/cands_spencerport.pkl
+
+For hundreds of variants (grid / random / successive halving over a process pool,
+results streamed to SQLite/CSV) use :mod:`training.cli.sweep_engine`.
 """
 
 from __future__ import annotations
@@ -0,0 +1,217 @@
+"""Single-file memory-mapped pack of a heatmap crop store.
+
+A crop store (``crops/*.npy`` + ``index.json``, see
+:func:`training.data_prep.heatmap_dataset.build_heatmap_crops`) holds one
+``.npy`` per sample. At hundreds of thousands of crops every training fetch is
+an ``open``/parse/close — on Windows + SMB that file-open overhead, not the
+net, sets the step time and starves the GPU. This module packs a store ONCE
+into one contiguous uint8 array that :class:`PackedCrops` reads through
+``np.memmap``: a sample fetch is a page-cache slice, zero per-sample opens.
+
+Layout under ``<store>/packed/`` (``<sha>`` = the pinned index sha)::
+
+    crops_<sha>.json        info: version, index_version, index_sha, n,
+                            channels, crop, splits
+    crops_<sha>.dat         (n, channels, crop, crop) uint8, index order
+    crops_<sha>.labels.npy  structured (n,) array: x, y, depth (float32, NaN
+                            = none/negative) and split (uint8 code into
+                            ``splits``)
+
+Provenance (``store_versions``) carries over unchanged: a pack is addressed by
+the sha of the immutable ``index_vN.json`` it was built from, so a mutated
+store (new crops appended by a miner → new sha) can never be served from a
+stale pack — the dataset simply falls back to the per-file ``.npy`` path until
+the new snapshot is packed. The ``.npy`` files stay the source of truth and
+are never touched.
+
+Pure numpy; :class:`~training.data_prep.heatmap_dataset.HeatmapCropDataset`
+adds the torch wrapper.
+
+Usage::
+
+    python -m training.data_prep.crop_pack G:/v4bench/hm_ds [--index-version N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from training.data_prep.store_versions import resolve_index
+
+PACK_VERSION = 1
+PACK_DIR = "packed"
+
+LABEL_DTYPE = np.dtype(
+    [("x", np.float32), ("y", np.float32), ("depth", np.float32), ("split", np.uint8)]
+)
+
+
+def packed_info_path(store: Path | str, index_sha: str) -> Path:
+    """Path of the pack info ``.json`` for the index snapshot ``index_sha``."""
+    return Path(store) / PACK_DIR / f"crops_{index_sha}.json"
+
+
+@dataclass(frozen=True)
+class PackInfo:
+    """Parsed pack info."""
+
+    path: Path  # the .json info path
+    index_version: int
+    index_sha: str
+    n: int
+    channels: int
+    crop: int
+    splits: list[str]
+
+    @property
+    def data_path(self) -> Path:
+        return self.path.with_suffix(".dat")
+
+    @property
+    def labels_path(self) -> Path:
+        return self.path.with_suffix(".labels.npy")
+
+
+def read_pack_info(info_path: Path | str) -> PackInfo:
+    """Parse a pack ``.json`` into a :class:`PackInfo`."""
+    info_path = Path(info_path)
+    d = json.loads(info_path.read_text())
+    if d.get("version") != PACK_VERSION:
+        raise ValueError(f"{info_path}: unsupported pack version {d.get('version')}")
+    return PackInfo(
+        path=info_path,
+        index_version=int(d["index_version"]),
+        index_sha=d["index_sha"],
+        n=int(d["n"]),
+        channels=int(d["channels"]),
+        crop=int(d["crop"]),
+        splits=list(d["splits"]),
+    )
+
+
+def _label_row(rec: dict, split_code: int) -> tuple:
+    def _f(v):
+        return np.nan if v is None else float(v)
+
+    return (_f(rec["x"]), _f(rec["y"]), _f(rec.get("depth")), split_code)
+
+
+def pack_crop_store(store: Path | str, index_version: int | None = None) -> PackInfo:
+    """Pack the store's pinned index snapshot into one memmap-able array.
+
+    ``index_version=None`` pins and packs the CURRENT ``index.json`` (the same
+    resolution :class:`HeatmapCropDataset` does). Idempotent: an existing pack
+    for the resolved sha is returned as-is. Crops are streamed one at a time,
+    so packing never holds the store in RAM.
+    """
+    store = Path(store)
+    data, version, sha = resolve_index(store, index_version)
+    info_path = packed_info_path(store, sha)
+    if info_path.exists():
+        return read_pack_info(info_path)
+
+    items = data["items"]
+    if not items:
+        raise ValueError(f"{store}: index has no items to pack")
+    splits = sorted({r["split"] for r in items})
+    codes = {s: k for k, s in enumerate(splits)}
+    labels = np.empty(len(items), dtype=LABEL_DTYPE)
+
+    info_path.parent.mkdir(parents=True, exist_ok=True)
+    data_tmp = info_path.with_suffix(".dat.tmp")
+    shape: tuple[int, ...] | None = None
+    with open(data_tmp, "wb") as fh:
+        for k, rec in enumerate(items):
+            arr = np.load(store / "crops" / rec["file"])
+            if arr.dtype != np.uint8 or arr.ndim != 3:
+                raise ValueError(
+                    f"crop {rec['file']} must be uint8 [C, H, W], got "
+                    f"{arr.dtype} {arr.shape}"
+                )
+            if shape is None:
+                shape = arr.shape
+            elif arr.shape != shape:
+                raise ValueError(
+                    f"all crops must share a shape; {rec['file']} is {arr.shape}, "
+                    f"expected {shape}"
+                )
+            fh.write(np.ascontiguousarray(arr).tobytes())
+            labels[k] = _label_row(rec, codes[rec["split"]])
+
+    labels_tmp = info_path.with_suffix(".labels.tmp.npy")
+    np.save(labels_tmp, labels)
+    info = {
+        "version": PACK_VERSION,
+        "index_version": version,
+        "index_sha": sha,
+        "n": len(items),
+        "channels": int(shape[0]),
+        "crop": int(shape[1]),
+        "splits": splits,
+    }
+    info_tmp = info_path.with_suffix(".json.tmp")
+    info_tmp.write_text(json.dumps(info))
+    # Data + labels first, info last: the info file is the commit point, so a
+    # reader never sees a pack whose array is still being written.
+    data_tmp.replace(info_path.with_suffix(".dat"))
+    labels_tmp.replace(info_path.with_suffix(".labels.npy"))
+    info_tmp.replace(info_path)
+    return read_pack_info(info_path)
+
+
+class PackedCrops:
+    """Random-access reader over one pack. Torch-free.
+
+    The crop array is memmapped read-only, so ``crops[i]`` is a zero-copy
+    page-cache view; callers ``astype`` it (a copy) before mutating.
+    """
+
+    def __init__(self, info_path: Path | str):
+        self.info = read_pack_info(info_path)
+        self.crops = np.memmap(
+            self.info.data_path,
+            dtype=np.uint8,
+            mode="r",
+            shape=(self.info.n, self.info.channels, self.info.crop, self.info.crop),
+        )
+        self.labels = np.load(self.info.labels_path)
+
+    def __len__(self) -> int:
+        return self.info.n
+
+    def rows(self, split: str) -> np.ndarray:
+        """Pack row numbers of every sample in ``split`` (index order)."""
+        if split not in self.info.splits:
+            return np.zeros(0, dtype=np.int64)
+        code = self.info.splits.index(split)
+        return np.flatnonzero(self.labels["split"] == code)
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("store", help="crop store (crops/ + index.json)")
+    ap.add_argument(
+        "--index-version",
+        type=int,
+        default=None,
+        help="pack this immutable index_vN.json snapshot (default: pin + pack the "
+        "CURRENT index.json)",
+    )
+    args = ap.parse_args(argv)
+    info = pack_crop_store(args.store, args.index_version)
+    size = info.data_path.stat().st_size
+    print(
+        f"PACKED: {info.n} crops [{info.channels}, {info.crop}, {info.crop}] "
+        f"index_v{info.index_version} ({info.index_sha}) -> {info.data_path} "
+        f"({size / 1e9:.2f} GB)",
+        flush=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ is not installed.
 """
 
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 
 import cv2
@@ -56,6 +57,82 @@ def extract_frames(
     )
 
 
+def frame_diff(frame: np.ndarray, prev_frame: np.ndarray) -> float:
+    """Mean absolute pixel difference of two same-sized frames.
+
+    ``cv2.absdiff`` on the uint8 frames is exact and avoids two float32
+    copies of a 4096x1800 panorama per sampled frame.
+    """
+    return float(np.mean(cv2.mean(cv2.absdiff(frame, prev_frame))[:3]))
+
+
+def sample_frames(
+    video_path: Path,
+    interval_sec: float = DEFAULT_INTERVAL_SEC,
+    diff_threshold: float = DEFAULT_DIFF_THRESHOLD,
+    frame_interval: int | None = None,
+    flip: bool = False,
+) -> Iterator[tuple[int, np.ndarray]]:
+    """Decode a video with PyAV and yield the frames extraction keeps.
+
+    Yields ``(frame_idx, bgr_frame)`` for every ``frame_interval``-th frame
+    that differs from the last kept one by at least ``diff_threshold``.
+    Corrupt packets are skipped. Frames stay in memory; ``extract_frames``
+    writes them out, ``stream_tile`` tiles them directly.
+    """
+    container = av.open(str(video_path))
+    try:
+        stream = container.streams.video[0]
+        fps = float(stream.average_rate or 25)
+        total_frames = stream.frames or 0
+
+        if frame_interval is None:
+            frame_interval = max(1, int(fps * interval_sec))
+
+        logger.info(
+            "Extracting frames from %s (%.1f fps, %d total, every %d frames) [PyAV]",
+            video_path.name,
+            fps,
+            total_frames,
+            frame_interval,
+        )
+
+        prev_frame = None
+        frame_idx = 0
+
+        stream.thread_type = "AUTO"
+        for packet in container.demux(stream):
+            try:
+                for av_frame in packet.decode():
+                    if frame_idx % frame_interval == 0:
+                        frame = av_frame.to_ndarray(format="bgr24")
+
+                        if flip:
+                            frame = cv2.flip(frame, -1)
+
+                        if prev_frame is not None:
+                            try:
+                                diff = frame_diff(frame, prev_frame)
+                            except (cv2.error, MemoryError, ValueError):
+                                frame_idx += 1
+                                continue
+                            if diff < diff_threshold:
+                                frame_idx += 1
+                                continue
+
+                        prev_frame = frame
+                        yield frame_idx, frame
+
+                    frame_idx += 1
+            except av.error.InvalidDataError:
+                continue
+            except Exception as e:
+                logger.debug("Skipping corrupt frame at %d: %s", frame_idx, e)
+                continue
+    finally:
+        container.close()
+
+
 def _extract_frames_av(
     video_path: Path,
     output_dir: Path,
@@ -66,77 +143,22 @@ def _extract_frames_av(
     flip: bool,
 ) -> int:
     """Extract frames using PyAV (ffmpeg). Robust against corrupt frames."""
-    container = av.open(str(video_path))
-    stream = container.streams.video[0]
-    fps = float(stream.average_rate or 25)
-    total_frames = stream.frames or 0
-
-    if frame_interval is None:
-        frame_interval = max(1, int(fps * interval_sec))
-
     output_dir.mkdir(parents=True, exist_ok=True)
     video_name = video_path.stem
-
-    logger.info(
-        "Extracting frames from %s (%.1f fps, %d total, every %d frames) [PyAV]",
-        video_path.name,
-        fps,
-        total_frames,
-        frame_interval,
-    )
-
-    prev_frame = None
     extracted = 0
-    frame_idx = 0
 
-    stream.thread_type = "AUTO"
-    for packet in container.demux(stream):
-        try:
-            for av_frame in packet.decode():
-                if frame_idx % frame_interval == 0:
-                    frame = av_frame.to_ndarray(format="bgr24")
-
-                    if flip:
-                        frame = cv2.flip(frame, -1)
-
-                    if prev_frame is not None:
-                        try:
-                            diff = np.mean(
-                                np.abs(
-                                    frame.astype(np.float32)
-                                    - prev_frame.astype(np.float32)
-                                )
-                            )
-                        except (MemoryError, ValueError):
-                            frame_idx += 1
-                            continue
-                        if diff < diff_threshold:
-                            frame_idx += 1
-                            continue
-
-                    out_path = output_dir / f"{video_name}_frame_{frame_idx:06d}.jpg"
-                    cv2.imwrite(
-                        str(out_path), frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality]
-                    )
-                    prev_frame = frame.copy()
-                    extracted += 1
-
-                    if extracted % 100 == 0:
-                        logger.info(
-                            "Extracted %d frames so far (at frame %d/%d)",
-                            extracted,
-                            frame_idx,
-                            total_frames,
-                        )
-
-                frame_idx += 1
-        except av.error.InvalidDataError:
-            continue
-        except Exception as e:
-            logger.debug("Skipping corrupt frame at %d: %s", frame_idx, e)
-            continue
+    for frame_idx, frame in sample_frames(
+        video_path, interval_sec, diff_threshold, frame_interval, flip
+    ):
+        out_path = output_dir / f"{video_name}_frame_{frame_idx:06d}.jpg"
+        cv2.imwrite(str(out_path), frame, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+        extracted += 1
+
+        if extracted % 100 == 0:
+            logger.info(
+                "Extracted %d frames so far (at frame %d)", extracted, frame_idx
+            )
 
-    container.close()
     logger.info("Extracted %d frames from %s", extracted, video_path.name)
     return extracted
 
@@ -23,6 +23,7 @@ label costs ~one GOP of decode, corruption-isolated per segment.
 
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
 
@@ -48,6 +49,30 @@ def gaussian_heatmap(h: int, w: int, cx: float, cy: float, sigma: float) -> np.n
     return g.astype(np.float32)
 
 
+@functools.lru_cache(maxsize=16384)
+def _gaussian_profile(n: int, c: float, sigma: float) -> np.ndarray:
+    d = np.arange(n, dtype=np.float64) - c
+    g = np.exp(-(d * d) / (2.0 * sigma * sigma))
+    g.flags.writeable = False
+    return g
+
+
+def cached_gaussian_heatmap(
+    h: int, w: int, cx: float, cy: float, sigma: float
+) -> np.ndarray:
+    """:func:`gaussian_heatmap` from cached 1-D profiles (the train-time path).
+
+    The isotropic Gaussian is separable — ``exp(-(dx²+dy²)/2σ²)`` is the outer
+    product of a row and a column profile — and index labels are rounded to
+    0.1 px, so the profiles repeat across samples and come from an LRU cache:
+    a target costs one ``h×w`` multiply instead of ``h×w`` ``exp`` calls.
+    Matches :func:`gaussian_heatmap` to float32 rounding.
+    """
+    gy = _gaussian_profile(h, float(cy), float(sigma))
+    gx = _gaussian_profile(w, float(cx), float(sigma))
+    return np.multiply.outer(gy, gx).astype(np.float32)
+
+
 def person_center_heatmap(
     h: int,
     w: int,
@@ -104,6 +129,7 @@ def build_heatmap_crops(
     hwaccel: bool = False,
     stabilize: bool = False,
     geo_channel: bool = False,
+    pack: bool = False,
 ) -> dict:
     """Pre-render 3-frame grayscale crops + ball-center targets to ``out_dir``.
 
@@ -145,6 +171,11 @@ def build_heatmap_crops(
     whose polygon fails the geometry gate (ordering/homography) is a HARD
     error — a neutral fallback would silently feed the net a constant channel.
     Recorded in the summary → a geo store gets its own index sha.
+
+    ``pack`` (default ``False``) additionally packs the freshly pinned index
+    into the single-file memmap store (:mod:`training.data_prep.crop_pack`)
+    that :class:`HeatmapCropDataset` reads without per-sample file opens. The
+    ``.npy`` crops are still written — they stay the store's source of truth.
     """
     import av
     import cv2
@@ -330,11 +361,22 @@ def build_heatmap_crops(
 
     v, sha = freeze_index(out_dir)
     print(f"STORE VERSIONED: created as v{v} ({sha})", flush=True)
+    if pack:
+        from training.data_prep.crop_pack import pack_crop_store
+
+        info = pack_crop_store(out_dir, v or None)
+        print(f"STORE PACKED: {info.n} crops -> {info.data_path}", flush=True)
     return summary
 
 
 class HeatmapCropDataset:
-    """torch Dataset over pre-rendered crops; builds the Gaussian target at load."""
+    """torch Dataset over pre-rendered crops; builds the Gaussian target at load.
+
+    Crops come from the store's memory-mapped pack (:mod:`crop_pack`) when one
+    exists for the pinned index sha, else one ``np.load`` per sample.
+    ``packed=True`` builds the pack first if it is missing; ``packed=False``
+    forces the per-file path.
+    """
 
     def __init__(
         self,
@@ -344,7 +386,9 @@ class HeatmapCropDataset:
         sigma: float | None = None,
         augment: bool | None = None,
         index_version: int | None = None,
+        packed: bool | None = None,
     ):
+        from training.data_prep.crop_pack import pack_crop_store, packed_info_path
         from training.data_prep.store_versions import resolve_index
 
         self.root = Path(root)
@@ -363,25 +407,57 @@ class HeatmapCropDataset:
             self.sigma = data.get("summary", {}).get("sigma", 4.0)
         else:
             self.sigma = float(sigma)
-        self.items = [r for r in data["items"] if r["split"] == split]
+        # _rows[i] = the item's position in the full index = its pack row.
+        self._rows = [k for k, r in enumerate(data["items"]) if r["split"] == split]
+        self.items = [data["items"][k] for k in self._rows]
         # Horizontal-flip augmentation (train only): a mirrored field strip is a valid, different
         # soccer scene, so it adds real variety — cheaper diversity than pure oversampling.
         self.augment = (split == "train") if augment is None else augment
 
+        self.pack_path: Path | None = None
+        if packed is not False:
+            info_path = packed_info_path(self.root, self.index_sha)
+            if packed and not info_path.exists():
+                pack_crop_store(self.root, self.index_version or None)
+            if info_path.exists():
+                self.pack_path = info_path
+        # Opened lazily, once per DataLoader worker: an open memmap would be
+        # pickled as a full in-RAM copy by the Windows spawn.
+        self._pack = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pack"] = None
+        return state
+
     def __len__(self):
         return len(self.items)
 
+    def _load_stack(self, i: int) -> np.ndarray:
+        """Sample ``i``'s crop as float32 ``[C, crop, crop]`` in [0, 1]."""
+        if self.pack_path is None:
+            raw = np.load(self.root / "crops" / self.items[i]["file"])
+        else:
+            if self._pack is None:
+                from training.data_prep.crop_pack import PackedCrops
+
+                self._pack = PackedCrops(self.pack_path)
+            raw = self._pack.crops[self._rows[i]]
+        return raw.astype(np.float32) / 255.0
+
+    def _ball_target(self, r: dict, sigma: float) -> np.ndarray:
+        if r["x"] is None:
+            return np.zeros((self.crop, self.crop), np.float32)
+        return cached_gaussian_heatmap(self.crop, self.crop, r["x"], r["y"], sigma)
+
     def __getitem__(self, i):
         import random
 
         import torch
 
         r = self.items[i]
-        stack = np.load(self.root / "crops" / r["file"]).astype(np.float32) / 255.0
-        if r["x"] is None:
-            tgt = np.zeros((self.crop, self.crop), np.float32)
-        else:
-            tgt = gaussian_heatmap(self.crop, self.crop, r["x"], r["y"], self.sigma)
+        stack = self._load_stack(i)
+        tgt = self._ball_target(r, self.sigma)
         if self.augment and random.random() < 0.5:
             # mirror the band AND the target so the Gaussian peak lands at W-1-x
             stack = np.ascontiguousarray(stack[:, :, ::-1])
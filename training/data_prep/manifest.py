@@ -33,6 +33,12 @@ import sqlite3
 import time
 from pathlib import Path
 
+from training.data_prep.segment_status import (
+    mark_segment,
+    open_status_db,
+    status_db_path,
+)
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_DB_PATH = Path("D:/training_data/manifest.db")
@@ -544,6 +550,7 @@ def pack_segment(
     pack_dir: Path = DEFAULT_PACK_DIR,
     delete_loose: bool = False,
     source_override: Path | None = None,
+    status_conn: sqlite3.Connection | None = None,
 ) -> dict:
     """Pack all tiles for one segment into a single .pack file.
 
@@ -554,6 +561,9 @@ def pack_segment(
     If delete_loose=True, removes loose .jpg files from tiles_dir (the
     original location, not source_override).
 
+    If status_conn is given, the segment is marked packed in the segment
+    status table (``segment_status.py``).
+
     Returns: {tiles_packed, pack_size, loose_deleted, elapsed}
     """
     t0 = time.time()
@@ -569,10 +579,6 @@ def pack_segment(
         (game_id, segment),
     ).fetchall()
 
-    updates = []
-    source_paths = []
-    source_sizes_sum = 0
-    offset = 0
     pack_path_str = str(pack_path)
 
     # Build file list upfront
@@ -583,48 +589,22 @@ def pack_segment(
         file_list.append((src, frame_idx, row, col))
 
     # Read files concurrently with a thread pool for better HDD scheduling,
-    # but write sequentially to maintain deterministic pack order.
-    from concurrent.futures import ThreadPoolExecutor, as_completed
+    # but write sequentially to maintain deterministic pack order. One pool
+    # for the whole segment; reads stream through a bounded in-order window.
+    from concurrent.futures import ThreadPoolExecutor
+
+    from training.data_prep.pack_scheduler import write_segment_pack
 
     READAHEAD = 8  # number of concurrent file reads (keep low for HDD)
 
-    def _read_file(item):
-        src, fidx, r, c = item
-        return (fidx, r, c, src, src.read_bytes())
-
-    with open(pack_path, "wb") as pf:
-        # Process in batches to keep memory bounded
-        for batch_start in range(0, len(file_list), READAHEAD * 4):
-            batch = file_list[batch_start : batch_start + READAHEAD * 4]
-            # Read batch concurrently
-            results = {}
-            with ThreadPoolExecutor(max_workers=READAHEAD) as pool:
-                futures = {
-                    pool.submit(_read_file, item): i for i, item in enumerate(batch)
-                }
-                for future in as_completed(futures):
-                    idx = futures[future]
-                    results[idx] = future.result()
-
-            # Write in order
-            for i in range(len(batch)):
-                fidx, r, c, src, data = results[i]
-                pf.write(data)
-                size = len(data)
-                source_sizes_sum += size
-                source_paths.append(src)
-                updates.append(
-                    (pack_path_str, offset, size, game_id, segment, fidx, r, c)
-                )
-                offset += size
-
-    # Verify pack file size matches sum of source files
-    actual_size = os.path.getsize(pack_path)
-    if actual_size != source_sizes_sum:
-        raise RuntimeError(
-            f"Pack verification failed for {game_id}/{segment}: "
-            f"expected {source_sizes_sum} bytes, got {actual_size}"
-        )
+    with ThreadPoolExecutor(max_workers=READAHEAD) as pool:
+        layout = write_segment_pack(file_list, pack_path, pool, window=READAHEAD * 4)
+    offset = sum(size for *_, size in layout)
+    updates = [
+        (pack_path_str, off, size, game_id, segment, fidx, r, c)
+        for fidx, r, c, off, size in layout
+    ]
+    source_paths = [src for src, *_ in file_list]
 
     # Batch update tiles table with pack info
     conn.executemany(
@@ -633,6 +613,8 @@ def pack_segment(
         updates,
     )
     conn.commit()
+    if status_conn is not None:
+        mark_segment(status_conn, game_id, segment, "packed", count=len(rows))
 
     # Delete loose files after successful pack + DB update
     deleted = 0
@@ -650,6 +632,82 @@ def pack_segment(
     }
 
 
+def record_segment_pack(
+    conn: sqlite3.Connection,
+    game_id: str,
+    segment: str,
+    pack_path: Path,
+    layout: list[tuple[int, int, int, int, int]],
+) -> int:
+    """Catalog a segment that was tiled straight into a pack (stream_tile.py).
+
+    There are no loose tiles to scan, so the segments/frames/tiles rows come
+    from the pack ``layout`` — ``[(frame_idx, row, col, offset, size)]`` as
+    returned by ``write_pack``. Any previous rows for the segment are
+    replaced, and the game row is created if missing.
+
+    Returns the number of tiles recorded.
+    """
+    from collections import Counter
+
+    now = time.time()
+    conn.execute(
+        "DELETE FROM tiles WHERE game_id = ? AND segment = ?", (game_id, segment)
+    )
+    conn.execute(
+        "DELETE FROM frames WHERE game_id = ? AND segment = ?", (game_id, segment)
+    )
+    conn.execute(
+        "DELETE FROM segments WHERE game_id = ? AND segment = ?", (game_id, segment)
+    )
+    conn.execute(
+        "INSERT INTO games (game_id, tiles_cataloged, last_updated) VALUES (?, ?, ?) "
+        "ON CONFLICT(game_id) DO NOTHING",
+        (game_id, now, now),
+    )
+
+    per_frame = Counter(fidx for fidx, *_ in layout)
+    frame_indices = sorted(per_frame)
+    max_gap = max(
+        (b - a for a, b in zip(frame_indices, frame_indices[1:], strict=False)),
+        default=0,
+    )
+    conn.execute(
+        "INSERT INTO segments (game_id, segment, frame_count, tile_count, "
+        "frame_min, frame_max, max_gap) VALUES (?,?,?,?,?,?,?)",
+        (
+            game_id,
+            segment,
+            len(frame_indices),
+            len(layout),
+            frame_indices[0] if frame_indices else 0,
+            frame_indices[-1] if frame_indices else 0,
+            max_gap,
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO frames (game_id, segment, frame_idx, tile_count) VALUES (?,?,?,?)",
+        [(game_id, segment, fidx, per_frame[fidx]) for fidx in frame_indices],
+    )
+    pack_file = str(pack_path)
+    conn.executemany(
+        "INSERT INTO tiles (game_id, segment, frame_idx, row, col, "
+        "pack_file, pack_offset, pack_size) VALUES (?,?,?,?,?,?,?,?)",
+        [
+            (game_id, segment, fidx, r, c, pack_file, off, size)
+            for fidx, r, c, off, size in layout
+        ],
+    )
+    conn.execute(
+        "UPDATE games SET tile_count = "
+        "(SELECT COUNT(*) FROM tiles WHERE game_id = ?), last_updated = ? "
+        "WHERE game_id = ?",
+        (game_id, now, game_id),
+    )
+    conn.commit()
+    return len(layout)
+
+
 def pack_game(
     conn: sqlite3.Connection,
     game_id: str,
@@ -657,6 +715,7 @@ def pack_game(
     pack_dir: Path = DEFAULT_PACK_DIR,
     delete_loose: bool = False,
     ssd_staging: Path | None = None,
+    status_conn: sqlite3.Connection | None = None,
 ) -> dict:
     """Pack all segments for a game. Returns aggregate stats.
 
@@ -719,6 +778,7 @@ def pack_game(
             pack_dir,
             delete_loose=delete_loose,
             source_override=source_dir,
+            status_conn=status_conn,
         )
         total["tiles_packed"] += stats["tiles_packed"]
         total["pack_size"] += stats["pack_size"]
@@ -752,11 +812,20 @@ def pack_all_games(
     games: list[str] | None = None,
     delete_loose: bool = False,
     ssd_staging: Path | None = None,
+    read_threads: int | None = None,
+    segments_per_device: int | None = None,
+    journal_path: Path | None = None,
+    status_conn: sqlite3.Connection | None = None,
 ) -> None:
     """Pack all cataloged games into segment pack files.
 
     If delete_loose=True, removes loose .jpg files after packing each segment.
-    If ssd_staging is set, copies tiles to SSD before packing for faster reads.
+    If ssd_staging is set, copies tiles to SSD before packing for faster reads
+    (one game at a time). Otherwise segments from all games are packed
+    concurrently by ``pack_scheduler.PackScheduler`` — per-disk reader pools
+    and writers, at most ``segments_per_device`` in flight per disk — with a
+    resumable journal at ``journal_path`` (``{pack_dir}/pack_journal.jsonl``).
+    Packed segments are recorded in ``status_conn``'s segment status table.
     """
     game_rows = conn.execute(
         "SELECT DISTINCT game_id FROM segments ORDER BY game_id"
@@ -773,6 +842,31 @@ def pack_all_games(
         ssd_staging,
     )
 
+    if ssd_staging is None:
+        from training.data_prep import pack_scheduler
+
+        scheduler = pack_scheduler.PackScheduler(
+            conn,
+            tiles_dir,
+            pack_dir,
+            delete_loose=delete_loose,
+            read_threads=read_threads or pack_scheduler.DEFAULT_READ_THREADS,
+            segments_per_device=(
+                segments_per_device or pack_scheduler.DEFAULT_SEGMENTS_PER_DEVICE
+            ),
+            journal_path=journal_path,
+            status_conn=status_conn,
+        )
+        stats = scheduler.run(game_ids)
+        logger.info(
+            "Packed %d segments, %d tiles, %.1fMB (%.1fs)",
+            stats["segments"],
+            stats["tiles_packed"],
+            stats["pack_size"] / 1024 / 1024,
+            stats["elapsed"],
+        )
+        return
+
     for game_id in game_ids:
         # Check if already packed
         row = conn.execute(
@@ -791,6 +885,7 @@ def pack_all_games(
             pack_dir,
             delete_loose=delete_loose,
             ssd_staging=ssd_staging,
+            status_conn=status_conn,
         )
         logger.info(
             "  %s: %d segments, %d tiles, %.1fMB (%.1fs)",
@@ -840,6 +935,90 @@ def read_tile_bytes(
     return path.read_bytes()
 
 
+# Keys per lookup query: 4 bound parameters each, so a chunk stays under
+# SQLite's historical 999-variable limit.
+_BATCH_LOOKUP_CHUNK = 200
+# Pack ranges closer than this are prefetched as one span — pulling a few
+# unwanted tiles into the page cache is cheaper than another HDD seek.
+_COALESCE_GAP = 64 * 1024
+# Upper bound on one prefetched span.
+_COALESCE_MAX_SPAN = 64 * 1024 * 1024
+
+
+def _lookup_tile_locations(
+    conn: sqlite3.Connection,
+    game_id: str,
+    keys: list[tuple[str, int, int, int]],
+) -> dict[tuple[str, int, int, int], tuple[str | None, int | None, int | None]]:
+    """``key -> (pack_file, pack_offset, pack_size)`` for every key in the manifest.
+
+    Set-based: each chunk of keys is one query joining a ``VALUES`` list
+    against the tiles primary key, instead of one ``SELECT`` per tile.
+    """
+    found: dict = {}
+    for start in range(0, len(keys), _BATCH_LOOKUP_CHUNK):
+        chunk = keys[start : start + _BATCH_LOOKUP_CHUNK]
+        values = ",".join(["(?,?,?,?)"] * len(chunk))
+        params = [v for key in chunk for v in key]
+        params.append(game_id)
+        rows = conn.execute(
+            "SELECT t.segment, t.frame_idx, t.row, t.col, "
+            "t.pack_file, t.pack_offset, t.pack_size "
+            f"FROM (VALUES {values}) AS k JOIN tiles t "
+            "ON t.game_id=? AND t.segment=k.column1 AND t.frame_idx=k.column2 "
+            "AND t.row=k.column3 AND t.col=k.column4",
+            params,
+        ).fetchall()
+        for seg, fidx, r, c, pack_file, pack_offset, pack_size in rows:
+            found[(seg, fidx, r, c)] = (pack_file, pack_offset, pack_size)
+    return found
+
+
+def _coalesce_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Merge offset-sorted ``(offset, size)`` ranges into ``(offset, size)`` spans.
+
+    Ranges that overlap, touch or sit within :data:`_COALESCE_GAP` of each
+    other share a span (capped at :data:`_COALESCE_MAX_SPAN`).
+    """
+    spans: list[list[int]] = []
+    for offset, size in ranges:
+        if spans:
+            span = spans[-1]
+            new_end = max(span[0] + span[1], offset + size)
+            if (
+                offset <= span[0] + span[1] + _COALESCE_GAP
+                and new_end - span[0] <= _COALESCE_MAX_SPAN
+            ):
+                span[1] = new_end - span[0]
+                continue
+        spans.append([offset, size])
+    return [(o, s) for o, s in spans]
+
+
+def _read_pack_ranges(pack_file: str, ranges: list[tuple[int, int]]) -> list[bytes]:
+    """Read offset-sorted ``(offset, size)`` ranges from one pack file.
+
+    The pack is memory-mapped, so each tile is one slice copy out of the page
+    cache with no per-tile ``seek``/``read`` syscalls. Where the platform
+    supports it, every coalesced span is first hinted ``MADV_WILLNEED`` so
+    the kernel fetches it as one large read instead of page-fault-sized ones.
+    """
+    import mmap
+
+    with open(pack_file, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return [b"" for _ in ranges]
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+                page = mmap.ALLOCATIONGRANULARITY
+                for offset, size in _coalesce_ranges(ranges):
+                    start = offset - offset % page
+                    length = min(offset + size, len(mm)) - start
+                    if length > 0:
+                        mm.madvise(mmap.MADV_WILLNEED, start, length)
+            return [mm[offset : offset + size] for offset, size in ranges]
+
+
 def read_tiles_batch(
     conn: sqlite3.Connection,
     game_id: str,
@@ -849,48 +1028,42 @@ def read_tiles_batch(
 
     tile_keys: list of (segment, frame_idx, row, col)
     Returns: list of ((segment, frame_idx, row, col), jpeg_bytes)
+
+    Locations come from chunked set-based lookups and each pack file is read
+    through one mapping (see :func:`_read_pack_ranges`). Keys missing from
+    the manifest are skipped.
     """
     if not tile_keys:
         return []
 
-    # Batch lookup
-    results = []
-    for seg, fidx, r, c in tile_keys:
-        row = conn.execute(
-            "SELECT pack_file, pack_offset, pack_size FROM tiles "
-            "WHERE game_id=? AND segment=? AND frame_idx=? AND row=? AND col=?",
-            (game_id, seg, fidx, r, c),
-        ).fetchone()
-        if row:
-            results.append(((seg, fidx, r, c), row[0], row[1], row[2]))
+    keys = [(seg, int(fidx), int(r), int(c)) for seg, fidx, r, c in tile_keys]
+    locations = _lookup_tile_locations(conn, game_id, list(dict.fromkeys(keys)))
+    results = [(key, *locations[key]) for key in keys if key in locations]
 
     # Sort by pack_file then offset for sequential reads
     results.sort(key=lambda x: (x[1] or "", x[2] or 0))
 
-    output = []
-    current_fh = None
-    current_path = None
-    try:
-        for key, pack_file, pack_offset, pack_size in results:
-            if pack_file and pack_offset is not None:
-                if pack_file != current_path:
-                    if current_fh:
-                        current_fh.close()
-                    current_fh = open(pack_file, "rb")
-                    current_path = pack_file
-                current_fh.seek(pack_offset)
-                data = current_fh.read(pack_size)
-            else:
-                # Fallback to loose file
-                game_meta = get_game(conn, game_id)
-                seg, fidx, r, c = key
-                stem = f"{seg}_frame_{fidx:06d}_r{r}_c{c}"
-                path = Path(game_meta["tile_dir"]) / f"{stem}.jpg"
-                data = path.read_bytes()
-            output.append((key, data))
-    finally:
-        if current_fh:
-            current_fh.close()
+    output: list = [None] * len(results)
+    packed: dict[str, list[int]] = {}
+    tile_dir = None
+    for i, (key, pack_file, pack_offset, _size) in enumerate(results):
+        if pack_file and pack_offset is not None:
+            packed.setdefault(pack_file, []).append(i)
+            continue
+        # Fallback to loose file (game row looked up once per batch)
+        if tile_dir is None:
+            game_meta = get_game(conn, game_id)
+            if not game_meta or not game_meta.get("tile_dir"):
+                raise FileNotFoundError(f"No tile_dir for game {game_id}")
+            tile_dir = Path(game_meta["tile_dir"])
+        seg, fidx, r, c = key
+        stem = f"{seg}_frame_{fidx:06d}_r{r}_c{c}"
+        output[i] = (key, (tile_dir / f"{stem}.jpg").read_bytes())
+
+    for pack_file, indices in packed.items():
+        ranges = [(results[i][2], results[i][3]) for i in indices]
+        for i, data in zip(indices, _read_pack_ranges(pack_file, ranges), strict=True):
+            output[i] = (results[i][0], data)
 
     return output
 
@@ -1881,6 +2054,24 @@ def main():
         default=None,
         help="SSD staging directory — copies tiles here before packing for faster reads",
     )
+    pak.add_argument(
+        "--read-threads",
+        type=int,
+        default=None,
+        help="Concurrent tile reads per source disk (default 8)",
+    )
+    pak.add_argument(
+        "--segments-per-device",
+        type=int,
+        default=None,
+        help="Segments packed concurrently per disk (default 2)",
+    )
+    pak.add_argument(
+        "--journal",
+        type=Path,
+        default=None,
+        help="Progress journal for resuming (default {pack-dir}/pack_journal.jsonl)",
+    )
 
     # backup
     sub.add_parser(
@@ -1925,6 +2116,7 @@ def main():
         conn.close()
     elif args.command == "pack":
         conn = open_db(args.db)
+        status_conn = open_status_db(status_db_path(args.tiles.parent))
         pack_all_games(
             conn,
             tiles_dir=args.tiles,
@@ -1932,7 +2124,12 @@ def main():
             games=args.games,
             delete_loose=args.delete_loose,
             ssd_staging=args.ssd,
+            read_threads=args.read_threads,
+            segments_per_device=args.segments_per_device,
+            journal_path=args.journal,
+            status_conn=status_conn,
         )
+        status_conn.close()
         conn.close()
     elif args.command == "build-dataset":
         conn = open_db(args.db)
@@ -40,6 +40,15 @@ from ultralytics.models.yolo.detect.train import DetectionTrainer
 from ultralytics.utils import LOGGER, colorstr
 from ultralytics.utils.torch_utils import unwrap_model
 
+from training.data_prep.manifest_sampling import build_samples
+from training.data_prep.pack_reader import (
+    DEFAULT_MAX_OPEN_PACKS,
+    PackIOStats,
+    PackReaderPool,
+    get_decoder,
+    read_and_decode,
+)
+
 _logger = logging.getLogger(__name__)
 
 
@@ -120,6 +129,9 @@ class ManifestDataset(YOLODataset):
         neg_ratio=1.0,
         hard_neg_ratio=0.5,
         seed=42,
+        decoder="cv2",
+        max_open_packs=DEFAULT_MAX_OPEN_PACKS,
+        sample_cache_dir=None,
         **kwargs,
     ):
         # Store config BEFORE super().__init__ calls get_img_files/get_labels
@@ -128,12 +140,35 @@ class ManifestDataset(YOLODataset):
         self._neg_ratio = neg_ratio
         self._hard_neg_ratio = hard_neg_ratio
         self._seed = seed
+        self._sample_cache_dir = sample_cache_dir
         self._tile_index = []  # (pack_file, offset, size) per image
         self._label_data = []  # label dict per image
         self._conn = None
-        self._pack_handles = {}  # cache open file handles
+        self._decoder_name = decoder
+        self._decoder = get_decoder(decoder)
+        self._max_open_packs = max_open_packs
+        # Per-process pack mappings, created lazily in each DataLoader worker.
+        self._pack_pool = None
+        # Shared with the workers; the trainer logs + resets it every epoch.
+        self.io_stats = PackIOStats()
 
         super().__init__(*args, **kwargs)
+        # The sample list is built; workers only need the in-memory tile
+        # index, so don't let every worker inherit (or re-open) a connection.
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_pack_pool"] = None
+        state["_decoder"] = None  # re-resolved by name (module-level lookup)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._decoder = get_decoder(self._decoder_name)
 
     def _get_conn(self):
         if self._conn is None:
@@ -142,126 +177,56 @@ class ManifestDataset(YOLODataset):
         return self._conn
 
     def get_img_files(self, img_path):
-        """Override: build image list from manifest instead of scanning directories."""
-        conn = self._get_conn()
-        random.seed(self._seed)
+        """Override: build image list from manifest instead of scanning directories.
+
+        Sampling runs in SQL (see ``manifest_sampling``) and is cached on disk
+        keyed by manifest content + sampling params.
+        """
+        samples = build_samples(
+            self._db_path,
+            self._game_ids,
+            neg_ratio=self._neg_ratio,
+            hard_neg_ratio=self._hard_neg_ratio,
+            seed=self._seed,
+            exclude_rows=EXCLUDE_ROWS,
+            cache_dir=self._sample_cache_dir,
+        )
 
         im_files = []
         tile_index = []
         label_data = []
 
-        for gid in self._game_ids:
-            # Get labels grouped by stem
-            label_rows = conn.execute(
-                "SELECT tile_stem, class_id, cx, cy, w, h FROM labels WHERE game_id = ?",
-                (gid,),
-            ).fetchall()
-            labels_by_stem = defaultdict(list)
-            for stem, cls, cx, cy, w, h in label_rows:
-                labels_by_stem[stem].append((cls, cx, cy, w, h))
-
-            # Get pack info for ALL tiles
-            tile_rows = conn.execute(
-                "SELECT segment, frame_idx, row, col, pack_file, pack_offset, pack_size "
-                "FROM tiles WHERE game_id = ? AND pack_file IS NOT NULL",
-                (gid,),
-            ).fetchall()
-
-            tile_info = {}  # key -> (pack_file, offset, size)
-            for seg, fidx, r, c, pf, po, ps in tile_rows:
-                if r in EXCLUDE_ROWS:
-                    continue
-                tile_info[(seg, fidx, r, c)] = (pf, po, ps)
-
-            # Positive tiles
-            positive_keys = set()
-            for stem, detections in labels_by_stem.items():
-                m = TILE_RE.match(stem)
-                if not m:
-                    continue
-                key = (m.group(1), int(m.group(2)), int(m.group(3)), int(m.group(4)))
-                if key not in tile_info:
-                    continue
-                positive_keys.add(key)
-                pf, po, ps = tile_info[key]
-
-                im_files.append(f"pack://{gid}/{stem}.jpg")
-                tile_index.append((pf, po, ps))
-
-                cls_arr = np.array([[d[0]] for d in detections], dtype=np.float32)
-                bbox_arr = np.array(
-                    [[d[1], d[2], d[3], d[4]] for d in detections], dtype=np.float32
-                )
-                label_data.append(
-                    {
-                        "im_file": f"pack://{gid}/{stem}.jpg",
-                        "shape": (TILE_SIZE, TILE_SIZE),
-                        "cls": cls_arr,
-                        "bboxes": bbox_arr,
-                        "segments": [],
-                        "keypoints": None,
-                        "normalized": True,
-                        "bbox_format": "xywh",
-                    }
-                )
-
-            # Hard negatives: spatial + temporal neighbors
-            hard_neg_keys = set()
-            for seg, fidx, r, c in positive_keys:
-                for dr in (-1, 0, 1):
-                    for dc in (-1, 0, 1):
-                        if dr == 0 and dc == 0:
-                            continue
-                        nk = (seg, fidx, r + dr, c + dc)
-                        if nk in tile_info and nk not in positive_keys:
-                            hard_neg_keys.add(nk)
-                for df in (-4, 4):
-                    nk = (seg, fidx + df, r, c)
-                    if nk in tile_info and nk not in positive_keys:
-                        hard_neg_keys.add(nk)
-
-            max_hard = int(len(positive_keys) * self._neg_ratio * self._hard_neg_ratio)
-            if len(hard_neg_keys) > max_hard:
-                hard_neg_keys = set(random.sample(list(hard_neg_keys), max_hard))
-
-            # Random negatives
-            max_random = int(
-                len(positive_keys) * self._neg_ratio * (1 - self._hard_neg_ratio)
+        def _add(gid, stem, pf, po, ps, cls_arr, bbox_arr):
+            vpath = f"pack://{gid}/{stem}.jpg"
+            im_files.append(vpath)
+            tile_index.append((pf, po, ps))
+            label_data.append(
+                {
+                    "im_file": vpath,
+                    "shape": (TILE_SIZE, TILE_SIZE),
+                    "cls": cls_arr,
+                    "bboxes": bbox_arr,
+                    "segments": [],
+                    "keypoints": None,
+                    "normalized": True,
+                    "bbox_format": "xywh",
+                }
             )
-            all_neg = set(tile_info.keys()) - positive_keys - hard_neg_keys
-            random_neg_keys = set()
-            if max_random > 0 and all_neg:
-                random_neg_keys = set(
-                    random.sample(list(all_neg), min(max_random, len(all_neg)))
-                )
 
-            # Add negatives
-            empty_cls = np.zeros((0, 1), dtype=np.float32)
-            empty_bbox = np.zeros((0, 4), dtype=np.float32)
-            for key in hard_neg_keys | random_neg_keys:
-                seg, fidx, r, c = key
-                stem = f"{seg}_frame_{fidx:06d}_r{r}_c{c}"
-                pf, po, ps = tile_info[key]
-                vpath = f"pack://{gid}/{stem}.jpg"
-                im_files.append(vpath)
-                tile_index.append((pf, po, ps))
-                label_data.append(
-                    {
-                        "im_file": vpath,
-                        "shape": (TILE_SIZE, TILE_SIZE),
-                        "cls": empty_cls,
-                        "bboxes": empty_bbox,
-                        "segments": [],
-                        "keypoints": None,
-                        "normalized": True,
-                        "bbox_format": "xywh",
-                    }
-                )
+        empty_cls = np.zeros((0, 1), dtype=np.float32)
+        empty_bbox = np.zeros((0, 4), dtype=np.float32)
+        for gid in self._game_ids:
+            sample = samples[gid]
+            for stem, pf, po, ps, detections in sample.positives:
+                cls_arr = np.array([[d[0]] for d in detections], dtype=np.float32)
+                bbox_arr = np.array([d[1:5] for d in detections], dtype=np.float32)
+                _add(gid, stem, pf, po, ps, cls_arr, bbox_arr)
+            for stem, pf, po, ps in sample.negatives:
+                _add(gid, stem, pf, po, ps, empty_cls, empty_bbox)
 
-            n_pos = len(positive_keys)
-            n_neg = len(hard_neg_keys) + len(random_neg_keys)
             LOGGER.info(
-                f"  {gid}: {n_pos} pos + {n_neg} neg ({len(hard_neg_keys)} hard, {len(random_neg_keys)} random)"
+                f"  {gid}: {len(sample.positives)} pos + {len(sample.negatives)} neg "
+                f"({sample.n_hard} hard, {sample.n_random} random)"
             )
 
         self._tile_index = tile_index
@@ -305,15 +270,13 @@ class ManifestDataset(YOLODataset):
 
         pack_file, offset, size = self._tile_index[i]
 
-        # Use cached file handle
-        if pack_file not in self._pack_handles:
-            resolved = _resolve_pack_path(pack_file)
-            self._pack_handles[pack_file] = open(resolved, "rb")
-        fh = self._pack_handles[pack_file]
-
-        fh.seek(offset)
-        data = fh.read(size)
-        im = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        if self._pack_pool is None:
+            self._pack_pool = PackReaderPool(
+                self._max_open_packs, resolve=_resolve_pack_path
+            )
+        im = read_and_decode(
+            self._pack_pool, self._decoder, pack_file, offset, size, self.io_stats
+        )
 
         if im is None:
             raise FileNotFoundError(f"Failed to decode tile at index {i}")
@@ -346,8 +309,8 @@ class ManifestDataset(YOLODataset):
         return im, (h0, w0), im.shape[:2]
 
     def __del__(self):
-        for fh in self._pack_handles.values():
-            fh.close()
+        if self._pack_pool is not None:
+            self._pack_pool.close()
         if self._conn:
             self._conn.close()
 
@@ -357,9 +320,31 @@ class ManifestDataset(YOLODataset):
 # ---------------------------------------------------------------------------
 
 
+def _log_pack_io(trainer) -> None:
+    """``on_train_epoch_end``: log the epoch's tile read vs decode time."""
+    ds = getattr(trainer, "_manifest_train_dataset", None)
+    if ds is None:
+        return
+    s = ds.io_stats.snapshot(reset=True)
+    if not s["tiles"]:
+        return
+    per_tile_ms = 1000.0 / s["tiles"]
+    LOGGER.info(
+        f"PACK I/O epoch {trainer.epoch + 1}: {s['tiles']} tiles "
+        f"({ds._decoder_name}), read {s['read_s']:.1f}s "
+        f"({s['read_s'] * per_tile_ms:.2f} ms/tile), decode {s['decode_s']:.1f}s "
+        f"({s['decode_s'] * per_tile_ms:.2f} ms/tile) — summed over workers"
+    )
+
+
 class ManifestTrainer(DetectionTrainer):
     """Detection trainer that uses ManifestDataset."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._manifest_train_dataset = None
+        self.add_callback("on_train_epoch_end", _log_pack_io)
+
     def build_dataset(self, img_path, mode="train", batch=None):
         """Build ManifestDataset from data dict's manifest config."""
         gs = max(int(unwrap_model(self.model).stride.max()), 32)
@@ -379,7 +364,7 @@ class ManifestTrainer(DetectionTrainer):
             f"ManifestDataset ({mode}): {len(game_ids)} games, neg_ratio={neg_ratio}"
         )
 
-        return ManifestDataset(
+        ds = ManifestDataset(
             img_path=img_path,
             imgsz=self.args.imgsz,
             batch_size=batch,
@@ -399,7 +384,14 @@ class ManifestTrainer(DetectionTrainer):
             db_path=db_path,
             game_ids=game_ids,
             neg_ratio=neg_ratio if mode == "train" else 0.5,
+            decoder=self.data.get("manifest_decoder", "cv2"),
+            max_open_packs=self.data.get(
+                "manifest_max_open_packs", DEFAULT_MAX_OPEN_PACKS
+            ),
         )
+        if mode == "train":
+            self._manifest_train_dataset = ds
+        return ds
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,412 @@
+"""Index-only tile sampling for ``ManifestDataset`` (positives + negatives).
+
+``ManifestDataset.get_img_files`` used to pull every label row and every tile
+row of every game into Python, regex-parse each label stem, and walk the 8
+spatial / ±4 frame neighbours of each positive in nested loops — minutes at
+every training start on the full manifest. Here the same sampling runs in
+SQLite against indexes:
+
+- **labels** gain parsed integer key columns ``(segment, frame_idx, row,
+  col)`` (backfilled once from ``tile_stem``; unparseable stems get
+  ``frame_idx = -1``) and an index on ``(game_id, segment, frame_idx, row,
+  col)``, so positives are a join on the tiles primary key.
+- **hard negatives** are one join of the positives against a 10-row table of
+  neighbour offsets, again on the tiles primary key.
+- **random negatives** are sampled from the rowids of a partial index over
+  packed tiles, so the pool never leaves the index and only the chosen rows
+  are fetched.
+
+The per-game sample is a pure function of the manifest content and the
+sampling params (each game has its own ``random.Random`` seeded from
+``seed`` + game id, and candidate pools are sorted before sampling), so it is
+cached to disk keyed by a manifest fingerprint + those params; a repeat run
+with an unchanged manifest starts instantly.
+
+The label columns and indexes are added to a manifest once, by an explicit
+migration (training start refuses an unmigrated manifest rather than
+altering the production tables itself):
+
+    uv run python -m training.data_prep.manifest_sampling migrate --db D:/training_data/manifest.db
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+TILE_RE = re.compile(r"^(.+)_frame_(\d{6})_r(\d+)_c(\d+)$")
+SAMPLE_CACHE_VERSION = 2
+
+_LABEL_KEY_COLUMNS = (
+    ("segment", "TEXT"),
+    ("frame_idx", "INTEGER"),
+    ("row", "INTEGER"),
+    ("col", "INTEGER"),
+)
+# Covering index over packed tiles: the random-negative rowid pool and the
+# cache fingerprint are both answered without touching the table.
+_TILES_PACKED_COLUMNS = ["game_id", "row", "pack_offset", "pack_size", "pack_file"]
+
+# (dr, dc, dframe) neighbours of a positive that make hard negatives.
+_HARD_NEG_OFFSETS = [
+    (dr, dc, 0) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0)
+] + [(0, 0, -4), (0, 0, 4)]
+_ROWID_CHUNK = 500
+
+
+def tile_stem(segment: str, frame_idx: int, row: int, col: int) -> str:
+    return f"{segment}_frame_{frame_idx:06d}_r{row}_c{col}"
+
+
+def migrate_sampling_schema(conn: sqlite3.Connection) -> int:
+    """Add the parsed label key columns and the sampling indexes, then backfill.
+
+    The one-time migration behind ``manifest_sampling migrate``. Idempotent
+    and additive (an ``idx_tiles_packed`` from before ``pack_file`` was
+    covered is rebuilt). Returns how many label rows were backfilled.
+    """
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(labels)")}
+    for name, sql_type in _LABEL_KEY_COLUMNS:
+        if name not in cols:
+            conn.execute(f"ALTER TABLE labels ADD COLUMN {name} {sql_type}")
+    backfilled = backfill_label_keys(conn)
+
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_labels_tile_key "
+        "ON labels(game_id, segment, frame_idx, row, col)"
+    )
+    if _index_columns(conn, "idx_tiles_packed") != _TILES_PACKED_COLUMNS:
+        conn.execute("DROP INDEX IF EXISTS idx_tiles_packed")
+        conn.execute(
+            f"CREATE INDEX idx_tiles_packed "
+            f"ON tiles({', '.join(_TILES_PACKED_COLUMNS)}) "
+            "WHERE pack_offset IS NOT NULL"
+        )
+    conn.commit()
+    return backfilled
+
+
+def _index_columns(conn: sqlite3.Connection, name: str) -> list[str]:
+    return [r[2] for r in conn.execute(f"PRAGMA index_info({name})")]
+
+
+def check_sampling_schema(conn: sqlite3.Connection, db_path: Path | str) -> None:
+    """Raise unless :func:`migrate_sampling_schema` has been run on ``db_path``."""
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(labels)")}
+    if (
+        not {name for name, _ in _LABEL_KEY_COLUMNS} <= cols
+        or not _index_columns(conn, "idx_labels_tile_key")
+        or _index_columns(conn, "idx_tiles_packed") != _TILES_PACKED_COLUMNS
+    ):
+        raise RuntimeError(
+            f"{db_path} has no tile sampling schema; run "
+            f"`python -m training.data_prep.manifest_sampling migrate --db {db_path}`"
+        )
+
+
+def backfill_label_keys(conn: sqlite3.Connection) -> int:
+    """Parse ``tile_stem`` into the label key columns where they are unset.
+
+    Rows inserted by writers that only set ``tile_stem`` are picked up on the
+    next call; unparseable stems get ``frame_idx = -1``. Returns how many
+    label rows were backfilled.
+    """
+    pending = conn.execute(
+        "SELECT id, tile_stem FROM labels WHERE frame_idx IS NULL"
+    ).fetchall()
+    updates = []
+    for label_id, stem in pending:
+        m = TILE_RE.match(stem or "")
+        if m:
+            key = (m.group(1), int(m.group(2)), int(m.group(3)), int(m.group(4)))
+        else:
+            key = (None, -1, None, None)
+        updates.append((*key, label_id))
+    if updates:
+        conn.executemany(
+            "UPDATE labels SET segment=?, frame_idx=?, row=?, col=? WHERE id=?",
+            updates,
+        )
+        conn.commit()
+    return len(updates)
+
+
+@dataclass
+class GameSample:
+    """One game's sampled tiles.
+
+    ``positives``: ``(stem, pack_file, offset, size, [(cls, cx, cy, w, h)])``;
+    ``negatives``: ``(stem, pack_file, offset, size)``.
+    """
+
+    positives: list = field(default_factory=list)
+    negatives: list = field(default_factory=list)
+    n_hard: int = 0
+    n_random: int = 0
+
+
+def _not_in_rows(exclude_rows) -> tuple[str, list[int]]:
+    rows = sorted(exclude_rows)
+    if not rows:
+        return "", []
+    return f" AND t.row NOT IN ({','.join('?' * len(rows))})", rows
+
+
+def sample_game(
+    conn: sqlite3.Connection,
+    game_id: str,
+    *,
+    neg_ratio: float,
+    hard_neg_ratio: float,
+    seed: int,
+    exclude_rows=frozenset(),
+) -> GameSample:
+    """Positives, hard negatives and random negatives for one game, in SQL.
+
+    Same selection rules as the original in-Python sampler: positives are
+    labeled packed tiles outside ``exclude_rows``; hard negatives are their
+    unlabeled 8-neighbours and ±4-frame neighbours, capped at
+    ``positives * neg_ratio * hard_neg_ratio``; random negatives fill
+    ``positives * neg_ratio * (1 - hard_neg_ratio)`` from the rest.
+    Requires :func:`migrate_sampling_schema`.
+    """
+    rng = random.Random(f"{seed}|{game_id}")
+    row_sql, row_params = _not_in_rows(exclude_rows)
+    out = GameSample()
+
+    pos_rows = conn.execute(
+        "SELECT DISTINCT t.rowid, t.segment, t.frame_idx, t.row, t.col, "
+        "t.pack_file, t.pack_offset, t.pack_size "
+        "FROM labels l CROSS JOIN tiles t ON t.game_id = l.game_id "
+        "AND t.segment = l.segment AND t.frame_idx = l.frame_idx "
+        "AND t.row = l.row AND t.col = l.col "
+        "WHERE l.game_id = ? AND t.pack_file IS NOT NULL" + row_sql,
+        [game_id, *row_params],
+    ).fetchall()
+    if not pos_rows:
+        return out
+
+    detections: dict[tuple, list] = {}
+    for seg, fidx, r, c, cls, cx, cy, w, h in conn.execute(
+        "SELECT segment, frame_idx, row, col, class_id, cx, cy, w, h "
+        "FROM labels WHERE game_id = ? AND frame_idx >= 0 ORDER BY id",
+        (game_id,),
+    ):
+        detections.setdefault((seg, fidx, r, c), []).append((cls, cx, cy, w, h))
+
+    pos_rowids = set()
+    for rowid, seg, fidx, r, c, pf, po, ps in sorted(pos_rows, key=lambda x: x[0]):
+        pos_rowids.add(rowid)
+        out.positives.append(
+            (tile_stem(seg, fidx, r, c), pf, po, ps, detections[(seg, fidx, r, c)])
+        )
+    n_pos = len(out.positives)
+
+    # Hard negatives: positives x neighbour offsets, joined on the tiles PK.
+    offsets = ",".join(["(?,?,?)"] * len(_HARD_NEG_OFFSETS))
+    hard_rows = conn.execute(
+        "WITH pos(segment, frame_idx, row, col) AS ("
+        "  SELECT DISTINCT t.segment, t.frame_idx, t.row, t.col "
+        "  FROM labels l CROSS JOIN tiles t ON t.game_id = l.game_id "
+        "  AND t.segment = l.segment AND t.frame_idx = l.frame_idx "
+        "  AND t.row = l.row AND t.col = l.col "
+        "  WHERE l.game_id = ? AND t.pack_file IS NOT NULL" + row_sql + "), "
+        f"off(dr, dc, df) AS (VALUES {offsets}) "
+        "SELECT DISTINCT t.rowid, t.segment, t.frame_idx, t.row, t.col, "
+        "t.pack_file, t.pack_offset, t.pack_size "
+        "FROM pos p CROSS JOIN off o JOIN tiles t ON t.game_id = ? "
+        "AND t.segment = p.segment AND t.frame_idx = p.frame_idx + o.df "
+        "AND t.row = p.row + o.dr AND t.col = p.col + o.dc "
+        "WHERE t.pack_file IS NOT NULL" + row_sql,
+        [
+            game_id,
+            *row_params,
+            *[v for o in _HARD_NEG_OFFSETS for v in o],
+            game_id,
+            *row_params,
+        ],
+    ).fetchall()
+    hard = sorted((r for r in hard_rows if r[0] not in pos_rowids), key=lambda x: x[0])
+    max_hard = int(n_pos * neg_ratio * hard_neg_ratio)
+    if len(hard) > max_hard:
+        hard = sorted(rng.sample(hard, max_hard), key=lambda x: x[0])
+    taken = pos_rowids | {r[0] for r in hard}
+
+    # Random negatives: sample rowids from the covering partial index, then
+    # fetch only the chosen rows.
+    max_random = int(n_pos * neg_ratio * (1 - hard_neg_ratio))
+    chosen: list[tuple] = []
+    if max_random > 0:
+        pool = [
+            rowid
+            for (rowid,) in conn.execute(
+                "SELECT t.rowid FROM tiles t INDEXED BY idx_tiles_packed "
+                "WHERE t.game_id = ? AND t.pack_offset IS NOT NULL" + row_sql,
+                [game_id, *row_params],
+            )
+            if rowid not in taken
+        ]
+        pool.sort()
+        picked = sorted(rng.sample(pool, min(max_random, len(pool))))
+        for start in range(0, len(picked), _ROWID_CHUNK):
+            chunk = picked[start : start + _ROWID_CHUNK]
+            chosen.extend(
+                conn.execute(
+                    "SELECT rowid, segment, frame_idx, row, col, "
+                    "pack_file, pack_offset, pack_size FROM tiles "
+                    f"WHERE rowid IN ({','.join('?' * len(chunk))}) ORDER BY rowid",
+                    chunk,
+                ).fetchall()
+            )
+
+    for _rowid, seg, fidx, r, c, pf, po, ps in hard + chosen:
+        out.negatives.append((tile_stem(seg, fidx, r, c), pf, po, ps))
+    out.n_hard = len(hard)
+    out.n_random = len(chosen)
+    return out
+
+
+def manifest_fingerprint(conn: sqlite3.Connection, game_ids: list[str]) -> list:
+    """Content fingerprint of the rows sampling reads, per game.
+
+    Label count / max id / value sums, and per pack file the packed-tile
+    count / max rowid / offset + size sums. Grouping by ``pack_file`` catches
+    tiles re-pointed at another pack with the same offsets (re-tiling and
+    ``record_segment_pack`` rewrite the rows), which the cached samples would
+    otherwise serve stale paths for. The tile aggregates are answered from
+    ``idx_tiles_packed`` alone, so this stays cheap on a full manifest, and
+    unlike file mtimes it does not change on WAL checkpoints.
+    """
+    fp = []
+    for gid in game_ids:
+        labels = conn.execute(
+            "SELECT COUNT(*), MAX(id), TOTAL(class_id + cx + cy + w + h) "
+            "FROM labels WHERE game_id = ?",
+            (gid,),
+        ).fetchone()
+        packs = conn.execute(
+            "SELECT pack_file, COUNT(*), MAX(rowid), TOTAL(pack_offset), "
+            "TOTAL(pack_size) FROM tiles INDEXED BY idx_tiles_packed "
+            "WHERE game_id = ? AND pack_offset IS NOT NULL "
+            "GROUP BY pack_file ORDER BY pack_file",
+            (gid,),
+        ).fetchall()
+        fp.append([gid, list(labels), [list(p) for p in packs]])
+    return fp
+
+
+def sample_cache_key(conn: sqlite3.Connection, game_ids: list[str], params) -> str:
+    blob = json.dumps(
+        {
+            "version": SAMPLE_CACHE_VERSION,
+            "manifest": manifest_fingerprint(conn, game_ids),
+            "params": params,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(blob.encode()).hexdigest()[:20]
+
+
+def default_cache_dir(db_path: Path | str) -> Path:
+    db_path = Path(db_path)
+    return db_path.with_name(f"{db_path.stem}_samples")
+
+
+def build_samples(
+    db_path: Path | str,
+    game_ids: list[str],
+    *,
+    neg_ratio: float,
+    hard_neg_ratio: float,
+    seed: int,
+    exclude_rows=frozenset(),
+    cache_dir: Path | str | None = None,
+) -> dict[str, GameSample]:
+    """Sample every game, reusing the on-disk cache when the manifest is unchanged.
+
+    ``cache_dir=None`` uses ``<db stem>_samples/`` next to the manifest.
+    """
+    db_path = Path(db_path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir(db_path)
+    params = {
+        "neg_ratio": neg_ratio,
+        "hard_neg_ratio": hard_neg_ratio,
+        "seed": seed,
+        "exclude_rows": sorted(exclude_rows),
+    }
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        check_sampling_schema(conn, db_path)
+        backfilled = backfill_label_keys(conn)
+        if backfilled:
+            _logger.info("Parsed tile keys for %d label rows", backfilled)
+        key = sample_cache_key(conn, game_ids, params)
+        cache_path = cache_dir / f"samples_{key}.json"
+        if cache_path.exists():
+            try:
+                cached = json.loads(cache_path.read_text())
+                _logger.info("Loaded tile samples from %s", cache_path)
+                return {gid: GameSample(**g) for gid, g in cached["games"].items()}
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                _logger.warning(
+                    "Ignoring unreadable sample cache %s: %s", cache_path, e
+                )
+
+        samples = {
+            gid: sample_game(
+                conn,
+                gid,
+                neg_ratio=neg_ratio,
+                hard_neg_ratio=hard_neg_ratio,
+                seed=seed,
+                exclude_rows=exclude_rows,
+            )
+            for gid in game_ids
+        }
+    finally:
+        conn.close()
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps(
+                {"params": params, "games": {g: vars(s) for g, s in samples.items()}}
+            )
+        )
+        tmp.replace(cache_path)
+    except OSError as e:
+        _logger.warning("Could not write sample cache %s: %s", cache_path, e)
+    return samples
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Tile sampling schema")
+    sub = parser.add_subparsers(dest="command", required=True)
+    mig = sub.add_parser("migrate", help="Add the sampling columns and indexes")
+    mig.add_argument("--db", type=Path, required=True, help="manifest.db")
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(str(args.db))
+    try:
+        backfilled = migrate_sampling_schema(conn)
+    finally:
+        conn.close()
+    _logger.info("Migrated %s (%d label rows parsed)", args.db, backfilled)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,15 @@ Remote mode: reads video from network share, tiles locally, writes to share.
 
 Both modes write tiles to the same output directory (D: on server, exposed
 as \\\\192.168.86.152\\training\\tiles_640). Lock files prevent two machines
-from tiling the same game.
+from tiling the same game. Which segments still need tiles comes from the
+segment status table next to the tiles directory (see segment_status.py),
+reconciled from disk the first time a game is seen.
+
+With --stream, segments are decoded, tiled and JPEG-encoded in memory straight
+into tile packs and the manifest (see stream_tile.py) instead of writing temp
+frames and loose tiles. Segments then run in parallel up to --cpu-budget. It
+writes manifest.db, which is WAL and must stay on local disk, so it is for
+server mode only.
 
 Usage:
     # Server (local I/O, fastest):
@@ -14,6 +22,9 @@ Usage:
     # Laptop (over network, while GPU trains):
     uv run python -m training.data_prep.mass_tile --remote \\\\192.168.86.152\\video \\\\192.168.86.152\\training
 
+    # Server, in-memory decode-to-pack:
+    uv run python -m training.data_prep.mass_tile --stream --cpu-budget 12
+
     # Dry run:
     uv run python -m training.data_prep.mass_tile --dry-run
     uv run python -m training.data_prep.mass_tile --game flash__2024.09.27_vs_RNYFC_Black_home
@@ -31,6 +42,24 @@ from pathlib import Path
 
 from training.data_prep.extract_frames import extract_frames
 from training.data_prep.game_registry import load_registry
+from training.data_prep.manifest import (
+    DEFAULT_DB_PATH,
+    DEFAULT_PACK_DIR,
+    open_db,
+    record_segment_pack,
+)
+from training.data_prep.segment_status import (
+    discover,
+    mark_segment,
+    open_status_db,
+    segment_counts,
+    status_db_path,
+)
+from training.data_prep.stream_tile import (
+    DEFAULT_ENCODE_THREADS,
+    segment_workers,
+    tile_segments,
+)
 from training.data_prep.tile_frames import tile_frame
 
 logging.basicConfig(
@@ -42,6 +71,7 @@ logger = logging.getLogger(__name__)
 
 STAGING_DIR = Path("D:/training_data/staging")
 TILES_DIR = Path("D:/training_data/tiles_640")
+LEGACY_TILES_DIR = Path("F:/training_data/tiles_640")
 
 DIFF_THRESHOLD = 2.0
 FRAME_INTERVAL = 4  # Extract every 4th frame (~6 fps at 24.6 fps source)
@@ -152,30 +182,52 @@ def copy_video_to_staging(game: dict, staging_dir: Path) -> list[Path]:
     return staged
 
 
-def tile_game(game: dict, videos: list[Path], tiles_dir: Path) -> dict:
-    """Extract frames and tile a single game from staged videos."""
+def game_segments(game: dict) -> list[str]:
+    """Segment stems a game is tiled from (the corrected video, if used)."""
+    if game["video_source"] == "corrected" and game["corrected_video"]:
+        return [Path(game["corrected_video"]).stem]
+    return [Path(s).stem for s in game["segments"]]
+
+
+def tile_game(
+    game: dict, videos: list[Path], tiles_dir: Path, status_conn=None
+) -> dict:
+    """Extract frames and tile a single game from staged videos.
+
+    With ``status_conn`` (the segment status table), already-tiled segments
+    are skipped from the table and each new one is recorded there; without
+    it they are found by globbing the tile directory.
+    """
     game_id = game["game_id"]
     needs_flip = game.get("needs_flip", False)
     game_tiles_dir = tiles_dir / game_id
 
     total_frames = 0
     total_tiles = 0
+    tiled = segment_counts(status_conn, game_id, "tiled") if status_conn else None
 
     for video in sorted(videos):
         segment_id = video.stem
 
         # Skip if this segment already has tiles
-        existing = (
-            list(game_tiles_dir.glob(f"{glob.escape(segment_id)}_*_r0_c0.jpg"))
-            if game_tiles_dir.exists()
-            else []
-        )
-        if existing:
+        if tiled is not None:
+            existing_tiles = tiled.get(segment_id)
+            already = segment_id in tiled
+        else:
+            existing = (
+                list(game_tiles_dir.glob(f"{glob.escape(segment_id)}_*_r0_c0.jpg"))
+                if game_tiles_dir.exists()
+                else []
+            )
+            existing_tiles = len(existing) * TILE_ROWS * TILE_COLS
+            already = bool(existing)
+        if already:
+            n_existing = (existing_tiles or 0) // (TILE_ROWS * TILE_COLS)
             logger.info(
-                "  Skipping %s (already tiled, %d frames)", segment_id, len(existing)
+                "  Skipping %s (already tiled, %d frames)", segment_id, n_existing
             )
-            total_tiles += len(existing) * TILE_ROWS * TILE_COLS
-            total_frames += len(existing)
+            total_tiles += existing_tiles or 0
+            total_frames += n_existing
             continue
 
         # Extract frames to temp dir
@@ -207,18 +259,129 @@ def tile_game(game: dict, videos: list[Path], tiles_dir: Path) -> dict:
 
         total_frames += n_frames
         total_tiles += n_tiles
+        if status_conn is not None:
+            mark_segment(
+                status_conn,
+                game_id,
+                segment_id,
+                "tiled",
+                count=n_tiles,
+                video_path=str(video),
+            )
         logger.info("  %s: %d frames → %d tiles", segment_id, n_frames, n_tiles)
 
     return {"game_id": game_id, "frames": total_frames, "tiles": total_tiles}
 
 
-def game_already_tiled(game: dict, tiles_dir: Path) -> bool:
-    """Check if a game already has tiles on D: or F:."""
-    for base in [tiles_dir, Path("F:/training_data/tiles_640")]:
-        game_tiles = base / game["game_id"]
-        if game_tiles.exists():
-            return True
-    return False
+def stream_tile_game(
+    game: dict,
+    videos: list[Path],
+    pack_dir: Path,
+    manifest_conn,
+    status_conn=None,
+    *,
+    cpu_budget: int | None = None,
+    encode_threads: int = DEFAULT_ENCODE_THREADS,
+) -> dict:
+    """Tile a game's videos in memory straight into segment packs.
+
+    Segments already tiled (per the status table, else an existing pack) are
+    skipped. The rest run in parallel, up to ``cpu_budget`` cores; each
+    finished segment is recorded in the manifest with its pack offsets and
+    marked tiled + packed in the status table.
+    """
+    game_id = game["game_id"]
+    out_dir = pack_dir / game_id
+    if status_conn is not None:
+        tiled = segment_counts(status_conn, game_id, "tiled")
+        todo = [v for v in sorted(videos) if v.stem not in tiled]
+    else:
+        todo = [v for v in sorted(videos) if not (out_dir / f"{v.stem}.pack").exists()]
+    for video in sorted(set(videos) - set(todo)):
+        logger.info("  Skipping %s (already tiled)", video.stem)
+
+    workers = segment_workers(cpu_budget, encode_threads, len(todo))
+    if todo:
+        logger.info(
+            "  Streaming %d segments, %d at a time x %d encode threads",
+            len(todo),
+            workers,
+            encode_threads,
+        )
+    total = {"game_id": game_id, "frames": 0, "tiles": 0, "pack_bytes": 0}
+    results = tile_segments(
+        [(v, out_dir / f"{v.stem}.pack") for v in todo],
+        workers=workers,
+        frame_interval=FRAME_INTERVAL,
+        diff_threshold=DIFF_THRESHOLD,
+        flip=game.get("needs_flip", False),
+        cols=TILE_COLS,
+        rows=TILE_ROWS,
+        tile_size=TILE_SIZE,
+        encode_threads=encode_threads,
+    )
+    for seg in results:
+        segment = seg["segment"]
+        record_segment_pack(
+            manifest_conn, game_id, segment, Path(seg["pack_path"]), seg["layout"]
+        )
+        if status_conn is not None:
+            for stage in ("tiled", "packed"):
+                mark_segment(
+                    status_conn,
+                    game_id,
+                    segment,
+                    stage,
+                    count=seg["tiles"],
+                    video_path=seg["video"],
+                )
+        total["frames"] += seg["frames"]
+        total["tiles"] += seg["tiles"]
+        total["pack_bytes"] += seg["pack_size"]
+        logger.info(
+            "  %s: %d frames → %d tiles, %.1f MB pack",
+            segment,
+            seg["frames"],
+            seg["tiles"],
+            seg["pack_size"] / 1e6,
+        )
+    return total
+
+
+def games_needing_tiles(
+    status_conn,
+    games: list[dict],
+    tiles_dir: Path,
+    pack_dir: Path = DEFAULT_PACK_DIR,
+) -> dict[str, list[str]]:
+    """game_id -> its untiled segments, for the games that have any.
+
+    One indexed query; games the status table hasn't seen are first
+    reconciled from their tile directories on D: and F: and their packs in
+    ``pack_dir``. A packed segment counts as tiled, whichever path made it:
+    ``manifest pack --delete-loose`` leaves only the pack behind.
+    """
+    needing = discover(
+        status_conn,
+        "tiled",
+        {g["game_id"]: g["path"] for g in games},
+        tiles_dirs=[tiles_dir, LEGACY_TILES_DIR],
+        pack_dir=pack_dir,
+        segments={g["game_id"]: game_segments(g) for g in games},
+    )
+    out: dict[str, list[str]] = {}
+    for game_id, segment, _video in needing:
+        out.setdefault(game_id, []).append(segment)
+    return out
+
+
+def game_already_tiled(
+    game: dict, tiles_dir: Path, status_conn=None, pack_dir: Path = DEFAULT_PACK_DIR
+) -> bool:
+    """Check if every segment of a game has tiles (on D: or F:, or packed)."""
+    if status_conn is None:
+        status_conn = open_status_db(status_db_path(tiles_dir.parent))
+    return not games_needing_tiles(status_conn, [game], tiles_dir, pack_dir)
 
 
 def mass_tile(
@@ -228,12 +391,20 @@ def mass_tile(
     dry_run: bool = False,
     game_filter: str | None = None,
     video_share: Path | None = None,
+    stream: bool = False,
+    pack_dir: Path = DEFAULT_PACK_DIR,
+    manifest_db: Path = DEFAULT_DB_PATH,
+    cpu_budget: int | None = None,
 ):
     """Tile all games with pipelined F:→D: copy.
 
     In remote mode (video_share set), reads video directly from network
     share without staging copy. Tiles written to tiles_dir (which may
     also be a network share path).
+
+    With ``stream``, games are tiled by ``stream_tile_game`` into packs in
+    ``pack_dir``, recorded in ``manifest_db``, using up to ``cpu_budget``
+    cores; no loose tiles are written.
     """
     if games is None:
         games = load_registry()
@@ -250,13 +421,16 @@ def mass_tile(
             return
 
     # Skip excluded and already-tiled games
+    status_conn = open_status_db(status_db_path(tiles_dir.parent))
+    included = [g for g in games if not g.get("exclude")]
+    needing = games_needing_tiles(status_conn, included, tiles_dir, pack_dir)
     to_process = []
     skipped = 0
     for g in games:
         if g.get("exclude"):
             logger.info("Excluding %s: %s", g["game_id"], g.get("exclude_reason", ""))
             continue
-        if game_already_tiled(g, tiles_dir):
+        if g["game_id"] not in needing:
             logger.info("Already tiled: %s", g["game_id"])
             skipped += 1
             continue
@@ -286,6 +460,7 @@ def mass_tile(
 
     tiles_dir.mkdir(parents=True, exist_ok=True)
     remote_mode = video_share is not None
+    manifest_conn = open_db(manifest_db, create=True) if stream else None
 
     if remote_mode:
         logger.info(
@@ -358,7 +533,17 @@ def mass_tile(
                     copy_thread.start()
 
             # Tile this game
-            result = tile_game(game, videos, tiles_dir)
+            if stream:
+                result = stream_tile_game(
+                    game,
+                    videos,
+                    pack_dir,
+                    manifest_conn,
+                    status_conn,
+                    cpu_budget=cpu_budget,
+                )
+            else:
+                result = tile_game(game, videos, tiles_dir, status_conn)
 
             # Don't delete staging — laptop may still need it for remote tiling.
             # Staging cleanup happens separately after all machines are done.
@@ -385,6 +570,9 @@ def mass_tile(
             logger.exception("Failed to tile %s", game_id)
             release_game(game_id, tiles_dir)
 
+    if manifest_conn is not None:
+        manifest_conn.close()
+
     if not remote_mode and staging_dir.exists() and not any(staging_dir.iterdir()):
         staging_dir.rmdir()
 
@@ -416,7 +604,22 @@ def main():
         type=Path,
         help="JSON file with list of game_ids to process (for splitting work between machines)",
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Decode and tile in memory straight into packs (server only)",
+    )
+    parser.add_argument("--pack-dir", type=Path, default=DEFAULT_PACK_DIR)
+    parser.add_argument("--manifest-db", type=Path, default=DEFAULT_DB_PATH)
+    parser.add_argument(
+        "--cpu-budget",
+        type=int,
+        default=None,
+        help="Cores for --stream (default: all); segments run in parallel",
+    )
     args = parser.parse_args()
+    if args.stream and args.remote:
+        parser.error("--stream writes manifest.db (WAL), so it must run on the server")
 
     video_share = None
     tiles_dir = args.tiles_dir
@@ -441,6 +644,10 @@ def main():
         dry_run=args.dry_run,
         game_filter=game_filter,
         video_share=video_share,
+        stream=args.stream,
+        pack_dir=args.pack_dir,
+        manifest_db=args.manifest_db,
+        cpu_budget=args.cpu_budget,
     )
 
 
@@ -0,0 +1,449 @@
+"""Parallel, resumable segment packing for ``manifest pack``.
+
+Packing is I/O bound on two different disks: loose tiles are read from the
+tiles HDD and packs are written to another drive. ``pack_all_games`` used to
+pack one segment at a time, so one disk always idled while the other worked.
+:class:`PackScheduler` keeps both busy:
+
+- **one long-lived reader pool per source device** (``read_threads`` threads
+  — enough queue depth for the HDD elevator without thrashing the head);
+- **one writer thread per destination device**, so writes to a disk are
+  sequential even when several segments are in flight;
+- **several segments in flight**, at most ``segments_per_device`` touching any
+  one device. Each segment streams reads into its pack in file order through
+  a bounded window, so memory stays at ``window`` tiles per segment.
+
+All SQLite work (tile lists, pack offsets, commits) stays on the calling
+thread; worker threads only do file I/O.
+
+Packs are written to ``<segment>.pack.partial``, fsynced, verified against the
+summed tile sizes and renamed into place before the tiles table is updated.
+Each finished step is appended to a JSONL journal (default
+``<pack_dir>/pack_journal.jsonl``):
+
+    {"game_id": ..., "segment": ..., "state": "packed", "tiles": ..., ...}
+    {"game_id": ..., "segment": ..., "state": "cleaned", "deleted": ...}
+
+An interrupted run resumes from the database (segments with unpacked tiles
+are packed again from scratch) plus the journal: segments journaled as
+``packed`` but not ``cleaned`` have their loose tiles deleted on the next
+``--delete-loose`` run instead of being left on disk forever.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from training.data_prep.segment_status import mark_segment
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_READ_THREADS = 8
+DEFAULT_SEGMENTS_PER_DEVICE = 2
+DEFAULT_WINDOW = 32
+JOURNAL_NAME = "pack_journal.jsonl"
+
+
+def device_of(path: Path) -> int:
+    """``st_dev`` of ``path`` or its nearest existing ancestor."""
+    p = Path(path).absolute()
+    while not p.exists() and p.parent != p:
+        p = p.parent
+    return os.stat(p).st_dev
+
+
+def _tile_path(game_tile_dir: Path, segment: str, fidx: int, r: int, c: int) -> Path:
+    return game_tile_dir / f"{segment}_frame_{fidx:06d}_r{r}_c{c}.jpg"
+
+
+def write_segment_pack(
+    file_list: list[tuple[Path, int, int, int]],
+    pack_path: Path,
+    read_pool: ThreadPoolExecutor,
+    write_pool: ThreadPoolExecutor | None = None,
+    window: int = DEFAULT_WINDOW,
+) -> list[tuple[int, int, int, int, int]]:
+    """Stream the loose tiles in ``file_list`` into ``pack_path`` in order.
+
+    Reads run on ``read_pool``; see :func:`write_pack`.
+    """
+    return write_pack(
+        ((src.read_bytes, fidx, r, c) for src, fidx, r, c in file_list),
+        pack_path,
+        read_pool,
+        write_pool,
+        window,
+    )
+
+
+def write_pack(
+    producers: Iterable[tuple[Callable[[], bytes], int, int, int]],
+    pack_path: Path,
+    pool: ThreadPoolExecutor,
+    write_pool: ThreadPoolExecutor | None = None,
+    window: int = DEFAULT_WINDOW,
+) -> list[tuple[int, int, int, int, int]]:
+    """Write the bytes of ``producers`` to ``pack_path`` in order; returns the layout.
+
+    Each producer is ``(fn, frame_idx, row, col)``; ``fn()`` returns the
+    tile's JPEG bytes (a file read, or an encode for ``stream_tile``). They
+    run on ``pool`` with at most ``window`` outstanding, and ``producers`` is
+    only advanced as the window drains. Writes run on ``write_pool`` (or
+    inline) in order. The pack is written to a ``.partial`` file, fsynced,
+    size-verified and renamed into place, so a crash never leaves a truncated
+    pack under the final name.
+
+    Returns ``[(frame_idx, row, col, offset, size)]`` in pack order.
+    """
+    partial = pack_path.with_name(pack_path.name + ".partial")
+    layout = []
+    offset = 0
+    reads: deque[tuple[Future, int, int, int]] = deque()
+    writes: deque[Future] = deque()
+    items = iter(producers)
+
+    def _fill():
+        while len(reads) < window:
+            item = next(items, None)
+            if item is None:
+                return
+            fn, fidx, r, c = item
+            reads.append((pool.submit(fn), fidx, r, c))
+
+    try:
+        with open(partial, "wb") as pf:
+            _fill()
+            while reads:
+                fut, fidx, r, c = reads.popleft()
+                data = fut.result()
+                _fill()
+                if write_pool is None:
+                    pf.write(data)
+                else:
+                    writes.append(write_pool.submit(pf.write, data))
+                    while len(writes) > window:
+                        writes.popleft().result()
+                layout.append((fidx, r, c, offset, len(data)))
+                offset += len(data)
+            while writes:
+                writes.popleft().result()
+            pf.flush()
+            os.fsync(pf.fileno())
+    except BaseException:
+        for fut, *_ in reads:
+            fut.cancel()
+        try:
+            partial.unlink()
+        except OSError:
+            pass
+        raise
+
+    actual_size = os.path.getsize(partial)
+    if actual_size != offset:
+        partial.unlink()
+        raise RuntimeError(
+            f"Pack verification failed for {pack_path}: "
+            f"expected {offset} bytes, got {actual_size}"
+        )
+    os.replace(partial, pack_path)
+    return layout
+
+
+class PackJournal:
+    """Append-only JSONL record of finished packing steps."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> dict[tuple[str, str], dict]:
+        """Latest record per ``(game_id, segment)``; torn last lines are ignored."""
+        state: dict[tuple[str, str], dict] = {}
+        if not self.path.exists():
+            return state
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    state[(rec["game_id"], rec["segment"])] = rec
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return state
+
+    def append(self, **record) -> None:
+        record["t"] = round(time.time(), 3)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+class PackScheduler:
+    """Packs many segments concurrently under per-device limits.
+
+    Args:
+        conn: manifest connection; only used from the calling thread.
+        tiles_dir / pack_dir: as for ``manifest.pack_segment``.
+        delete_loose: delete loose tiles once a segment's pack is committed.
+        read_threads: reader threads per source device.
+        segments_per_device: max segments in flight touching one device.
+        window: outstanding reads (and writes) per segment.
+        journal_path: progress journal; ``<pack_dir>/pack_journal.jsonl``
+            by default.
+        status_conn: segment status connection; packed segments are marked
+            there (``segment_status.py``).
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        tiles_dir: Path,
+        pack_dir: Path,
+        delete_loose: bool = False,
+        read_threads: int = DEFAULT_READ_THREADS,
+        segments_per_device: int = DEFAULT_SEGMENTS_PER_DEVICE,
+        window: int = DEFAULT_WINDOW,
+        journal_path: Path | None = None,
+        status_conn: sqlite3.Connection | None = None,
+    ):
+        if read_threads < 1 or segments_per_device < 1 or window < 1:
+            raise ValueError(
+                "read_threads, segments_per_device and window must be >= 1"
+            )
+        self.conn = conn
+        self.tiles_dir = Path(tiles_dir)
+        self.pack_dir = Path(pack_dir)
+        self.delete_loose = delete_loose
+        self.read_threads = read_threads
+        self.segments_per_device = segments_per_device
+        self.window = window
+        self.journal = PackJournal(journal_path or self.pack_dir / JOURNAL_NAME)
+        self.status_conn = status_conn
+        self._readers: dict[int, ThreadPoolExecutor] = {}
+        self._writers: dict[int, ThreadPoolExecutor] = {}
+
+    def _reader(self, dev: int) -> ThreadPoolExecutor:
+        if dev not in self._readers:
+            self._readers[dev] = ThreadPoolExecutor(
+                self.read_threads, thread_name_prefix=f"pack-read-{dev}"
+            )
+        return self._readers[dev]
+
+    def _writer(self, dev: int) -> ThreadPoolExecutor:
+        if dev not in self._writers:
+            self._writers[dev] = ThreadPoolExecutor(
+                1, thread_name_prefix=f"pack-write-{dev}"
+            )
+        return self._writers[dev]
+
+    def _shutdown(self) -> None:
+        for pool in [*self._readers.values(), *self._writers.values()]:
+            pool.shutdown(wait=True, cancel_futures=True)
+        self._readers.clear()
+        self._writers.clear()
+
+    def _segment_tiles(self, game_id: str, segment: str) -> list[tuple]:
+        return self.conn.execute(
+            "SELECT frame_idx, row, col FROM tiles "
+            "WHERE game_id = ? AND segment = ? ORDER BY frame_idx, row, col",
+            (game_id, segment),
+        ).fetchall()
+
+    def pending_segments(self, game_ids: list[str]) -> list[tuple[str, str]]:
+        """Segments that still have tiles without a pack, in game/segment order."""
+        jobs = []
+        for game_id in game_ids:
+            rows = self.conn.execute(
+                "SELECT DISTINCT segment FROM tiles "
+                "WHERE game_id = ? AND pack_file IS NULL ORDER BY segment",
+                (game_id,),
+            ).fetchall()
+            jobs.extend((game_id, seg) for (seg,) in rows)
+        return jobs
+
+    def _delete_loose(self, game_id: str, segment: str) -> int:
+        game_tile_dir = self.tiles_dir / game_id
+        deleted = 0
+        for fidx, r, c in self._segment_tiles(game_id, segment):
+            try:
+                _tile_path(game_tile_dir, segment, fidx, r, c).unlink()
+                deleted += 1
+            except FileNotFoundError:
+                pass
+        self.journal.append(
+            game_id=game_id, segment=segment, state="cleaned", deleted=deleted
+        )
+        return deleted
+
+    def _still_packed(self, game_id: str, segment: str, pack_file: str | None) -> bool:
+        """True if every tile of the segment still points into ``pack_file``.
+
+        A journaled "packed" record can be stale: the game may have been
+        re-tiled and re-cataloged since (``pack_file`` back to NULL), and then
+        the loose tiles on disk are the only copy.
+        """
+        if not pack_file:
+            return False
+        total, packed = self.conn.execute(
+            "SELECT COUNT(*), "
+            "COALESCE(SUM(pack_file = ? AND pack_offset IS NOT NULL), 0) "
+            "FROM tiles WHERE game_id = ? AND segment = ?",
+            (pack_file, game_id, segment),
+        ).fetchone()
+        return total > 0 and packed == total
+
+    def _finish_interrupted_cleanup(self, game_ids: list[str]) -> int:
+        wanted = set(game_ids)
+        deleted = 0
+        for (game_id, segment), rec in self.journal.load().items():
+            if game_id not in wanted or rec.get("state") != "packed":
+                continue
+            if not self._still_packed(game_id, segment, rec.get("pack_file")):
+                logger.info(
+                    "  %s/%s: journaled pack no longer matches the manifest, "
+                    "keeping loose tiles",
+                    game_id,
+                    segment,
+                )
+                continue
+            logger.info("  %s/%s: resuming loose-tile cleanup", game_id, segment)
+            deleted += self._delete_loose(game_id, segment)
+        return deleted
+
+    def _commit(self, game_id, segment, pack_path: Path, layout) -> None:
+        pack_path_str = str(pack_path)
+        self.conn.executemany(
+            "UPDATE tiles SET pack_file=?, pack_offset=?, pack_size=? "
+            "WHERE game_id=? AND segment=? AND frame_idx=? AND row=? AND col=?",
+            [
+                (pack_path_str, offset, size, game_id, segment, fidx, r, c)
+                for fidx, r, c, offset, size in layout
+            ],
+        )
+        self.conn.commit()
+        if self.status_conn is not None:
+            mark_segment(
+                self.status_conn, game_id, segment, "packed", count=len(layout)
+            )
+        self.journal.append(
+            game_id=game_id,
+            segment=segment,
+            state="packed",
+            pack_file=pack_path_str,
+            tiles=len(layout),
+            bytes=sum(x[4] for x in layout),
+        )
+
+    def run(self, game_ids: list[str]) -> dict:
+        """Pack every pending segment of ``game_ids``; returns aggregate stats.
+
+        Raises ``RuntimeError`` after all other segments have finished if any
+        segment failed; rerunning resumes with just the failed ones.
+        """
+        t0 = time.time()
+        total = {
+            "segments": 0,
+            "tiles_packed": 0,
+            "pack_size": 0,
+            "loose_deleted": 0,
+            "elapsed": 0.0,
+        }
+        if self.delete_loose:
+            total["loose_deleted"] += self._finish_interrupted_cleanup(game_ids)
+
+        queue = deque(self.pending_segments(game_ids))
+        logger.info(
+            "Packing %d segments (%d per device, %d read threads per source)",
+            len(queue),
+            self.segments_per_device,
+            self.read_threads,
+        )
+        busy: dict[int, int] = {}
+        running: dict[Future, tuple] = {}
+        failed: list[tuple[str, str, BaseException]] = []
+        jobs = ThreadPoolExecutor(thread_name_prefix="pack-segment")
+
+        def _devices(game_id):
+            out_dir = self.pack_dir / game_id
+            out_dir.mkdir(parents=True, exist_ok=True)
+            return device_of(self.tiles_dir / game_id), device_of(out_dir)
+
+        def _submit_ready():
+            for _ in range(len(queue)):
+                game_id, segment = queue.popleft()
+                src_dev, dst_dev = _devices(game_id)
+                devs = {src_dev, dst_dev}
+                if any(busy.get(d, 0) >= self.segments_per_device for d in devs):
+                    queue.append((game_id, segment))
+                    continue
+                for d in devs:
+                    busy[d] = busy.get(d, 0) + 1
+                game_tile_dir = self.tiles_dir / game_id
+                file_list = [
+                    (_tile_path(game_tile_dir, segment, fidx, r, c), fidx, r, c)
+                    for fidx, r, c in self._segment_tiles(game_id, segment)
+                ]
+                pack_path = self.pack_dir / game_id / f"{segment}.pack"
+                fut = jobs.submit(
+                    write_segment_pack,
+                    file_list,
+                    pack_path,
+                    self._reader(src_dev),
+                    self._writer(dst_dev),
+                    self.window,
+                )
+                running[fut] = (game_id, segment, pack_path, devs, time.time())
+
+        try:
+            _submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    game_id, segment, pack_path, devs, started = running.pop(fut)
+                    for d in devs:
+                        busy[d] -= 1
+                    try:
+                        layout = fut.result()
+                    except Exception as e:
+                        logger.error("  %s/%s: packing failed: %s", game_id, segment, e)
+                        failed.append((game_id, segment, e))
+                        continue
+                    self._commit(game_id, segment, pack_path, layout)
+                    deleted = (
+                        self._delete_loose(game_id, segment) if self.delete_loose else 0
+                    )
+                    size = sum(x[4] for x in layout)
+                    total["segments"] += 1
+                    total["tiles_packed"] += len(layout)
+                    total["pack_size"] += size
+                    total["loose_deleted"] += deleted
+                    deleted_info = f", {deleted} deleted" if self.delete_loose else ""
+                    logger.info(
+                        "    %s/%s: %d tiles, %.1fMB (%.1fs)%s",
+                        game_id,
+                        segment,
+                        len(layout),
+                        size / 1024 / 1024,
+                        time.time() - started,
+                        deleted_info,
+                    )
+                _submit_ready()
+        finally:
+            jobs.shutdown(wait=True, cancel_futures=True)
+            self._shutdown()
+
+        total["elapsed"] = time.time() - t0
+        if failed:
+            names = ", ".join(f"{g}/{s}" for g, s, _ in failed)
+            raise RuntimeError(
+                f"{len(failed)} segment(s) failed to pack: {names}"
+            ) from failed[0][2]
+        return total
@@ -0,0 +1,476 @@
+"""Per-segment processing status — labeled / tiled / packed.
+
+Work discovery used to probe the filesystem: ``rglob`` every game's video
+directory for ``[F][0@0]`` segments, then one glob per segment into the label
+or tile directory (thousands of directory reads over SMB per submit or worker
+poll). The producers now record what they made, and discovery is an indexed
+query:
+
+    segment_status (game_id, segment) ->
+        video_path,
+        labeled_at / labeled_version / labeled_count,
+        tiled_at   / tiled_version   / tiled_count,
+        packed_at  / packed_version  / packed_count
+
+``*_at`` is NULL until that stage has produced output, and a partial index
+over the NULLs of each stage makes "what still needs X" a range scan.
+``*_version`` is the producing code (git revision, else package version);
+rows re-derived from disk say ``reconciled``.
+
+The disk stays the source of truth: ``reconcile()`` re-derives the table for
+a set of games with one directory listing per game and output directory,
+instead of one glob per segment. ``discover()`` does this automatically for
+games it has never seen, and ``python -m training.data_prep.segment_status
+reconcile`` does it on demand (after hand-deleting tiles, say).
+
+The database lives in the training_data root on the server's local disk,
+next to tiles_640/ and labels_640_ext/, and only processes on the server open
+it: SQLite written from other machines over SMB gets corrupted (DECISIONS.md,
+2026-04-09, "HTTP API-only architecture"). ``open_status_db`` keeps the table
+in memory when given a share path, so workers on other machines derive it
+from disk for each discovery and leave their output only on disk.
+``discover()`` re-checks every game the table says still needs work, so the
+server picks that output up without a full reconcile.
+
+Usage:
+    uv run python -m training.data_prep.segment_status reconcile
+    uv run python -m training.data_prep.segment_status needs tiled
+"""
+
+import argparse
+import functools
+import logging
+import os
+import re
+import sqlite3
+import subprocess
+import time
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+STATUS_DB_NAME = "segment_status.db"
+MEMORY_DB = ":memory:"
+DEFAULT_STATUS_DB = Path("D:/training_data") / STATUS_DB_NAME
+
+STAGES = ("labeled", "tiled", "packed")
+# The reconcile() directories each stage's output is read from.
+_STAGE_DIRS = {
+    "labeled": ("labels_dir",),
+    "tiled": ("tiles_dirs", "pack_dir"),
+    "packed": ("pack_dir",),
+}
+RECONCILED = "reconciled"
+
+# Everything before "_frame_NNNNNN" in a tile or label file name.
+_SEGMENT_RE = re.compile(r"^(.+)_frame_\d{6}")
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS segment_status (
+    game_id TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    video_path TEXT,
+    labeled_at REAL,
+    labeled_version TEXT,
+    labeled_count INTEGER,
+    tiled_at REAL,
+    tiled_version TEXT,
+    tiled_count INTEGER,
+    packed_at REAL,
+    packed_version TEXT,
+    packed_count INTEGER,
+    PRIMARY KEY (game_id, segment)
+);
+
+CREATE INDEX IF NOT EXISTS idx_status_need_labeled
+    ON segment_status(game_id, segment) WHERE labeled_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_status_need_tiled
+    ON segment_status(game_id, segment) WHERE tiled_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_status_need_packed
+    ON segment_status(game_id, segment) WHERE packed_at IS NULL;
+
+-- Games whose segments have been derived from disk at least once.
+CREATE TABLE IF NOT EXISTS status_games (
+    game_id TEXT PRIMARY KEY,
+    video_dir TEXT,
+    reconciled_at REAL
+);
+"""
+
+
+def status_db_path(training_root: Path | str) -> Path:
+    """The status database for a training_data root."""
+    return Path(training_root) / STATUS_DB_NAME
+
+
+def is_local_db(db_path: Path | str) -> bool:
+    """True for a database file on this machine's disk: not ``:memory:`` and
+    not a ``\\\\host\\share`` or ``//host/share`` path (a mapped drive letter
+    can't be told apart, so don't point one at the share)."""
+    path = str(db_path)
+    return path != MEMORY_DB and not path.startswith(("\\\\", "//"))
+
+
+def open_status_db(db_path: Path | str = DEFAULT_STATUS_DB) -> sqlite3.Connection:
+    """Open (creating if needed) the segment status database.
+
+    A share path gets an in-memory table instead (see the module docstring),
+    as does ``MEMORY_DB``.
+    """
+    if not is_local_db(db_path):
+        if str(db_path) != MEMORY_DB:
+            logger.warning(
+                "%s is on a share, keeping segment status in memory", db_path
+            )
+        db_path = MEMORY_DB
+    else:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path), timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=30000")
+    conn.executescript(SCHEMA_SQL)
+    conn.commit()
+    return conn
+
+
+@functools.cache
+def code_version() -> str:
+    """The producing code's version: short git revision, else package version."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        if out.returncode == 0 and out.stdout.strip():
+            return out.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        pass
+    try:
+        from video_grouper.version import __version__
+
+        return __version__
+    except ImportError:
+        return "unknown"
+
+
+def _check_stage(stage: str) -> str:
+    if stage not in STAGES:
+        raise ValueError(f"Unknown stage {stage!r} (expected one of {STAGES})")
+    return stage
+
+
+# ---------------------------------------------------------------------------
+# Producers
+# ---------------------------------------------------------------------------
+
+
+def register_segments(
+    conn: sqlite3.Connection, rows: list[tuple[str, str, str | None]]
+) -> None:
+    """Add (game_id, segment, video_path) rows; existing rows keep their status."""
+    conn.executemany(
+        """INSERT INTO segment_status (game_id, segment, video_path)
+           VALUES (?, ?, ?)
+           ON CONFLICT(game_id, segment)
+           DO UPDATE SET video_path=COALESCE(excluded.video_path, video_path)""",
+        rows,
+    )
+    conn.commit()
+
+
+def mark_segment(
+    conn: sqlite3.Connection,
+    game_id: str,
+    segment: str,
+    stage: str,
+    *,
+    count: int | None = None,
+    version: str | None = None,
+    video_path: str | None = None,
+) -> None:
+    """Record that ``stage`` produced output for a segment (``count`` files)."""
+    _check_stage(stage)
+    conn.execute(
+        f"""INSERT INTO segment_status
+               (game_id, segment, video_path, {stage}_at, {stage}_version,
+                {stage}_count)
+           VALUES (?, ?, ?, ?, ?, ?)
+           ON CONFLICT(game_id, segment)
+           DO UPDATE SET video_path=COALESCE(excluded.video_path, video_path),
+                         {stage}_at=excluded.{stage}_at,
+                         {stage}_version=excluded.{stage}_version,
+                         {stage}_count=excluded.{stage}_count""",
+        (
+            game_id,
+            segment,
+            video_path,
+            time.time(),
+            version or code_version(),
+            count,
+        ),
+    )
+    conn.commit()
+
+
+# ---------------------------------------------------------------------------
+# Discovery
+# ---------------------------------------------------------------------------
+
+
+def segments_needing(
+    conn: sqlite3.Connection, stage: str, game_ids: list[str] | None = None
+) -> list[tuple[str, str, str | None]]:
+    """(game_id, segment, video_path) rows ``stage`` hasn't produced yet."""
+    _check_stage(stage)
+    sql = (
+        f"SELECT game_id, segment, video_path FROM segment_status "
+        f"WHERE {stage}_at IS NULL"
+    )
+    args: list = []
+    if game_ids is not None:
+        sql += f" AND game_id IN ({','.join('?' * len(game_ids))})"
+        args = list(game_ids)
+    return conn.execute(sql + " ORDER BY game_id, segment", args).fetchall()
+
+
+def segment_done(
+    conn: sqlite3.Connection, game_id: str, segment: str, stage: str
+) -> bool:
+    _check_stage(stage)
+    row = conn.execute(
+        f"SELECT {stage}_at FROM segment_status WHERE game_id = ? AND segment = ?",
+        (game_id, segment),
+    ).fetchone()
+    return row is not None and row[0] is not None
+
+
+def segment_counts(
+    conn: sqlite3.Connection, game_id: str, stage: str
+) -> dict[str, int | None]:
+    """segment -> ``{stage}_count`` for the segments ``stage`` has produced."""
+    _check_stage(stage)
+    rows = conn.execute(
+        f"SELECT segment, {stage}_count FROM segment_status "
+        f"WHERE game_id = ? AND {stage}_at IS NOT NULL",
+        (game_id,),
+    ).fetchall()
+    return dict(rows)
+
+
+def reconciled_games(conn: sqlite3.Connection) -> set[str]:
+    return {r[0] for r in conn.execute("SELECT game_id FROM status_games")}
+
+
+def discover(
+    conn: sqlite3.Connection,
+    stage: str,
+    games: dict[str, Path | str],
+    **dirs,
+) -> list[tuple[str, str, str | None]]:
+    """Segments of ``games`` that ``stage`` still needs. ``dirs`` are
+    ``reconcile()``'s output directories.
+
+    Games not seen before are reconciled first. Known games the table says
+    still need ``stage`` are re-checked on disk too, since workers on other
+    machines don't write the table; finished games cost only the query.
+    """
+    unseen = sorted(set(games) - reconciled_games(conn))
+    if unseen:
+        reconcile(conn, {g: games[g] for g in unseen}, **dirs)
+    needing = segments_needing(conn, stage, list(games))
+    recheck = sorted({game_id for game_id, *_ in needing} - set(unseen))
+    if recheck:
+        # Their segments are known: list the output dirs, not the video dir.
+        known: dict[str, list[str]] = {g: [] for g in recheck}
+        for game_id, segment in conn.execute(
+            "SELECT game_id, segment FROM segment_status WHERE game_id IN "
+            f"({','.join('?' * len(recheck))})",
+            recheck,
+        ):
+            known[game_id].append(segment)
+        stage_dirs = {k: v for k, v in dirs.items() if k in _STAGE_DIRS[stage]}
+        reconcile(conn, {g: games[g] for g in recheck}, segments=known, **stage_dirs)
+        needing = segments_needing(conn, stage, list(games))
+    return needing
+
+
+# ---------------------------------------------------------------------------
+# Reconciler — re-derive the table from disk
+# ---------------------------------------------------------------------------
+
+
+def _list_video_segments(video_dir: Path) -> dict[str, str]:
+    """segment stem -> video path for the ``[F][0@0]`` segments under a game."""
+    return {
+        p.stem: str(p) for p in sorted(video_dir.rglob("*.mp4")) if "[F][0@0]" in p.name
+    }
+
+
+def _count_by_segment(out_dir: Path, suffix: str, marker: str = "") -> Counter:
+    """Files per segment in ``out_dir`` (one listing). ``marker`` restricts the
+    count to names containing it (e.g. ``_r0_c0`` = one per tiled frame)."""
+    counts: Counter = Counter()
+    try:
+        entries = os.scandir(out_dir)
+    except OSError:
+        return counts
+    with entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith(suffix) or marker not in name:
+                continue
+            m = _SEGMENT_RE.match(name)
+            if m:
+                counts[m.group(1)] += 1
+    return counts
+
+
+def reconcile(
+    conn: sqlite3.Connection,
+    games: dict[str, Path | str],
+    *,
+    labels_dir: Path | str | None = None,
+    tiles_dirs: list[Path | str] | None = None,
+    pack_dir: Path | str | None = None,
+    segments: dict[str, list[str]] | None = None,
+) -> dict:
+    """Re-derive the status of ``games`` (game_id -> video dir) from disk.
+
+    Segments come from the video directory, or from ``segments[game_id]``
+    when given (the game registry's list). A stage is marked done when its
+    output exists (version ``reconciled``; rows already marked by a producer
+    keep their version) and cleared when it doesn't; a segment with a pack
+    counts as tiled. Stages whose directory isn't given are left alone.
+    """
+    totals = Counter()
+    now = time.time()
+    for game_id, video_dir in games.items():
+        video_dir = Path(video_dir) if video_dir else None
+        if segments and game_id in segments:
+            found = dict.fromkeys(segments[game_id])
+        elif video_dir is not None and video_dir.exists():
+            found = _list_video_segments(video_dir)
+        else:
+            logger.warning("Video dir not found for %s: %s", game_id, video_dir)
+            continue  # not stamped: retried on the next discover()
+        outputs: dict[str, Counter] = {}
+        if labels_dir is not None:
+            outputs["labeled"] = _count_by_segment(Path(labels_dir) / game_id, ".txt")
+        if tiles_dirs:
+            tiled: Counter = Counter()
+            for tiles_dir in tiles_dirs:
+                tiled |= _count_by_segment(Path(tiles_dir) / game_id, ".jpg")
+            outputs["tiled"] = tiled
+        if pack_dir is not None:
+            packs = Path(pack_dir) / game_id
+            outputs["packed"] = Counter(
+                {s: 1 for s in found if (packs / f"{s}.pack").exists()}
+            )
+
+        register_segments(conn, [(game_id, s, v) for s, v in found.items()])
+        packed = outputs.get("packed", Counter())
+        for stage, counts in outputs.items():
+            # A pack holds the segment's tiles (loose ones deleted after
+            # packing, or streamed straight in), so it counts as tiled.
+            kept = packed if stage == "tiled" else Counter()
+            done = [
+                (now, RECONCILED, counts[s] or None, game_id, s)
+                for s in found
+                if counts[s] or kept[s]
+            ]
+            gone = [(game_id, s) for s in found if not (counts[s] or kept[s])]
+            # Producer-marked rows keep their timestamp, version and, for
+            # pack-only segments, count.
+            conn.executemany(
+                f"""UPDATE segment_status
+                       SET {stage}_at=COALESCE({stage}_at, ?),
+                           {stage}_version=COALESCE({stage}_version, ?),
+                           {stage}_count=COALESCE(?, {stage}_count)
+                     WHERE game_id = ? AND segment = ?""",
+                done,
+            )
+            conn.executemany(
+                f"""UPDATE segment_status
+                       SET {stage}_at=NULL, {stage}_version=NULL, {stage}_count=NULL
+                     WHERE game_id = ? AND segment = ?""",
+                gone,
+            )
+            totals[stage] += len(done)
+        conn.execute(
+            """INSERT INTO status_games (game_id, video_dir, reconciled_at)
+               VALUES (?, ?, ?)
+               ON CONFLICT(game_id)
+               DO UPDATE SET video_dir=excluded.video_dir,
+                             reconciled_at=excluded.reconciled_at""",
+            (game_id, str(video_dir) if video_dir else None, now),
+        )
+        conn.commit()
+        totals["segments"] += len(found)
+    totals["games"] = len(games)
+    return dict(totals)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main():
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Per-segment processing status")
+    parser.add_argument("--db", type=Path, default=DEFAULT_STATUS_DB)
+    sub = parser.add_subparsers(dest="command")
+
+    rec = sub.add_parser("reconcile", help="Re-derive status from disk")
+    rec.add_argument("--games", nargs="*", help="Game IDs (default: registry)")
+    rec.add_argument(
+        "--tiles-dir", type=Path, default=Path("D:/training_data/tiles_640")
+    )
+    rec.add_argument(
+        "--labels-dir", type=Path, default=Path("D:/training_data/labels_640_ext")
+    )
+    rec.add_argument(
+        "--pack-dir", type=Path, default=Path("D:/training_data/tile_packs")
+    )
+
+    needs = sub.add_parser("needs", help="List segments a stage still needs")
+    needs.add_argument("stage", choices=STAGES)
+    needs.add_argument("--games", nargs="*")
+
+    args = parser.parse_args()
+    conn = open_status_db(args.db)
+
+    if args.command == "reconcile":
+        from training.data_prep.game_registry import load_registry
+
+        registry = load_registry()
+        if args.games:
+            registry = [g for g in registry if g["game_id"] in args.games]
+        totals = reconcile(
+            conn,
+            {g["game_id"]: g["path"] for g in registry},
+            labels_dir=args.labels_dir,
+            tiles_dirs=[args.tiles_dir],
+            pack_dir=args.pack_dir,
+            segments={
+                g["game_id"]: [Path(s).stem for s in g.get("segments", [])]
+                for g in registry
+                if g.get("segments")
+            },
+        )
+        print(totals)
+    elif args.command == "needs":
+        for game_id, segment, _video in segments_needing(conn, args.stage, args.games):
+            print(f"{game_id}\t{segment}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""In-memory decode-to-pack tiling for ``mass_tile --stream``.
+
+The classic ``mass_tile`` path writes every sampled frame to a temp JPEG
+(``extract_frames``), reads it back and crops it (``tile_frame``), writes each
+tile as a loose JPEG, and deletes the temp frames; ``manifest pack`` later
+reads the loose tiles again to build the segment pack. That is two lossy
+encodes per tile and three disk round-trips.
+
+Here a segment goes straight from video to its pack:
+
+- frames are decoded with PyAV and frame-diff filtered in memory
+  (``extract_frames.sample_frames``, the same sampling as the classic path);
+- tiles are numpy views into the decoded frame (``tile_frames.tile_info``
+  boxes), so nothing is copied before the encode;
+- tiles are JPEG-encoded once on a thread pool (``cv2.imencode`` releases the
+  GIL, as in ``training/tasks/tile.py``) and written in order into
+  ``<pack_dir>/<game_id>/<segment>.pack`` by ``pack_scheduler.write_pack``;
+- segments of a game run in parallel worker processes, as many as the CPU
+  budget allows after each one's encode threads.
+
+The pack layout is returned to the caller, which owns the SQLite connections
+and records it with ``manifest.record_segment_pack``.
+"""
+
+import logging
+import os
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from training.data_prep.extract_frames import (
+    DEFAULT_DIFF_THRESHOLD,
+    HAS_AV,
+    sample_frames,
+)
+from training.data_prep.pack_scheduler import write_pack
+from training.data_prep.tile_frames import (
+    DEFAULT_COLS,
+    DEFAULT_JPEG_QUALITY,
+    DEFAULT_ROWS,
+    DEFAULT_TILE_SIZE,
+    tile_info,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODE_THREADS = 4
+# Frames' worth of tiles in flight per segment (bounds memory to a few
+# decoded panoramas per worker).
+FRAMES_IN_FLIGHT = 2
+
+
+def encode_tile(view: np.ndarray, jpeg_quality: int = DEFAULT_JPEG_QUALITY) -> bytes:
+    """JPEG-encode one tile (a view into the decoded frame)."""
+    ok, buf = cv2.imencode(".jpg", view, [cv2.IMWRITE_JPEG_QUALITY, jpeg_quality])
+    if not ok:
+        raise ValueError(f"JPEG encode failed for a {view.shape} tile")
+    return buf.tobytes()
+
+
+def segment_workers(cpu_budget: int | None, encode_threads: int, segments: int) -> int:
+    """Segments to run at once: the CPU budget split by encode threads."""
+    budget = cpu_budget or os.cpu_count() or 1
+    return max(1, min(segments, budget // max(1, encode_threads)))
+
+
+def tile_segment_to_pack(
+    video: Path,
+    pack_path: Path,
+    *,
+    frame_interval: int | None = None,
+    diff_threshold: float = DEFAULT_DIFF_THRESHOLD,
+    flip: bool = False,
+    cols: int = DEFAULT_COLS,
+    rows: int = DEFAULT_ROWS,
+    tile_size: int = DEFAULT_TILE_SIZE,
+    jpeg_quality: int = DEFAULT_JPEG_QUALITY,
+    encode_threads: int = DEFAULT_ENCODE_THREADS,
+) -> dict:
+    """Decode, sample and tile one segment video straight into its pack.
+
+    Runs in a worker process under ``tile_segments``; everything it returns
+    is picklable. Tile order in the pack is (frame_idx, row, col), the order
+    ``manifest.pack_segment`` uses.
+
+    Returns: {segment, video, pack_path, frames, tiles, pack_size, layout}
+    """
+    if not HAS_AV:
+        raise RuntimeError("stream tiling needs PyAV (pip install av)")
+    video = Path(video)
+    pack_path = Path(pack_path)
+    pack_path.parent.mkdir(parents=True, exist_ok=True)
+    frames = 0
+
+    def _producers():
+        nonlocal frames
+        for frame_idx, frame in sample_frames(
+            video,
+            diff_threshold=diff_threshold,
+            frame_interval=frame_interval,
+            flip=flip,
+        ):
+            frames += 1
+            h, w = frame.shape[:2]
+            for i, (x, y, tw, th) in enumerate(
+                tile_info(w, h, cols=cols, rows=rows, tile_size=tile_size)
+            ):
+                view = frame[y : y + th, x : x + tw]
+                yield (
+                    partial(encode_tile, view, jpeg_quality),
+                    frame_idx,
+                    i // cols,
+                    i % cols,
+                )
+
+    with ThreadPoolExecutor(
+        max_workers=encode_threads, thread_name_prefix="tile-encode"
+    ) as pool:
+        layout = write_pack(
+            _producers(), pack_path, pool, window=FRAMES_IN_FLIGHT * rows * cols
+        )
+
+    return {
+        "segment": video.stem,
+        "video": str(video),
+        "pack_path": str(pack_path),
+        "frames": frames,
+        "tiles": len(layout),
+        "pack_size": sum(size for *_, size in layout),
+        "layout": layout,
+    }
+
+
+def tile_segments(
+    jobs: list[tuple[Path, Path]], *, workers: int = 1, **params
+) -> Iterator[dict]:
+    """Run ``tile_segment_to_pack`` for each ``(video, pack_path)``.
+
+    Up to ``workers`` segments run at once in worker processes (inline when
+    1); results are yielded as segments finish. ``params`` are passed through
+    to ``tile_segment_to_pack``.
+    """
+    if workers <= 1:
+        for video, pack_path in jobs:
+            yield tile_segment_to_pack(video, pack_path, **params)
+        return
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            pool.submit(tile_segment_to_pack, video, pack_path, **params)
+            for video, pack_path in jobs
+        ]
+        for fut in as_completed(futures):
+            yield fut.result()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
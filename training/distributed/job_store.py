@@ -0,0 +1,318 @@
+"""SQLite job index for the distributed worker queue, owned by the Pipeline API.
+
+Replaces the per-claim directory scan of ``jobs.py``: an idle worker used to
+glob ``pending/``, sort it, and ``json.load`` file after file until one matched
+its capabilities, all over SMB. Here a claim is one write transaction with an
+index seek per capability subset:
+
+- ``requires`` is stored canonically (sorted, comma-joined), and
+  ``(status, requires, priority, id)`` is indexed. A worker with capabilities
+  ``{gpu, cpu}`` probes the subsets ``""``, ``"cpu"``, ``"gpu"``, ``"cpu,gpu"``
+  and takes the best ``(priority, id)``, which is the order the filename sort
+  gave (``id`` is the legacy filename stem).
+- Claims carry a lease (``lease_expires``) instead of a ``claimed_at`` file
+  rewrite. An expired lease (worker crashed or was switched off) returns the
+  job to ``pending`` at the next claim. Long jobs renew it.
+- Workers buffer completions and send them with their next claim, which
+  commits them in the claim's transaction, so a job cycle is one request and
+  one write transaction instead of two rewrites plus two renames.
+
+Only the Pipeline API process opens the database (DECISIONS.md, 2026-04-09,
+"HTTP API-only architecture"): ``training/pipeline/api.py`` keeps it next to
+``work_queue.db`` on the server's local disk and workers reach it through the
+``/api/jobs`` endpoints. ``jobs.py`` falls back to the rename protocol when
+the API is not configured or unreachable.
+"""
+
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    requires TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT 'pending',
+    data TEXT NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    lease_expires REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, requires, priority, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_expires);
+CREATE INDEX IF NOT EXISTS idx_jobs_type ON jobs(type, status);
+"""
+
+STATUSES = ("pending", "active", "done", "failed")
+
+# Past this many capabilities the subset probes outnumber a scan of the
+# distinct requirement sets, so claim() reads those instead.
+MAX_SUBSET_CAPS = 6
+
+# One finished job sent by a worker: (job_id, result, finished_at).
+Completion = tuple[str, dict | None, float]
+
+
+def canonical_requires(requires) -> str:
+    """``["gpu", "cpu"]`` -> ``"cpu,gpu"`` (the indexed form)."""
+    return ",".join(sorted(set(requires or [])))
+
+
+def _subsets(caps: set[str]) -> list[str]:
+    items = sorted(caps)
+    return [
+        ",".join(combo)
+        for n in range(len(items) + 1)
+        for combo in itertools.combinations(items, n)
+    ]
+
+
+class JobStore:
+    """Lease-based job table, shared by every worker through the API.
+
+    ``lease_s`` matches the old stale-lock age (4 h). ``worker`` arguments
+    identify the claiming process (``hostname:pid``); a lease is only renewed
+    or completed by the worker holding it.
+    """
+
+    def __init__(self, db_path: str | Path, *, lease_s: float = 4 * 3600):
+        self.db_path = Path(db_path)
+        self.lease_s = lease_s
+        self._lock = threading.RLock()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,  # FastAPI runs endpoints on a thread pool
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.executescript(SCHEMA_SQL)
+
+    def _tx(self):
+        return _Transaction(self._conn, self._lock)
+
+    # ---- Submission ----
+
+    def submit(self, job_id: str, job: dict) -> None:
+        with self._tx() as conn:
+            self._insert(conn, job_id, job)
+
+    def submit_many(self, jobs: Iterable[tuple[str, dict]]) -> None:
+        """Insert many jobs in one transaction (bulk submit)."""
+        with self._tx() as conn:
+            for job_id, job in jobs:
+                self._insert(conn, job_id, job)
+
+    @staticmethod
+    def _insert(conn, job_id: str, job: dict) -> None:
+        conn.execute(
+            "INSERT OR IGNORE INTO jobs (id, type, priority, requires, data) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                job_id,
+                job["type"],
+                int(job.get("priority", 5)),
+                canonical_requires(job.get("requires")),
+                json.dumps(job),
+            ),
+        )
+
+    def exists(self, job_type: str, **match_fields) -> bool:
+        """True if a pending/active ``job_type`` job matches ``match_fields``."""
+        sql = "SELECT 1 FROM jobs WHERE type = ? AND status IN ('pending', 'active')"
+        args: list = [job_type]
+        for key, value in match_fields.items():
+            sql += " AND json_extract(data, ?) = ?"
+            args += [f"$.{key}", value]
+        with self._lock:
+            return self._conn.execute(sql + " LIMIT 1", args).fetchone() is not None
+
+    # ---- Claiming ----
+
+    def claim(
+        self,
+        worker: str,
+        capabilities: list[str] | None = None,
+        completed: Iterable[Completion] = (),
+    ) -> tuple[str, dict] | None:
+        """Claim the best pending job ``worker`` can run: ``(job_id, job)``.
+
+        ``completed`` (the worker's buffered completions) is committed in the
+        same transaction, and expired leases are returned to ``pending`` first.
+        """
+        caps = set(capabilities or [])
+        now = time.time()
+        with self._tx() as conn:
+            self._apply_completions(conn, worker, completed)
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', claimed_by = NULL, "
+                "lease_expires = NULL WHERE status = 'active' AND lease_expires < ?",
+                (now,),
+            )
+            if len(caps) <= MAX_SUBSET_CAPS:
+                options = _subsets(caps)
+            else:
+                rows = conn.execute(
+                    "SELECT DISTINCT requires FROM jobs WHERE status = 'pending'"
+                ).fetchall()
+                options = [
+                    r for (r,) in rows if set(filter(None, r.split(","))) <= caps
+                ]
+            best = None
+            for req in options:
+                row = conn.execute(
+                    "SELECT priority, id, data FROM jobs "
+                    "WHERE status = 'pending' AND requires = ? "
+                    "ORDER BY priority, id LIMIT 1",
+                    (req,),
+                ).fetchone()
+                if row is not None and (best is None or row[:2] < best[:2]):
+                    best = row
+            if best is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'active', claimed_by = ?, "
+                    "claimed_at = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (worker, now, now + self.lease_s, best[1]),
+                )
+        if best is None:
+            return None
+        _priority, job_id, data = best
+        job = json.loads(data)
+        job["claimed_by"] = worker.rsplit(":", 1)[0]
+        job["claimed_at"] = now
+        return job_id, job
+
+    def renew(self, job_id: str, worker: str) -> bool:
+        """Extend ``worker``'s lease on ``job_id``. False if it was lost."""
+        with self._tx() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE id = ? AND claimed_by = ? AND status = 'active'",
+                (time.time() + self.lease_s, job_id, worker),
+            )
+            return cur.rowcount == 1
+
+    # ---- Completion ----
+
+    def complete(self, worker: str, completed: Iterable[Completion]) -> int:
+        """Commit ``worker``'s completions without claiming; returns how many
+        still held their lease."""
+        with self._tx() as conn:
+            return self._apply_completions(conn, worker, completed)
+
+    @staticmethod
+    def _apply_completions(conn, worker: str, completed: Iterable[Completion]) -> int:
+        applied = 0
+        for job_id, result, done_at in completed:
+            row = conn.execute(
+                "SELECT data FROM jobs WHERE id = ? AND claimed_by = ? "
+                "AND status = 'active'",
+                (job_id, worker),
+            ).fetchone()
+            if row is None:
+                logger.warning("Lease on %s was lost before completion", job_id)
+                continue
+            data = json.loads(row[0])
+            if result:
+                data["result"] = result
+                data["completed_at"] = done_at
+            conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, data = ?, "
+                "lease_expires = NULL WHERE id = ?",
+                (done_at, json.dumps(data), job_id),
+            )
+            applied += 1
+        return applied
+
+    def fail(self, job_id: str, error: str) -> bool:
+        """Mark ``job_id`` failed. False if there is no such job."""
+        now = time.time()
+        with self._tx() as conn:
+            row = conn.execute(
+                "SELECT data FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            data = json.loads(row[0])
+            data["error"] = error
+            data["failed_at"] = now
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', finished_at = ?, data = ?, "
+                "lease_expires = NULL WHERE id = ?",
+                (now, json.dumps(data), job_id),
+            )
+            return True
+
+    # ---- Status / maintenance ----
+
+    def jobs(self, status: str) -> list[dict]:
+        """Every job in ``status``, in claim order, as the job-file dicts."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data, claimed_by, claimed_at FROM jobs WHERE status = ? "
+                "ORDER BY priority, id",
+                (status,),
+            ).fetchall()
+        out = []
+        for data, claimed_by, claimed_at in rows:
+            job = json.loads(data)
+            if claimed_by:
+                job["claimed_by"] = claimed_by.rsplit(":", 1)[0]
+                job["claimed_at"] = claimed_at
+            out.append(job)
+        return out
+
+    def clean(self, *, retry_failed: bool = False) -> None:
+        """Drop done jobs, and failed ones too unless ``retry_failed``
+        returns them to ``pending``."""
+        with self._tx() as conn:
+            conn.execute("DELETE FROM jobs WHERE status = 'done'")
+            if retry_failed:
+                conn.execute(
+                    "UPDATE jobs SET status = 'pending', claimed_by = NULL, "
+                    "claimed_at = NULL, finished_at = NULL WHERE status = 'failed'"
+                )
+            else:
+                conn.execute("DELETE FROM jobs WHERE status = 'failed'")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class _Transaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT`` under the store's lock."""
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.RLock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+        return False
@@ -1,7 +1,17 @@
 """Filesystem-based job queue for distributed GPU/CPU workers.
 
-Jobs are JSON files in a shared directory. Workers claim jobs by
-atomically renaming them from pending/ to active/. No coordinator needed.
+Jobs are JSON files in a shared directory, claimed by atomically renaming
+them from pending/ to active/.
+
+With ``JOBS_API`` set to the Pipeline API's URL (e.g.
+``http://192.168.86.152:8643``), jobs go to the job index it owns instead
+(``jobs.db`` on the server's local disk, see ``job_store.py``;
+DECISIONS.md 2026-04-09, "HTTP API-only architecture"). Claims are
+capability-indexed, leases replace claim-time file rewrites, and completions
+are buffered and sent with the worker's next claim. Job files stay the
+fallback when the API is not configured or unreachable, and job files
+dropped into pending/ are still claimed once the index has nothing this
+worker can run.
 
 Job types: label, tile, train, infer, qa
 
@@ -14,13 +24,25 @@ Submit jobs:
 """
 
 import argparse
+import contextlib
 import json
 import logging
 import os
 import socket
+import threading
 import time
 from pathlib import Path
 
+try:
+    from training.data_prep.segment_status import discover, open_status_db, reconcile
+    from training.distributed.job_store import STATUSES
+    from training.pipeline.client import PipelineClient
+except ImportError:
+    from job_store import STATUSES
+    from segment_status import discover, open_status_db, reconcile
+
+    PipelineClient = None  # run from a bare copy of this dir: job files only
+
 logger = logging.getLogger(__name__)
 
 # ---- Paths ----
@@ -30,10 +52,23 @@ PENDING = JOBS_DIR / "pending"
 ACTIVE = JOBS_DIR / "active"
 DONE = JOBS_DIR / "done"
 FAILED = JOBS_DIR / "failed"
+# Pipeline API that owns the job index; unset = job files only.
+JOBS_API = os.environ.get("JOBS_API", "")
+LEASE_S = float(os.environ.get("JOBS_LEASE_S", 4 * 3600))  # the index's lease
+# Buffered completions past this count are sent without waiting for a claim.
+COMPLETE_BATCH = 16
+
+# A claimed job is either an index job id (str) or its active/ file (Path).
+JobRef = str | Path
 
 MODEL_PATH = os.environ.get("BALL_MODEL_PATH", "")
 LABELS_DIR = f"{SHARE}/training_data/labels_640_ext"
 TILES_DIR = f"{SHARE}/training_data/tiles_640"
+PACK_DIR = f"{SHARE}/training_data/tile_packs"
+# SQLite stays off the share (DECISIONS.md, 2026-04-09): by default the
+# segment status table is in memory and derived from disk per discovery. Only
+# set SEGMENT_STATUS_DB on the server, to its local segment_status.db.
+STATUS_DB = os.environ.get("SEGMENT_STATUS_DB", ":memory:")
 
 GAMES = {
     "flash__06.01.2024_vs_IYSA_home": f"{SHARE}/Flash_2013s/06.01.2024 - vs IYSA (home)",
@@ -48,6 +83,37 @@ GAMES = {
 }
 
 
+# ---- Job index (Pipeline API) ----
+
+_CLIENT = None
+# Finished index jobs not yet sent: {"id", "result", "finished_at"}.
+_COMPLETED: list[dict] = []
+_COMPLETED_LOCK = threading.Lock()
+
+
+def _api():
+    """The Pipeline API client, or None to use the rename protocol."""
+    global _CLIENT
+    if _CLIENT is None and JOBS_API and PipelineClient is not None:
+        _CLIENT = PipelineClient(JOBS_API)
+    return _CLIENT
+
+
+def _worker_id() -> str:
+    """Lease holder id sent with claims (one per worker process)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _buffered() -> list[dict]:
+    with _COMPLETED_LOCK:
+        return list(_COMPLETED)
+
+
+def _forget_completions(sent: int) -> None:
+    with _COMPLETED_LOCK:
+        del _COMPLETED[:sent]
+
+
 # ---- Job creation ----
 
 
@@ -69,91 +135,88 @@ def make_job(
 
 
 def submit_job(job: dict) -> Path:
-    """Write a job file to pending/. Returns the job file path."""
-    PENDING.mkdir(parents=True, exist_ok=True)
+    """Submit a job: an index row through the API, or a job file in pending/.
+
+    Returns the job's pending/ path; in the index its stem is the job id and
+    no file is written.
+    """
     # Filename: priority_type_timestamp_random.json
     ts = int(time.time() * 1000)
     rand = os.urandom(4).hex()
     name = f"{job['priority']:02d}_{job['type']}_{ts}_{rand}.json"
     path = PENDING / name
+    api = _api()
+    if api is not None:
+        if api.submit_jobs({path.stem: job}) is not None:
+            return path
+        logger.warning("Job API unavailable, writing %s as a job file", path.name)
+    PENDING.mkdir(parents=True, exist_ok=True)
     with open(path, "w") as f:
         json.dump(job, f, indent=2)
     return path
 
 
-def submit_label_jobs(game_ids: list[str]) -> int:
-    """Submit label jobs for unlabeled segments in the given games."""
-    import glob as glob_mod
-
-    count = 0
+def _segments_needing(
+    stage: str, game_ids: list[str], rescan: bool = False
+) -> list[tuple[str, str, str]]:
+    """(game_id, segment, video_path) still needing ``stage``, from the segment
+    status table; ``rescan`` re-derives it from disk first."""
+    games = {}
     for game_id in game_ids:
-        video_src = GAMES.get(game_id)
-        if not video_src:
+        if game_id in GAMES:
+            games[game_id] = GAMES[game_id]
+        else:
             logger.warning("Unknown game: %s", game_id)
+    dirs = {"labels_dir": LABELS_DIR, "tiles_dirs": [TILES_DIR], "pack_dir": PACK_DIR}
+    conn = open_status_db(STATUS_DB)
+    try:
+        if rescan:
+            reconcile(conn, games, **dirs)
+        return discover(conn, stage, games, **dirs)
+    finally:
+        conn.close()
+
+
+def submit_label_jobs(game_ids: list[str], rescan: bool = False) -> int:
+    """Submit label jobs for unlabeled segments in the given games."""
+    count = 0
+    for game_id, segment, video_path in _segments_needing("labeled", game_ids, rescan):
+        # Check if job already pending/active
+        if _job_exists("label", game_id=game_id, segment=segment):
             continue
-        video_dir = Path(video_src)
-        if not video_dir.exists():
-            logger.warning("Video dir not found: %s", video_src)
-            continue
-        label_dir = Path(LABELS_DIR) / game_id
-        segments = sorted([p for p in video_dir.rglob("*.mp4") if "[F][0@0]" in p.name])
-        for seg in segments:
-            # Check if already labeled
-            if label_dir.exists():
-                escaped = glob_mod.escape(seg.stem)
-                if list(label_dir.glob(f"{escaped}_frame_*.txt")):
-                    continue
-            # Check if job already pending/active
-            if _job_exists("label", game_id=game_id, segment=seg.stem):
-                continue
-            job = make_job(
-                "label",
-                priority=3,
-                requires=["gpu"],
-                game_id=game_id,
-                segment=seg.stem,
-                video_path=str(seg),
-                model_path=MODEL_PATH,
-                output_dir=str(Path(LABELS_DIR) / game_id),
-            )
-            submit_job(job)
-            count += 1
-            logger.info("  label: %s/%s", game_id, seg.stem[:40])
+        job = make_job(
+            "label",
+            priority=3,
+            requires=["gpu"],
+            game_id=game_id,
+            segment=segment,
+            video_path=video_path,
+            model_path=MODEL_PATH,
+            output_dir=str(Path(LABELS_DIR) / game_id),
+        )
+        submit_job(job)
+        count += 1
+        logger.info("  label: %s/%s", game_id, segment[:40])
     return count
 
 
-def submit_tile_jobs(game_ids: list[str]) -> int:
+def submit_tile_jobs(game_ids: list[str], rescan: bool = False) -> int:
     """Submit tile jobs for untiled segments in the given games."""
-    import glob as glob_mod
-
     count = 0
-    for game_id in game_ids:
-        video_src = GAMES.get(game_id)
-        if not video_src:
-            continue
-        video_dir = Path(video_src)
-        if not video_dir.exists():
+    for game_id, segment, video_path in _segments_needing("tiled", game_ids, rescan):
+        if _job_exists("tile", game_id=game_id, segment=segment):
             continue
-        tile_dir = Path(TILES_DIR) / game_id
-        segments = sorted([p for p in video_dir.rglob("*.mp4") if "[F][0@0]" in p.name])
-        for seg in segments:
-            if tile_dir.exists():
-                escaped = glob_mod.escape(seg.stem)
-                if list(tile_dir.glob(f"{escaped}_frame_000000_r0_c0.jpg")):
-                    continue
-            if _job_exists("tile", game_id=game_id, segment=seg.stem):
-                continue
-            job = make_job(
-                "tile",
-                priority=7,  # lower priority than labeling
-                game_id=game_id,
-                segment=seg.stem,
-                video_path=str(seg),
-                output_dir=str(Path(TILES_DIR) / game_id),
-            )
-            submit_job(job)
-            count += 1
-            logger.info("  tile: %s/%s", game_id, seg.stem[:40])
+        job = make_job(
+            "tile",
+            priority=7,  # lower priority than labeling
+            game_id=game_id,
+            segment=segment,
+            video_path=video_path,
+            output_dir=str(Path(TILES_DIR) / game_id),
+        )
+        submit_job(job)
+        count += 1
+        logger.info("  tile: %s/%s", game_id, segment[:40])
     return count
 
 
@@ -171,6 +234,9 @@ def submit_train_job(config_path: str, **kwargs) -> Path:
 
 def _job_exists(job_type: str, **match_fields) -> bool:
     """Check if a matching job is already pending or active."""
+    api = _api()
+    if api is not None and api.job_exists(job_type, match_fields):
+        return True
     for d in [PENDING, ACTIVE]:
         if not d.exists():
             continue
@@ -189,12 +255,27 @@ def _job_exists(job_type: str, **match_fields) -> bool:
 # ---- Job claiming (for workers) ----
 
 
-def claim_job(capabilities: list[str] | None = None) -> tuple[dict, Path] | None:
+def claim_job(capabilities: list[str] | None = None) -> tuple[dict, JobRef] | None:
     """Claim the highest-priority pending job this worker can handle.
 
-    Returns (job_dict, active_path) or None if no work available.
-    Claiming is atomic via os.rename (same filesystem).
+    Returns (job_dict, ref) or None if no work available. ``ref`` is the
+    index job id, or the job's active/ path for a job file (claimed
+    atomically via os.rename, same filesystem). Buffered completions go to
+    the index with the claim.
     """
+    api = _api()
+    if api is not None:
+        completed = _buffered()
+        reply = api.claim_job(_worker_id(), list(capabilities or []), completed)
+        if reply is not None:
+            _forget_completions(len(completed))
+            if reply.get("job_id"):
+                return reply["job"], reply["job_id"]
+    return _claim_job_file(capabilities)
+
+
+def _claim_job_file(capabilities: list[str] | None) -> tuple[dict, Path] | None:
+    """The rename protocol: scan pending/ for a job file this worker can run."""
     caps = set(capabilities or [])
     if not PENDING.exists():
         return None
@@ -231,8 +312,63 @@ def claim_job(capabilities: list[str] | None = None) -> tuple[dict, Path] | None
     return None
 
 
-def complete_job(active_path: Path, result: dict | None = None):
-    """Move job from active/ to done/."""
+def renew_job(ref: JobRef) -> bool:
+    """Extend the lease on an index job (job files have no lease)."""
+    if isinstance(ref, Path):
+        return True
+    api = _api()
+    return api is not None and api.renew_job(ref, _worker_id())
+
+
+@contextlib.contextmanager
+def hold_lease(ref: JobRef, every_s: float | None = None):
+    """Renew ``ref``'s lease in the background while the block runs."""
+    if isinstance(ref, Path):
+        yield
+        return
+    stop = threading.Event()
+    interval = every_s if every_s is not None else LEASE_S / 3
+
+    def keep():
+        while not stop.wait(interval):
+            if not renew_job(ref):
+                logger.warning("Lost the lease on %s", ref)
+
+    keeper = threading.Thread(target=keep, daemon=True)
+    keeper.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        keeper.join()
+
+
+def flush_jobs():
+    """Send buffered completions (call when idle and at exit)."""
+    completed = _buffered()
+    if not completed:
+        return
+    api = _api()
+    if api is None or api.complete_jobs(_worker_id(), completed) is None:
+        logger.error(
+            "Job API unavailable: %d completion(s) kept for the next claim",
+            len(completed),
+        )
+        return
+    _forget_completions(len(completed))
+
+
+def complete_job(active_path: JobRef, result: dict | None = None):
+    """Mark a job done: buffered for the index, or moved from active/ to done/."""
+    if not isinstance(active_path, Path):
+        with _COMPLETED_LOCK:
+            _COMPLETED.append(
+                {"id": active_path, "result": result, "finished_at": time.time()}
+            )
+            full = len(_COMPLETED) >= COMPLETE_BATCH
+        if full:
+            flush_jobs()
+        return
     DONE.mkdir(parents=True, exist_ok=True)
     if result:
         data = json.load(open(active_path))
@@ -246,8 +382,17 @@ def complete_job(active_path: Path, result: dict | None = None):
         pass
 
 
-def fail_job(active_path: Path, error: str):
-    """Move job from active/ to failed/."""
+def fail_job(active_path: JobRef, error: str):
+    """Mark a job failed in the index, or move it from active/ to failed/.
+
+    An index job that can't be failed would run again when its lease
+    expires (hours later), so this raises if the API is unreachable.
+    """
+    if not isinstance(active_path, Path):
+        api = _api()
+        if api is None or api.fail_job(active_path, error) is None:
+            raise RuntimeError(f"Job API unavailable, cannot fail {active_path}")
+        return
     FAILED.mkdir(parents=True, exist_ok=True)
     try:
         data = json.load(open(active_path))
@@ -267,8 +412,12 @@ def fail_job(active_path: Path, error: str):
 
 
 def get_status() -> dict:
-    """Get job queue status."""
-    status = {}
+    """Get job queue status: index jobs (one API call), then job files."""
+    status: dict[str, list] = {name: [] for name in STATUSES}
+    api = _api()
+    reply = api.job_status() if api is not None else None
+    if reply is not None:
+        status = {name: list(reply.get(name, [])) for name in STATUSES}
     for name, d in [
         ("pending", PENDING),
         ("active", ACTIVE),
@@ -276,15 +425,13 @@ def get_status() -> dict:
         ("failed", FAILED),
     ]:
         if not d.exists():
-            status[name] = []
             continue
-        jobs = []
+        jobs = status[name]
         for f in sorted(d.glob("*.json")):
             try:
                 jobs.append(json.load(open(f)))
             except (json.JSONDecodeError, OSError):
                 pass
-        status[name] = jobs
     return status
 
 
@@ -342,6 +489,11 @@ def main():
         "--games", nargs="*", default=["all"], help="Game IDs or 'all'"
     )
     submit_p.add_argument("--config", help="Training config path (for train jobs)")
+    submit_p.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Re-derive segment status from disk before submitting",
+    )
 
     # status
     sub.add_parser("status", help="Show queue status")
@@ -359,10 +511,10 @@ def main():
         game_ids = list(GAMES.keys()) if "all" in args.games else args.games
 
         if args.job_type == "label":
-            n = submit_label_jobs(game_ids)
+            n = submit_label_jobs(game_ids, rescan=args.rescan)
             print(f"Submitted {n} label jobs")
         elif args.job_type == "tile":
-            n = submit_tile_jobs(game_ids)
+            n = submit_tile_jobs(game_ids, rescan=args.rescan)
             print(f"Submitted {n} tile jobs")
         elif args.job_type == "train":
             if not args.config:
@@ -375,17 +527,19 @@ def main():
         print_status()
 
     elif args.command == "list":
-        if PENDING.exists():
-            for f in sorted(PENDING.glob("*.json")):
-                j = json.load(open(f))
-                reqs = ",".join(j.get("requires", [])) or "cpu"
-                print(
-                    f"  [{j['type']}] {j.get('game_id', '')}/{j.get('segment', '')[:30]} ({reqs})"
-                )
-        else:
+        pending = get_status()["pending"]
+        for j in pending:
+            reqs = ",".join(j.get("requires", [])) or "cpu"
+            print(
+                f"  [{j['type']}] {j.get('game_id', '')}/{j.get('segment', '')[:30]} ({reqs})"
+            )
+        if not pending:
             print("No pending jobs")
 
     elif args.command == "clean":
+        api = _api()
+        if api is not None:
+            api.clean_jobs(retry_failed=args.failed)
         for d in [DONE] + ([FAILED] if not args.failed else []):
             if d.exists():
                 for f in d.glob("*.json"):
@@ -13,7 +13,6 @@ Usage:
 """
 
 import argparse
-import glob as glob_mod
 import logging
 import os
 import socket
@@ -32,7 +31,12 @@ SHARE = os.environ.get("SHARE_PATH", "//192.168.86.152/video")
 MODEL_PATH = os.environ.get("BALL_MODEL_PATH", "")
 LABELS_DIR = f"{SHARE}/training_data/labels_640_ext"
 TILES_DIR = f"{SHARE}/training_data/tiles_640"
+PACK_DIR = f"{SHARE}/training_data/tile_packs"
 LOCKS_DIR = f"{SHARE}/training_data/worker_locks"
+# SQLite stays off the share (DECISIONS.md, 2026-04-09): by default the
+# segment status table is in memory and derived from disk per discovery. Only
+# set SEGMENT_STATUS_DB on the server, to its local segment_status.db.
+STATUS_DB = os.environ.get("SEGMENT_STATUS_DB", ":memory:")
 
 GAMES = {
     "flash__06.01.2024_vs_IYSA_home": f"{SHARE}/Flash_2013s/06.01.2024 - vs IYSA (home)",
@@ -165,44 +169,60 @@ def should_work(idle_threshold: int) -> bool:
 # ---- Work discovery ----
 
 
+def _segment_status():
+    """The segment status helpers (package or standalone deploy)."""
+    try:
+        from training.data_prep import segment_status
+    except ImportError:
+        import segment_status
+    return segment_status
+
+
+def _find_segments(stage: str) -> list[tuple[str, str, Path]]:
+    status = _segment_status()
+    conn = status.open_status_db(STATUS_DB)
+    try:
+        rows = status.discover(
+            conn,
+            stage,
+            GAMES,
+            labels_dir=LABELS_DIR,
+            tiles_dirs=[TILES_DIR],
+            pack_dir=PACK_DIR,
+        )
+    finally:
+        conn.close()
+    return [(game_id, seg, Path(video)) for game_id, seg, video in rows]
+
+
 def find_unlabeled_segments() -> list[tuple[str, str, Path]]:
     """Find all segments that need labeling. Returns (game_id, segment_stem, video_path)."""
-    work = []
-    for game_id, video_src in GAMES.items():
-        video_dir = Path(video_src)
-        if not video_dir.exists():
-            continue
-        label_dir = Path(LABELS_DIR) / game_id
-        segments = sorted([p for p in video_dir.rglob("*.mp4") if "[F][0@0]" in p.name])
-        for seg in segments:
-            # Check if labels already exist
-            if label_dir.exists():
-                escaped = glob_mod.escape(seg.stem)
-                existing = list(label_dir.glob(f"{escaped}_frame_*.txt"))
-                if existing:
-                    continue
-            work.append((game_id, seg.stem, seg))
-    return work
+    return _find_segments("labeled")
 
 
 def find_untiled_segments() -> list[tuple[str, str, Path]]:
     """Find all segments that need tiling. Returns (game_id, segment_stem, video_path)."""
-    work = []
-    for game_id, video_src in GAMES.items():
-        video_dir = Path(video_src)
-        if not video_dir.exists():
-            continue
-        tile_dir = Path(TILES_DIR) / game_id
-        segments = sorted([p for p in video_dir.rglob("*.mp4") if "[F][0@0]" in p.name])
-        for seg in segments:
-            # Check if tiles already exist (just check first tile of first frame)
-            if tile_dir.exists():
-                escaped = glob_mod.escape(seg.stem)
-                existing = list(tile_dir.glob(f"{escaped}_frame_000000_r0_c0.jpg"))
-                if existing:
-                    continue
-            work.append((game_id, seg.stem, seg))
-    return work
+    return _find_segments("tiled")
+
+
+def _mark_done(game_id: str, video_path: Path, stage: str, count: int):
+    """Record a finished segment in the server's status table. Elsewhere the
+    output on disk is the record (the server's discover() re-checks it)."""
+    status = _segment_status()
+    if not status.is_local_db(STATUS_DB):
+        return
+    conn = status.open_status_db(STATUS_DB)
+    try:
+        status.mark_segment(
+            conn,
+            game_id,
+            video_path.stem,
+            stage,
+            count=count,
+            video_path=str(video_path),
+        )
+    finally:
+        conn.close()
 
 
 # ---- Task execution ----
@@ -234,6 +254,7 @@ def do_label(game_id: str, video_path: Path):
     output_dir.mkdir(parents=True, exist_ok=True)
 
     n = process_segment(video_path, sess, output_dir)
+    _mark_done(game_id, video_path, "labeled", n)
     logger.info("Labeled %s/%s: %d files", game_id, video_path.stem[:40], n)
 
 
@@ -320,6 +341,7 @@ def do_tile(game_id: str, video_path: Path, frame_interval: int = 4):
     write_queue.put(None)
     writer_t.join()
     cap.release()
+    _mark_done(game_id, video_path, "tiled", n_tiles)
 
     logger.info(
         "Tiled %s/%s: %d tiles from %d frames",
@@ -402,9 +424,19 @@ def main():
         sys.path.insert(0, script_dir)
 
     try:
-        from training.distributed.jobs import claim_job, complete_job, fail_job
+        from training.distributed.jobs import (
+            claim_job,
+            complete_job,
+            fail_job,
+            flush_jobs,
+            hold_lease,
+        )
     except ImportError:
-        from jobs import claim_job, complete_job, fail_job
+        from jobs import claim_job, complete_job, fail_job, flush_jobs, hold_lease
+
+    import atexit
+
+    atexit.register(flush_jobs)  # Ctrl-C / --once: don't strand completions
 
     idle_count = 0
     while True:
@@ -426,12 +458,14 @@ def main():
                 job.get("segment", job.get("config_path", ""))[:40],
             )
             try:
-                execute_job(job)
+                with hold_lease(job_path):
+                    execute_job(job)
                 complete_job(job_path, {"hostname": hostname})
             except Exception as e:
                 logger.error("Job failed: %s", e, exc_info=True)
                 fail_job(job_path, str(e))
         else:
+            flush_jobs()  # completions otherwise ride on the next claim
             idle_count += 1
             if idle_count == 1:
                 logger.info("No jobs in queue. Polling every 30s...")
@@ -0,0 +1,194 @@
+"""Micro-benchmark for ``manifest.read_tiles_batch`` (tiles/s).
+
+Companion to ``io_benchmark.py``: that one gates the warped-shard DataLoader,
+this one measures the packed-tile read path the tile datasets sit on. Two
+batch shapes, each timed for the current set-based reader and for the legacy
+one-``SELECT``-per-tile reader (kept here as the reference):
+
+  random      — ``--batch`` keys sampled uniformly from the game (a shuffled
+                training batch: many packs, scattered offsets).
+  sequential  — ``--batch`` consecutive keys in pack order (a verification /
+                export sweep: long coalescable runs).
+
+With no ``--db`` it builds a synthetic manifest + packs (``--frames`` frames of
+21 tiles, ``--tile-kb`` of random bytes each) in a temp dir through the real
+``catalog_game_tiles`` / ``pack_game`` path. Synthetic packs sit in the page
+cache, so those numbers isolate the SQLite + syscall overhead; point it at the
+real manifest for cold-HDD numbers.
+
+Example:
+    uv run python -m training.experiments.tile_batch_benchmark --batch 10000
+    uv run python -m training.experiments.tile_batch_benchmark \
+        --db D:/training_data/manifest.db --game flash__2024.05.01_vs_RNYFC_away
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from training.data_prep import manifest as M
+
+TILE_ROWS, TILE_COLS = 3, 7
+
+
+def _read_tiles_batch_per_key(
+    conn: sqlite3.Connection,
+    game_id: str,
+    tile_keys: list[tuple[str, int, int, int]],
+) -> list[tuple[tuple[str, int, int, int], bytes]]:
+    """The pre-vectorization reader: one lookup per key, one read per tile."""
+    results = []
+    for seg, fidx, r, c in tile_keys:
+        row = conn.execute(
+            "SELECT pack_file, pack_offset, pack_size FROM tiles "
+            "WHERE game_id=? AND segment=? AND frame_idx=? AND row=? AND col=?",
+            (game_id, seg, fidx, r, c),
+        ).fetchone()
+        if row:
+            results.append(((seg, fidx, r, c), row[0], row[1], row[2]))
+    results.sort(key=lambda x: (x[1] or "", x[2] or 0))
+    output = []
+    current_fh = None
+    current_path = None
+    try:
+        for key, pack_file, pack_offset, pack_size in results:
+            if pack_file != current_path:
+                if current_fh:
+                    current_fh.close()
+                current_fh = open(pack_file, "rb")
+                current_path = pack_file
+            current_fh.seek(pack_offset)
+            output.append((key, current_fh.read(pack_size)))
+    finally:
+        if current_fh:
+            current_fh.close()
+    return output
+
+
+def build_synthetic_manifest(
+    work_dir: Path, frames: int, tile_kb: int, segments: int = 4
+) -> tuple[sqlite3.Connection, str]:
+    """Catalog + pack a synthetic game; returns ``(conn, game_id)``."""
+    game_id = "bench_game"
+    tiles_dir = work_dir / "tiles"
+    game_dir = tiles_dir / game_id
+    game_dir.mkdir(parents=True)
+    rng = random.Random(0)
+    payload = rng.randbytes(tile_kb * 1024)
+    for s in range(segments):
+        seg = f"18.00.{s:02d}-18.05.{s:02d}"
+        for f in range(frames // segments):
+            for r in range(TILE_ROWS):
+                for c in range(TILE_COLS):
+                    stem = f"{seg}_frame_{f * 4:06d}_r{r}_c{c}"
+                    (game_dir / f"{stem}.jpg").write_bytes(payload)
+    conn = M.open_db(work_dir / "manifest.db", create=True)
+    M.catalog_game_tiles(conn, game_id, game_dir)
+    M.pack_game(conn, game_id, tiles_dir, work_dir / "packs", delete_loose=True)
+    return conn, game_id
+
+
+def _game_keys(conn: sqlite3.Connection, game_id: str) -> list[tuple]:
+    """All packed tile keys of a game, in pack order."""
+    return conn.execute(
+        "SELECT segment, frame_idx, row, col FROM tiles "
+        "WHERE game_id = ? AND pack_file IS NOT NULL "
+        "ORDER BY pack_file, pack_offset",
+        (game_id,),
+    ).fetchall()
+
+
+def _time_reader(reader, conn, game_id, batches, repeats) -> dict:
+    rates = []
+    for _ in range(repeats):
+        for keys in batches:
+            t0 = time.perf_counter()
+            out = reader(conn, game_id, keys)
+            dt = time.perf_counter() - t0
+            assert len(out) == len(keys)
+            rates.append(len(keys) / dt if dt > 0 else float("inf"))
+    return {
+        "tiles_per_s_mean": round(statistics.mean(rates)),
+        "tiles_per_s_p50": round(statistics.median(rates)),
+    }
+
+
+def run_benchmark(
+    conn: sqlite3.Connection,
+    game_id: str,
+    batch: int,
+    n_batches: int,
+    repeats: int,
+    seed: int = 0,
+) -> dict:
+    keys = _game_keys(conn, game_id)
+    if not keys:
+        raise SystemExit(f"no packed tiles for game {game_id}")
+    batch = min(batch, len(keys))
+    rng = random.Random(seed)
+    shapes = {
+        "random": [rng.sample(keys, batch) for _ in range(n_batches)],
+        "sequential": [
+            keys[start : start + batch]
+            for start in (
+                rng.randrange(0, len(keys) - batch + 1) for _ in range(n_batches)
+            )
+        ],
+    }
+    report: dict = {"game_id": game_id, "tiles": len(keys), "batch": batch}
+    for shape, batches in shapes.items():
+        new = _time_reader(M.read_tiles_batch, conn, game_id, batches, repeats)
+        old = _time_reader(_read_tiles_batch_per_key, conn, game_id, batches, repeats)
+        report[shape] = {
+            "set_based": new,
+            "per_key": old,
+            "speedup": round(
+                new["tiles_per_s_p50"] / max(1, old["tiles_per_s_p50"]), 2
+            ),
+        }
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--db", type=Path, default=None, help="real manifest.db")
+    ap.add_argument("--game", default=None, help="game_id (required with --db)")
+    ap.add_argument("--batch", type=int, default=10_000)
+    ap.add_argument("--batches", type=int, default=5)
+    ap.add_argument("--repeats", type=int, default=3)
+    ap.add_argument("--frames", type=int, default=2000, help="synthetic frames")
+    ap.add_argument("--tile-kb", type=int, default=24, help="synthetic tile size")
+    ap.add_argument("--out", type=Path, default=None, help="write the report JSON")
+    args = ap.parse_args(argv)
+
+    if args.db is not None:
+        if not args.game:
+            ap.error("--game is required with --db")
+        conn = M.open_db(args.db)
+        report = run_benchmark(conn, args.game, args.batch, args.batches, args.repeats)
+    else:
+        with tempfile.TemporaryDirectory(prefix="tile_bench_") as tmp:
+            conn, game_id = build_synthetic_manifest(
+                Path(tmp), args.frames, args.tile_kb
+            )
+            try:
+                report = run_benchmark(
+                    conn, game_id, args.batch, args.batches, args.repeats
+                )
+            finally:
+                conn.close()
+
+    print(json.dumps(report, indent=2))
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
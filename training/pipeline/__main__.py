@@ -58,6 +58,12 @@ def cmd_status(args):
         f"{stats.get('claimed', 0)} claimed, {stats.get('done', 0)} done, "
         f"{stats.get('failed', 0)} failed"
     )
+    loc = q.get_locality_stats()
+    if loc["claims"]:
+        print(
+            f"Locality: {loc['local_claims']}/{loc['claims']} claims had inputs "
+            f"local ({loc['local_bytes'] / 1e9:.1f} GB cached at claim)"
+        )
 
     # Games
     state_counts = reg.get_state_counts()
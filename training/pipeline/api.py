@@ -14,16 +14,24 @@ Endpoints:
     GET  /api/games              — all games with states
     GET  /api/game/{game_id}     — single game detail + file paths
     GET  /api/queue              — current work items
+    POST /api/jobs/claim         — claim a distributed job (+ batched completions)
+    GET  /api/jobs/status        — distributed jobs by state
+
+The ``/api/jobs`` endpoints serve the distributed worker queue
+(``training/distributed/jobs.py``) from a job index (``jobs.db``, see
+``training/distributed/job_store.py``) kept next to ``work_queue.db``.
 """
 
 import logging
 import threading
+from pathlib import Path
 
 import uvicorn
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from starlette.responses import Response
 
+from training.distributed.job_store import STATUSES, JobStore
 from training.pipeline.queue import WorkQueue
 from training.pipeline.registry import GameRegistry
 
@@ -35,14 +43,24 @@ app = FastAPI(title="Pipeline API", version="1.0.0")
 _queue_db_path: str = ""
 _registry_db_path: str = ""
 _cfg = None
+# The distributed job index: one store (it serializes its own transactions),
+# opened on first use.
+_jobs_db_path: str = ""
+_job_store: JobStore | None = None
+_job_store_lock = threading.Lock()
 
 
 def init_app(queue: WorkQueue, registry: GameRegistry, cfg=None):
     """Store DB paths so the API can create its own connections (thread-safe)."""
-    global _queue_db_path, _registry_db_path, _cfg
+    global _queue_db_path, _registry_db_path, _cfg, _jobs_db_path, _job_store
     _queue_db_path = str(queue.db_path)
     _registry_db_path = str(registry.db_path)
     _cfg = cfg
+    with _job_store_lock:
+        if _job_store is not None:
+            _job_store.close()
+            _job_store = None
+        _jobs_db_path = str(Path(queue.db_path).with_name("jobs.db"))
 
 
 def _get_queue() -> WorkQueue:
@@ -53,6 +71,14 @@ def _get_registry() -> GameRegistry:
     return GameRegistry(_registry_db_path)
 
 
+def _get_job_store() -> JobStore:
+    global _job_store
+    with _job_store_lock:
+        if _job_store is None:
+            _job_store = JobStore(_jobs_db_path)
+        return _job_store
+
+
 # --- Request models ---
 
 
@@ -83,6 +109,8 @@ class WorkerStatusRequest(BaseModel):
     ram_total_gb: float | None = None
     disk_free_gb: float | None = None
     is_user_idle: bool = True
+    local_games: dict[str, int] | None = None
+    cache_stats: dict | None = None
 
 
 # --- Queue endpoints ---
@@ -120,6 +148,100 @@ def fail(item_id: int, req: FailRequest):
     return {"ok": True}
 
 
+# --- Distributed job index (training/distributed/jobs.py) ---
+
+
+class JobCompletion(BaseModel):
+    id: str
+    result: dict | None = None
+    finished_at: float
+
+
+class JobSubmitRequest(BaseModel):
+    jobs: dict[str, dict]  # job id -> job dict
+
+
+class JobClaimRequest(BaseModel):
+    worker: str  # hostname:pid, the lease holder
+    capabilities: list[str] = []
+    completed: list[JobCompletion] = []
+
+
+class JobCompleteRequest(BaseModel):
+    worker: str
+    completed: list[JobCompletion]
+
+
+class JobRenewRequest(BaseModel):
+    worker: str
+
+
+class JobExistsRequest(BaseModel):
+    type: str
+    match: dict = {}
+
+
+class JobCleanRequest(BaseModel):
+    retry_failed: bool = False
+
+
+def _completions(items: list[JobCompletion]) -> list[tuple[str, dict | None, float]]:
+    return [(c.id, c.result, c.finished_at) for c in items]
+
+
+@app.post("/api/jobs/submit")
+def jobs_submit(req: JobSubmitRequest):
+    _get_job_store().submit_many(req.jobs.items())
+    return {"submitted": len(req.jobs)}
+
+
+@app.post("/api/jobs/claim")
+def jobs_claim(req: JobClaimRequest):
+    """Commit the worker's buffered completions and claim its next job.
+
+    Always 200: ``job_id`` is None when nothing matches, so the worker can
+    tell an empty queue from an unreachable API.
+    """
+    claimed = _get_job_store().claim(
+        req.worker, req.capabilities, _completions(req.completed)
+    )
+    job_id, job = claimed if claimed is not None else (None, None)
+    return {"job_id": job_id, "job": job}
+
+
+@app.post("/api/jobs/complete")
+def jobs_complete(req: JobCompleteRequest):
+    applied = _get_job_store().complete(req.worker, _completions(req.completed))
+    return {"completed": applied}
+
+
+@app.post("/api/jobs/{job_id}/renew")
+def jobs_renew(job_id: str, req: JobRenewRequest):
+    return {"ok": _get_job_store().renew(job_id, req.worker)}
+
+
+@app.post("/api/jobs/{job_id}/fail")
+def jobs_fail(job_id: str, req: FailRequest):
+    return {"ok": _get_job_store().fail(job_id, req.error)}
+
+
+@app.post("/api/jobs/exists")
+def jobs_exists(req: JobExistsRequest):
+    return {"exists": _get_job_store().exists(req.type, **req.match)}
+
+
+@app.get("/api/jobs/status")
+def jobs_status():
+    store = _get_job_store()
+    return {name: store.jobs(name) for name in STATUSES}
+
+
+@app.post("/api/jobs/clean")
+def jobs_clean(req: JobCleanRequest):
+    _get_job_store().clean(retry_failed=req.retry_failed)
+    return {"ok": True}
+
+
 # --- Status endpoints ---
 
 
@@ -139,6 +261,8 @@ def worker_status(req: WorkerStatusRequest):
         ram_total_gb=req.ram_total_gb,
         disk_free_gb=req.disk_free_gb,
         is_user_idle=req.is_user_idle,
+        local_games=req.local_games,
+        cache_stats=req.cache_stats,
     )
     return {"ok": True}
 
@@ -153,6 +277,7 @@ def status():
     return {
         "workers": workers,
         "queue": queue_stats,
+        "locality": q.get_locality_stats(),
         "games": state_counts,
         "events": events,
     }
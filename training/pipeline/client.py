@@ -102,6 +102,49 @@ class PipelineClient:
         """Move a done item to archived status."""
         self._post(f"/api/archive/{item_id}")
 
+    # --- Distributed job index (training/distributed/jobs.py) ---
+    # These return None when the API can't be reached, so the caller can fall
+    # back to job files.
+
+    def submit_jobs(self, jobs: dict[str, dict]) -> dict | None:
+        """Add jobs (job id -> job dict) to the index."""
+        return self._post("/api/jobs/submit", {"jobs": jobs})
+
+    def claim_job(
+        self, worker: str, capabilities: list[str], completed: list[dict]
+    ) -> dict | None:
+        """Send buffered completions and claim the next job:
+        ``{"job_id", "job"}`` (both None when nothing matches)."""
+        return self._post(
+            "/api/jobs/claim",
+            {"worker": worker, "capabilities": capabilities, "completed": completed},
+        )
+
+    def complete_jobs(self, worker: str, completed: list[dict]) -> dict | None:
+        """Send buffered completions without claiming."""
+        return self._post(
+            "/api/jobs/complete", {"worker": worker, "completed": completed}
+        )
+
+    def renew_job(self, job_id: str, worker: str) -> bool:
+        """Extend ``worker``'s lease on ``job_id``; False if lost or unreachable."""
+        result = self._post(f"/api/jobs/{job_id}/renew", {"worker": worker})
+        return bool(result and result.get("ok"))
+
+    def fail_job(self, job_id: str, error: str) -> dict | None:
+        return self._post(f"/api/jobs/{job_id}/fail", {"error": error})
+
+    def job_exists(self, job_type: str, match: dict) -> bool | None:
+        result = self._post("/api/jobs/exists", {"type": job_type, "match": match})
+        return result.get("exists", False) if result else None
+
+    def job_status(self) -> dict | None:
+        """Distributed jobs by state (pending / active / done / failed)."""
+        return self._get("/api/jobs/status")
+
+    def clean_jobs(self, retry_failed: bool = False) -> dict | None:
+        return self._post("/api/jobs/clean", {"retry_failed": retry_failed})
+
     # --- Status ---
 
     def report_status(
@@ -120,8 +163,10 @@ class PipelineClient:
         ram_total_gb: float | None = None,
         disk_free_gb: float | None = None,
         is_user_idle: bool = True,
+        local_games: dict[str, int] | None = None,
+        cache_stats: dict | None = None,
     ):
-        """Report worker resource status."""
+        """Report worker resource status, local inputs and input-cache stats."""
         self._post(
             "/api/worker-status",
             {
@@ -138,6 +183,8 @@ class PipelineClient:
                 "ram_total_gb": ram_total_gb,
                 "disk_free_gb": disk_free_gb,
                 "is_user_idle": is_user_idle,
+                "local_games": local_games,
+                "cache_stats": cache_stats,
             },
         )
 
@@ -135,6 +135,7 @@ class WorkerConfig:
         ]
     )
     heartbeat_interval: int = 30
+    input_cache_gb: float = 100.0  # persistent TaskIO input cache on local SSD
 
 
 @dataclass(frozen=True)
@@ -68,6 +68,7 @@ CREATE TABLE IF NOT EXISTS worker_status (
     ram_total_gb REAL,
     disk_free_gb REAL,
     is_user_idle INTEGER,
+    cache_stats TEXT,
     FOREIGN KEY (current_task_id) REFERENCES work_items(id)
 );
 
@@ -82,8 +83,26 @@ CREATE TABLE IF NOT EXISTS event_log (
 );
 
 CREATE INDEX IF NOT EXISTS idx_events_time ON event_log(timestamp DESC);
+
+-- Per-worker inventory of game inputs already on the worker's local disk,
+-- replaced on every status report. claim() prefers items whose game is here.
+CREATE TABLE IF NOT EXISTS worker_cache (
+    hostname TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL,
+    PRIMARY KEY (hostname, game_id)
+);
 """
 
+# Data-locality bounds for claim(): a queued item whose inputs are already on
+# the claiming worker wins over the head of the queue only if its priority is
+# at most LOCALITY_PRIORITY_SLACK worse and the head has waited less than
+# LOCALITY_MAX_WAIT_S. Inventories older than LOCALITY_TTL_S are ignored.
+LOCALITY_PRIORITY_SLACK = 10
+LOCALITY_MAX_WAIT_S = 1800
+LOCALITY_TTL_S = 900
+
 
 class WorkQueue:
     """Pull-based work queue backed by SQLite."""
@@ -123,6 +142,17 @@ class WorkQueue:
                 "ALTER TABLE work_items ADD COLUMN failed_workers TEXT DEFAULT ''"
             )
             conn.commit()
+        if "local_bytes" not in cols:
+            # Bytes of the item's inputs the claiming worker already had
+            # locally (0 = pulled everything); NULL until claimed.
+            conn.execute("ALTER TABLE work_items ADD COLUMN local_bytes INTEGER")
+            conn.commit()
+        worker_cols = {
+            r[1] for r in conn.execute("PRAGMA table_info(worker_status)").fetchall()
+        }
+        if "cache_stats" not in worker_cols:
+            conn.execute("ALTER TABLE worker_status ADD COLUMN cache_stats TEXT")
+            conn.commit()
 
     def _verify_integrity(self):
         """Check DB integrity on first connection. Rebuild if corrupt."""
@@ -346,6 +376,10 @@ class WorkQueue:
     ) -> dict | None:
         """Atomically claim the highest-priority item this worker can handle.
 
+        Prefers an item whose game inputs the worker reported as local (see
+        ``update_worker_status(local_games=...)``) over the head of the queue,
+        within ``LOCALITY_PRIORITY_SLACK`` / ``LOCALITY_MAX_WAIT_S``.
+
         Returns the claimed item as a dict, or None if nothing available.
         """
         conn = self._get_conn()
@@ -353,33 +387,62 @@ class WorkQueue:
 
         # Build placeholders for capabilities
         placeholders = ",".join("?" for _ in capabilities)
+        eligible = f"""FROM work_items w
+                    LEFT JOIN worker_cache c
+                      ON c.hostname = ? AND c.game_id = w.game_id
+                         AND c.updated_at >= ?
+                    WHERE w.status = 'queued'
+                      AND (w.target_machine IS NULL OR w.target_machine = ?)
+                      AND w.task_type IN ({placeholders})
+                      AND (w.failed_workers = '' OR w.failed_workers NOT LIKE ?)"""
+        params = (
+            hostname,
+            now - LOCALITY_TTL_S,
+            hostname,
+            *capabilities,
+            f"%{hostname}%",
+        )
 
         # Atomic claim: SELECT + UPDATE in one transaction
         # The re-check on status='queued' prevents races between workers.
         try:
             conn.execute("BEGIN IMMEDIATE")
             row = conn.execute(
-                f"""SELECT id FROM work_items
-                    WHERE status = 'queued'
-                      AND (target_machine IS NULL OR target_machine = ?)
-                      AND task_type IN ({placeholders})
-                      AND (failed_workers = '' OR failed_workers NOT LIKE ?)
-                    ORDER BY priority ASC, created_at ASC
+                f"""SELECT w.id, w.priority, w.created_at,
+                           COALESCE(c.bytes, 0) AS local_bytes
+                    {eligible}
+                    ORDER BY w.priority ASC, w.created_at ASC
                     LIMIT 1""",
-                (hostname, *capabilities, f"%{hostname}%"),
+                params,
             ).fetchone()
 
             if row is None:
                 conn.execute("ROLLBACK")
                 return None
 
+            if (
+                row["local_bytes"] == 0
+                and now - (row["created_at"] or now) < LOCALITY_MAX_WAIT_S
+            ):
+                local = conn.execute(
+                    f"""SELECT w.id, w.priority, w.created_at, c.bytes AS local_bytes
+                        {eligible}
+                          AND c.bytes > 0 AND w.priority <= ?
+                        ORDER BY w.priority ASC, w.created_at ASC
+                        LIMIT 1""",
+                    (*params, row["priority"] + LOCALITY_PRIORITY_SLACK),
+                ).fetchone()
+                if local is not None:
+                    row = local
+
             item_id = row["id"]
             conn.execute(
                 """UPDATE work_items
                    SET status = 'claimed', claimed_at = ?, claimed_by = ?,
-                       heartbeat_at = ?, attempts = attempts + 1
+                       heartbeat_at = ?, attempts = attempts + 1,
+                       local_bytes = ?
                    WHERE id = ? AND status = 'queued'""",
-                (now, hostname, now, item_id),
+                (now, hostname, now, row["local_bytes"], item_id),
             )
             conn.commit()
         except sqlite3.OperationalError:
@@ -408,13 +471,16 @@ class WorkQueue:
                     pass
 
         logger.info(
-            "%s claimed %s for %s (id=%d, attempt %d/%d)",
+            "%s claimed %s for %s (id=%d, attempt %d/%d%s)",
             hostname,
             result["task_type"],
             result.get("game_id") or "pipeline",
             item_id,
             result["attempts"],
             result["max_attempts"],
+            f", {result['local_bytes'] / 1e9:.1f} GB local"
+            if result.get("local_bytes")
+            else "",
         )
         return result
 
@@ -720,8 +786,15 @@ class WorkQueue:
         ram_total_gb: float | None = None,
         disk_free_gb: float | None = None,
         is_user_idle: bool = True,
+        local_games: dict[str, int] | None = None,
+        cache_stats: dict | None = None,
     ):
-        """Upsert worker resource status."""
+        """Upsert worker resource status.
+
+        ``local_games`` ({game_id: bytes} of inputs already on the worker's
+        disk) replaces the worker's locality inventory; None leaves it as is.
+        ``cache_stats`` is the worker's input-cache hit/miss summary.
+        """
         conn = self._get_conn()
         conn.execute(
             """INSERT INTO worker_status
@@ -729,8 +802,8 @@ class WorkQueue:
                 gpu_name, gpu_util_pct, gpu_temp_c,
                 gpu_memory_used_mb, gpu_memory_total_mb,
                 cpu_util_pct, ram_used_gb, ram_total_gb,
-                disk_free_gb, is_user_idle)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                disk_free_gb, is_user_idle, cache_stats)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                ON CONFLICT(hostname) DO UPDATE SET
                    last_seen=excluded.last_seen,
                    status=excluded.status,
@@ -744,7 +817,8 @@ class WorkQueue:
                    ram_used_gb=excluded.ram_used_gb,
                    ram_total_gb=excluded.ram_total_gb,
                    disk_free_gb=excluded.disk_free_gb,
-                   is_user_idle=excluded.is_user_idle""",
+                   is_user_idle=excluded.is_user_idle,
+                   cache_stats=COALESCE(excluded.cache_stats, cache_stats)""",
             (
                 hostname,
                 time.time(),
@@ -760,8 +834,21 @@ class WorkQueue:
                 ram_total_gb,
                 disk_free_gb,
                 1 if is_user_idle else 0,
+                json.dumps(cache_stats) if cache_stats is not None else None,
             ),
         )
+        if local_games is not None:
+            now = time.time()
+            conn.execute("DELETE FROM worker_cache WHERE hostname = ?", (hostname,))
+            conn.executemany(
+                "INSERT INTO worker_cache (hostname, game_id, bytes, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (hostname, game_id, int(size), now)
+                    for game_id, size in local_games.items()
+                    if size > 0
+                ],
+            )
         conn.commit()
 
     def get_worker_status(self, hostname: str | None = None) -> list[dict]:
@@ -773,7 +860,14 @@ class WorkQueue:
             ).fetchall()
         else:
             rows = conn.execute("SELECT * FROM worker_status").fetchall()
-        return [dict(r) for r in rows]
+        out = [dict(r) for r in rows]
+        for w in out:
+            if w.get("cache_stats"):
+                try:
+                    w["cache_stats"] = json.loads(w["cache_stats"])
+                except (json.JSONDecodeError, TypeError):
+                    pass
+        return out
 
     # ------------------------------------------------------------------
     # Event log
@@ -842,6 +936,30 @@ class WorkQueue:
         ).fetchall()
         return {r["status"]: r["cnt"] for r in rows}
 
+    def get_locality_stats(self) -> dict:
+        """How often claims found their inputs already local.
+
+        Counts the latest claim of each game item. ``local_bytes`` is what the
+        claiming worker reported as cached for the game at claim time, not a
+        measured saving; the workers' cache hit counters (``cache_stats``)
+        have the bytes actually served from cache.
+        """
+        conn = self._get_conn()
+        row = conn.execute(
+            """SELECT COUNT(*) AS claims,
+                      COALESCE(SUM(local_bytes > 0), 0) AS local_claims,
+                      COALESCE(SUM(local_bytes), 0) AS local_bytes
+               FROM work_items
+               WHERE game_id IS NOT NULL AND local_bytes IS NOT NULL"""
+        ).fetchone()
+        claims = row["claims"]
+        return {
+            "claims": claims,
+            "local_claims": row["local_claims"],
+            "local_hit_rate": row["local_claims"] / claims if claims else 0.0,
+            "local_bytes": row["local_bytes"],
+        }
+
     def get_items(
         self,
         *,
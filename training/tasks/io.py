@@ -7,6 +7,9 @@ Every task uses these helpers to:
 4. Clean up local working files
 
 This ensures consistent behavior across all tasks and all machines.
+
+Pulls go through the worker's persistent input cache (``local_cache``), so a
+game's inputs are copied over the network once per change, not once per task.
 """
 
 import logging
@@ -14,9 +17,25 @@ import os
 import shutil
 from pathlib import Path
 
+from training.tasks.local_cache import CACHE_DIRNAME, LocalCache, get_cache
+
 logger = logging.getLogger(__name__)
 
 
+def local_inventory(local_work_dir: Path) -> dict[str, int]:
+    """Bytes of inputs (manifest, packs, video) per game kept on this machine.
+
+    Read from the input cache's index: per-game work dirs are deleted by
+    ``TaskIO.cleanup`` after each task, so the cache is what outlives it.
+    Reported to the queue with the worker status so ``WorkQueue.claim`` can
+    prefer games whose inputs are already here.
+    """
+    root = Path(local_work_dir)
+    if not (root / CACHE_DIRNAME / "index.db").exists():
+        return {}
+    return get_cache(root).inventory()
+
+
 class TaskIO:
     """Manages local working directory and server data access for a task.
 
@@ -47,10 +66,12 @@ class TaskIO:
         game_id: str,
         local_work_dir: Path,
         server_share: str = "",
+        cache: LocalCache | None = None,
     ):
         self.game_id = game_id
         self.local_work_dir = Path(local_work_dir)
         self.server_share = server_share
+        self.cache = cache if cache is not None else get_cache(self.local_work_dir)
 
         # Load config for paths
         from training.pipeline.config import load_config
@@ -178,7 +199,10 @@ class TaskIO:
     # ------------------------------------------------------------------
 
     def pull_manifest(self) -> Path:
-        """Copy manifest.db from server to local SSD."""
+        """Copy manifest.db from server to local SSD.
+
+        Copied out of the cache rather than linked: tasks write to it.
+        """
         src = self.server_manifest()
         if not src.exists():
             raise FileNotFoundError(f"Server manifest not found: {src}")
@@ -188,29 +212,37 @@ class TaskIO:
             stale = Path(str(self.local_manifest_path) + suffix)
             if stale.exists():
                 stale.unlink()
-        shutil.copy2(str(src), str(self.local_manifest_path))
+        hit = self.cache.fetch(
+            src, self.local_manifest_path, game_id=self.game_id, link=False
+        )
         logger.debug(
-            "Pulled manifest.db for %s (%.1f MB)",
+            "Pulled manifest.db for %s (%.1f MB, %s)",
             self.game_id,
             os.path.getsize(str(self.local_manifest_path)) / 1e6,
+            "cached" if hit else "copied",
         )
         return self.local_manifest_path
 
     def pull_packs(self) -> Path:
-        """Copy pack files from server to local SSD."""
+        """Link pack files from the input cache (pulling misses from server).
+
+        The local files share the cache's bytes: do not modify them in place.
+        """
         src = self.server_packs()
         self.local_packs.mkdir(parents=True, exist_ok=True)
-        count = 0
+        count = hits = 0
         for pack_file in src.glob("*.pack"):
             dest = self.local_packs / pack_file.name
             if not dest.exists():
-                shutil.copy2(str(pack_file), str(dest))
+                hits += self.cache.fetch(pack_file, dest, game_id=self.game_id)
                 count += 1
-        logger.debug("Pulled %d pack files for %s", count, self.game_id)
+        logger.debug(
+            "Pulled %d pack files for %s (%d from cache)", count, self.game_id, hits
+        )
         return self.local_packs
 
     def pull_video(self) -> Path:
-        """Copy video files from F: (or share) to local SSD."""
+        """Link video files from the input cache (pulling misses from F:/share)."""
         src = self.video_path()
         if src is None:
             raise FileNotFoundError(f"No video path found for {self.game_id}")
@@ -220,13 +252,15 @@ class TaskIO:
         if not video_files:
             video_files = sorted(src.rglob("*.mp4"))
 
-        count = 0
+        count = hits = 0
         for vf in video_files:
             dest = self.local_video / vf.name
             if not dest.exists():
-                shutil.copy2(str(vf), str(dest))
+                hits += self.cache.fetch(vf, dest, game_id=self.game_id)
                 count += 1
-        logger.debug("Pulled %d video files for %s", count, self.game_id)
+        logger.debug(
+            "Pulled %d video files for %s (%d from cache)", count, self.game_id, hits
+        )
         return self.local_video
 
     # ------------------------------------------------------------------
@@ -0,0 +1,294 @@
+"""Persistent, size-bounded cache of server inputs on the worker's SSD.
+
+Consecutive tasks on one game (tile -> label -> QA -> train) used to pull the
+same manifest, packs and video over SMB into a fresh work dir and delete them
+in ``TaskIO.cleanup``. :class:`LocalCache` keeps a copy of every pulled file
+under ``<local_work_dir>/.cache/``:
+
+- **content-addressed**: an object's key is ``sha256(server path | size |
+  mtime_ns)``, so a file changed on the server is a new object and a stale
+  copy is never served. Older versions of the same server path are dropped
+  when a new one is stored.
+- **materialized by hard link** into the task's work dir (no data copied;
+  falls back to a copy across volumes). Linked files share the cache's
+  bytes, so tasks must not modify them in place — pull with ``link=False``
+  for anything the task writes (the manifest).
+- **verified on every hit**: the object's size and mtime must still match
+  what was recorded when it was stored, so an object modified in place
+  through a hard link (or truncated) is pulled again.
+- **LRU-bounded** to ``max_bytes``; eviction only unlinks the cache's name,
+  so files already linked into a running task stay valid. An object that
+  can't be unlinked keeps its index row, so it is never orphaned.
+
+The index and hit/miss counters live in ``.cache/index.db`` (SQLite, shared
+by every process on the machine); :meth:`LocalCache.stats` is reported with
+the worker status.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIRNAME = ".cache"
+DEFAULT_MAX_GB = 100.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    server_path TEXT NOT NULL,
+    game_id TEXT,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    obj_mtime_ns INTEGER,
+    created_at REAL,
+    last_used REAL,
+    hits INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries(last_used);
+CREATE INDEX IF NOT EXISTS idx_entries_path ON entries(server_path);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_COUNTERS = ("hits", "misses", "bytes_hit", "bytes_pulled", "evictions")
+
+
+def cache_key(server_path: Path | str, size: int, mtime_ns: int) -> str:
+    ident = f"{os.path.normcase(str(server_path))}|{size}|{mtime_ns}"
+    return hashlib.sha256(ident.encode()).hexdigest()
+
+
+class LocalCache:
+    """Content-addressed file cache rooted at ``root``.
+
+    Args:
+        root: cache directory (objects + ``index.db``).
+        max_bytes: LRU eviction bound on the summed object sizes.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.root / "index.db"), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {r[1] for r in self._conn.execute("PRAGMA table_info(entries)")}
+        if "obj_mtime_ns" not in columns:  # index.db from before hit checks
+            self._conn.execute("ALTER TABLE entries ADD COLUMN obj_mtime_ns INTEGER")
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO counters (name, value) VALUES (?, 0)",
+            [(c,) for c in _COUNTERS],
+        )
+        self._conn.commit()
+
+    def _object_path(self, key: str) -> Path:
+        return self.objects / key[:2] / key
+
+    def _bump(self, **deltas: int) -> None:
+        self._conn.executemany(
+            "UPDATE counters SET value = value + ? WHERE name = ?",
+            [(v, k) for k, v in deltas.items()],
+        )
+
+    def fetch(
+        self,
+        src: Path,
+        dest: Path,
+        *,
+        game_id: str | None = None,
+        link: bool = True,
+    ) -> bool:
+        """Materialize server file ``src`` at ``dest`` via the cache.
+
+        Returns True on a cache hit (no bytes read from ``src``).
+        """
+        st = os.stat(src)
+        key = cache_key(src, st.st_size, st.st_mtime_ns)
+        obj = self._object_path(key)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, obj_mtime_ns FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            hit = row is not None and _size_mtime_or_none(obj) == row
+        obj_mtime_ns = None
+        if not hit:
+            obj_mtime_ns = self._store(src, obj, st.st_size)
+        with self._lock:
+            if hit:
+                self._conn.execute(
+                    "UPDATE entries SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                    (now, key),
+                )
+                self._bump(hits=1, bytes_hit=st.st_size)
+            else:
+                # Older versions of this server file can never hit again.
+                for (old,) in self._conn.execute(
+                    "SELECT key FROM entries WHERE server_path = ? AND key != ?",
+                    (str(src), key),
+                ).fetchall():
+                    self._drop(old)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, server_path, game_id, size, "
+                    "mtime_ns, obj_mtime_ns, created_at, last_used, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                    (
+                        key,
+                        str(src),
+                        game_id,
+                        st.st_size,
+                        st.st_mtime_ns,
+                        obj_mtime_ns,
+                        now,
+                        now,
+                    ),
+                )
+                self._bump(misses=1, bytes_pulled=st.st_size)
+            self._conn.commit()
+
+        _materialize(obj, Path(dest), link=link)
+        if not hit:
+            self.evict(keep=key)
+        return hit
+
+    def _store(self, src: Path, obj: Path, size: int) -> int:
+        """Copy ``src`` into the object store; returns the object's mtime_ns."""
+        obj.parent.mkdir(parents=True, exist_ok=True)
+        tmp = obj.with_name(f"{obj.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            shutil.copy2(str(src), str(tmp))
+            st = tmp.stat()
+            if st.st_size != size:
+                raise OSError(f"short copy of {src}: {st.st_size} != {size}")
+            os.replace(tmp, obj)
+        finally:
+            tmp.unlink(missing_ok=True)
+        return st.st_mtime_ns
+
+    def _drop(self, key: str) -> int | None:
+        """Remove one object, then its entry (caller holds the lock); returns
+        the bytes freed, or None (entry kept) if the object can't be removed."""
+        try:
+            self._object_path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Windows refuses to unlink a file another process has open.
+            logger.debug("Could not remove cache object %s: %s", key, e)
+            return None
+        row = self._conn.execute(
+            "SELECT size FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        return row[0] if row else 0
+
+    def evict(self, keep: str | None = None) -> int:
+        """Drop least-recently-used objects until under ``max_bytes``."""
+        evicted = 0
+        with self._lock:
+            total = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            for (key,) in self._conn.execute(
+                "SELECT key FROM entries ORDER BY last_used ASC"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                freed = self._drop(key)
+                if freed is not None:
+                    total -= freed
+                    evicted += 1
+            self._bump(evictions=evicted)
+            self._conn.commit()
+        if evicted:
+            logger.info("Evicted %d cached input(s) to stay under budget", evicted)
+        return evicted
+
+    def inventory(self) -> dict[str, int]:
+        """Cached bytes per game (for the queue's locality-aware claim)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT game_id, SUM(size) FROM entries "
+                "WHERE game_id IS NOT NULL GROUP BY game_id"
+            ).fetchall()
+        return dict(rows)
+
+    def stats(self) -> dict:
+        """Lifetime hit/miss counters plus current size, for the heartbeat."""
+        with self._lock:
+            out = dict(self._conn.execute("SELECT name, value FROM counters"))
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = out["hits"] + out["misses"]
+        out["hit_rate"] = out["hits"] / lookups if lookups else 0.0
+        out["entries"] = entries
+        out["bytes"] = size
+        out["max_bytes"] = self.max_bytes
+        return out
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _size_mtime_or_none(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _materialize(obj: Path, dest: Path, *, link: bool) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if dest.exists() or dest.is_symlink():
+        dest.unlink()
+    if link:
+        try:
+            os.link(obj, dest)
+            return
+        except OSError:
+            pass  # cross-volume or no hard-link support: copy instead
+    shutil.copy2(str(obj), str(dest))
+
+
+_caches: dict[str, LocalCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(local_work_dir: Path, max_gb: float | None = None) -> LocalCache:
+    """Process-wide cache for a work dir (created on first use).
+
+    The first caller fixes the size bound; the worker does this at startup
+    with its configured ``input_cache_gb``.
+    """
+    root = Path(local_work_dir) / CACHE_DIRNAME
+    with _caches_lock:
+        cache = _caches.get(str(root))
+        if cache is None:
+            gb = DEFAULT_MAX_GB if max_gb is None else max_gb
+            cache = LocalCache(root, int(gb * 1024**3))
+            _caches[str(root)] = cache
+        return cache
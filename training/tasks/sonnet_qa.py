@@ -508,37 +508,29 @@ def _find_needed_packs(candidates: list[dict], manifest) -> set[str]:
 
 
 def _pull_selective_packs(task_io: TaskIO, pack_files: set[str]):
-    """Copy only the specific pack files needed for QA."""
-    import shutil
-
+    """Link only the specific pack files needed for QA from the input cache
+    (pulling misses from the server)."""
     task_io.local_packs.mkdir(parents=True, exist_ok=True)
     # Only restore the specific packs we need from F: archive, not all packs
     pack_names = {Path(p).name for p in pack_files}
     server_packs = task_io.ensure_server_packs(pack_names)
-    copied = 0
-    for pack_path_str in pack_files:
-        pack_name = Path(pack_path_str).name
+    pulled = hits = 0
+    for pack_name in sorted(pack_names):
         src = server_packs / pack_name
-        dest = task_io.local_packs / pack_name
-        src_size = src.stat().st_size if src.exists() else 0
-        if dest.exists() and dest.stat().st_size == src_size:
-            logger.info(
-                "Pack %s already on SSD (%.1f GB), skipping copy",
-                pack_name,
-                src_size / (1024**3),
-            )
-        elif src.exists():
-            size_gb = src_size / (1024**3)
-            if dest.exists():
-                logger.info("Pack %s on SSD is wrong size, re-copying...", pack_name)
-                dest.unlink()
-            logger.info("Copying %s (%.1f GB) to SSD...", pack_name, size_gb)
-            shutil.copy2(str(src), str(dest))
-            copied += 1
-            logger.info("Copied %s (%.1f GB)", pack_name, size_gb)
-        else:
+        if not src.exists():
             logger.warning("Pack source not found: %s", src)
-    logger.info("Pulled %d/%d needed pack files to SSD", copied, len(pack_files))
+            continue
+        hit = task_io.cache.fetch(
+            src, task_io.local_packs / pack_name, game_id=task_io.game_id
+        )
+        pulled += 1
+        hits += hit
+    logger.info(
+        "Pulled %d/%d needed pack files to SSD (%d from cache)",
+        pulled,
+        len(pack_names),
+        hits,
+    )
 
 
 def _ensure_game_phases(manifest, task_io: TaskIO):
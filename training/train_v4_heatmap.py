@@ -149,15 +149,12 @@ class _DepthDataset(HeatmapCropDataset):
         import numpy as _np
         import torch
 
-        from training.data_prep.heatmap_dataset import gaussian_heatmap
-
         r = self.items[i]
-        stack = _np.load(self.root / "crops" / r["file"]).astype(_np.float32) / 255.0
+        stack = self._load_stack(i)
+        tgt = self._ball_target(r, self.sigma)
         if r["x"] is None:
-            tgt = _np.zeros((self.crop, self.crop), _np.float32)
             far = 0.0
         else:
-            tgt = gaussian_heatmap(self.crop, self.crop, r["x"], r["y"], self.sigma)
             # depth is guaranteed by require_positive_depth() at startup; a
             # KeyError here means the guard was bypassed — fail loudly.
             far = float(1.0 - r["depth"])  # far touchline -> 1.0
@@ -185,18 +182,16 @@ class _DynSigmaDataset(HeatmapCropDataset):
         import numpy as _np
         import torch
 
-        from training.data_prep.heatmap_dataset import gaussian_heatmap
-
         r = self.items[i]
-        stack = _np.load(self.root / "crops" / r["file"]).astype(_np.float32) / 255.0
+        stack = self._load_stack(i)
         if r["x"] is None:
-            tgt = _np.zeros((self.crop, self.crop), _np.float32)
+            tgt = self._ball_target(r, self.sigma)
         else:
             # depth is guaranteed by require_positive_depth() at startup; a
             # KeyError here means the guard was bypassed — fail loudly.
             depth = float(r["depth"])
             sig = self.sigma_far + (self.sigma_near - self.sigma_far) * depth
-            tgt = gaussian_heatmap(self.crop, self.crop, r["x"], r["y"], sig)
+            tgt = self._ball_target(r, sig)
         if self.augment and random.random() < 0.5:
             stack = _np.ascontiguousarray(stack[:, :, ::-1])
             tgt = _np.ascontiguousarray(tgt[:, ::-1])
@@ -220,17 +215,11 @@ class _PersonDataset(HeatmapCropDataset):
         import numpy as _np
         import torch
 
-        from training.data_prep.heatmap_dataset import (
-            gaussian_heatmap,
-            person_center_heatmap,
-        )
+        from training.data_prep.heatmap_dataset import person_center_heatmap
 
         r = self.items[i]
-        stack = _np.load(self.root / "crops" / r["file"]).astype(_np.float32) / 255.0
-        if r["x"] is None:
-            tgt = _np.zeros((self.crop, self.crop), _np.float32)
-        else:
-            tgt = gaussian_heatmap(self.crop, self.crop, r["x"], r["y"], self.sigma)
+        stack = self._load_stack(i)
+        tgt = self._ball_target(r, self.sigma)
         boxes = self.persons.get(r["file"])
         pvalid = 0.0 if boxes is None else 1.0
         ptgt = person_center_heatmap(self.crop, self.crop, boxes or [])
@@ -405,6 +394,14 @@ def main():
         default=0.5,
         help="λ on the person-channel loss (only with --person-sidecar)",
     )
+    ap.add_argument(
+        "--pack-store",
+        action="store_true",
+        help="read crops from the store's single-file memmap pack (built from the "
+        "pinned index on first use; see training.data_prep.crop_pack) instead of one "
+        "np.load per sample. Default: use an existing pack for the pinned index, "
+        "else the per-file crops.",
+    )
     args = ap.parse_args()
 
     import torch
@@ -472,7 +469,15 @@ def main():
         ds_cls = _PersonDataset
     else:
         ds_cls = HeatmapCropDataset
-    tr = ds_cls(out, "train", args.crop, args.sigma, index_version=args.index_version)
+    packed = True if args.pack_store else None
+    tr = ds_cls(
+        out,
+        "train",
+        args.crop,
+        args.sigma,
+        index_version=args.index_version,
+        packed=packed,
+    )
     if dyn_on or far_on:
         require_positive_depth(
             tr.items, out, "--dynamic-sigma" if dyn_on else "--far-weight"
@@ -490,7 +495,12 @@ def main():
             flush=True,
         )
     va = HeatmapCropDataset(
-        out, "val", args.crop, args.sigma, index_version=args.index_version
+        out,
+        "val",
+        args.crop,
+        args.sigma,
+        index_version=args.index_version,
+        packed=packed,
     )
     print(
         f"train crops={len(tr)} val crops={len(va)} far_weight={args.far_weight}",
@@ -498,7 +508,8 @@ def main():
     )
     print(
         f"DATA: store={out} index_v{tr.index_version} sha={tr.index_sha}"
-        + (" (UNPINNED - store not writable)" if tr.index_version == 0 else ""),
+        + (" (UNPINNED - store not writable)" if tr.index_version == 0 else "")
+        + (f" packed={tr.pack_path.name}" if tr.pack_path else ""),
         flush=True,
     )
     if len(tr) == 0:
@@ -23,6 +23,8 @@ import tomllib
 from pathlib import Path
 
 from training.pipeline.client import PipelineClient
+from training.tasks.io import local_inventory
+from training.tasks.local_cache import CACHE_DIRNAME, DEFAULT_MAX_GB, get_cache
 from training.worker.resources import ResourceMonitor, ResourceState
 
 logger = logging.getLogger(__name__)
@@ -52,6 +54,7 @@ class Worker:
         gpu_device: int = 0,
         idle_games: list[str] | None = None,
         heartbeat_interval: int = 30,
+        input_cache_gb: float = DEFAULT_MAX_GB,
     ):
         self.hostname = hostname
         self.capabilities = capabilities
@@ -71,6 +74,8 @@ class Worker:
 
         # Ensure work dir exists
         self.local_work_dir.mkdir(parents=True, exist_ok=True)
+        # Persistent input cache shared by every TaskIO in this process
+        self.input_cache = get_cache(self.local_work_dir, input_cache_gb)
 
         self._current_task_id: int | None = None
         self._heartbeat_thread: threading.Thread | None = None
@@ -104,6 +109,7 @@ class Worker:
             gpu_device=r.get("gpu_device", 0),
             idle_games=r.get("idle_games", w.get("idle_games", [])),
             heartbeat_interval=raw.get("heartbeat", {}).get("interval", 30),
+            input_cache_gb=w.get("input_cache_gb", DEFAULT_MAX_GB),
         )
 
     # ------------------------------------------------------------------
@@ -310,8 +316,9 @@ class Worker:
 
         gc.collect()
 
-        # "training" subdir is used by the train task for datasets — skip it
-        skip = {"training"}
+        # "training" subdir is used by the train task for datasets, and the
+        # input cache persists across tasks — skip both
+        skip = {"training", CACHE_DIRNAME}
         cleaned = 0
         for entry in self.local_work_dir.iterdir():
             if not entry.is_dir() or entry.name in skip:
@@ -397,6 +404,8 @@ class Worker:
                 ram_total_gb=state.ram_total_gb,
                 disk_free_gb=state.disk_free_gb,
                 is_user_idle=state.is_user_idle,
+                local_games=local_inventory(self.local_work_dir),
+                cache_stats=self.input_cache.stats(),
             )
         except Exception as e:
             logger.debug("Failed to report status: %s", e)
@@ -89,15 +89,6 @@ class TrackPoint:
     detected: bool  # False => position is a physics prediction through occlusion
 
 
-@dataclass
-class _State:
-    pos: np.ndarray
-    vel: np.ndarray
-    score: float  # cumulative path log-likelihood reaching this node
-    back: int | None
-    detected: bool
-
-
 @dataclass
 class TBDResult:
     """The MAP single-ball trajectory and its total log-likelihood."""
@@ -106,34 +97,50 @@ class TBDResult:
     total_logprob: float = float("-inf")
 
 
-def _emission_logprob(cand: Candidate, geom: FieldGeometry, cfg: TBDConfig) -> float:
-    """Observation log-likelihood of a candidate, folding in geometry priors."""
-    lp = cfg.score_weight * math.log(max(cand.score, 1e-6))
-    xy = np.array([[cand.x, cand.y]], dtype=np.float64)
-    if cand.size_px is not None:
-        lp += cfg.size_weight * float(
-            geom.size_consistency_logprob(
-                xy, np.array([cand.size_px]), cfg.size_rel_sigma
-            )[0]
-        )
-    if not bool(geom.is_in_support(xy, cfg.support_margin_px, cfg.support_dome_px)[0]):
-        lp += cfg.support_penalty
-    return lp
+def _pack_frames(
+    frames: list[list[Candidate]], cfg: TBDConfig
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Top-K candidates of every frame, flattened in per-frame score order.
 
+    Returns ``(t_idx, j_idx, cand)``: frame index, rank within the frame, and an
+    ``(N, 4)`` array of ``x, y, score, size_px`` (NaN = unknown size). Ties keep
+    the input order, like a stable descending sort.
+    """
+    k = cfg.max_candidates_per_frame
+    t_idx: list[int] = []
+    j_idx: list[int] = []
+    rows: list[tuple[float, float, float, float]] = []
+    for t, cands in enumerate(frames):
+        top = sorted(cands, key=lambda c: c.score, reverse=True)[:k]
+        for j, c in enumerate(top):
+            t_idx.append(t)
+            j_idx.append(j)
+            rows.append(
+                (c.x, c.y, c.score, math.nan if c.size_px is None else c.size_px)
+            )
+    return (
+        np.asarray(t_idx, dtype=np.intp),
+        np.asarray(j_idx, dtype=np.intp),
+        np.asarray(rows, dtype=np.float64).reshape(-1, 4),
+    )
 
-def _frame_nodes(
-    cands: list[Candidate], geom: FieldGeometry, cfg: TBDConfig
-) -> list[tuple[np.ndarray | None, float, bool]]:
-    """Build (pos, emission, detected) nodes for a frame: top-K dets + a miss."""
-    top = sorted(cands, key=lambda c: c.score, reverse=True)[
-        : cfg.max_candidates_per_frame
-    ]
-    nodes: list[tuple[np.ndarray | None, float, bool]] = [
-        (np.array([c.x, c.y], dtype=np.float64), _emission_logprob(c, geom, cfg), True)
-        for c in top
-    ]
-    nodes.append((None, cfg.miss_logprob, False))  # occlusion node
-    return nodes
+
+def _emission_logprob(
+    cand: np.ndarray, geom: FieldGeometry, cfg: TBDConfig
+) -> np.ndarray:
+    """Observation log-likelihood of each candidate row, folding in geometry priors."""
+    lp = cfg.score_weight * np.log(np.maximum(cand[:, 2], 1e-6))
+    xy = cand[:, :2]
+    sized = ~np.isnan(cand[:, 3])
+    if sized.any():
+        lp[sized] += cfg.size_weight * geom.size_consistency_logprob(
+            xy[sized], cand[sized, 3], cfg.size_rel_sigma
+        )
+    off = ~np.asarray(
+        geom.is_in_support(xy, cfg.support_margin_px, cfg.support_dome_px), bool
+    )
+    lp[off] += cfg.support_penalty
+    return lp
 
 
 def run_tbd(
@@ -158,133 +165,86 @@ def run_tbd(
     incoming path and its implied velocity, then scores transitions by an
     acceleration penalty + a max-speed gate. Occlusion ``miss`` nodes inherit the
     constant-velocity prediction so the track bridges gaps smoothly.
+
+    The lattice is array-based: emissions are a padded ``(T, J + 1)`` matrix
+    (column ``J`` is the miss node, padding is ``-inf``) computed in one batch,
+    each frame pair is scored as one ``(J + 1, J + 1)`` transition block, and
+    the path is recovered from an integer back-pointer array.
     """
     cfg = cfg or TBDConfig()
     t_count = len(frames)
-    table: list[list[_State | None] | None] = [None] * t_count
+    t_idx, j_idx, cand = _pack_frames(frames, cfg)
+    if not len(cand):
+        return TBDResult()
 
-    prev: list[_State | None] | None = None
-    seed_done = False
-    inv_accel_var = 1.0 / (cfg.accel_sigma_px**2)
+    j_max = int(j_idx.max()) + 1
+    miss = j_max  # the occlusion node is the last column of every frame
+    emis = np.full((t_count, j_max + 1), -np.inf)
+    emis[t_idx, j_idx] = _emission_logprob(cand, geom, cfg)
+    emis[:, miss] = cfg.miss_logprob
+    # Node positions per frame; the miss column is filled in as the pass runs
+    # (it is the constant-velocity prediction from its chosen predecessor).
+    node_pos = np.zeros((t_count, j_max + 1, 2))
+    node_pos[t_idx, j_idx] = cand[:, :2]
+    back = np.full((t_count, j_max + 1), -1, dtype=np.intp)
+
+    # Track must start on a real detection (a miss has no position).
+    seed_t = int(t_idx[0])
+    score = emis[seed_t].copy()
+    score[miss] = -np.inf
+    vel = np.zeros((j_max + 1, 2))
 
-    for t in range(t_count):
-        nodes = _frame_nodes(frames[t], geom, cfg)
-
-        if not seed_done:
-            # Track must start on a real detection (a miss has no position).
-            states: list[_State | None] = []
-            any_det = False
-            for pos, emis, det in nodes:
-                if det and pos is not None:
-                    states.append(
-                        _State(
-                            pos=pos,
-                            vel=np.zeros(2),
-                            score=emis,
-                            back=None,
-                            detected=True,
-                        )
-                    )
-                    any_det = True
-                else:
-                    states.append(None)
-            if any_det:
-                table[t] = states
-                prev = states
-                seed_done = True
-            continue
-
-        assert prev is not None
-        states = []
-        for pos, emis, det in nodes:
-            best_score = float("-inf")
-            best_back: int | None = None
-            best_pos: np.ndarray | None = None
-            best_vel: np.ndarray | None = None
-            for pi, ps in enumerate(prev):
-                if ps is None:
-                    continue
-                if det and pos is not None:
-                    npos = pos
-                else:
-                    # Occlusion: coast on a decaying velocity, clamped in-frame so a
-                    # long miss-run can't extrapolate off to infinity.
-                    pred = ps.pos + ps.vel * cfg.occlusion_decay
-                    if cfg.frame_w > 0.0:
-                        pred = np.array(
-                            [
-                                min(max(pred[0], 0.0), cfg.frame_w),
-                                min(max(pred[1], 0.0), cfg.frame_h),
-                            ]
-                        )
-                    npos = pred
-                disp = npos - ps.pos
-                speed = float(np.hypot(disp[0], disp[1]))
-                if speed > cfg.teleport_px:
-                    continue
-                pen = cfg.reacquire_penalty if speed > cfg.max_speed_px else 0.0
-                accel = disp - ps.vel
-                tcost = -0.5 * float(accel @ accel) * inv_accel_var
-                total = ps.score + tcost + pen + emis
-                if total > best_score:
-                    best_score = total
-                    best_back = pi
-                    best_pos = npos
-                    best_vel = disp
-            if best_back is None:
-                states.append(None)
-            else:
-                states.append(
-                    _State(
-                        pos=best_pos,  # type: ignore[arg-type]
-                        vel=best_vel,  # type: ignore[arg-type]
-                        score=best_score,
-                        back=best_back,
-                        detected=det,
-                    )
-                )
-        table[t] = states
-        prev = states
-
-    return _backtrack(table)
-
-
-def _backtrack(table: list[list[_State | None] | None]) -> TBDResult:
+    inv_accel_var = 1.0 / (cfg.accel_sigma_px**2)
+    cols = np.arange(j_max + 1)
+    disp = np.empty((j_max + 1, j_max + 1, 2))  # [prev node, node, xy]
+    for t in range(seed_t + 1, t_count):
+        pos = node_pos[t - 1]
+        # Occlusion: coast on a decaying velocity, clamped in-frame so a long
+        # miss-run can't extrapolate off to infinity.
+        pred = pos + vel * cfg.occlusion_decay
+        if cfg.frame_w > 0.0:
+            np.clip(pred[:, 0], 0.0, cfg.frame_w, out=pred[:, 0])
+            np.clip(pred[:, 1], 0.0, cfg.frame_h, out=pred[:, 1])
+        np.subtract(node_pos[t][None, :, :], pos[:, None, :], out=disp)
+        disp[:, miss] = pred - pos
+        dx, dy = disp[..., 0], disp[..., 1]
+        speed = np.hypot(dx, dy)
+        ax = dx - vel[:, 0:1]
+        ay = dy - vel[:, 1:2]
+        total = score[:, None] + (-0.5 * (ax * ax + ay * ay) * inv_accel_var)
+        total += np.where(speed > cfg.max_speed_px, cfg.reacquire_penalty, 0.0)
+        total += emis[t]
+        total[speed > cfg.teleport_px] = -np.inf
+
+        # argmax takes the first max (lowest prev node on ties). Unreachable
+        # nodes score -inf; no finite path ever points back through one.
+        best = np.argmax(total, axis=0)
+        back[t] = best
+        score = total[best, cols]
+        vel = disp[best, cols]
+        node_pos[t, miss] = pred[best[miss]]
+
+    return _backtrack(score, back, node_pos, seed_t, miss)
+
+
+def _backtrack(
+    score: np.ndarray,
+    back: np.ndarray,
+    node_pos: np.ndarray,
+    seed_t: int,
+    miss: int,
+) -> TBDResult:
     """Walk back the best final node to recover the trajectory."""
-    seed_t = next((t for t, s in enumerate(table) if s is not None), None)
-    if seed_t is None:
-        return TBDResult()
-    last_t = max(t for t, s in enumerate(table) if s is not None)
-
-    final = table[last_t]
-    assert final is not None
-    best_idx = max(
-        (i for i, st in enumerate(final) if st is not None),
-        key=lambda i: final[i].score,  # type: ignore[union-attr]
-        default=None,
-    )
-    if best_idx is None:
+    if not np.isfinite(score).any():
         return TBDResult()
-
-    total = final[best_idx].score  # type: ignore[union-attr]
-    chain: dict[int, _State] = {}
-    t = last_t
-    idx: int | None = best_idx
-    while t >= seed_t and idx is not None:
-        st = table[t][idx]  # type: ignore[index]
-        if st is None:
-            break
-        chain[t] = st
-        idx = st.back
-        t -= 1
-
-    points = [
-        TrackPoint(
-            frame_idx=ti,
-            x=float(chain[ti].pos[0]),
-            y=float(chain[ti].pos[1]),
-            detected=chain[ti].detected,
+    idx = int(np.argmax(score))
+    total = float(score[idx])
+    points: list[TrackPoint] = []
+    for t in range(len(back) - 1, seed_t - 1, -1):
+        x, y = node_pos[t, idx]
+        points.append(
+            TrackPoint(frame_idx=t, x=float(x), y=float(y), detected=idx != miss)
         )
-        for ti in sorted(chain)
-    ]
-    return TBDResult(points=points, total_logprob=float(total))
+        idx = int(back[t, idx])
+    points.reverse()
+    return TBDResult(points=points, total_logprob=total)
@@ -592,7 +592,10 @@ class NtfyAPI:
         )
 
         screenshot_created = await create_screenshot(
-            combined_video_path, screenshot_path, time_offset=time_offset
+            combined_video_path,
+            screenshot_path,
+            time_offset=time_offset,
+            allow_thumbnail=True,
         )
 
         if not screenshot_created:
@@ -977,7 +980,10 @@ class NtfyAPI:
                 os.path.dirname(combined_video_path), screenshot_name
             )
             screenshot_created = await create_screenshot(
-                combined_video_path, temp_path, time_offset=time_offset
+                combined_video_path,
+                temp_path,
+                time_offset=time_offset,
+                allow_thumbnail=True,
             )
             if screenshot_created:
                 screenshot_path = await compress_image(
@@ -16,6 +16,8 @@ from cryptography.exceptions import InvalidSignature, InvalidTag
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
+from video_grouper.inference.session_pool import get_session_pool
+
 logger = logging.getLogger(__name__)
 
 ARTIFACT_MAGIC = b"TTBM"
@@ -270,30 +272,15 @@ class SecureLoader:
         # When set, every successful acquire is recorded for the tray UI.
         self._state_storage_path = state_storage_path
 
-    def acquire(
-        self,
-        model_key: str,
-        channel: str | None = None,
-        pipeline_version: str | None = None,
-    ) -> LoadedModel:
-        if not self._ttt.is_authenticated():
-            raise SecureLoaderError("TTT client is not authenticated")
-
-        try:
-            license_response = self._ttt.acquire_model_license(
-                model_key, channel=channel, pipeline_version=pipeline_version
-            )
-        except Exception as exc:
-            raise SecureLoaderError(
-                f"Could not acquire license for {model_key}: {exc}"
-            ) from exc
-
-        user_id = self._ttt.current_user_id()
-        if not user_id:
-            raise SecureLoaderError("TTT client returned no user_id")
-
-        manifest = _verify_license(license_response, self._public_keys, user_id)
+    def _load_session(
+        self, license_response: dict, manifest: dict, alias: str | None
+    ) -> Any:
+        """Download + verify + decrypt the artifact and build its session.
 
+        The plaintext only ever lives in memory: it goes straight into the
+        session pool with ``persist_optimized=False`` (ORT's optimised graph
+        would be the weights in the clear) and is dropped on return.
+        """
         artifact_url = manifest.get("artifact_url")
         if not artifact_url:
             raise SecureLoaderError("License manifest missing artifact_url")
@@ -316,10 +303,53 @@ class SecureLoader:
 
         providers = _select_providers()
         try:
-            session = _onnxruntime().InferenceSession(plaintext, providers=providers)
+            return get_session_pool().get(
+                plaintext,
+                providers,
+                label=f"{manifest['model_key']} v{manifest['model_version']}",
+                alias=alias,
+                persist_optimized=False,
+                ort=_onnxruntime(),
+            )
         except Exception as exc:
             raise SecureLoaderError(f"ONNX Runtime rejected the model: {exc}") from exc
 
+    def acquire(
+        self,
+        model_key: str,
+        channel: str | None = None,
+        pipeline_version: str | None = None,
+    ) -> LoadedModel:
+        if not self._ttt.is_authenticated():
+            raise SecureLoaderError("TTT client is not authenticated")
+
+        try:
+            license_response = self._ttt.acquire_model_license(
+                model_key, channel=channel, pipeline_version=pipeline_version
+            )
+        except Exception as exc:
+            raise SecureLoaderError(
+                f"Could not acquire license for {model_key}: {exc}"
+            ) from exc
+
+        user_id = self._ttt.current_user_id()
+        if not user_id:
+            raise SecureLoaderError("TTT client returned no user_id")
+
+        manifest = _verify_license(license_response, self._public_keys, user_id)
+
+        # A verified license naming an artifact this process already decrypted
+        # reuses the pooled session: no download, no decrypt, no rebuild.
+        sha = manifest.get("artifact_sha256")
+        alias = (
+            f"ttbm:{manifest.get('model_key')}:{manifest.get('model_version')}:{sha}"
+            if sha
+            else None
+        )
+        pool = get_session_pool()
+        session = pool.lookup(alias) if alias else None
+        if session is None:
+            session = self._load_session(license_response, manifest, alias)
         loaded = LoadedModel(
             session=session,
             model_key=manifest["model_key"],
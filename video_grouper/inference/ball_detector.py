@@ -33,6 +33,7 @@ from video_grouper.inference.iso_warp import (
     far_margin_polygon,
     native_iso_warp,
 )
+from video_grouper.inference.session_pool import get_session_pool
 
 logger = logging.getLogger(__name__)
 
@@ -49,12 +50,12 @@ FAR_MARGIN_PX = 400.0
 BOUNDARY_MARGIN_PX = 0.0
 
 
-def create_session(model_path: Path, use_gpu: bool = True) -> ort.InferenceSession:
-    """Create an ONNX inference session.
+def session_providers(use_gpu: bool = True) -> list[str]:
+    """Provider list for a detector session, preferred first.
 
-    Provider order when ``use_gpu`` is True: CUDA (onnxruntime-gpu wheel), then
-    DirectML (onnxruntime-directml wheel — the norm on customer Windows installs,
-    where the GPU is whatever the machine has), then CPU. Only providers the
+    When ``use_gpu`` is True: CUDA (onnxruntime-gpu wheel), then DirectML
+    (onnxruntime-directml wheel — the norm on customer Windows installs, where
+    the GPU is whatever the machine has), then CPU. Only providers the
     installed wheel actually offers are requested.
     """
     available = set(ort.get_available_providers())
@@ -64,8 +65,18 @@ def create_session(model_path: Path, use_gpu: bool = True) -> ort.InferenceSessi
             if p in available:
                 providers.append(p)
     providers.append("CPUExecutionProvider")
+    return providers
+
 
-    sess = ort.InferenceSession(str(model_path), providers=providers)
+def create_session(model_path: Path, use_gpu: bool = True) -> ort.InferenceSession:
+    """Create an ONNX inference session on :func:`session_providers`.
+
+    Sessions come from the process-wide
+    :class:`~video_grouper.inference.session_pool.SessionPool`, so a second
+    game on the same model reuses the built, warmed session.
+    """
+    providers = session_providers(use_gpu)
+    sess = get_session_pool().get(model_path, providers, ort=ort)
     logger.info("ONNX session using: %s", sess.get_providers())
     return sess
 
@@ -29,7 +29,6 @@ from dataclasses import dataclass
 
 import numpy as np
 
-from video_grouper.inference.ball_tracker import static_persistence
 from video_grouper.inference.world_geometry import FieldGeometry
 
 FEATURE_NAMES: tuple[str, ...] = (
@@ -57,6 +56,8 @@ FEATURE_NAMES: tuple[str, ...] = (
     # load_selector stays, ready for the next feature.)
 )
 
+_COL = {name: j for j, name in enumerate(FEATURE_NAMES)}
+
 # feature families for knockout ablations
 FEATURE_FAMILIES: dict[str, tuple[str, ...]] = {
     "score": ("score", "rank_norm", "pct_frame", "pct_depth"),
@@ -69,6 +70,7 @@ FEATURE_FAMILIES: dict[str, tuple[str, ...]] = {
 _CONT_CAP_M = 50.0  # continuity distances capped here (a gap reads as "no support")
 _CONT_CAP_MPF = 6.0  # per-FRAME cap when ``ef`` is given (stride-invariant mode)
 _N_DEPTH_BANDS = 4
+_WINDOW_FRAMES = 1024  # frames per padded block in build_features
 
 
 def _signed_infield(geom: FieldGeometry, xy: np.ndarray) -> np.ndarray:
@@ -77,10 +79,17 @@ def _signed_infield(geom: FieldGeometry, xy: np.ndarray) -> np.ndarray:
 
     if geom.polygon is None:
         return np.zeros(len(xy))
+    if len(xy) == 0:
+        return np.zeros(0)
     poly = geom.polygon.reshape(-1, 1, 2).astype(np.float32)
+    # Static distractors repeat the same (0.1 px rounded) spot frame after
+    # frame after frame: test each distinct point once (x + iy keys sort ~10x
+    # faster than a row-wise unique).
+    keys = np.ascontiguousarray(xy, dtype=np.float64).view(np.complex128).ravel()
+    pts, inv = np.unique(keys, return_inverse=True)
     d = np.array(
-        [cv2.pointPolygonTest(poly, (float(x), float(y)), True) for x, y in xy]
-    )
+        [cv2.pointPolygonTest(poly, (p.real, p.imag), True) for p in pts.tolist()]
+    )[inv]
     return np.clip(d / 1000.0, -1.0, 1.0)
 
 
@@ -89,6 +98,7 @@ def build_features(
     geom: FieldGeometry,
     top_k: int = 24,
     ef: list[int] | None = None,
+    window: int = _WINDOW_FRAMES,
 ) -> list[np.ndarray]:
     """Per-frame ``(K_t, F)`` float32 feature arrays for ``frames`` (lists of
     :class:`~video_grouper.inference.ball_tracker.Candidate`), in dump order.
@@ -96,96 +106,136 @@ def build_features(
     Pass ``ef`` (the dump's GLOBAL frame numbers) to make the window-continuity
     features stride-invariant: distances are normalized to meters-PER-FRAME instead
     of per dump step. Without it, a stride-8 training dump and a stride-4 eval dump
-    measure different physical quantities."""
+    measure different physical quantities.
+
+    Columnar: candidates are flattened once; per-candidate terms are computed on
+    the flat arrays, and the in-frame pairwise / t±1, t±2 neighbour terms on
+    ``[T, Kmax]`` padded blocks of ``window`` frames (plus a 2-frame halo), so
+    the pairwise temporaries stay bounded on a full game. Bit-identical to the
+    per-frame loop it replaced (``benchmarks/selector_features.py`` keeps that
+    loop as the reference)."""
     n = len(frames)
-    xy = [np.asarray([(c.x, c.y) for c in cs], float).reshape(-1, 2) for cs in frames]
-    world = [geom.image_to_world(p) if len(p) else np.zeros((0, 2)) for p in xy]
-    scores = [np.asarray([c.score for c in cs], float) for cs in frames]
-    sizes = [
-        np.asarray([c.size_px if c.size_px is not None else 0.0 for c in cs], float)
-        for cs in frames
-    ]
-    pers = static_persistence(world, cell_m=2.0)
-    expected = [
-        geom.expected_ball_diameter_px(p) if len(p) else np.zeros(0) for p in xy
-    ]
+    counts = np.fromiter((len(cs) for cs in frames), np.int64, n)
+    offsets = np.zeros(n + 1, np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    total = int(offsets[-1])
+    nf = len(FEATURE_NAMES)
+    out = np.zeros((total, nf), np.float32)
+    if total == 0:
+        return np.split(out, offsets[1:-1])
+
+    cand = np.array(
+        [
+            (c.x, c.y, c.score, c.size_px if c.size_px is not None else 0.0)
+            for cs in frames
+            for c in cs
+        ],
+        float,
+    )
+    xy, sc, sizes = cand[:, :2], cand[:, 2], cand[:, 3]
+    fidx = np.repeat(np.arange(n), counts)
+    col = np.arange(total) - offsets[fidx]
+
+    # Homography terms batched per candidate count: each (m, k, 2) batch maps
+    # every frame with the same matmul a per-frame call uses (bit-identical).
+    world = np.empty((total, 2))
+    expected = np.empty(total)
+    for k in np.unique(counts[counts > 0]).tolist():
+        rows = (offsets[:-1][counts == k][:, None] + np.arange(k)).ravel()
+        batch = xy[rows].reshape(-1, k, 2)
+        world[rows] = geom.image_to_world(batch).reshape(-1, 2)
+        expected[rows] = geom.expected_ball_diameter_px(batch).ravel()
+
+    # ball_tracker.static_persistence (2 m cells), columnar: the fraction of
+    # frames with a candidate in each candidate's world cell.
+    cxy = np.round(world / 2.0).astype(np.int64)
+    cxy -= cxy.min(axis=0)
+    _, cell = np.unique(
+        cxy[:, 0] * (cxy[:, 1].max() + 1) + cxy[:, 1], return_inverse=True
+    )
+    n_cells = int(cell.max()) + 1
+    occ = np.bincount(np.unique(fidx * n_cells + cell) % n_cells, minlength=n_cells)
+    pers = occ[cell] / n
 
     # depth bands over the whole dump -> per-band sorted scores for cross-frame percentile
-    all_exp = np.concatenate([e for e in expected if len(e)]) if n else np.zeros(0)
-    all_sc = np.concatenate([s for s in scores if len(s)]) if n else np.zeros(0)
-    edges = (
-        np.quantile(all_exp, np.linspace(0, 1, _N_DEPTH_BANDS + 1)[1:-1])
-        if len(all_exp)
-        else np.zeros(_N_DEPTH_BANDS - 1)
-    )
-    band_of = lambda e: np.searchsorted(edges, e)  # noqa: E731
-    band_scores = [
-        np.sort(all_sc[band_of(all_exp) == b]) for b in range(_N_DEPTH_BANDS)
-    ]
-
-    def _cont(t: int, off: int) -> np.ndarray:
-        """log-scaled nearest-candidate distance from frame t's candidates to t+off —
-        meters per dump step, or meters per FRAME when ``ef`` is given."""
-        k = len(world[t])
-        u = t + off
-        if k == 0:
-            return np.zeros(0)
-        cap = _CONT_CAP_MPF if ef is not None else _CONT_CAP_M
-        if not (0 <= u < n) or len(world[u]) == 0:
-            d = np.full(k, cap)
-        else:
-            diff = world[t][:, None, :] - world[u][None, :, :]
-            d = np.sqrt((diff**2).sum(-1)).min(axis=1)
-            if ef is not None:
-                d = d / max(abs(int(ef[u]) - int(ef[t])), 1)
-            d = np.minimum(d, cap)
-        return np.log1p(d) / np.log1p(cap)
-
-    out: list[np.ndarray] = []
-    for t in range(n):
-        k = len(frames[t])
-        if k == 0:
-            out.append(np.zeros((0, len(FEATURE_NAMES)), np.float32))
-            continue
-        sc = scores[t]
-        order = np.argsort(-sc, kind="stable")
-        rank = np.empty(k, int)
-        rank[order] = np.arange(k)
-        pct_frame = 1.0 - rank / max(k - 1, 1)
-        bands = np.atleast_1d(band_of(expected[t]))
-        pct_depth = np.array(
-            [
-                np.searchsorted(band_scores[b], s) / max(len(band_scores[b]), 1)
-                for b, s in zip(bands.tolist(), sc.tolist(), strict=True)
-            ]
+    edges = np.quantile(expected, np.linspace(0, 1, _N_DEPTH_BANDS + 1)[1:-1])
+    bands = np.searchsorted(edges, expected)
+    pct_depth = np.empty(total)
+    for b in range(_N_DEPTH_BANDS):
+        in_b = bands == b
+        band_scores = np.sort(sc[in_b])
+        pct_depth[in_b] = np.searchsorted(band_scores, sc[in_b]) / max(
+            len(band_scores), 1
         )
-        exp_d = np.maximum(expected[t], 1e-6)
-        size_ratio = np.where(sizes[t] > 0, sizes[t] / exp_d, 0.0)
-        if k > 1:
-            diff = world[t][:, None, :] - world[t][None, :, :]
-            dm = np.sqrt((diff**2).sum(-1))
-            np.fill_diagonal(dm, np.inf)
-            dens = (dm <= 5.0).sum(axis=1) / top_k
-        else:
-            dens = np.zeros(k)
-        cols = [
-            sc,
-            rank / max(top_k - 1, 1),
-            pct_frame,
-            pct_depth,
-            np.clip(size_ratio, 0.0, 8.0),
-            pers[t],
-            _signed_infield(geom, xy[t]),
-            expected[t] / 20.0,
-            np.full(k, k / top_k),
-            _cont(t, +1),
-            _cont(t, -1),
-            _cont(t, +2),
-            _cont(t, -2),
-            dens,
-        ]
-        out.append(np.stack(cols, axis=1).astype(np.float32))
-    return out
+
+    exp_d = np.maximum(expected, 1e-6)
+    size_ratio = np.where(sizes > 0, sizes / exp_d, 0.0)
+    flat_cols = {
+        "score": sc,
+        "pct_depth": pct_depth,
+        "size_ratio": np.clip(size_ratio, 0.0, 8.0),
+        "persistence": pers,
+        "infield": _signed_infield(geom, xy),
+        "depth": expected / 20.0,
+        "n_cands": counts[fidx] / top_k,
+    }
+    for name, v in flat_cols.items():
+        out[:, _COL[name]] = v
+
+    cap = _CONT_CAP_MPF if ef is not None else _CONT_CAP_M
+    log_cap = np.log1p(cap)
+    ef_arr = np.asarray(ef, np.int64) if ef is not None else None
+    for w0 in range(0, n, window):
+        w1 = min(w0 + window, n)
+        h0, h1 = max(w0 - 2, 0), min(w1 + 2, n)
+        kmax = int(counts[h0:h1].max())
+        if kmax == 0:
+            continue
+        # NaN-padded x / y planes: a pad never compares <= or wins fmin.
+        s0, s1 = offsets[h0], offsets[h1]
+        px = np.full((h1 - h0, kmax), np.nan)
+        py = np.full((h1 - h0, kmax), np.nan)
+        key = np.full((h1 - h0, kmax), np.nan)  # NaN pads sort after every score
+        r, c = fidx[s0:s1] - h0, col[s0:s1]
+        px[r, c], py[r, c] = world[s0:s1, 0], world[s0:s1, 1]
+        key[r, c] = -sc[s0:s1]
+
+        lo, hi = w0 - h0, w1 - h0
+        bx, by = px[lo:hi, :, None], py[lo:hi, :, None]
+        k_t = counts[w0:w1, None]
+        blk_valid = np.arange(kmax) < k_t
+        order = np.argsort(key[lo:hi], axis=1, kind="stable")
+        rank = np.empty_like(order)
+        np.put_along_axis(rank, order, np.arange(kmax)[None], axis=1)
+        # dx*dx + dy*dy is exactly the (diff**2).sum(-1) of a 2-vector.
+        dx, dy = bx - px[lo:hi, None, :], by - py[lo:hi, None, :]
+        near = (np.sqrt(dx * dx + dy * dy) <= 5.0).sum(axis=2)
+        near -= ~np.isnan(px[lo:hi])  # each candidate's zero distance to itself
+        cols = {
+            "rank_norm": rank / max(top_k - 1, 1),
+            "pct_frame": 1.0 - rank / np.maximum(k_t - 1, 1),
+            "dens_5m": near / top_k,
+        }
+        for name, off in (
+            ("cont_p1", 1),
+            ("cont_m1", -1),
+            ("cont_p2", 2),
+            ("cont_m2", -2),
+        ):
+            u = np.arange(w0, w1) + off
+            has_u = (u >= 0) & (u < n)
+            u = np.clip(u, 0, n - 1)
+            has_u &= counts[u] > 0
+            dx, dy = bx - px[u - h0, None, :], by - py[u - h0, None, :]
+            # sqrt is monotone, so sqrt-after-min is the same nearest distance.
+            d = np.sqrt(np.fmin.reduce(dx * dx + dy * dy, axis=2))
+            if ef_arr is not None:
+                d = d / np.maximum(np.abs(ef_arr[u] - ef_arr[w0:w1]), 1)[:, None]
+            d = np.where(has_u[:, None], np.minimum(d, cap), cap)
+            cols[name] = np.log1p(d) / log_cap
+        for name, v in cols.items():
+            out[offsets[w0] : offsets[w1], _COL[name]] = v[blk_valid]
+    return np.split(out, offsets[1:-1])
 
 
 def feature_mask(knockouts: list[str]) -> np.ndarray:
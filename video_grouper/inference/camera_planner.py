@@ -80,82 +80,107 @@ def plan_camera(
     ``depth01`` optionally gives the ball's field depth per frame (0 = far
     touchline, 1 = near) for the calibrated depth-zoom term; ``None`` entries
     (or the whole argument) fall back to mid-depth.
+
+    Array-based: the control law is split into its recurrences — velocity EMA,
+    zoom ease, and the error-adaptive pan follow (the only nonlinear one) — each
+    a plain-float pass, with everything separable between them (speed, dead-ball
+    run length, zoom target, lead room) computed on whole arrays. Bit-identical
+    to the per-frame loop it replaced (``benchmarks/camera_planner.py`` keeps
+    that loop as the reference).
     """
     cfg = config or PlannerConfig()
     n = len(trajectory)
-    out: list[tuple[float, float, float]] = []
     if n == 0:
-        return out
+        return []
 
-    # seed on the first known position (or frame centre)
-    first = next((p for p in trajectory if p is not None), None)
-    cx, cy = (
-        (float(first[0]), float(first[1]))
-        if first is not None
-        else (src_w / 2.0, src_h / 2.0)
+    valid = np.fromiter((p is not None for p in trajectory), bool, n)
+    xy = np.asarray(
+        [(p[0], p[1]) if p is not None else (0.0, 0.0) for p in trajectory], float
     )
-    hfov = cfg.zoom_base_deg * cfg.zoom_scale
+    depth = np.full(n, 0.5)
+    if depth01 is not None:
+        depth = np.asarray(
+            [0.5 if dv is None else float(dv) for dv in depth01[:n]], float
+        )
+
+    # ---- velocity EMA over each run of known positions (reset across a miss:
+    # upsample_track emits None across a wide blanked gap, e.g. halftime, and
+    # the first real frame after it must not read the whole-break displacement
+    # as one frame's velocity) ----
+    vx_l, vy_l = [0.0] * n, [0.0] * n
+    a_v, keep_v = cfg.velocity_ema, 1 - cfg.velocity_ema
     vx = vy = 0.0
-    prev: tuple[float, float] | None = None
-    slow_run = 0
-
-    for t in range(n):
-        p = trajectory[t]
-        if p is not None:
-            x, y = float(p[0]), float(p[1])
-            if prev is not None:
-                vx = cfg.velocity_ema * (x - prev[0]) + (1 - cfg.velocity_ema) * vx
-                vy = cfg.velocity_ema * (y - prev[1]) + (1 - cfg.velocity_ema) * vy
-            prev = (x, y)
-            speed = float(np.hypot(vx, vy))
-            slow = speed / (src_w / 180.0) < cfg.deadball_speed_degf
-            slow_run = slow_run + 1 if slow else 0
-
-            # ---- zoom target: calibrated curve, then dead-ball override ----
-            d = 0.5
-            if depth01 is not None:
-                dv = depth01[t]
-                if dv is not None:
-                    d = float(dv)
-            speed_degf = speed / (src_w / 180.0)
-            target_hfov = cfg.zoom_base_deg + (
-                min(speed_degf / cfg.zoom_speed_norm_degf, 1.0)
-                * cfg.zoom_speed_gain_deg
-            )
-            target_hfov += d * cfg.zoom_depth_gain_deg
-            target_hfov = float(
-                np.clip(target_hfov, cfg.zoom_min_deg, cfg.zoom_max_deg)
-            )
-            target_hfov *= cfg.zoom_scale
-            if slow_run >= cfg.deadball_frames:
-                target_hfov = max(target_hfov, cfg.deadball_hfov_deg)
-
-            # ---- pan target: ball + capped velocity lead room ----
-            view_w_px = src_w * (hfov / 180.0)  # approx px width of the view
-            lead_cap = cfg.max_lead_room_fraction * view_w_px
-            tx = x + float(np.clip(vx * cfg.lead_frames, -lead_cap, lead_cap))
-            ty = y + float(np.clip(vy * cfg.lead_frames, -lead_cap, lead_cap))
-
-            # error-adaptive follow: steady on target, responsive when far behind
-            err = float(np.hypot(tx - cx, ty - cy))
-            resp = min(1.0, err / max(view_w_px / 2.0, 1.0))
-            a_pan = cfg.pan_smoothing_min + resp * (
-                cfg.pan_smoothing_max - cfg.pan_smoothing_min
-            )
-            cx += a_pan * (tx - cx)
-            cy += cfg.pitch_smoothing * (ty - cy)
-        else:
-            # no information at all: hold bearing, ease to the widest view. Reset
-            # the velocity/prev state: upsample_track emits None across a wide
-            # blanked gap (e.g. halftime), and without this the first real frame
-            # after the gap reads the whole-break displacement (x - prev[0]) as a
-            # single frame's velocity and lurches the lead term to its cap.
+    prev = None
+    for t, (ok, (x, y)) in enumerate(zip(valid.tolist(), xy.tolist(), strict=True)):
+        if not ok:
             prev = None
             vx = vy = 0.0
-            target_hfov = cfg.missing_hfov_deg
-        hfov += cfg.zoom_smoothing * (target_hfov - hfov)
-        out.append((float(cx), float(cy), float(hfov)))
-    return out
+            continue
+        if prev is not None:
+            vx = a_v * (x - prev[0]) + keep_v * vx
+            vy = a_v * (y - prev[1]) + keep_v * vy
+        prev = (x, y)
+        vx_l[t], vy_l[t] = vx, vy
+    vel = np.column_stack([vx_l, vy_l])
+
+    # ---- zoom target: calibrated curve, then dead-ball override ----
+    speed_degf = np.hypot(vel[:, 0], vel[:, 1]) / (src_w / 180.0)
+    # consecutive slow KNOWN frames (a miss neither extends nor breaks the run)
+    slow = speed_degf[valid] < cfg.deadball_speed_degf
+    n_slow = np.cumsum(slow)
+    slow_run = np.zeros(n, np.int64)
+    slow_run[valid] = n_slow - np.maximum.accumulate(np.where(slow, 0, n_slow))
+    target_hfov = cfg.zoom_base_deg + (
+        np.minimum(speed_degf / cfg.zoom_speed_norm_degf, 1.0) * cfg.zoom_speed_gain_deg
+    )
+    target_hfov += depth * cfg.zoom_depth_gain_deg
+    target_hfov = np.clip(target_hfov, cfg.zoom_min_deg, cfg.zoom_max_deg)
+    target_hfov *= cfg.zoom_scale
+    dead = slow_run >= cfg.deadball_frames
+    target_hfov[dead] = np.maximum(target_hfov[dead], cfg.deadball_hfov_deg)
+    # no information at all: hold bearing, ease to the widest view
+    target_hfov[~valid] = cfg.missing_hfov_deg
+
+    # ---- incremental zoom; the pan step sees the view BEFORE this frame's ease
+    hfov_in: list[float] = []
+    hfov_out: list[float] = []
+    hfov = cfg.zoom_base_deg * cfg.zoom_scale
+    for target in target_hfov.tolist():
+        hfov_in.append(hfov)
+        hfov += cfg.zoom_smoothing * (target - hfov)
+        hfov_out.append(hfov)
+
+    # ---- pan target: ball + capped velocity lead room ----
+    view_w_px = src_w * (np.asarray(hfov_in) / 180.0)  # approx px width of the view
+    lead_cap = cfg.max_lead_room_fraction * view_w_px
+    tx = xy[:, 0] + np.clip(vel[:, 0] * cfg.lead_frames, -lead_cap, lead_cap)
+    ty = xy[:, 1] + np.clip(vel[:, 1] * cfg.lead_frames, -lead_cap, lead_cap)
+    half_view = np.maximum(view_w_px / 2.0, 1.0)
+
+    # ---- error-adaptive follow: steady on target, responsive when far behind.
+    # Seed on the first known position (or frame centre).
+    if valid.any():
+        first = int(np.argmax(valid))
+        cx, cy = float(xy[first, 0]), float(xy[first, 1])
+    else:
+        cx, cy = src_w / 2.0, src_h / 2.0
+    a_min = cfg.pan_smoothing_min
+    a_span = cfg.pan_smoothing_max - cfg.pan_smoothing_min
+    a_tilt = cfg.pitch_smoothing
+    cxs: list[float] = []
+    cys: list[float] = []
+    hypot = np.hypot
+    for ok, txt, tyt, hv in zip(
+        valid.tolist(), tx.tolist(), ty.tolist(), half_view.tolist(), strict=True
+    ):
+        if ok:
+            err = float(hypot(txt - cx, tyt - cy))
+            resp = min(1.0, err / hv)
+            cx += (a_min + resp * a_span) * (txt - cx)
+            cy += a_tilt * (tyt - cy)
+        cxs.append(cx)
+        cys.append(cy)
+    return list(zip(cxs, cys, hfov_out, strict=True))
 
 
 def upsample_track(
@@ -179,17 +204,19 @@ def upsample_track(
     gs = np.asarray([g for g, _ in pts], int)
     xs = np.asarray([xy[0] for _, xy in pts], float)
     ys = np.asarray([xy[1] for _, xy in pts], float)
-    lo, hi = int(gs[0]), int(gs[-1])
-    for g in range(max(g_start, lo), min(g_end, hi + 1)):
-        x = float(np.interp(g, gs, xs))
-        y = float(np.interp(g, gs, ys))
-        out[g - g_start] = (x, y)
+    g0, g1 = max(g_start, int(gs[0])), min(g_end, int(gs[-1]) + 1)
+    if g0 >= g1:
+        return out
+    g = np.arange(g0, g1)
+    x = np.interp(g, gs, xs)
+    y = np.interp(g, gs, ys)
     # blank the interiors of wide grid gaps (exclusive: endpoints stay tracked)
-    for k in range(1, len(gs)):
-        if int(gs[k]) - int(gs[k - 1]) > max_gap:
-            for g in range(int(gs[k - 1]) + 1, int(gs[k])):
-                if g_start <= g < g_end:
-                    out[g - g_start] = None
+    k = np.clip(np.searchsorted(gs, g, side="right"), 1, len(gs) - 1)
+    blank = (g > gs[k - 1]) & (g < gs[k]) & (gs[k] - gs[k - 1] > max_gap)
+    out[g0 - g_start : g1 - g_start] = [
+        None if b else (xv, yv)
+        for b, xv, yv in zip(blank.tolist(), x.tolist(), y.tolist(), strict=True)
+    ]
     return out
 
 
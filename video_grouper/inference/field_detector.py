@@ -28,6 +28,8 @@ import cv2
 import numpy as np
 import onnxruntime as ort
 
+from video_grouper.inference.session_pool import get_session_pool
+
 logger = logging.getLogger(__name__)
 
 INPUT_W = 768
@@ -37,12 +39,13 @@ INPUT_H = 384
 def create_field_session(
     model_path: Path, use_gpu: bool = True
 ) -> ort.InferenceSession:
-    """Create an ONNX inference session for the field keypoint model."""
+    """Create (or reuse, via the session pool) an ONNX inference session for
+    the field keypoint model."""
     providers: list[str] = []
     if use_gpu:
         providers.append("CUDAExecutionProvider")
     providers.append("CPUExecutionProvider")
-    return ort.InferenceSession(str(model_path), providers=providers)
+    return get_session_pool().get(model_path, providers, ort=ort)
 
 
 def _infer_keypoints(
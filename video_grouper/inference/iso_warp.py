@@ -11,6 +11,7 @@ Pure numpy + cv2 (lazy) — no torch/onnxruntime, importable in every bundle.
 
 from __future__ import annotations
 
+import statistics
 from dataclasses import dataclass
 
 import numpy as np
@@ -153,16 +154,20 @@ class BandStabilizer:
         self._boxes = None
         self.last = (0.0, 0.0)
 
+    @staticmethod
+    def _patch_boxes(h: int, w: int) -> list[tuple[int, int, int, int]]:
+        """(x0, x1, y0, y1) of the left / center / right full-height patches."""
+        pw = max(32, w // 6)
+        return [
+            (max(0, int(cx * w) - pw // 2), min(w, int(cx * w) + pw // 2), 0, h)
+            for cx in (0.15, 0.5, 0.85)
+        ]
+
     def _patches(self, gray: np.ndarray) -> list[np.ndarray]:
         import cv2  # noqa: PLC0415
 
-        h, w = gray.shape
         if self._boxes is None:
-            pw = max(32, w // 6)
-            self._boxes = [
-                (max(0, int(cx * w) - pw // 2), min(w, int(cx * w) + pw // 2), 0, h)
-                for cx in (0.15, 0.5, 0.85)
-            ]
+            self._boxes = self._patch_boxes(*gray.shape)
         d = self.downscale
         out = []
         for x0, x1, y0, y1 in self._boxes:
@@ -229,6 +234,220 @@ class BandStabilizer:
         )
 
 
+def _subpixel(c_minus: float, c0: float, c_plus: float) -> float:
+    """Sub-pixel offset of a correlation peak from a parabola through it and
+    its two neighbours (on the Hanning-windowed surface this halves the
+    half-pixel bias of ``cv2.phaseCorrelate``'s 5x5 centroid)."""
+    den = c_minus - 2.0 * c0 + c_plus
+    return 0.5 * (c_minus - c_plus) / den if den < 0.0 else 0.0
+
+
+def _phase_peak(
+    ref_spec: np.ndarray, cur_spec: np.ndarray
+) -> tuple[float, float, float]:
+    """Phase correlation of precomputed (zero-mean, windowed,
+    ``DFT_COMPLEX_OUTPUT``) spectra -> ``(dx, dy, response)``, in ``cv2.phaseCorrelate``'s sign
+    convention (content shift of ``cur`` vs ``ref``) and response scale (sum of
+    the 5x5 neighbourhood of the peak)."""
+    import cv2  # noqa: PLC0415
+
+    cross = cv2.mulSpectrums(ref_spec, cur_spec, 0, conjB=True)
+    mag = cv2.magnitude(cross[..., 0], cross[..., 1])
+    # whiten, but don't blow near-empty bins up to unit phase noise
+    cross = cross / np.maximum(mag, 1e-3 * float(mag.max()) + 1e-12)[..., None]
+    corr = cv2.idft(cross, flags=cv2.DFT_REAL_OUTPUT | cv2.DFT_SCALE)
+    h, w = corr.shape
+    _, _, _, (px, py) = cv2.minMaxLoc(corr)
+    # the surface is circular: neighbours wrap around
+    k = np.arange(-2, 3)
+    nb = corr[np.ix_((py + k) % h, (px + k) % w)]
+    cx = px + _subpixel(float(nb[2, 1]), float(nb[2, 2]), float(nb[2, 3]))
+    cy = py + _subpixel(float(nb[1, 2]), float(nb[2, 2]), float(nb[3, 2]))
+    # the peak sits at -shift (mod size)
+    dx = -(cx - w if cx > w / 2 else cx)
+    dy = -(cy - h if cy > h / 2 else cy)
+    return dx, dy, float(nb.sum())
+
+
+def _patch_spectrum(
+    band_gray: np.ndarray,
+    x0: int,
+    y0: int,
+    w: int,
+    h: int,
+    factor: int,
+    win: np.ndarray,
+) -> np.ndarray:
+    """Zero-mean, windowed ``DFT_COMPLEX_OUTPUT`` spectrum of one box,
+    downscaled by ``factor`` to the window's size."""
+    import cv2  # noqa: PLC0415
+
+    p = band_gray[y0 : y0 + h, x0 : x0 + w]
+    if factor > 1:
+        p = cv2.resize(p, win.shape[::-1], interpolation=cv2.INTER_AREA)
+    p = p.astype(np.float32)
+    p -= p.mean()  # a flat patch -> zero spectrum -> zero response
+    return cv2.dft(p * win, flags=cv2.DFT_COMPLEX_OUTPUT)
+
+
+@dataclass
+class _PyramidLevel:
+    """One patch at one pyramid level: the source box, its integer downscale
+    factor, the Hanning window and the anchor's windowed spectrum."""
+
+    x0: int
+    y0: int
+    w: int
+    h: int
+    factor: int
+    win: np.ndarray
+    ref: np.ndarray
+
+    @classmethod
+    def build(cls, band_gray, x0, y0, w, h, factor) -> _PyramidLevel:
+        import cv2  # noqa: PLC0415
+
+        x0, y0, w, h, factor = int(x0), int(y0), int(w), int(h), int(factor)
+        win = cv2.createHanningWindow((w // factor, h // factor), cv2.CV_32F)
+        ref = _patch_spectrum(band_gray, x0, y0, w, h, factor, win)
+        return cls(x0, y0, w, h, factor, win, ref)
+
+    def spectrum(self, band_gray: np.ndarray, ox: int, oy: int) -> np.ndarray:
+        return _patch_spectrum(
+            band_gray,
+            self.x0 + ox,
+            self.y0 + oy,
+            self.w,
+            self.h,
+            self.factor,
+            self.win,
+        )
+
+    def correlate(
+        self, band_gray: np.ndarray, ox: int, oy: int
+    ) -> tuple[float, float, float]:
+        """Shift (band px) of the box content offset by ``(ox, oy)`` vs the
+        anchor's, + the phase-correlation response."""
+        dx, dy, resp = _phase_peak(self.ref, self.spectrum(band_gray, ox, oy))
+        return dx * self.factor, dy * self.factor, resp
+
+
+class PyramidBandStabilizer(BandStabilizer):
+    """Drop-in :class:`BandStabilizer` with a cheaper per-frame estimator.
+
+    Same anchor / ``last`` / ``align`` contract and the same three L/C/R patches
+    + median, but:
+
+    - the Hanning windows and the anchor's spectra are computed once in
+      :meth:`set_anchor` (``cv2.phaseCorrelate`` re-windows and re-transforms
+      the anchor patch on every call);
+    - each patch is first correlated at a coarse pyramid level
+      (``downscale * coarse_factor``, ~40x108 px per patch for a 1080p band)
+      — that locates the peak to within a band px or two;
+    - the estimate is then refined on a ``refine_size`` crop at the
+      ``downscale`` level, cut from the current frame at the coarse offset so
+      the residual shift is small — one small DFT instead of a full patch;
+    - a frame whose coarse shift moved less than ``min_motion`` band px (both
+      axes) since the last refined frame keeps ``last`` and skips refinement
+      (calm stretches, i.e. most of a game); ``min_motion=0`` never skips.
+
+    Patches are mean-subtracted before windowing, and sub-pixel peaks come from
+    a 3-point parabola rather than phaseCorrelate's 5x5 centroid.
+    ``benchmarks/band_stabilizer.py`` compares the shifts against
+    :class:`BandStabilizer` on synthetic wind-translated bands and times both
+    (1080p band: ~2.5-3x lower ``estimate`` latency at the same ~0.1 band px
+    mean error without skipping, ~0.17 px with the default ``min_motion``).
+    """
+
+    def __init__(
+        self,
+        downscale: int = 2,
+        max_shift: float = 150.0,
+        min_response: float = 0.03,
+        coarse_factor: int = 4,
+        refine_size: int = 64,
+        min_motion: float = 0.25,
+    ):
+        super().__init__(downscale, max_shift, min_response)
+        self.coarse_factor = int(coarse_factor)
+        self.refine_size = int(refine_size)
+        self.min_motion = float(min_motion)
+        self.frames = 0
+        self.skipped = 0
+        self._plan: list[tuple[_PyramidLevel, _PyramidLevel]] | None = None
+        self._ref_coarse: tuple[float, float] = (0.0, 0.0)
+
+    def reset(self) -> None:
+        super().reset()
+        self._plan = None
+        self._ref_coarse = (0.0, 0.0)
+
+    def set_anchor(self, band_gray: np.ndarray) -> None:
+        self._boxes = self._patch_boxes(*band_gray.shape)
+        d = self.downscale
+        cd = d * self.coarse_factor
+        plan = []
+        for x0, x1, y0, y1 in self._boxes:
+            bw, bh = x1 - x0, y1 - y0
+            # whole multiples of the factor: INTER_AREA's integer-ratio fast path
+            cw, ch = max(1, bw // cd) * cd, max(1, bh // cd) * cd
+            fw = min(self.refine_size * d, max(1, bw // d) * d)
+            fh = min(self.refine_size * d, max(1, bh // d) * d)
+            plan.append(
+                (
+                    _PyramidLevel.build(
+                        band_gray, x0 + (bw - cw) // 2, y0 + (bh - ch) // 2, cw, ch, cd
+                    ),
+                    _PyramidLevel.build(
+                        band_gray, x0 + (bw - fw) // 2, y0 + (bh - fh) // 2, fw, fh, d
+                    ),
+                )
+            )
+        self._plan = plan
+        self._ref_coarse = (0.0, 0.0)
+        self.last = (0.0, 0.0)
+
+    def estimate(self, band_gray: np.ndarray) -> tuple[float, float]:
+        """(dx, dy) of ``band_gray``'s content relative to the anchor, band px.
+        First call adopts the frame as the anchor and returns (0, 0)."""
+        if self._plan is None:
+            self.set_anchor(band_gray)
+            return self.last
+        self.frames += 1
+        h, w = band_gray.shape
+        coarse = []
+        for lv_c, lv_f in self._plan:
+            dx, dy, resp = lv_c.correlate(band_gray, 0, 0)
+            if resp >= self.min_response:
+                coarse.append((lv_f, dx, dy))
+        if not coarse:
+            return self.last
+        cmx = statistics.median([c[1] for c in coarse])
+        cmy = statistics.median([c[2] for c in coarse])
+        rx, ry = self._ref_coarse
+        if abs(cmx - rx) < self.min_motion and abs(cmy - ry) < self.min_motion:
+            self.skipped += 1
+            return self.last
+
+        shifts = []
+        for lv_f, cdx, cdy in coarse:
+            # cut the fine crop where the coarse shift says the content went, so
+            # only a small residual is left to measure
+            ax = min(max(lv_f.x0 + int(round(cdx)), 0), w - lv_f.w) - lv_f.x0
+            ay = min(max(lv_f.y0 + int(round(cdy)), 0), h - lv_f.h) - lv_f.y0
+            rdx, rdy, resp = lv_f.correlate(band_gray, ax, ay)
+            if resp >= self.min_response:
+                shifts.append((ax + rdx, ay + rdy))
+            else:  # textureless crop: fall back to this patch's coarse shift
+                shifts.append((cdx, cdy))
+        dx = statistics.median([s[0] for s in shifts])
+        dy = statistics.median([s[1] for s in shifts])
+        if abs(dx) <= self.max_shift and abs(dy) <= self.max_shift:
+            self.last = (dx, dy)
+            self._ref_coarse = (cmx, cmy)
+        return self.last
+
+
 def dewarp_mask_gray(
     frame_bgr,
     warp: CropIsoWarp,
@@ -245,10 +464,9 @@ def dewarp_mask_gray(
     gray = cv2.cvtColor(band, cv2.COLOR_BGR2GRAY)
     if stabilizer is not None:
         gray = stabilizer.align(gray)
-        if gray.base is not None or not gray.flags.writeable:
-            gray = gray.copy()
-    gray[mask == 0] = 0
-    return gray
+    # a fresh array zero-filled outside the mask (never writes into ``align``'s
+    # passthrough of the caller-visible band)
+    return cv2.bitwise_and(gray, gray, mask=mask)
 
 
 def band_mask(warp: CropIsoWarp, polygon) -> np.ndarray:
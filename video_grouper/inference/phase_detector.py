@@ -30,6 +30,8 @@ import cv2
 import numpy as np
 import onnxruntime as ort
 
+from video_grouper.inference.session_pool import get_session_pool
+
 PLAY_THR = 5  # >= this many in-field persons => play
 # END-whistle loudness gate: the full-time whistle must be at least this multiple of the p75 frame
 # loudness. Wind resonating through the mic at the ref's pitch makes a faint, pitch-wandering
@@ -124,22 +126,22 @@ def resolve_person_model(explicit=None):
     return explicit or os.environ.get("YOLO_PERSON_MODEL") or _bundled_person_model()
 
 
-_SESS_CACHE: dict = {}
+# Person-model session providers (DirectML first; ORT drops any the wheel lacks).
+PERSON_PROVIDERS = ["DmlExecutionProvider", "CPUExecutionProvider"]
 
 
 def sess(model_path):
-    """Cached ONNX session for ``model_path`` (keyed by path — one model per run)."""
-    s = _SESS_CACHE.get(model_path)
-    if s is None:
-        s = ort.InferenceSession(
-            model_path, providers=["DmlExecutionProvider", "CPUExecutionProvider"]
-        )
-        _SESS_CACHE[model_path] = s
-    return s
+    """Pooled ONNX session for ``model_path`` (keyed by file content — see
+    :mod:`video_grouper.inference.session_pool`)."""
+    return get_session_pool().get(model_path, PERSON_PROVIDERS, ort=ort)
 
 
 # ---------- player-on-field curve ----------
-def persons(frame, session, thr=0.30):
+def person_blob(frame):
+    """Letterbox ``frame`` into the person model's 1280x1280 RGB input.
+
+    Returns ``(blob, r, top, left)``: the ``(1, 3, 1280, 1280)`` float32 blob
+    and the scale/offsets that map canvas px back to frame px."""
     h, w = frame.shape[:2]
     r = min(1280 / h, 1280 / w)
     nh, nw = int(round(h * r)), int(round(w * r))
@@ -147,6 +149,11 @@ def persons(frame, session, thr=0.30):
     top, left = (1280 - nh) // 2, (1280 - nw) // 2
     canvas[top : top + nh, left : left + nw] = cv2.resize(frame, (nw, nh))
     blob = canvas[:, :, ::-1].transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+    return blob, r, top, left
+
+
+def persons(frame, session, thr=0.30):
+    blob, r, top, left = person_blob(frame)
     s = session
     out = s.run(None, {s.get_inputs()[0].name: blob})[0][0]
     res = []
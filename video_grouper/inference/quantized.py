@@ -0,0 +1,111 @@
+"""INT8 model variants and the accuracy gate that decides whether to use them.
+
+``training.cli.quantize_models`` writes two files next to an FP32 ``model.onnx``:
+
+- ``model.int8.onnx`` — the static-quantized (QDQ) variant;
+- ``model.int8.gate.json`` — held-out recall/precision of BOTH models, plus
+  the SHA-256 of each file, so the gate always describes exactly this pair.
+
+At runtime a step opts in (``quantized = true``) and :func:`select_model_path`
+hands back the INT8 file only when all of these hold. Otherwise it falls back
+to FP32 and gives the reason for the step log:
+
+- every session provider that is actually available is the CPU one, since
+  the INT8 graphs are tuned for (and only measured on) the CPU path;
+- both files and the gate exist, and both hashes match;
+- neither recall nor precision dropped by more than ``tolerance`` against FP32.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+GATE_VERSION = 1
+GATE_METRICS = ("recall", "precision")
+DEFAULT_TOLERANCE = 0.02
+
+
+def int8_path(fp32_path: Path | str) -> Path:
+    """``model.onnx`` -> ``model.int8.onnx``."""
+    p = Path(fp32_path)
+    return p.with_name(f"{p.stem}.int8.onnx")
+
+
+def gate_path(fp32_path: Path | str) -> Path:
+    """``model.onnx`` -> ``model.int8.gate.json``."""
+    p = Path(fp32_path)
+    return p.with_name(f"{p.stem}.int8.gate.json")
+
+
+def file_sha256(path: Path | str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def gate_failures(gate: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Why ``gate`` does NOT admit the INT8 model (empty list = it passes)."""
+    if gate.get("version") != GATE_VERSION:
+        return [f"unsupported gate version {gate.get('version')!r}"]
+    metrics = gate.get("metrics") or {}
+    fp32, int8 = metrics.get("fp32") or {}, metrics.get("int8") or {}
+    failures = []
+    for name in GATE_METRICS:
+        if name not in fp32 or name not in int8:
+            failures.append(f"gate has no {name}")
+            continue
+        drop = float(fp32[name]) - float(int8[name])
+        if drop > tolerance:
+            failures.append(f"{name} drops {drop:.3f} > tolerance {tolerance:.3f}")
+    return failures
+
+
+def select_model_path(
+    fp32_path: Path | str,
+    *,
+    tolerance: float = DEFAULT_TOLERANCE,
+    providers: Sequence[str] = ("CPUExecutionProvider",),
+    available: Sequence[str] | None = None,
+) -> tuple[Path, str]:
+    """``(model path to load, reason)`` — the INT8 variant only if gated in.
+
+    ``providers`` is the list the session will be created with; ``available``
+    defaults to ``onnxruntime.get_available_providers()``.
+    """
+    fp32 = Path(fp32_path)
+    if available is None:
+        available = importlib.import_module("onnxruntime").get_available_providers()
+    accel = [
+        p for p in providers if p in set(available) and p != "CPUExecutionProvider"
+    ]
+    if accel:
+        return fp32, f"FP32: INT8 is CPU-only and {accel[0]} is active"
+    q, g = int8_path(fp32), gate_path(fp32)
+    if not q.is_file() or not g.is_file():
+        return fp32, f"FP32: no {q.name} + {g.name} next to the model"
+    try:
+        gate = json.loads(g.read_text(encoding="utf-8"))
+        if gate.get("fp32", {}).get("sha256") != file_sha256(fp32):
+            return fp32, f"FP32: {g.name} was measured against a different FP32 model"
+        if gate.get("int8", {}).get("sha256") != file_sha256(q):
+            return fp32, f"FP32: {q.name} changed since {g.name} was written"
+    except (OSError, ValueError, AttributeError) as e:
+        return fp32, f"FP32: unreadable gate {g.name} ({e})"
+    failures = gate_failures(gate, tolerance)
+    if failures:
+        return fp32, "FP32: INT8 gate failed — " + "; ".join(failures)
+    m = gate["metrics"]
+    return q, (
+        f"INT8: gate passed (recall {m['int8']['recall']:.3f} vs "
+        f"{m['fp32']['recall']:.3f}, precision {m['int8']['precision']:.3f} vs "
+        f"{m['fp32']['precision']:.3f}, tolerance {tolerance:.3f})"
+    )
@@ -0,0 +1,474 @@
+"""Process-wide pool of ONNX Runtime inference sessions.
+
+Every model-running step used to build its own ``InferenceSession`` per game,
+so back-to-back games paid for decrypt, graph optimisation and warm-up again.
+:class:`SessionPool` keeps one live session per (model content hash, provider
+list) and hands the same object to every caller.
+
+- **Concurrent runs.** ORT allows concurrent ``run`` calls on one session only
+  for the CPU and CUDA providers; DirectML (and the other compiling
+  providers) allow one ``run`` at a time per session. Sessions on any other
+  provider are handed out behind :class:`SerializedSession`, which takes a
+  per-session lock around ``run``, so callers sharing them queue instead of
+  corrupting the device state.
+
+- **In memory only for licensed bytes.** A model passed as ``bytes`` (the
+  SecureLoader's decrypted TTBM payload) is hashed and handed straight to ORT;
+  the pool never keeps or writes the plaintext, and such models are added
+  with ``persist_optimized=False`` so ORT's optimised graph (which is the
+  weights in the clear) never reaches disk either.
+- **Optimised-model cache.** For plaintext on-disk models (community /
+  bring-your-own / bundled) the first, cold build asks ORT to serialise its
+  optimised graph into ``cache_dir``; the next process loads that file with
+  graph optimisation disabled. The file name carries the content hash, the
+  provider tag and the ORT version, so a new model, device or runtime never
+  picks up a stale graph. Only CPU / CUDA sessions are persisted — providers
+  that compile graph partitions (DirectML, TensorRT, ...) can't be serialised.
+- **Warm-up.** Each new session runs one all-zeros batch before it is handed
+  out, so the first real frame doesn't pay for lazy kernel/arena set-up.
+  :meth:`SessionPool.prewarm` runs loaders on a background thread at service
+  start.
+- **Eviction.** Least-recently-used sessions are dropped past
+  ``max_sessions`` and, when ``rss_budget_mb`` is set, while the process RSS
+  is over budget. Callers still holding an evicted session keep using it.
+
+:meth:`SessionPool.describe` reports whether a session came in cold (build +
+warm-up timings) or warm (a pool hit) for the step logs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 4
+
+# Providers whose optimised graph ORT can serialise (no compiled partitions).
+_PERSIST_PROVIDERS = frozenset({"CPUExecutionProvider", "CUDAExecutionProvider"})
+
+# Providers that support concurrent ``run`` calls on one session.
+_CONCURRENT_RUN_PROVIDERS = frozenset({"CPUExecutionProvider", "CUDAExecutionProvider"})
+
+# Dummy-batch dtypes for the ORT input type strings the repo's models use.
+_WARMUP_DTYPES = {
+    "tensor(float)": np.float32,
+    "tensor(float16)": np.float16,
+    "tensor(double)": np.float64,
+    "tensor(uint8)": np.uint8,
+    "tensor(int8)": np.int8,
+    "tensor(int32)": np.int32,
+    "tensor(int64)": np.int64,
+    "tensor(bool)": np.bool_,
+}
+# Symbolic (dynamic) dims in the dummy batch: batch axis 1, anything else 64 —
+# divisible by the stride-32 encoders, small enough to be near-free.
+_WARMUP_DYNAMIC_DIM = 64
+
+
+def _onnxruntime():
+    """Lazy import, so importing the pool never loads the runtime."""
+    return importlib.import_module("onnxruntime")
+
+
+def _provider_names(providers: Sequence) -> list[str]:
+    """Provider names from a ``providers=`` list (names or (name, options))."""
+    return [p if isinstance(p, str) else p[0] for p in providers]
+
+
+def _provider_tag(providers: Sequence) -> str:
+    """Stable short tag for a provider list *including* per-provider options."""
+    canon = json.dumps(
+        [p if isinstance(p, str) else [p[0], p[1]] for p in providers],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()[:12]
+
+
+def _warmup_feeds(session: Any) -> dict[str, np.ndarray] | None:
+    """All-zeros feeds for ``session``'s inputs, or None if a dtype is unknown."""
+    feeds: dict[str, np.ndarray] = {}
+    for inp in session.get_inputs():
+        dtype = _WARMUP_DTYPES.get(inp.type)
+        if dtype is None:
+            return None
+        shape = [
+            d
+            if isinstance(d, int) and d > 0
+            else (1 if i == 0 else _WARMUP_DYNAMIC_DIM)
+            for i, d in enumerate(inp.shape or [])
+        ]
+        feeds[inp.name] = np.zeros(shape, dtype)
+    return feeds
+
+
+class SerializedSession:
+    """A shared ``InferenceSession`` whose ``run`` calls take turns.
+
+    Everything else (``get_inputs``, ``get_providers``, ...) is passed
+    straight through to the wrapped session.
+    """
+
+    def __init__(self, session: Any):
+        self.session = session
+        self._run_lock = threading.Lock()
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        with self._run_lock:
+            return self.session.run(*args, **kwargs)
+
+    def run_with_iobinding(self, *args: Any, **kwargs: Any) -> Any:
+        with self._run_lock:
+            return self.session.run_with_iobinding(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+
+@dataclass
+class _Entry:
+    key: str
+    label: str
+    session: Any
+    source: str  # "model" | "optimized cache"
+    create_ms: float
+    warmup_ms: float
+    hits: int = 0
+    aliases: set[str] = field(default_factory=set)
+
+
+class SessionPool:
+    """LRU pool of live ``InferenceSession``s keyed by content hash + providers.
+
+    Use :func:`get_session_pool` for the process-wide instance; the service
+    applies ``[PIPELINE]`` settings to it with :meth:`configure` at start-up.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        rss_budget_mb: float | None = None,
+    ):
+        self._lock = threading.RLock()
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._by_session: dict[int, _Entry] = {}
+        self._aliases: dict[str, str] = {}
+        # (path, size, mtime_ns) -> sha256, so an unchanged file isn't re-hashed.
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self.cache_dir: Path | None = None
+        self.max_sessions = DEFAULT_MAX_SESSIONS
+        self.rss_budget_mb: float | None = None
+        self.configure(cache_dir, max_sessions, rss_budget_mb)
+
+    def configure(
+        self,
+        cache_dir: Path | str | None = None,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        rss_budget_mb: float | None = None,
+    ) -> None:
+        """Set the optimised-model cache dir and the eviction budget.
+
+        ``cache_dir=None`` disables the on-disk cache; ``rss_budget_mb`` of
+        None / 0 disables the RSS check. Live sessions are kept (and trimmed
+        to the new budget).
+        """
+        with self._lock:
+            self.cache_dir = Path(cache_dir) if cache_dir else None
+            self.max_sessions = max(1, int(max_sessions))
+            self.rss_budget_mb = float(rss_budget_mb) if rss_budget_mb else None
+            self._evict(keep=None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every pooled session (callers holding one keep it)."""
+        with self._lock:
+            self._entries.clear()
+            self._by_session.clear()
+            self._aliases.clear()
+
+    # -- lookup ---------------------------------------------------------------
+
+    def lookup(self, alias: str) -> Any | None:
+        """The live session registered under ``alias``, or None.
+
+        Lets a caller that can name a model before it has its bytes (the
+        SecureLoader: model key + version + artifact hash from a verified
+        license) skip fetching and decrypting it again.
+        """
+        with self._lock:
+            key = self._aliases.get(alias)
+            entry = self._entries.get(key) if key else None
+            if entry is None:
+                self._aliases.pop(alias, None)
+                return None
+            return self._hit(entry)
+
+    def describe(self, session: Any) -> str | None:
+        """Cold/warm timing line for a pooled ``session`` (None if not pooled)."""
+        entry = self._by_session.get(id(session))
+        if entry is None or entry.session is not session:
+            return None
+        built = (
+            f"{entry.create_ms:.0f} ms build ({entry.source}) "
+            f"+ {entry.warmup_ms:.0f} ms warm-up"
+        )
+        if entry.hits:
+            return f"warm: pool hit #{entry.hits} for {entry.label} (cold was {built})"
+        return f"cold: {entry.label} {built}"
+
+    # -- acquire --------------------------------------------------------------
+
+    def get(
+        self,
+        model: bytes | Path | str,
+        providers: Sequence,
+        *,
+        label: str | None = None,
+        alias: str | None = None,
+        persist_optimized: bool = True,
+        ort: Any = None,
+    ) -> Any:
+        """Return a live session for ``model`` on ``providers``, building it once.
+
+        ``model`` is the serialized ONNX ``bytes`` or a path to a ``.onnx``. A
+        path that can't be read is handed to ORT unpooled, so the caller sees
+        ORT's own error. ``ort`` is the runtime module to build with (callers
+        pass the one they imported; defaults to ``onnxruntime``).
+        """
+        ort = ort or _onnxruntime()
+        providers = list(providers)
+        digest: str | None
+        if isinstance(model, bytes):
+            digest = hashlib.sha256(model).hexdigest()
+            name = label or "model"
+        else:
+            digest = self._file_digest(Path(model))
+            if digest is None:
+                return ort.InferenceSession(str(model), providers=providers)
+            name = label or Path(model).name
+        key = f"{digest}:{_provider_tag(providers)}"
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if alias:
+                    self._alias(alias, entry)
+                return self._hit(entry)
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:  # one build per key; other keys build concurrently
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    if alias:
+                        self._alias(alias, entry)
+                    return self._hit(entry)
+            entry = self._build(
+                ort, model, providers, key, digest, name, persist_optimized
+            )
+            with self._lock:
+                self._entries[key] = entry
+                self._by_session[id(entry.session)] = entry
+                if alias:
+                    self._alias(alias, entry)
+                self._key_locks.pop(key, None)
+                self._evict(keep=key)
+        logger.info("session pool: %s", self.describe(entry.session))
+        return entry.session
+
+    def prewarm(
+        self, loaders: Sequence[Callable[[], Any]], name: str = "session-prewarm"
+    ) -> threading.Thread | None:
+        """Run ``loaders`` (each builds a session through this pool) on a
+        daemon thread. A failing loader is logged and skipped."""
+        if not loaders:
+            return None
+
+        def _run() -> None:
+            for load in loaders:
+                try:
+                    load()
+                except Exception:
+                    logger.warning("session pool: prewarm failed", exc_info=True)
+
+        thread = threading.Thread(target=_run, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    # -- internals ------------------------------------------------------------
+
+    def _hit(self, entry: _Entry) -> Any:
+        entry.hits += 1
+        self._entries.move_to_end(entry.key)
+        return entry.session
+
+    def _alias(self, alias: str, entry: _Entry) -> None:
+        self._aliases[alias] = entry.key
+        entry.aliases.add(alias)
+
+    def _file_digest(self, path: Path) -> str | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        stamp = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+        digest = self._digests.get(stamp)
+        if digest is None:
+            h = hashlib.sha256()
+            try:
+                with open(path, "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        h.update(chunk)
+            except OSError:
+                return None
+            digest = self._digests[stamp] = h.hexdigest()
+        return digest
+
+    def _cache_path(self, ort: Any, digest: str, providers: list) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        if not set(_provider_names(providers)) <= _PERSIST_PROVIDERS:
+            return None
+        version = re.sub(r"[^0-9A-Za-z.]", "", str(getattr(ort, "__version__", "")))
+        return (
+            self.cache_dir
+            / f"{digest[:32]}-{_provider_tag(providers)}-ort{version}.onnx"
+        )
+
+    def _build(
+        self,
+        ort: Any,
+        model: bytes | Path | str,
+        providers: list,
+        key: str,
+        digest: str,
+        label: str,
+        persist_optimized: bool,
+    ) -> _Entry:
+        src = model if isinstance(model, bytes) else str(model)
+        cached = self._cache_path(ort, digest, providers) if persist_optimized else None
+        t0 = time.perf_counter()
+        session = None
+        source = "model"
+        if cached is not None and cached.is_file():
+            opts = ort.SessionOptions()
+            opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+            try:
+                session = ort.InferenceSession(
+                    str(cached), sess_options=opts, providers=providers
+                )
+                source = "optimized cache"
+            except Exception:
+                logger.warning(
+                    "session pool: discarding unreadable optimized model %s",
+                    cached,
+                    exc_info=True,
+                )
+                cached.unlink(missing_ok=True)
+                t0 = time.perf_counter()
+        if session is None and cached is not None:
+            session = self._build_persisting(ort, src, providers, cached)
+        if session is None:
+            session = ort.InferenceSession(src, providers=providers)
+        create_ms = (time.perf_counter() - t0) * 1e3
+
+        t0 = time.perf_counter()
+        try:
+            feeds = _warmup_feeds(session)
+            if feeds:
+                session.run(None, feeds)
+        except Exception as exc:
+            logger.debug("session pool: warm-up skipped for %s: %s", label, exc)
+        warmup_ms = (time.perf_counter() - t0) * 1e3
+        if not set(_provider_names(providers)) <= _CONCURRENT_RUN_PROVIDERS:
+            session = SerializedSession(session)
+        return _Entry(key, label, session, source, create_ms, warmup_ms)
+
+    @staticmethod
+    def _build_persisting(
+        ort: Any, src: bytes | str, providers: list, cached: Path
+    ) -> Any | None:
+        """Cold build that also serialises ORT's optimised graph to ``cached``.
+
+        ORT writes the file while it builds, so it goes to a per-process temp
+        name and is renamed into place — a concurrent reader never sees a
+        half-written graph. Returns None (caller builds plainly) on failure.
+        """
+        tmp = cached.with_name(f"{cached.name}.{os.getpid()}.tmp")
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            opts = ort.SessionOptions()
+            opts.optimized_model_filepath = str(tmp)
+            session = ort.InferenceSession(src, sess_options=opts, providers=providers)
+            os.replace(tmp, cached)
+            return session
+        except Exception:
+            logger.warning(
+                "session pool: could not persist optimized model to %s",
+                cached,
+                exc_info=True,
+            )
+            tmp.unlink(missing_ok=True)
+            return None
+
+    def _evict(self, keep: str | None) -> None:
+        """Drop LRU entries past ``max_sessions`` / the RSS budget (never ``keep``)."""
+        while len(self._entries) > self.max_sessions and self._drop_oldest(keep):
+            pass
+        if self.rss_budget_mb is None:
+            return
+        try:
+            import psutil  # optional: only the metrics / tray extras ship it
+        except ImportError:
+            logger.warning(
+                "session pool: psutil not installed, ignoring the RSS budget"
+            )
+            return
+        budget = self.rss_budget_mb * 1024 * 1024
+        proc = psutil.Process()
+        while proc.memory_info().rss > budget and self._drop_oldest(keep):
+            pass
+
+    def _drop_oldest(self, keep: str | None) -> bool:
+        for key, entry in self._entries.items():
+            if key == keep:
+                continue
+            del self._entries[key]
+            self._by_session.pop(id(entry.session), None)
+            for alias in entry.aliases:
+                self._aliases.pop(alias, None)
+            logger.info("session pool: evicted %s (%d hits)", entry.label, entry.hits)
+            return True
+        return False
+
+
+_POOL = SessionPool()
+
+
+def get_session_pool() -> SessionPool:
+    """The process-wide :class:`SessionPool`."""
+    return _POOL
+
+
+def describe_session(session: Any) -> str | None:
+    """Shorthand for ``get_session_pool().describe(session)``."""
+    return _POOL.describe(session)
@@ -80,17 +80,25 @@ def _apply_homography(h: np.ndarray, pts: np.ndarray) -> np.ndarray:
     """Apply a 3x3 homography to ``(M, 2)`` points in float64.
 
     Done by hand (not ``cv2.perspectiveTransform``) to keep full float64
-    precision for round-trip tests.
+    precision for round-trip tests. A ``(B, M, 2)`` batch maps each ``(M, 2)``
+    slice with the same matmul a single call would use, so results are
+    bit-identical to ``B`` separate calls.
     """
-    pts = np.asarray(pts, dtype=np.float64).reshape(-1, 2)
-    hom = np.concatenate([pts, np.ones((pts.shape[0], 1))], axis=1) @ h.T
-    w = hom[:, 2:3]
+    pts = _as_points(pts)
+    hom = np.concatenate([pts, np.ones(pts.shape[:-1] + (1,))], axis=-1) @ h.T
+    w = hom[..., 2:3]
     # Guard against division by ~0 at the horizon (points on the field never hit
     # this, but a caller may probe outside the field). Preserve sign: for a small
     # NEGATIVE w, np.sign(w)*1e-12 + 1e-12 collapsed to exactly 0.0 -> inf/nan,
     # the very failure this guard exists to prevent.
     w = np.where(np.abs(w) < 1e-12, np.where(w < 0.0, -1e-12, 1e-12), w)
-    return hom[:, :2] / w
+    return hom[..., :2] / w
+
+
+def _as_points(pts_xy: np.ndarray) -> np.ndarray:
+    """float64 ``(M, 2)`` points; a ``(B, M, 2)`` batch passes through as-is."""
+    pts = np.asarray(pts_xy, dtype=np.float64)
+    return pts if pts.ndim == 3 else pts.reshape(-1, 2)
 
 
 def _polygon_ordering_ok(poly: np.ndarray) -> bool:
@@ -169,7 +177,8 @@ class FieldGeometry:
         """Map source pixel ``(x, y)`` to field-plane metric ``(X, Y)``.
 
         Assumes the points lie on the ground plane. ``(M, 2)`` in, ``(M, 2)``
-        out. Raises if the geometry is neutral (no homography).
+        out (or ``(B, M, 2)`` batches). Raises if the geometry is neutral (no
+        homography).
         """
         if not self.valid or self.h_img2world is None:
             raise ValueError("image_to_world requires a valid (non-neutral) geometry")
@@ -191,22 +200,23 @@ class FieldGeometry:
         pixels. Larger near the camera (bottom of image), smaller in the far
         field (top) — the perspective gradient, derived purely from geometry.
 
-        ``(M, 2)`` or ``(2,)`` in; returns ``(M,)``. Neutral geometry returns
-        the uniform ``fallback_ball_px`` for every point.
+        ``(M, 2)`` or ``(2,)`` in; returns ``(M,)`` (``(B, M)`` for a
+        ``(B, M, 2)`` batch). Neutral geometry returns the uniform
+        ``fallback_ball_px`` for every point.
         """
-        pts = np.asarray(pts_xy, dtype=np.float64).reshape(-1, 2)
+        pts = _as_points(pts_xy)
         if not self.valid:
-            return np.full(pts.shape[0], self.fallback_ball_px)
+            return np.full(pts.shape[:-1], self.fallback_ball_px)
 
         world = self.image_to_world(pts)  # (M, 2)
         half = self.ball_diameter_m / 2.0
-        sizes = np.empty(pts.shape[0], dtype=np.float64)
+        sizes = np.empty(pts.shape[:-1], dtype=np.float64)
         for axis in (0, 1):  # world-X then world-Y oriented segment
             off = np.zeros((1, 2))
             off[0, axis] = half
             img_plus = self.world_to_image(world + off)
             img_minus = self.world_to_image(world - off)
-            seg = np.linalg.norm(img_plus - img_minus, axis=1)
+            seg = np.linalg.norm(img_plus - img_minus, axis=-1)
             sizes = seg if axis == 0 else (sizes + seg)
         return sizes / 2.0
 
@@ -32,13 +32,21 @@ class PipelineConfig(BaseModel):
 
     ``steps`` is the ordered list of step ids; ``step_specs`` maps each id to its
     spec. ``enabled`` is the master switch. Resource-pool capacities tune the
-    scheduler. ``per_team`` allows per-team overrides (applied upstream).
+    scheduler. The ``session_pool_*`` knobs size the process-wide ONNX session
+    pool (see :mod:`video_grouper.inference.session_pool`); an RSS budget of 0
+    disables that check. ``per_team`` allows per-team overrides (applied
+    upstream).
     """
 
     enabled: bool = False
     community_plugins_enabled: bool = False
     gpu_concurrency: int = 1
     ram_heavy_concurrency: int = 1
+    session_pool_max_sessions: int = 4
+    session_pool_rss_budget_mb: int = 0
+    # Persist ORT's optimised graph for plaintext models under
+    # <storage>/ort_cache (licensed models never touch disk).
+    optimized_model_cache: bool = True
     steps: list[str] = Field(default_factory=list)
     step_specs: dict[str, PipelineStepSpec] = Field(default_factory=dict)
     per_team: dict[str, str] = Field(default_factory=dict, alias="PER_TEAM")
@@ -0,0 +1,129 @@
+"""Service start-up warm-up for the pipeline's on-disk ONNX models.
+
+``VideoGrouperApp`` calls :func:`prewarm_pipeline_sessions` once at start-up:
+every configured ``ball_detect`` / ``field_detect`` step with a ``model_path``
+and the ``phase_detect`` person model get built (and run one dummy batch)
+through the process-wide session pool on a background thread, so the first
+game doesn't pay for graph optimisation. The loaders are the same session
+factories the steps call, so the step later gets a pool hit.
+
+TTT-licensed (``model_key``) models are not prewarmed — that needs a license
+round-trip per model; the first game builds them and later games reuse them.
+
+Step modules are imported lazily, per type, so a bundle without the inference
+stack simply has nothing to warm.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from video_grouper.pipeline.base import StepSpec
+
+if TYPE_CHECKING:
+    from video_grouper.pipeline.steps.ball_detect import BallDetectStepConfig
+    from video_grouper.pipeline.steps.field_detect import FieldDetectStepConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _detector_loader(spec: StepSpec) -> Callable[[], Any] | None:
+    cfg: BallDetectStepConfig | FieldDetectStepConfig
+    # INT8 accuracy tolerance when the step picks a quantized model
+    # (ball_detect only).
+    tolerance: float | None = None
+    if spec.type == "ball_detect":
+        from video_grouper.inference.ball_detector import create_session as factory
+        from video_grouper.pipeline.steps.ball_detect import BallDetectStepConfig
+
+        cfg = BallDetectStepConfig(**spec.config)
+        if cfg.quantized:
+            tolerance = cfg.quantized_tolerance
+    else:
+        from video_grouper.inference.field_detector import (
+            create_field_session as factory,
+        )
+        from video_grouper.pipeline.steps.field_detect import FieldDetectStepConfig
+
+        cfg = FieldDetectStepConfig(**spec.config)
+    if not cfg.model_path:
+        return None
+    use_gpu = cfg.device.startswith(("cuda", "gpu"))
+    model_path = Path(cfg.model_path)
+    if tolerance is not None:
+        from video_grouper.inference.ball_detector import session_providers
+        from video_grouper.inference.quantized import select_model_path
+
+        model_path, _why = select_model_path(
+            model_path,
+            tolerance=tolerance,
+            providers=session_providers(use_gpu),
+        )
+    return lambda: factory(model_path, use_gpu)
+
+
+def _phase_loader(spec: StepSpec) -> Callable[[], Any] | None:
+    from video_grouper.inference.phase_detector import (
+        PERSON_PROVIDERS,
+        resolve_person_model,
+        sess,
+    )
+    from video_grouper.inference.quantized import select_model_path
+    from video_grouper.pipeline.steps.phase_detect import PhaseDetectStepConfig
+
+    cfg = PhaseDetectStepConfig(**spec.config)
+    model_path = resolve_person_model(cfg.model_path)
+    if model_path and cfg.quantized:
+        selected, _why = select_model_path(
+            model_path, tolerance=cfg.quantized_tolerance, providers=PERSON_PROVIDERS
+        )
+        model_path = str(selected)
+    # Same plausibility gate as compute_signals (an un-pulled LFS pointer).
+    if not model_path or not os.path.isfile(model_path):
+        return None
+    if os.path.getsize(model_path) < 1_000_000:
+        return None
+    return lambda: sess(model_path)
+
+
+_LOADERS: dict[str, Callable[[StepSpec], Callable[[], Any] | None]] = {
+    "ball_detect": _detector_loader,
+    "field_detect": _detector_loader,
+    "phase_detect": _phase_loader,
+}
+
+
+def prewarm_pipeline_sessions(step_specs: list[StepSpec]) -> threading.Thread | None:
+    """Start a background thread that builds + warms the configured models.
+
+    Returns the thread (None when there is nothing to warm). A step whose
+    module or config doesn't load is skipped with a debug log — the step
+    itself will surface that error when it runs.
+    """
+    from video_grouper.inference.session_pool import get_session_pool
+
+    loaders: list[Callable[[], Any]] = []
+    for spec in step_specs:
+        make = _LOADERS.get(spec.type)
+        if make is None:
+            continue
+        try:
+            loader = make(spec)
+        except Exception as e:  # noqa: BLE001 — the step reports it at run time
+            logger.debug(
+                "pipeline: no prewarm for step %s (%s: %s)",
+                spec.step_id,
+                type(e).__name__,
+                e,
+            )
+            continue
+        if loader is not None:
+            loaders.append(loader)
+    if loaders:
+        logger.info("pipeline: prewarming %d ONNX session(s)", len(loaders))
+    return get_session_pool().prewarm(loaders)
@@ -35,11 +35,16 @@ from pydantic import BaseModel
 from video_grouper.inference.ball_detector import (
     create_session,
     detect_video_candidates,
+    session_providers,
 )
+from video_grouper.inference.quantized import select_model_path
 from video_grouper.pipeline import register_step
 from video_grouper.pipeline.base import PipelineStep, StepContext
 from video_grouper.pipeline.manifest import PipelineManifest
-from video_grouper.pipeline.steps.licensed_model import build_secure_loader_session
+from video_grouper.pipeline.steps.licensed_model import (
+    build_secure_loader_session,
+    log_session_timing,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -78,6 +83,12 @@ class BallDetectStepConfig(BaseModel):
     # physics can engage. 0 = legacy (far-touchline margin only).
     detect_boundary_margin: float = 0.0
     detect_target_width: int | None = None
+    # model_path only: use the model's INT8 variant (<model>.int8.onnx) when
+    # the session runs on CPU and its stored gate file shows held-out
+    # recall/precision within quantized_tolerance of FP32 (see
+    # video_grouper.inference.quantized / training.cli.quantize_models).
+    quantized: bool = False
+    quantized_tolerance: float = 0.02
 
 
 def _load_polygon(path: str | None) -> np.ndarray | None:
@@ -171,9 +182,17 @@ class BallDetectStep(PipelineStep[BallDetectStepConfig]):
             )
         elif cfg.model_path:
             use_gpu = cfg.device.startswith(("cuda", "gpu"))
-            session = await asyncio.to_thread(
-                create_session, Path(cfg.model_path), use_gpu
-            )
+            model_path = Path(cfg.model_path)
+            if cfg.quantized:
+                model_path, why = await asyncio.to_thread(
+                    select_model_path,
+                    model_path,
+                    tolerance=cfg.quantized_tolerance,
+                    providers=session_providers(use_gpu),
+                )
+                logger.info("detect: %s", why)
+            session = await asyncio.to_thread(create_session, model_path, use_gpu)
+            log_session_timing(self.name, session)
         else:
             raise RuntimeError(
                 "detect: neither model_key nor model_path is configured. Set "
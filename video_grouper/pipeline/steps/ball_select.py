@@ -92,9 +92,9 @@ def _run_selection(
 ) -> int:
     with open(detections_path, encoding="utf-8") as f:
         art = json.load(f)
-    if art.get("schema") != "candidates/1":
+    if art.get("schema") not in ("candidates/1", "candidates/2"):
         raise RuntimeError(
-            f"select: {detections_path} is not a candidates/1 artifact "
+            f"select: {detections_path} is not a candidates/1 or candidates/2 artifact "
             f"(got {art.get('schema')!r}) — re-run ball_detect."
         )
     with open(polygon_path, encoding="utf-8") as f:
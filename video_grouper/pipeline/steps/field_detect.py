@@ -45,7 +45,10 @@ from video_grouper.inference.field_detector import (
 from video_grouper.pipeline import register_step
 from video_grouper.pipeline.base import PipelineStep, StepContext
 from video_grouper.pipeline.manifest import PipelineManifest
-from video_grouper.pipeline.steps.licensed_model import build_secure_loader_session
+from video_grouper.pipeline.steps.licensed_model import (
+    build_secure_loader_session,
+    log_session_timing,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -200,6 +203,7 @@ class FieldDetectStep(PipelineStep[FieldDetectStepConfig]):
             session = await asyncio.to_thread(
                 create_field_session, Path(cfg.model_path), use_gpu
             )
+            log_session_timing(self.name, session)
             source = "model_path"
         else:
             session = None
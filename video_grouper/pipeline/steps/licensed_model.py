@@ -64,4 +64,17 @@ def build_secure_loader_session(
         loaded.tier,
         loaded.provider,
     )
+    log_session_timing(step_name, loaded.session)
     return loaded.session
+
+
+def log_session_timing(step_name: str, session: Any) -> None:
+    """Log whether ``session`` came from the session pool cold or warm.
+
+    Sessions built outside the pool (e.g. test doubles) log nothing.
+    """
+    from video_grouper.inference.session_pool import describe_session
+
+    timing = describe_session(session)
+    if timing:
+        logger.info("%s: ONNX session %s", step_name, timing)
@@ -32,7 +32,13 @@ from pydantic import BaseModel
 # at module top). In a bundle without the inference stack importing this module
 # fails and register_steps' try/except omits the step — same pattern as
 # field_detect / ball_detect.
-from video_grouper.inference.phase_detector import PersonModelUnavailable, detect_phases
+from video_grouper.inference.phase_detector import (
+    PERSON_PROVIDERS,
+    PersonModelUnavailable,
+    detect_phases,
+    resolve_person_model,
+)
+from video_grouper.inference.quantized import select_model_path
 from video_grouper.pipeline import register_step
 from video_grouper.pipeline.base import PipelineStep, StepContext
 from video_grouper.pipeline.manifest import PipelineManifest
@@ -56,6 +62,12 @@ class PhaseDetectStepConfig(BaseModel):
     # can't be resolved the step degrades to an ok=false artifact (below).
     model_path: str | None = None
 
+    # Use the person model's INT8 variant (<model>.int8.onnx) when the session
+    # runs on CPU and its stored gate file shows held-out recall/precision
+    # within quantized_tolerance of FP32 (see video_grouper.inference.quantized).
+    quantized: bool = False
+    quantized_tolerance: float = 0.02
+
 
 def _load_polygon(path: str) -> list:
     """Return the ``polygon`` list from a field_detect ``field_polygon.json``."""
@@ -106,13 +118,17 @@ class PhaseDetectStep(PipelineStep[PhaseDetectStepConfig]):
         polygon_path = cast(str, manifest.get("field_polygon_path"))
         polygon = await asyncio.to_thread(_load_polygon, polygon_path)
 
+        person_model = self.config.model_path
+        if self.config.quantized:
+            person_model = await asyncio.to_thread(self._select_person_model)
+
         try:
             result = await asyncio.to_thread(
                 detect_phases,
                 str(in_path),
                 polygon,
                 step=self.config.phase_step_seconds,
-                person_model=self.config.model_path,
+                person_model=person_model,
             )
             payload = _build_payload(result)
         except PersonModelUnavailable:
@@ -154,6 +170,21 @@ class PhaseDetectStep(PipelineStep[PhaseDetectStepConfig]):
         )
         return True
 
+    def _select_person_model(self) -> str | None:
+        """The configured/bundled person model, swapped for its gated INT8
+        variant when that passes (an unresolvable model is left to
+        ``detect_phases`` to report)."""
+        resolved = resolve_person_model(self.config.model_path)
+        if not resolved:
+            return self.config.model_path
+        path, why = select_model_path(
+            resolved,
+            tolerance=self.config.quantized_tolerance,
+            providers=PERSON_PROVIDERS,
+        )
+        logger.info("phase_detect: %s", why)
+        return str(path)
+
     @staticmethod
     def _persist_to_state(ctx: StepContext, payload: dict) -> None:
         try:
@@ -2,12 +2,29 @@
 
 import asyncio
 import logging
+import time
 from abc import ABC, abstractmethod
 
 from ..utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Wake-up topics. Other processors call ``signal_wakeup(topic)`` when they
+# produce something a poller would otherwise only notice on its next cycle;
+# every started poller listing the topic in ``wake_topics`` polls right away.
+WAKE_DOWNLOADS_DRAINED = "downloads_drained"
+WAKE_GROUP_TRIMMED = "group_trimmed"
+
+_WAKE_SUBSCRIBERS: dict[str, set["PollingProcessor"]] = {}
+
+
+def signal_wakeup(topic: str) -> int:
+    """Wake every running poller subscribed to *topic*; returns how many."""
+    subscribers = list(_WAKE_SUBSCRIBERS.get(topic, ()))
+    for processor in subscribers:
+        processor.wake(topic)
+    return len(subscribers)
+
 
 class PollingProcessor(ABC):
     """
@@ -15,8 +32,23 @@ class PollingProcessor(ABC):
 
     These processors discover work and delegate it to other processors.
     They don't need to track individual state or maintain queues.
+
+    Scheduling is adaptive. ``discover_work`` may return ``False`` to report
+    an idle cycle (nothing found); consecutive idle cycles stretch the sleep
+    by ``backoff_factor`` up to ``max_backoff_multiplier`` x ``poll_interval``,
+    and any productive cycle (``True`` / ``None``) drops straight back to
+    ``poll_interval``. The default multiplier of 1 keeps the fixed cadence.
+    A ``wake()`` (directly or via :func:`signal_wakeup`) cuts the current
+    sleep short and resets the backoff.
     """
 
+    #: Upper bound on the idle backoff, as a multiple of ``poll_interval``.
+    max_backoff_multiplier: float = 1.0
+    #: Growth of the sleep per consecutive idle cycle.
+    backoff_factor: float = 2.0
+    #: :func:`signal_wakeup` topics that trigger an immediate poll.
+    wake_topics: tuple[str, ...] = ()
+
     def __init__(self, storage_path: str, config: Config, poll_interval: int = 60):
         """
         Initialize the polling processor.
@@ -32,22 +64,79 @@ class PollingProcessor(ABC):
 
         self._processor_task = None
         self._shutdown_event = asyncio.Event()
+        self._wake_event = asyncio.Event()
+
+        # Poll-cost metrics, surfaced on the dashboard via poll_stats().
+        self._idle_streak = 0
+        self._poll_count = 0
+        self._wakeup_count = 0
+        self._last_poll_at: float | None = None
+        self._last_poll_seconds: float | None = None
+        self._total_poll_seconds = 0.0
+        self._last_wake_reason: str | None = None
 
         logger.info(
             f"Initialized {self.__class__.__name__} with poll interval: {poll_interval}s"
         )
 
+    @property
+    def poll_name(self) -> str:
+        """Label for logs and the dashboard's poller table."""
+        return self.__class__.__name__
+
     @abstractmethod
-    async def discover_work(self) -> None:
+    async def discover_work(self) -> bool | None:
         """
         Discover new work that needs to be done.
         This is called periodically by the polling loop.
+
+        Returns:
+            ``False`` if the cycle found nothing (lets the scheduler back
+            off); ``True`` or ``None`` otherwise.
         """
         pass
 
+    def current_interval(self) -> float:
+        """Seconds the loop will sleep after the latest cycle."""
+        multiplier = min(
+            self.backoff_factor**self._idle_streak, self.max_backoff_multiplier
+        )
+        return self.poll_interval * max(1.0, multiplier)
+
+    def wake(self, reason: str = "manual") -> None:
+        """Poll now instead of at the end of the current sleep.
+
+        Idempotent — wake-ups landing during one sleep collapse to one
+        extra poll. Also resets the idle backoff: whatever woke us is
+        evidence there is work again.
+        """
+        self._idle_streak = 0
+        self._wakeup_count += 1
+        self._last_wake_reason = reason
+        self._wake_event.set()
+
+    def poll_stats(self) -> dict:
+        """Snapshot of the poll-cost metrics."""
+        return {
+            "polls": self._poll_count,
+            "wakeups": self._wakeup_count,
+            "last_wake_reason": self._last_wake_reason,
+            "idle_streak": self._idle_streak,
+            "interval_seconds": self.current_interval(),
+            "last_poll_at": self._last_poll_at,
+            "last_poll_seconds": self._last_poll_seconds,
+            "avg_poll_seconds": (
+                self._total_poll_seconds / self._poll_count
+                if self._poll_count
+                else None
+            ),
+        }
+
     async def start(self) -> None:
         """Start the polling processor."""
         logger.info(f"Starting {self.__class__.__name__}")
+        for topic in self.wake_topics:
+            _WAKE_SUBSCRIBERS.setdefault(topic, set()).add(self)
 
         # Start the processor task
         self._processor_task = asyncio.create_task(self._run())
@@ -56,6 +145,8 @@ class PollingProcessor(ABC):
         """Stop the polling processor."""
         logger.info(f"Stopping {self.__class__.__name__}")
         self._shutdown_event.set()
+        for topic in self.wake_topics:
+            _WAKE_SUBSCRIBERS.get(topic, set()).discard(self)
 
         if self._processor_task:
             self._processor_task.cancel()
@@ -64,12 +155,36 @@ class PollingProcessor(ABC):
             except asyncio.CancelledError:
                 pass
 
+    async def _poll_once(self) -> None:
+        """Run one discover_work cycle and update the backoff + metrics."""
+        started = time.monotonic()
+        try:
+            found = await self.discover_work()
+        except Exception as e:
+            logger.error(f"{self.__class__.__name__}: Error in polling loop: {e}")
+            found = None
+        elapsed = time.monotonic() - started
+        self._poll_count += 1
+        self._last_poll_at = time.time()
+        self._last_poll_seconds = elapsed
+        self._total_poll_seconds += elapsed
+        if found is False:
+            self._idle_streak += 1
+        else:
+            self._idle_streak = 0
+
+    async def _sleep(self) -> None:
+        """Sleep for the current interval, or until woken."""
+        try:
+            await asyncio.wait_for(
+                self._wake_event.wait(), timeout=self.current_interval()
+            )
+        except TimeoutError:
+            pass
+        self._wake_event.clear()
+
     async def _run(self) -> None:
         """Main polling loop."""
         while not self._shutdown_event.is_set():
-            try:
-                await self.discover_work()
-                await asyncio.sleep(self.poll_interval)
-            except Exception as e:
-                logger.error(f"{self.__class__.__name__}: Error in polling loop: {e}")
-                await asyncio.sleep(self.poll_interval)
+            await self._poll_once()
+            await self._sleep()
@@ -10,6 +10,7 @@ from abc import ABC, abstractmethod
 from video_grouper.task_processors.tasks.base_task import BaseTask
 from video_grouper.utils.config import Config
 
+from .base_polling_processor import signal_wakeup
 from .queue_type import QueueType
 from .task_registry import task_registry
 
@@ -22,6 +23,10 @@ class QueueProcessor(ABC):
     Provides common functionality for queue management and state persistence.
     """
 
+    #: :func:`~.base_polling_processor.signal_wakeup` topic raised whenever a
+    #: successful item leaves the queue empty (None: don't signal).
+    drained_wake_topic: str | None = None
+
     def __init__(self, storage_path: str, config: Config):
         """
         Initialize the queue processor.
@@ -224,6 +229,8 @@ class QueueProcessor(ABC):
                     logger.info(
                         f"{self.__class__.__name__}: Removed completed item from queue: {item} (queue size: {queue_size})"
                     )
+                    if queue_size == 0 and self.drained_wake_topic:
+                        signal_wakeup(self.drained_wake_topic)
                 except Exception as e:
                     from video_grouper.cameras.base import CameraUnreachableError
                     from video_grouper.utils.youtube_upload import YouTubeQuotaError
@@ -8,11 +8,12 @@ import pytz
 from video_grouper.cameras.base import Camera
 from video_grouper.models import DirectoryState, RecordingFile
 from video_grouper.task_processors.download_processor import DownloadProcessor
+from video_grouper.utils.camera_listing_cache import CameraListingCache
 from video_grouper.utils.config import Config
 from video_grouper.utils.locking import FileLock
 from video_grouper.utils.paths import get_camera_state_path, get_home_cleanup_state_path
 
-from .base_polling_processor import PollingProcessor
+from .base_polling_processor import WAKE_DOWNLOADS_DRAINED, PollingProcessor
 
 logger = logging.getLogger(__name__)
 
@@ -122,6 +123,21 @@ def _parse_recording_times(file_info: dict):
     return start, end
 
 
+# File states that still need (or are waiting on) a download.
+_UNDOWNLOADED_STATUSES = frozenset({"pending", "downloading", "download_failed"})
+
+
+def _download_settled(file_obj: RecordingFile | None) -> bool:
+    """Whether a known file needs no further download (done or skipped).
+
+    Only these go in the listing cache: a cached entry is skipped by the
+    next poll, so a queued-but-undownloaded file must stay out of it.
+    """
+    if file_obj is None:
+        return False
+    return file_obj.skip or file_obj.status not in _UNDOWNLOADED_STATUSES
+
+
 def _identify_runt_recordings(files: list[dict], existing_dirs: list[str]) -> set[str]:
     """Return the set of file paths that are *isolated* runt recordings.
 
@@ -196,8 +212,15 @@ class CameraPoller(PollingProcessor):
     """
     Task processor for camera file discovery and grouping.
     Polls the camera for new files and groups them into appropriate directories.
+
+    Backs off (up to 4x ``poll_interval``) while the camera is unreachable or
+    has nothing new, and polls immediately when a download queue drains so
+    the unplug notification and the next sync don't wait out the interval.
     """
 
+    max_backoff_multiplier = 4.0
+    wake_topics = (WAKE_DOWNLOADS_DRAINED,)
+
     def __init__(
         self,
         storage_path: str,
@@ -225,11 +248,33 @@ class CameraPoller(PollingProcessor):
         # a wide camera search on every single poll while the queue happens to
         # be idle.
         self._last_reconcile_time: datetime | None = None
-        self._reconcile_min_interval_seconds = 3600
+        self._reconcile_min_interval_seconds = (
+            config.app.reconcile_interval_minutes * 60
+        )
+        # Persisted index of listing entries already acted on (see
+        # utils.camera_listing_cache); loaded on first use.
+        self._listing_cache: CameraListingCache | None = None
+        # Set when a listing looks like the SD card was wiped; forces the
+        # next reconcile regardless of the interval.
+        self._reformat_suspected = False
+
+    @property
+    def listing_cache(self) -> CameraListingCache:
+        if self._listing_cache is None:
+            self._listing_cache = CameraListingCache(
+                self.storage_path, self.camera.name
+            )
+        return self._listing_cache
+
+    @property
+    def poll_name(self) -> str:
+        return f"{self.__class__.__name__}[{self.camera.name}]"
 
-    async def discover_work(self) -> None:
+    async def discover_work(self) -> bool | None:
         """
         Poll camera for new files and group them into directories.
+
+        Returns False when the camera is unreachable or had nothing new.
         """
         try:
             # Check if this camera is enabled on this machine (TTT multi-computer)
@@ -249,7 +294,7 @@ class CameraPoller(PollingProcessor):
                 self._clear_cleanup_state()
                 self._last_poll_found_files = True
                 logger.debug("CAMERA_POLLER: Camera not available, skipping file sync")
-                return
+                return False
 
             await self._sync_files_from_camera()
 
@@ -264,6 +309,7 @@ class CameraPoller(PollingProcessor):
 
             # Check if all downloads are complete and notify to unplug
             await self._check_downloads_complete()
+            return self._last_poll_found_files
 
         except Exception as e:
             logger.error(f"CAMERA_POLLER: Error during camera polling: {e}")
@@ -288,6 +334,12 @@ class CameraPoller(PollingProcessor):
         except Exception:
             return False
 
+        if self._reformat_suspected:
+            return True
+        if self._last_reconcile_time is None:
+            # After a restart, honor the reconcile time persisted with the
+            # listing cache rather than re-scanning on every boot.
+            self._last_reconcile_time = self.listing_cache.last_full_reconcile
         if self._last_reconcile_time is None:
             return True
         elapsed = (datetime.now() - self._last_reconcile_time).total_seconds()
@@ -325,8 +377,35 @@ class CameraPoller(PollingProcessor):
             start_time=start_time, end_time=end_time
         )
 
+        cache = self.listing_cache
+        if cache.suspect_reformat(files or [], start_time):
+            logger.warning(
+                "CAMERA_POLLER: %s no longer lists any of its recordings since "
+                "%s -- SD card reformatted or swapped? Dropping the listing "
+                "cache and forcing a reconcile.",
+                self.camera.name,
+                start_time,
+            )
+            cache.clear()
+            self._reformat_suspected = True
+
+        # Diff against the listing cache: entries already acted on with the
+        # same size/start/end need no grouping lookup or state load. What's
+        # left is new files plus the segment that was still recording.
+        listed_files = files or []
+        if files:
+            cached = len(files)
+            files = [f for f in files if not cache.is_unchanged(f)]
+            cached -= len(files)
+            if cached:
+                logger.debug(
+                    "CAMERA_POLLER: %d listed file(s) unchanged since last poll",
+                    cached,
+                )
+
         if not files:
             self._last_poll_found_files = False
+            cache.save()
             logger.debug(
                 "CAMERA_POLLER: No new files found on the camera since last sync."
             )
@@ -352,8 +431,9 @@ class CameraPoller(PollingProcessor):
         # Drop isolated runt recordings (e.g. a few-second startup stub the
         # camera writes before idling at home) before they reach the queue.
         # A short tail that belongs to a real game is contiguous with its
-        # other segments, so it is not flagged here.
-        runt_paths = _identify_runt_recordings(files, existing_dirs)
+        # other segments, so it is not flagged here. Judged against the full
+        # listing: cached neighbours still count as contiguous segments.
+        runt_paths = _identify_runt_recordings(listed_files, existing_dirs)
 
         latest_end_time = None
         latest_end_time_file = None
@@ -473,6 +553,8 @@ class CameraPoller(PollingProcessor):
                 dir_state = DirectoryState(group_dir)
                 if dir_state.is_file_in_state(local_path):
                     counts["already_known"] += 1
+                    if _download_settled(dir_state.get_file_by_path(local_path)):
+                        cache.record(file_info, local_path)
                     logger.info(
                         "CAMERA_POLLER: File %s (end=%s) already known; "
                         "HWM advanced past it, no re-download.",
@@ -514,6 +596,10 @@ class CameraPoller(PollingProcessor):
                     logger.info(
                         f"CAMERA_POLLER: Skipping download for {os.path.basename(local_path)} as per state file."
                     )
+                # Only queued, not downloaded: left out of the cache so the
+                # next poll still sees it until its download has settled.
+                if recording_file.skip:
+                    cache.record(file_info, local_path)
 
             except Exception as e:
                 logger.error(
@@ -550,6 +636,8 @@ class CameraPoller(PollingProcessor):
             counts["unparseable"],
         )
 
+        cache.save()
+
         if latest_end_time:
             await self._update_latest_processed_time(latest_end_time)
             logger.info(
@@ -631,6 +719,8 @@ class CameraPoller(PollingProcessor):
         rediscovered here.
         """
         self._last_reconcile_time = datetime.now()
+        self._reformat_suspected = False
+        cache = self.listing_cache
 
         reconcile_days = getattr(self.config.app, "reconcile_lookback_days", 14)
         end_time = datetime.now()
@@ -646,7 +736,12 @@ class CameraPoller(PollingProcessor):
         files = await self.camera.get_file_list(
             start_time=start_time, end_time=end_time
         )
+        # The full-window listing is authoritative: forget cached entries the
+        # camera no longer has (overwritten, deleted, aged out).
+        cache.prune_missing(files or [])
+        cache.mark_full_reconcile(self._last_reconcile_time)
         if not files:
+            cache.save()
             logger.debug("CAMERA_POLLER: Reconcile found no files on the camera.")
             return
 
@@ -661,6 +756,9 @@ class CameraPoller(PollingProcessor):
         runt_paths = _identify_runt_recordings(files, existing_dirs)
 
         requeued = 0
+        # One DirectoryState per group for the whole pass instead of one
+        # state.json load per camera file.
+        dir_states: dict[str, DirectoryState] = {}
         for file_info in files:
             try:
                 if file_info["path"] in runt_paths:
@@ -673,29 +771,47 @@ class CameraPoller(PollingProcessor):
                     file_end_time = file_start_time
 
                 filename = os.path.basename(file_info["path"])
-                group_dir = find_group_directory(
-                    file_start_time, self.storage_path, existing_dirs
-                )
-                if group_dir not in existing_dirs:
-                    existing_dirs.append(group_dir)
-                local_path = os.path.join(group_dir, filename)
+                cached = cache.get(file_info["path"])
+                if (
+                    cached
+                    and cached.get("local_path")
+                    and cached.get("startTime") == file_info.get("startTime")
+                    and os.path.isdir(os.path.dirname(cached["local_path"]))
+                ):
+                    # Grouped on an earlier pass: skip the group lookup.
+                    local_path = cached["local_path"]
+                    group_dir = os.path.dirname(local_path)
+                else:
+                    group_dir = find_group_directory(
+                        file_start_time, self.storage_path, existing_dirs
+                    )
+                    if group_dir not in existing_dirs:
+                        existing_dirs.append(group_dir)
+                    local_path = os.path.join(group_dir, filename)
 
-                # Prefer the camera-reported size from search metadata; fall
+                # Prefer the camera-reported size from search metadata, then a
+                # size the cache learned for this same closed recording; fall
                 # back to an explicit size probe so a short/partial local file
                 # is detected even when the search result omitted size.
                 expected_size = file_info.get("size")
+                probed_size = None
+                if not expected_size and cache.is_unchanged(file_info):
+                    expected_size = probed_size = cached.get("probed_size")
                 if not expected_size:
                     try:
-                        expected_size = await self.camera.get_file_size(
+                        expected_size = probed_size = await self.camera.get_file_size(
                             file_info["path"]
                         )
                     except Exception:
                         expected_size = None
 
-                dir_state = DirectoryState(group_dir)
+                dir_state = dir_states.get(group_dir)
+                if dir_state is None:
+                    dir_state = dir_states[group_dir] = DirectoryState(group_dir)
                 if not await self._file_needs_download(
                     local_path, dir_state, expected_size
                 ):
+                    cache.record(file_info, local_path, probed_size=probed_size)
                     continue
 
                 file_info["camera_name"] = self.camera.name
@@ -715,6 +831,8 @@ class CameraPoller(PollingProcessor):
                     recording_file.skip = existing_file_obj.skip
 
                 await dir_state.add_file(local_path, recording_file)
+                if recording_file.skip:
+                    cache.record(file_info, local_path, probed_size=probed_size)
 
                 if not recording_file.skip and self.download_processor:
                     await self.download_processor.add_work(recording_file)
@@ -729,6 +847,7 @@ class CameraPoller(PollingProcessor):
                     "CAMERA_POLLER: Reconcile error on file %s: %s", file_info, e
                 )
 
+        cache.save()
         logger.info(
             "CAMERA_POLLER: Reconcile pass complete -- %d file(s) re-queued of "
             "%d scanned.",
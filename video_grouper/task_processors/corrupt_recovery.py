@@ -14,7 +14,8 @@ REACTIVE: when a pipeline decode step fails, :class:`PipelineProcessor` calls
 :func:`recover_pipeline_input` on that game — already known to be corrupt — which:
 
 1. **Localizes** the corruption by null-decoding the SOURCE segments
-   (:func:`detect_video_decode_corruption` — the one expensive decode, ONLY here).
+   (:func:`detect_video_decode_corruption` — the one expensive decode, ONLY here;
+   per-segment verdicts are cached so a repeat never re-decodes unchanged bytes).
 2. **Repairs** by re-combining the segments with the corrupt one cut at its last
    clean keyframe (:func:`combine_videos` ``corrupt_starts=`` — the proven path)
    then re-trimming to the same ``-raw.mp4`` the pipeline reads.
@@ -164,6 +165,7 @@ async def recover_pipeline_input(
     from video_grouper.models import DirectoryState, MatchInfo
     from video_grouper.pipeline.manifest import PipelineManifest
     from video_grouper.task_processors.tasks.video import TrimTask
+    from video_grouper.utils.decode_verdicts import is_verified_clean
     from video_grouper.utils.ffmpeg_utils import (
         combine_videos,
         detect_video_decode_corruption,
@@ -177,7 +179,17 @@ async def recover_pipeline_input(
         return RecoveryOutcome(False, reason="no source segments found to re-combine")
 
     # Localize: the one expensive null-decode of every source segment, run ONLY
-    # here (game already known corrupt), never proactively.
+    # here (game already known corrupt), never proactively. Segments probed on
+    # an earlier attempt keep their cached verdict (decode_verdicts.json), so
+    # only new or changed bytes are decoded, fanned out one segment per worker.
+    verified_clean = sum(1 for s in sources if is_verified_clean(s))
+    if verified_clean:
+        logger.info(
+            "RECOVERY: %d/%d segment(s) of %s already verified clean; probing the rest",
+            verified_clean,
+            len(sources),
+            os.path.basename(group_dir),
+        )
     corruptions = await asyncio.to_thread(detect_video_decode_corruption, sources)
     if not corruptions:
         # The decode failure wasn't a source-segment corruption we can cut around
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 
@@ -6,7 +7,10 @@ from video_grouper.models import DirectoryState, RecordingFile
 from video_grouper.task_processors.video_processor import VideoProcessor
 from video_grouper.utils.config import Config
 from video_grouper.utils.disk_space import check_disk_space
+from video_grouper.utils.incremental_combine import append_downloaded_segments
+from video_grouper.utils.paths import get_combined_video_path
 
+from .base_polling_processor import WAKE_DOWNLOADS_DRAINED
 from .base_queue_processor import QueueProcessor
 from .queue_type import QueueType
 from .tasks.video import CombineTask
@@ -45,6 +49,10 @@ class DownloadProcessor(QueueProcessor):
     Processes download queue sequentially, one file at a time.
     """
 
+    # Wakes the camera pollers when the queue drains: the unplug
+    # notification and the next sync shouldn't wait out a backed-off poll.
+    drained_wake_topic = WAKE_DOWNLOADS_DRAINED
+
     def __init__(
         self,
         storage_path: str,
@@ -57,6 +65,8 @@ class DownloadProcessor(QueueProcessor):
         self.video_processor = video_processor
         self.ttt_reporter = None
         self.error_tracker = None
+        # Incremental-combine appends in flight (kept so they aren't GC'd).
+        self._append_tasks: set[asyncio.Task] = set()
 
     @property
     def queue_type(self) -> QueueType:
@@ -124,6 +134,7 @@ class DownloadProcessor(QueueProcessor):
                     f"{expected_size / 1024 / 1024:.1f}MB)"
                 )
                 await dir_state.update_file_state(file_path, status="downloaded")
+                self._schedule_incremental_append(group_dir)
                 if dir_state.is_ready_for_combining() and self.video_processor:
                     combine_task = CombineTask(group_dir=group_dir)
                     add_work_result = self.video_processor.add_work(combine_task)
@@ -252,6 +263,8 @@ class DownloadProcessor(QueueProcessor):
                     )
                     await self.add_work(incomplete)
 
+                self._schedule_incremental_append(group_dir)
+
                 # Check if all files in the group are downloaded and ready for combining
                 if dir_state.is_ready_for_combining():
                     logger.info(
@@ -323,5 +336,30 @@ class DownloadProcessor(QueueProcessor):
                 self.error_tracker.record("download", str(e), {"file": file_name})
             raise
 
+    def _schedule_incremental_append(self, group_dir: str) -> None:
+        """Feed newly downloaded segments to the group's incremental combine
+        in the background, so the next download doesn't wait on the append.
+
+        No-op unless ``[PROCESSING] incremental_combine`` is on.
+        """
+        if not self.config.processing.incremental_combine:
+            return
+        task = asyncio.create_task(self._append_incremental(group_dir))
+        self._append_tasks.add(task)
+        task.add_done_callback(self._append_tasks.discard)
+
+    async def _append_incremental(self, group_dir: str) -> None:
+        """Never raises: a failed append only means CombineTask falls back to
+        a full combine."""
+        try:
+            await append_downloaded_segments(
+                group_dir, get_combined_video_path(group_dir, self.storage_path)
+            )
+        except Exception as e:
+            logger.warning(
+                f"DOWNLOAD: incremental combine append failed for "
+                f"{os.path.basename(group_dir)}: {e}"
+            )
+
     def get_item_key(self, item: RecordingFile) -> str:
         return f"recording:{item.file_path}"
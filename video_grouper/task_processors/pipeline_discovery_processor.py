@@ -18,7 +18,7 @@ from pathlib import Path
 
 from video_grouper.utils.config import Config
 
-from .base_polling_processor import PollingProcessor
+from .base_polling_processor import WAKE_GROUP_TRIMMED, PollingProcessor
 from .tasks.pipeline import PipelineTask
 from .tasks.pipeline.utils import get_ball_tracking_io_paths
 
@@ -30,6 +30,11 @@ _COMPLETE_STATUSES = ("pipeline_complete", "ball_tracking_complete")
 
 
 class PipelineDiscoveryProcessor(PollingProcessor):
+    # Trim completion wakes the scan directly (WAKE_GROUP_TRIMMED), so idle
+    # scans can back off to 4x the interval without delaying a new game.
+    max_backoff_multiplier = 4.0
+    wake_topics = (WAKE_GROUP_TRIMMED,)
+
     def __init__(
         self,
         storage_path: str,
@@ -41,12 +46,14 @@ class PipelineDiscoveryProcessor(PollingProcessor):
         self.pipeline_processor = pipeline_processor
         self._recovered_uploads: set[str] = set()
 
-    async def discover_work(self) -> None:
+    async def discover_work(self) -> bool:
         logger.info("PIPELINE_DISCOVERY: scanning for trimmed groups")
         groups_dir = Path(self.storage_path)
         if not self.pipeline_processor:
             logger.warning("PIPELINE_DISCOVERY: no processor available; skipping")
-            return
+            return False
+
+        found = 0
 
         for group_dir in groups_dir.iterdir():
             if not group_dir.is_dir():
@@ -75,10 +82,12 @@ class PipelineDiscoveryProcessor(PollingProcessor):
                 # set; the runner picks up the recording_dir's
                 # ``reprocess_request.json`` and applies the override.
                 await self._enqueue_for(group_dir)
+                found += 1
             elif status in _COMPLETE_STATUSES:
                 await self._recover_upload(group_dir)
 
         logger.info("PIPELINE_DISCOVERY: discovery complete")
+        return found > 0
 
     async def _enqueue_for(self, group_dir: Path) -> None:
         try:
@@ -253,8 +253,10 @@ class BaseNtfyTask(BaseTask, ABC):
             )
 
             # Create screenshot
+            # The screenshot is compressed to 800px below anyway, so the
+            # precomputed thumbnail strip is as good as a fresh decode.
             screenshot_created = await create_screenshot(
-                video_path, screenshot_path, time_offset=time_str
+                video_path, screenshot_path, time_offset=time_str, allow_thumbnail=True
             )
 
             if screenshot_created:
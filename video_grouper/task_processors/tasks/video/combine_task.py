@@ -8,10 +8,15 @@ from dataclasses import dataclass
 from typing import Any
 
 from video_grouper.models import DirectoryState
+from video_grouper.utils.decode_verdicts import cached_corrupt_starts
 from video_grouper.utils.ffmpeg_utils import (
     combine_videos,
     detect_audio_video_gaps,
 )
+from video_grouper.utils.incremental_combine import (
+    discard_incremental_combine,
+    finalize_incremental_combine,
+)
 from video_grouper.utils.paths import (
     get_combined_video_path,
     resolve_path,
@@ -142,18 +147,43 @@ class CombineTask(BaseFfmpegTask):
         except Exception:
             pass  # Non-critical: metadata is optional
 
-        try:
-            # Pass file paths directly to combine_videos (PyAV-based). No
-            # corrupt_starts here: combine never decodes, so it can't (and
-            # shouldn't) localize corruption — that's the reactive recovery's job
-            # if a downstream decode step fails.
-            success = await combine_videos(
-                dav_files,
-                output_path,
-                camera_name=camera_name,
-                camera_type=camera_type,
+        # Combine never decodes, so it can't (and shouldn't) localize
+        # corruption — that's the reactive recovery's job if a downstream decode
+        # step fails. But once recovery HAS probed a segment, its verdict is
+        # cached next to it; a re-combine of the same bytes (reprocess) reuses
+        # those cuts instead of muxing the dead region back in.
+        corrupt_starts = cached_corrupt_starts(dav_files)
+        if corrupt_starts:
+            logger.warning(
+                "COMBINE: reusing cached decode verdicts for %s: cutting %d "
+                "known-corrupt segment(s)",
+                os.path.basename(self.group_dir),
+                len(corrupt_starts),
             )
 
+        try:
+            # In incremental mode the download processor has already appended
+            # every segment but (at most) the last; finishing that output takes
+            # seconds. Falls through to the one-shot combine when there is no
+            # usable incremental output (mode off, restart, failed append) or a
+            # segment needs a corrupt-region cut the incremental path doesn't do.
+            success = False
+            if corrupt_starts:
+                await discard_incremental_combine(self.group_dir)
+            else:
+                success = await finalize_incremental_combine(
+                    self.group_dir, dav_files, output_path
+                )
+            if not success:
+                # Pass file paths directly to combine_videos (PyAV-based).
+                success = await combine_videos(
+                    dav_files,
+                    output_path,
+                    camera_name=camera_name,
+                    camera_type=camera_type,
+                    corrupt_starts=corrupt_starts or None,
+                )
+
             if success:
                 await self._handle_post_combine_actions()
             else:
@@ -28,6 +28,10 @@ logger = logging.getLogger(__name__)
 
 
 class UploadRecoveryProcessor(PollingProcessor):
+    # The tray's handoff has no in-process event to wake this scan, so idle
+    # scans back off only modestly.
+    max_backoff_multiplier = 4.0
+
     def __init__(
         self,
         storage_path: str,
@@ -39,9 +43,10 @@ class UploadRecoveryProcessor(PollingProcessor):
         self.upload_processor = upload_processor
         self._recovered: set[str] = set()
 
-    async def discover_work(self) -> None:
+    async def discover_work(self) -> bool:
         if not self.config.youtube.enabled:
-            return
+            return False
+        queued = 0
         groups_dir = Path(self.storage_path)
         for group_dir in groups_dir.iterdir():
             if not group_dir.is_dir():
@@ -62,12 +67,13 @@ class UploadRecoveryProcessor(PollingProcessor):
             # Accept BOTH completion statuses: ``ball_tracking_complete``
             # (legacy path) and ``pipeline_complete`` (config-driven pipeline).
             if status in ("ball_tracking_complete", "pipeline_complete"):
-                await self._recover_upload(group_dir)
+                queued += await self._recover_upload(group_dir)
+        return queued > 0
 
-    async def _recover_upload(self, group_dir: Path) -> None:
+    async def _recover_upload(self, group_dir: Path) -> bool:
         key = str(group_dir)
         if key in self._recovered:
-            return
+            return False
         from .tasks.upload import YoutubeUploadTask
 
         relative = os.path.relpath(str(group_dir), self.storage_path)
@@ -75,3 +81,4 @@ class UploadRecoveryProcessor(PollingProcessor):
         await self.upload_processor.add_work(task)
         self._recovered.add(key)
         logger.info("UPLOAD_RECOVERY: queued YouTube upload for %s", group_dir.name)
+        return True
@@ -7,6 +7,7 @@ from video_grouper.task_processors.upload_processor import UploadProcessor
 from video_grouper.utils.config import Config
 from video_grouper.utils.paths import get_combined_video_path, get_match_info_path
 
+from .base_polling_processor import WAKE_GROUP_TRIMMED, signal_wakeup
 from .base_queue_processor import QueueProcessor
 from .queue_type import QueueType
 from .tasks.video import BaseFfmpegTask
@@ -159,6 +160,9 @@ class VideoProcessor(QueueProcessor):
                     # the video-corruption NTFY via _send_video_corruption_warning's
                     # shared notifier at that point.
                     asyncio.create_task(self._on_combine_complete(item.get_item_path()))
+                    asyncio.create_task(
+                        self._build_thumbnail_strip(item.get_item_path())
+                    )
                 elif (
                     item.task_type == "trim"
                     and not self.config.post_trim_processing_active()
@@ -168,6 +172,10 @@ class VideoProcessor(QueueProcessor):
                     # active, leave the group at ``trimmed`` for the pipeline
                     # discovery to pick up.
                     asyncio.create_task(self._on_trim_complete(item.get_item_path()))
+                elif item.task_type == "trim":
+                    # ... and wake that discovery now rather than at its next
+                    # (possibly backed-off) scan.
+                    signal_wakeup(WAKE_GROUP_TRIMMED)
             else:
                 logger.error(f"VIDEO: Task execution failed: {item}")
 
@@ -268,6 +276,27 @@ class VideoProcessor(QueueProcessor):
                 f"VIDEO: Error in post-combine transition for {group_dir}: {e}"
             )
 
+    async def _build_thumbnail_strip(self, group_dir: str) -> None:
+        """Precompute the combined video's preview thumbnails in the background.
+
+        Runs alongside _on_combine_complete: the first NTFY prompt may still
+        decode the video, every re-send and dashboard preview after that reads
+        the strip. No-op when ``[PROCESSING] thumbnail_interval_seconds`` is 0.
+        """
+        interval = self.config.processing.thumbnail_interval_seconds
+        if interval <= 0:
+            return
+        try:
+            from video_grouper.utils.thumbnail_strip import build_thumbnail_strip
+
+            combined_path = get_combined_video_path(group_dir, self.storage_path)
+            if os.path.exists(combined_path):
+                await build_thumbnail_strip(
+                    combined_path, interval_seconds=float(interval)
+                )
+        except Exception as e:
+            logger.warning(f"VIDEO: Thumbnail strip failed for {group_dir}: {e}")
+
     async def _send_audio_gap_warning(self, group_dir: str, gaps: list[dict]) -> None:
         """Notify the camera manager (via NTFY) of audio/video length mismatches.
 
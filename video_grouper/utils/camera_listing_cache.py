@@ -0,0 +1,206 @@
+"""Persisted index of the camera's recording listing, for incremental diffing.
+
+Every poll used to treat the camera's listing as brand new: each returned file
+went through ``find_group_directory`` (a ``state.json`` read per group dir) and
+a ``DirectoryState`` load just to learn it was already known, and the reconcile
+pass did the same — plus a camera ``get_file_size`` round-trip for any entry the
+search left unsized — for 14 days of recordings. This cache remembers, per
+camera, every listing entry whose download has settled (on disk, or marked
+skip), keyed by camera path with the fingerprint the camera reports (``size``, ``startTime``,
+``endTime``) and the local path it was grouped to. A poll then only processes
+entries that are new or whose fingerprint changed (the still-recording
+segment), i.e. O(new files). A file that is only queued stays out until its
+download lands, so a failed download is still seen by the next poll.
+
+The cache is an optimization only — never a source of truth. The reconcile
+pass still decides on-disk completeness for every camera file; it just skips
+the grouping lookup and size probe for entries it already knows.
+
+Layout of ``camera_listing.json`` (one section per camera name)::
+
+    {
+      "default": {
+        "version": 1,
+        "last_full_reconcile": "2026-06-20T21:14:03",
+        "entries": {
+          "/mnt/sd/.../10.00.00-10.05.00[R][0@0][0].dav": {
+            "size": 812345678,
+            "startTime": "2026-06-20 10:00:00",
+            "endTime": "2026-06-20 10:05:00",
+            "local_path": ".../2026.06.20-10.00.00/10.00.00-10.05.00....dav"
+          }
+        }
+      }
+    }
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from datetime import datetime
+
+from video_grouper.utils.atomic_json import read_json, update_json
+
+logger = logging.getLogger(__name__)
+
+LISTING_CACHE_FILENAME = "camera_listing.json"
+LISTING_CACHE_VERSION = 1
+
+# How many of the newest cached entries suspect_reformat() looks for.
+REFORMAT_CHECK_ENTRIES = 5
+
+
+def get_listing_cache_path(storage_path: str) -> str:
+    """Path of the shared listing cache under *storage_path*."""
+    return os.path.join(storage_path, LISTING_CACHE_FILENAME)
+
+
+def _fingerprint(file_info: dict) -> tuple:
+    return (
+        file_info.get("size"),
+        file_info.get("startTime"),
+        file_info.get("endTime"),
+    )
+
+
+class CameraListingCache:
+    """One camera's section of ``camera_listing.json``, held in memory.
+
+    Only the owning :class:`~video_grouper.task_processors.camera_poller.CameraPoller`
+    touches a section, so it is loaded once and written back with
+    :meth:`save` after each sync / reconcile pass.
+    """
+
+    def __init__(self, storage_path: str, camera_name: str):
+        self.path = get_listing_cache_path(storage_path)
+        self.camera_name = camera_name
+        section = read_json(self.path, default={}) or {}
+        section = section.get(camera_name) if isinstance(section, dict) else None
+        if (
+            not isinstance(section, dict)
+            or section.get("version") != LISTING_CACHE_VERSION
+        ):
+            section = {}
+        self.entries: dict[str, dict] = dict(section.get("entries") or {})
+        self.last_full_reconcile: datetime | None = None
+        if section.get("last_full_reconcile"):
+            try:
+                self.last_full_reconcile = datetime.fromisoformat(
+                    section["last_full_reconcile"]
+                )
+            except ValueError:
+                pass
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def is_unchanged(self, file_info: dict) -> bool:
+        """True if this listing entry was already acted on with the same fingerprint."""
+        cached = self.entries.get(file_info.get("path", ""))
+        return cached is not None and _fingerprint(cached) == _fingerprint(file_info)
+
+    def get(self, camera_path: str) -> dict | None:
+        return self.entries.get(camera_path)
+
+    def record(
+        self, file_info: dict, local_path: str, probed_size: int | None = None
+    ) -> None:
+        """Remember a settled listing entry, grouped to *local_path*.
+
+        *probed_size* is a size learned from ``get_file_size`` for an entry the
+        listing left unsized; it is kept apart from the listing fingerprint so
+        the next (still unsized) listing of the same file stays a cache hit.
+        """
+        entry = {
+            "size": file_info.get("size"),
+            "startTime": file_info.get("startTime"),
+            "endTime": file_info.get("endTime"),
+            "local_path": local_path,
+        }
+        previous = self.entries.get(file_info["path"])
+        if probed_size:
+            entry["probed_size"] = probed_size
+        elif previous and _fingerprint(previous) == _fingerprint(entry):
+            if previous.get("probed_size"):
+                entry["probed_size"] = previous["probed_size"]
+        self.entries[file_info["path"]] = entry
+        self._dirty = True
+
+    def suspect_reformat(self, files: list[dict], window_start: datetime) -> bool:
+        """Whether the camera dropped entries it should still list.
+
+        Entries are only cached once their download settles, by which time
+        the HWM has usually moved past them, so they rarely start inside the
+        poll window. Instead the newest cached entries are checked: one the
+        listing must contain (it ends inside the window, or starts after the
+        oldest listed entry) yet is missing, with none of the others listed,
+        means the recording index was wiped (SD card reformatted or swapped).
+        Matching also accepts the same ``startTime`` so a segment that was
+        still recording at the last poll — and got a new path once it closed —
+        doesn't count as missing. Loop-recording overwrites only ever drop the
+        OLDEST entries, so they never trip this.
+        """
+        newest = sorted(
+            (e["startTime"], e.get("endTime") or e["startTime"], path)
+            for path, e in self.entries.items()
+            if e.get("startTime")
+        )[-REFORMAT_CHECK_ENTRIES:]
+        paths = {f.get("path") for f in files}
+        starts = {f.get("startTime") for f in files}
+        if any(p in paths or s in starts for s, _e, p in newest):
+            return False
+        lo = window_start.strftime("%Y-%m-%d %H:%M:%S")
+        oldest_listed = min(filter(None, starts), default=None)
+        return any(
+            end >= lo or (oldest_listed is not None and start >= oldest_listed)
+            for start, end, _p in newest
+        )
+
+    def prune_missing(self, files: list[dict]) -> int:
+        """Drop cached entries missing from a full reconcile listing.
+
+        The reconcile window is the cache's horizon: anything it doesn't list
+        was overwritten, deleted, or has aged out. Returns how many entries
+        were removed.
+        """
+        listed = {f.get("path") for f in files}
+        stale = [path for path in self.entries if path not in listed]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.last_full_reconcile = None
+        self._dirty = True
+
+    def mark_full_reconcile(self, when: datetime) -> None:
+        self.last_full_reconcile = when
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write this camera's section back (no-op when nothing changed)."""
+        if not self._dirty:
+            return
+        section = {
+            "version": LISTING_CACHE_VERSION,
+            "last_full_reconcile": (
+                self.last_full_reconcile.isoformat(timespec="seconds")
+                if self.last_full_reconcile
+                else None
+            ),
+            "entries": self.entries,
+        }
+        try:
+            update_json(self.path, lambda d: d.__setitem__(self.camera_name, section))
+            self._dirty = False
+        except (OSError, TimeoutError) as e:
+            logger.warning(
+                "CAMERA_POLLER: could not persist listing cache for %s: %s",
+                self.camera_name,
+                e,
+            )
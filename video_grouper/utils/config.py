@@ -88,6 +88,15 @@ class ProcessingConfig(BaseModel):
     ffmpeg_timeout_seconds: int = 1800
     seam_realign_enabled: bool = False
     seam_realign_profile_path: str | None = None
+    # Append each segment to combined.mp4 as soon as it is downloaded and
+    # size-verified instead of combining the whole game after the last
+    # download (see video_grouper.utils.incremental_combine). Falls back to
+    # the one-shot combine whenever the incremental output can't be used.
+    incremental_combine: bool = False
+    # Seconds between the keyframe thumbnails precomputed next to
+    # combined.mp4 after combine (see video_grouper.utils.thumbnail_strip);
+    # NTFY prompts and the dashboard serve previews from it. 0 disables.
+    thumbnail_interval_seconds: int = 10
     # How the game-start time used for trimming is found (decision 1).
     #   "phase_detection" (default): run the offline whistle/ball/player
     #     game-phase detector on the combined video and set the start
@@ -123,6 +132,11 @@ class AppConfig(BaseModel):
     # the high-water mark. 14 days covers a typical multi-week gap between
     # plugging the camera in.
     reconcile_lookback_days: int = 14
+    # Minimum minutes between reconcile passes (they only run while the
+    # download queue is idle). Polls in between diff the camera listing
+    # against a persisted cache (camera_listing.json) and only act on new
+    # entries; a suspected SD-card reformat forces a reconcile early.
+    reconcile_interval_minutes: int = 60
     # Auto-upgrade settings. auto_update=true (Chrome-style) silently installs
     # detected updates once the pipeline is quiescent; =false stops after
     # download+verify and waits for the tray's POST /api/update/apply.
@@ -652,6 +666,9 @@ def save_config(config: Config, config_path: Path):
                 "community_plugins_enabled": str(value.community_plugins_enabled),
                 "gpu_concurrency": str(value.gpu_concurrency),
                 "ram_heavy_concurrency": str(value.ram_heavy_concurrency),
+                "session_pool_max_sessions": str(value.session_pool_max_sessions),
+                "session_pool_rss_budget_mb": str(value.session_pool_rss_budget_mb),
+                "optimized_model_cache": str(value.optimized_model_cache),
             }
             if value.steps:
                 main["steps"] = ", ".join(value.steps)
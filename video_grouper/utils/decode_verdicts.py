@@ -0,0 +1,130 @@
+"""Per-segment decode-probe verdicts cached in the group directory.
+
+A decode probe (:func:`video_grouper.utils.ffmpeg_utils.detect_video_decode_corruption`)
+is the one expensive operation in the corruption-recovery path: it forces a real
+decode over windows of every source segment. Its answer depends only on the
+segment's bytes, so it is persisted next to the segments in
+``decode_verdicts.json`` keyed by file name and fingerprinted by
+``(size, mtime_ns)`` — a reprocess after recovery, or a second recovery attempt
+on the same game, reuses the verdicts instead of re-decoding 20+ segments. A
+segment whose bytes changed (re-downloaded, replaced) no longer matches its
+fingerprint and is probed again.
+
+Layout::
+
+    {
+      "RecM09_....mp4": {
+        "size": 812345678,
+        "mtime_ns": 1717430400000000000,
+        "window_seconds": 3.0,
+        "corrupt_start_seconds": null,      # null = decodes clean
+        "cut_seconds": null,
+        "video_seconds": null,
+        "probed_at": "2026-06-08T21:14:03"
+      }
+    }
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime
+
+from video_grouper.utils.atomic_json import read_json, update_json
+
+logger = logging.getLogger(__name__)
+
+VERDICTS_FILENAME = "decode_verdicts.json"
+
+
+def verdicts_path(group_dir: str) -> str:
+    """Path of the verdict cache for segments in *group_dir*."""
+    return os.path.join(group_dir, VERDICTS_FILENAME)
+
+
+def _fingerprint(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def cached_verdict(path: str, window_seconds: float | None = None) -> dict | None:
+    """The stored verdict for *path*, or None if absent or stale.
+
+    A verdict is stale when the segment's size or mtime changed since it was
+    probed. When *window_seconds* is given, a verdict probed with a different
+    window is treated as absent (its corrupt-start localization differs).
+    """
+    fp = _fingerprint(path)
+    if fp is None:
+        return None
+    entry = read_json(verdicts_path(os.path.dirname(path)), default={}).get(
+        os.path.basename(path)
+    )
+    if not isinstance(entry, dict):
+        return None
+    if (entry.get("size"), entry.get("mtime_ns")) != fp:
+        return None
+    if window_seconds is not None and entry.get("window_seconds") != window_seconds:
+        return None
+    return entry
+
+
+def record_verdicts(verdicts: dict[str, dict], window_seconds: float) -> None:
+    """Persist probe results, one read-modify-write per group directory.
+
+    *verdicts* maps a segment path to its probe result (``corrupt_start_seconds``
+    and, for corrupt segments, ``cut_seconds`` / ``video_seconds``).
+    """
+    by_dir: dict[str, dict[str, dict]] = defaultdict(dict)
+    now = datetime.now().isoformat(timespec="seconds")
+    for path, result in verdicts.items():
+        fp = _fingerprint(path)
+        if fp is None:
+            continue
+        by_dir[os.path.dirname(path)][os.path.basename(path)] = {
+            "size": fp[0],
+            "mtime_ns": fp[1],
+            "window_seconds": window_seconds,
+            "corrupt_start_seconds": result.get("corrupt_start_seconds"),
+            "cut_seconds": result.get("cut_seconds"),
+            "video_seconds": result.get("video_seconds"),
+            "probed_at": now,
+        }
+    for group_dir, entries in by_dir.items():
+
+        def merge(data: dict, entries: dict[str, dict] = entries) -> None:
+            data.update(entries)
+
+        try:
+            update_json(verdicts_path(group_dir), merge)
+        except OSError as e:
+            logger.warning("DECODE_PROBE: could not persist verdicts: %s", e)
+
+
+def is_verified_clean(path: str) -> bool:
+    """True if *path* was decode-probed clean and hasn't changed since.
+
+    Cheap (a stat and a small JSON read) — safe to call from the combine path.
+    """
+    entry = cached_verdict(path)
+    return entry is not None and entry.get("corrupt_start_seconds") is None
+
+
+def cached_corrupt_starts(paths: list[str]) -> dict[str, float]:
+    """``{path: corrupt_start_seconds}`` for segments with a cached corrupt verdict.
+
+    The shape :func:`~video_grouper.utils.ffmpeg_utils.combine_videos` takes as
+    ``corrupt_starts``, so a re-combine of a game that recovery already
+    localized cuts the same dead regions without probing again.
+    """
+    starts: dict[str, float] = {}
+    for path in paths:
+        entry = cached_verdict(path)
+        if entry is not None and entry.get("corrupt_start_seconds") is not None:
+            starts[path] = float(entry["corrupt_start_seconds"])
+    return starts
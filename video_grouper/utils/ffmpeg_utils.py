@@ -2,6 +2,7 @@ import asyncio
 import logging
 import os
 import shutil
+from dataclasses import dataclass
 
 
 # ``av`` is loaded lazily via the proxy below. The tray PyInstaller
@@ -70,6 +71,11 @@ DECODE_PROBE_WINDOW_SECONDS = 3.0
 # into a 300s file, so a coarse sweep across the segment (not just first/mid/
 # last) is what localizes the dead region cheaply.
 DECODE_PROBE_STEP_SECONDS = 30.0
+# DECODE_PROBE_MAX_WORKERS: segments probed concurrently by
+# detect_video_decode_corruption (one segment per worker). Each HEVC decoder
+# already spreads over a few threads, so a handful of workers saturates a
+# typical service box without starving the rest of the pipeline.
+DECODE_PROBE_MAX_WORKERS = 4
 
 # numpy dtype (as a string) to allocate silence for each libav sample format.
 _SILENCE_DTYPE = {
@@ -516,6 +522,19 @@ def _is_frame_corrupt(image) -> bool:
     return False
 
 
+def _parse_time_offset(time_offset: str) -> float:
+    """Seconds for an ``HH:MM:SS`` / ``MM:SS`` / plain-seconds offset (1.0 if unparseable)."""
+    try:
+        parts = time_offset.split(":")
+        if len(parts) == 3:
+            return int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
+        if len(parts) == 2:
+            return int(parts[0]) * 60 + float(parts[1])
+        return float(time_offset)
+    except (ValueError, IndexError):
+        return 1.0
+
+
 def _create_screenshot_sync(
     video_path: str,
     output_path: str,
@@ -534,17 +553,7 @@ def _create_screenshot_sync(
     under ntfy.sh's ~4 MB free-tier attachment cap. The default leaves
     full-resolution / quality-95 output unchanged for everything else.
     """
-    # Parse time offset string (HH:MM:SS or seconds)
-    try:
-        parts = time_offset.split(":")
-        if len(parts) == 3:
-            seconds = int(parts[0]) * 3600 + int(parts[1]) * 60 + float(parts[2])
-        elif len(parts) == 2:
-            seconds = int(parts[0]) * 60 + float(parts[1])
-        else:
-            seconds = float(time_offset)
-    except (ValueError, IndexError):
-        seconds = 1.0
+    seconds = _parse_time_offset(time_offset)
 
     with av_open_read(video_path) as container:
         stream = container.streams.video[0]
@@ -597,6 +606,7 @@ async def create_screenshot(
     time_offset: str = "00:00:01",
     max_dim: int | None = None,
     quality: int = 95,
+    allow_thumbnail: bool = False,
 ) -> bool:
     """Creates a screenshot from a video file.
 
@@ -604,7 +614,37 @@ async def create_screenshot(
     notifications need to stay under ntfy.sh's free-tier attachment
     cap of ~4 MB; 4K Reolink panoramas at quality 95 routinely
     exceed that).
+
+    ``allow_thumbnail`` lets callers that only need a preview-sized image
+    (the 800px NTFY prompts) take the nearest keyframe from the video's
+    precomputed thumbnail strip instead of decoding the video; it falls
+    back to the decode when the strip is missing, stale, or has no
+    thumbnail within one strip interval of ``time_offset``.
     """
+    if allow_thumbnail:
+        # Lazy import: thumbnail_strip builds on this module.
+        from video_grouper.utils.thumbnail_strip import ThumbnailStrip
+
+        try:
+            strip = ThumbnailStrip.open(video_path)
+            seconds = _parse_time_offset(time_offset)
+            found = strip.nearest(seconds) if strip else None
+            if (
+                strip is not None
+                and found
+                and abs(found[0] - seconds) <= strip.interval_seconds
+            ):
+                with open(output_path, "wb") as f:
+                    f.write(found[1])
+                logger.info(
+                    f"Using precomputed thumbnail at {found[0]:.1f}s for "
+                    f"{os.path.basename(video_path)}"
+                )
+                return True
+        except Exception as e:
+            logger.warning(
+                f"Thumbnail strip lookup failed for {os.path.basename(video_path)}: {e}"
+            )
     try:
         result = await _run_in_thread_with_timeout(
             _create_screenshot_sync,
@@ -875,9 +915,97 @@ def _last_keyframe_pts_seconds(file_path: str, before_seconds: float) -> float |
         return last_kf_pts
 
 
+def _probe_segment(path: str, window_seconds: float) -> dict:
+    """Decode-probe one segment: the per-worker unit of the corruption scan.
+
+    Returns ``{"corrupt_start_seconds": None}`` for a clean segment, else the
+    corrupt start plus the keyframe-aligned ``cut_seconds`` and the container
+    ``video_seconds``. Top-level (picklable) so a process pool can run it.
+    """
+    corrupt_start = _decode_probe_sync(path, window_seconds)
+    if corrupt_start is None:
+        return {"corrupt_start_seconds": None}
+    video_seconds = corrupt_start
+    try:
+        dur = _get_video_duration_sync(path)
+        if dur is not None:
+            video_seconds = dur
+    except Exception:
+        pass
+    # Keyframe-align the cut so lost_seconds reflects the real GOP-boundary
+    # cut the combine will make, not the raw corrupt second.
+    cut_seconds: float | None
+    try:
+        cut_seconds = _last_keyframe_pts_seconds(path, corrupt_start)
+    except Exception as exc:
+        logger.warning(f"COMBINE: keyframe scan failed for {path}: {exc}")
+        cut_seconds = None
+    return {
+        "corrupt_start_seconds": corrupt_start,
+        "cut_seconds": cut_seconds,
+        "video_seconds": video_seconds,
+    }
+
+
+def _probe_executor(max_workers: int):
+    """Pool for fanning decode probes out, one segment per worker.
+
+    Processes when running from source, so each decode gets its own GIL and
+    libav context. The frozen (PyInstaller) service never calls
+    ``multiprocessing.freeze_support()``, so a spawned child would re-launch
+    the service executable; there we fall back to threads (PyAV releases the
+    GIL inside libav decode calls, so they still overlap).
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    from video_grouper.utils.paths import _is_pyinstaller
+
+    if _is_pyinstaller():
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def _probe_segments(
+    paths: list[str], window_seconds: float, max_workers: int
+) -> dict[str, dict]:
+    """Probe *paths* (in parallel when worthwhile); failed probes are omitted."""
+    results: dict[str, dict] = {}
+    if max_workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            try:
+                results[path] = _probe_segment(path, window_seconds)
+            except Exception as exc:
+                logger.warning(f"COMBINE: decode probe failed for {path}: {exc}")
+        return results
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    try:
+        with _probe_executor(min(max_workers, len(paths))) as pool:
+            futures = {
+                path: pool.submit(_probe_segment, path, window_seconds)
+                for path in paths
+            }
+            for path, future in futures.items():
+                try:
+                    results[path] = future.result()
+                except BrokenProcessPool:
+                    raise
+                except Exception as exc:
+                    logger.warning(f"COMBINE: decode probe failed for {path}: {exc}")
+    except (BrokenProcessPool, OSError) as exc:
+        logger.warning(
+            "DECODE_PROBE: worker pool unavailable (%s); probing serially", exc
+        )
+        remaining = [p for p in paths if p not in results]
+        results.update(_probe_segments(remaining, window_seconds, max_workers=1))
+    return results
+
+
 def detect_video_decode_corruption(
     file_paths: list[str],
     window_seconds: float = DECODE_PROBE_WINDOW_SECONDS,
+    max_workers: int | None = None,
 ) -> list[dict]:
     """Return source segments that decode partway then hit a corrupt region.
 
@@ -904,31 +1032,45 @@ def detect_video_decode_corruption(
     pipeline decode step has already failed on a game, i.e. one already known to be
     corrupt. The recovery then re-combines with these cuts, flags ``video_loss``, and
     sends the NTFY warning, so a corrupt game isn't shipped as if perfect.
+
+    Segments are probed in parallel (up to *max_workers*, default
+    ``DECODE_PROBE_MAX_WORKERS``), and every verdict is cached in the group
+    directory (:mod:`video_grouper.utils.decode_verdicts`) so an unchanged
+    segment is never decoded twice.
     """
+    from video_grouper.utils.decode_verdicts import cached_verdict, record_verdicts
+
+    verdicts: dict[str, dict] = {}
+    pending: list[str] = []
+    for path in file_paths:
+        cached = cached_verdict(path, window_seconds)
+        if cached is not None:
+            verdicts[path] = cached
+        else:
+            pending.append(path)
+    if verdicts:
+        logger.info(
+            "DECODE_PROBE: reusing cached verdicts for %d/%d segment(s)",
+            len(verdicts),
+            len(file_paths),
+        )
+
+    if pending:
+        workers = max_workers or min(DECODE_PROBE_MAX_WORKERS, os.cpu_count() or 1)
+        probed = _probe_segments(pending, window_seconds, workers)
+        record_verdicts(probed, window_seconds)
+        verdicts.update(probed)
+
     corruptions: list[dict] = []
     for path in file_paths:
-        try:
-            corrupt_start = _decode_probe_sync(path, window_seconds)
-        except Exception as exc:
-            logger.warning(f"COMBINE: decode probe failed for {path}: {exc}")
+        verdict = verdicts.get(path)
+        if verdict is None or verdict.get("corrupt_start_seconds") is None:
             continue
-        if corrupt_start is None:
-            continue
-        video_seconds = corrupt_start
-        try:
-            dur = _get_video_duration_sync(path)
-            if dur is not None:
-                video_seconds = dur
-        except Exception:
-            pass
-        # Keyframe-align the cut so lost_seconds reflects the real GOP-boundary
-        # cut the combine will make, not the raw corrupt second.
-        cut_seconds: float | None
-        try:
-            cut_seconds = _last_keyframe_pts_seconds(path, corrupt_start)
-        except Exception as exc:
-            logger.warning(f"COMBINE: keyframe scan failed for {path}: {exc}")
-            cut_seconds = None
+        corrupt_start = verdict["corrupt_start_seconds"]
+        cut_seconds = verdict.get("cut_seconds")
+        video_seconds = verdict.get("video_seconds")
+        if video_seconds is None:
+            video_seconds = corrupt_start
         # No keyframe at/before the corrupt point => first-GOP corruption; the
         # combine drops the whole segment's video, so the entire span is lost.
         effective_cut = cut_seconds if cut_seconds is not None else 0.0
@@ -945,6 +1087,58 @@ def detect_video_decode_corruption(
     return corruptions
 
 
+@dataclass
+class _CombineCursor:
+    """Running position of a combine output across appended segments."""
+
+    # Video pts (output time base) where the next segment starts.
+    video_pts_offset: int = 0
+    # A decoded real frame, reused as the format/layout/rate template for any
+    # silence we synthesize. Captured from the first segment that has audio.
+    audio_template: object | None = None
+
+
+def _setup_combine_output(
+    output_container,
+    first_file: str,
+    camera_name: str | None = None,
+    camera_type: str | None = None,
+):
+    """Write camera metadata and add the combine's output streams.
+
+    Stream parameters come from *first_file*: video is a stream-copy template,
+    audio a fresh AAC encoder. Returns ``(out_video_stream, out_audio_stream)``;
+    the audio stream is ``None`` when the first segment has no audio.
+    """
+    # Write camera metadata if available
+    if camera_name:
+        output_container.metadata["camera_name"] = camera_name
+        if camera_type:
+            output_container.metadata["camera_type"] = camera_type
+            output_container.metadata["comment"] = (
+                f"Camera: {camera_name} ({camera_type})"
+            )
+        else:
+            output_container.metadata["comment"] = f"Camera: {camera_name}"
+    out_video_stream = None
+    out_audio_stream = None
+
+    # Probe the first file to set up output streams
+    with av_open_read(first_file) as probe:
+        for stream in probe.streams:
+            if stream.type == "video" and out_video_stream is None:
+                out_video_stream = output_container.add_stream_from_template(stream)
+            elif stream.type == "audio" and out_audio_stream is None:
+                out_audio_stream = output_container.add_stream(
+                    "aac", rate=stream.rate or 44100
+                )
+                out_audio_stream.bit_rate = 192000
+
+    if out_video_stream is None:
+        raise ValueError("No video stream found in first input file")
+    return out_video_stream, out_audio_stream
+
+
 def _combine_videos_sync(
     file_paths: list[str],
     output_path: str,
@@ -970,33 +1164,9 @@ def _combine_videos_sync(
     with av_open_write(
         output_path, options={"movflags": "faststart"}
     ) as output_container:
-        # Write camera metadata if available
-        if camera_name:
-            output_container.metadata["camera_name"] = camera_name
-            if camera_type:
-                output_container.metadata["camera_type"] = camera_type
-                output_container.metadata["comment"] = (
-                    f"Camera: {camera_name} ({camera_type})"
-                )
-            else:
-                output_container.metadata["comment"] = f"Camera: {camera_name}"
-        out_video_stream = None
-        out_audio_stream = None
-
-        # Probe the first file to set up output streams
-        with av_open_read(file_paths[0]) as probe:
-            for stream in probe.streams:
-                if stream.type == "video" and out_video_stream is None:
-                    out_video_stream = output_container.add_stream_from_template(stream)
-                elif stream.type == "audio" and out_audio_stream is None:
-                    out_audio_stream = output_container.add_stream(
-                        "aac", rate=stream.rate or 44100
-                    )
-                    out_audio_stream.bit_rate = 192000
-
-        if out_video_stream is None:
-            raise ValueError("No video stream found in first input file")
-
+        out_video_stream, out_audio_stream = _setup_combine_output(
+            output_container, file_paths[0], camera_name, camera_type
+        )
         return _combine_copy(
             file_paths,
             output_container,
@@ -1046,181 +1216,207 @@ def _combine_copy(
     now-shorter video — A/V stays in sync with the corrupt region removed.
     """
     corrupt_starts = corrupt_starts or {}
-    video_pts_offset = 0
-    # A decoded real frame, reused as the format/layout/rate template for any
-    # silence we synthesize. Captured from the first segment that has audio.
-    audio_template = None
-
+    cursor = _CombineCursor()
     for file_path in file_paths:
-        # If this segment was flagged corrupt, cut its video on a GOP boundary
-        # (the last keyframe at/before the corrupt second) instead of muxing the
-        # garbage that follows. A raw mid-GOP cut leaves an incomplete access
-        # unit the decoder later rejects, so first resolve the keyframe pts.
-        seg_corrupt_s = corrupt_starts.get(file_path)
-        # Keyframe-aligned cut point (raw pts seconds) for a corrupt segment;
-        # 0.0 when its video is dropped wholesale. Only meaningful when
-        # ``seg_corrupt_s`` is not None.
-        seg_cut_s: float = 0.0
-        drop_segment_video = False
+        _append_segment_copy(
+            file_path,
+            output_container,
+            out_video_stream,
+            out_audio_stream,
+            cursor,
+            corrupt_starts.get(file_path),
+        )
+    _flush_combine_audio(output_container, out_audio_stream)
+    return True
+
+
+def _flush_combine_audio(output_container, out_audio_stream) -> None:
+    """Drain the AAC encoder once the last segment has been appended."""
+    if out_audio_stream:
+        for out_packet in out_audio_stream.encode(None):
+            output_container.mux(out_packet)
+
+
+def _append_segment_copy(
+    file_path: str,
+    output_container,
+    out_video_stream,
+    out_audio_stream,
+    cursor: _CombineCursor,
+    seg_corrupt_s: float | None = None,
+) -> None:
+    """Append one segment to an open combine output (see :func:`_combine_copy`).
+
+    The per-segment half of the combine: video packets are stream-copied at
+    ``cursor.video_pts_offset``, audio is re-encoded and padded/trimmed to the
+    segment's own video length, then the cursor advances past this segment.
+    Split out so :mod:`video_grouper.utils.incremental_combine` can append each
+    segment as soon as it lands instead of waiting for the whole game.
+    """
+    # If this segment was flagged corrupt, cut its video on a GOP boundary
+    # (the last keyframe at/before the corrupt second) instead of muxing the
+    # garbage that follows. A raw mid-GOP cut leaves an incomplete access
+    # unit the decoder later rejects, so first resolve the keyframe pts.
+    # Keyframe-aligned cut point (raw pts seconds) for a corrupt segment;
+    # 0.0 when its video is dropped wholesale. Only meaningful when
+    # ``seg_corrupt_s`` is not None.
+    seg_cut_s: float = 0.0
+    drop_segment_video = False
+    if seg_corrupt_s is not None:
+        last_kf_pts = _last_keyframe_pts_seconds(file_path, seg_corrupt_s)
+        if last_kf_pts is None:
+            # Corruption in the very first GOP: there is no clean keyframe to
+            # end on, so dropping the whole segment's video is the only way to
+            # avoid emitting a broken stream.
+            drop_segment_video = True
+            seg_cut_s = 0.0
+            logger.error(
+                "COMBINE: %s is corrupt within its first GOP (no keyframe "
+                "at/before %.1fs); dropping this segment's video entirely",
+                os.path.basename(file_path),
+                seg_corrupt_s,
+            )
+        else:
+            seg_cut_s = last_kf_pts
+    with av_open_read(file_path) as input_container:
+        in_video = None
+        in_audio = None
+        for stream in input_container.streams:
+            if stream.type == "video" and in_video is None:
+                in_video = stream
+            elif stream.type == "audio" and in_audio is None:
+                in_audio = stream
+
+        streams_to_demux = []
+        if in_video:
+            streams_to_demux.append(in_video)
+        if in_audio:
+            streams_to_demux.append(in_audio)
+
+        first_dts = {}
+        max_video_pts = 0
+        seg_audio_samples = 0
+        seg_audio_rate = 0
+        # Metadata video duration for this segment. Needed to trim
+        # overrunning audio mid-stream, since the decode-accurate
+        # ``max_video_pts`` isn't known until after the demux loop.
+        seg_video_target_s = None
+        if in_video is not None and in_video.duration:
+            seg_video_target_s = float(in_video.duration * in_video.time_base)
+        # A corrupt segment's metadata duration still reads the full length
+        # (the bad packets carry PTS), so clamp the audio target to the
+        # keyframe cut point — otherwise audio would be trimmed/padded to dead
+        # video.
         if seg_corrupt_s is not None:
-            last_kf_pts = _last_keyframe_pts_seconds(file_path, seg_corrupt_s)
-            if last_kf_pts is None:
-                # Corruption in the very first GOP: there is no clean keyframe to
-                # end on, so dropping the whole segment's video is the only way to
-                # avoid emitting a broken stream.
-                drop_segment_video = True
-                seg_cut_s = 0.0
-                logger.error(
-                    "COMBINE: %s is corrupt within its first GOP (no keyframe "
-                    "at/before %.1fs); dropping this segment's video entirely",
+            seg_video_target_s = (
+                seg_cut_s
+                if seg_video_target_s is None
+                else min(seg_video_target_s, seg_cut_s)
+            )
+            if not drop_segment_video:
+                logger.warning(
+                    "COMBINE: cutting corrupt video region in %s at GOP "
+                    "boundary %.3fs (corruption first seen ~%.1fs; dropping "
+                    "the undecodable tail)",
                     os.path.basename(file_path),
+                    seg_cut_s,
                     seg_corrupt_s,
                 )
-            else:
-                seg_cut_s = last_kf_pts
-        with av_open_read(file_path) as input_container:
-            in_video = None
-            in_audio = None
-            for stream in input_container.streams:
-                if stream.type == "video" and in_video is None:
-                    in_video = stream
-                elif stream.type == "audio" and in_audio is None:
-                    in_audio = stream
 
-            streams_to_demux = []
-            if in_video:
-                streams_to_demux.append(in_video)
-            if in_audio:
-                streams_to_demux.append(in_audio)
+        for packet in input_container.demux(streams_to_demux):
+            if packet.dts is None:
+                continue
 
-            first_dts = {}
-            max_video_pts = 0
-            seg_audio_samples = 0
-            seg_audio_rate = 0
-            # Metadata video duration for this segment. Needed to trim
-            # overrunning audio mid-stream, since the decode-accurate
-            # ``max_video_pts`` isn't known until after the demux loop.
-            seg_video_target_s = None
-            if in_video is not None and in_video.duration:
-                seg_video_target_s = float(in_video.duration * in_video.time_base)
-            # A corrupt segment's metadata duration still reads the full length
-            # (the bad packets carry PTS), so clamp the audio target to the
-            # keyframe cut point — otherwise audio would be trimmed/padded to dead
-            # video.
-            if seg_corrupt_s is not None:
-                seg_video_target_s = (
-                    seg_cut_s
-                    if seg_video_target_s is None
-                    else min(seg_video_target_s, seg_cut_s)
-                )
-                if not drop_segment_video:
-                    logger.warning(
-                        "COMBINE: cutting corrupt video region in %s at GOP "
-                        "boundary %.3fs (corruption first seen ~%.1fs; dropping "
-                        "the undecodable tail)",
-                        os.path.basename(file_path),
-                        seg_cut_s,
-                        seg_corrupt_s,
-                    )
+            try:
+                if packet.stream == in_video:
+                    # Cut the dead region on a GOP boundary BEFORE normalizing:
+                    # ``seg_cut_s`` is the keyframe pts in *raw* seconds (same
+                    # frame of reference as :func:`_last_keyframe_pts_seconds`),
+                    # so compare the raw pts here. Drop this corrupt segment's
+                    # video once its pts passes the keyframe cut, so the muxed
+                    # stream ends on a complete I-frame (no dangling P/B
+                    # references) and the garbage tail never lands in the
+                    # output. ``drop_segment_video`` drops it wholesale when no
+                    # clean keyframe precedes the corruption.
+                    if drop_segment_video:
+                        continue
+                    if (
+                        seg_corrupt_s is not None
+                        and seg_cut_s is not None
+                        and in_video.time_base
+                        and packet.pts is not None
+                        and float(packet.pts * in_video.time_base) > seg_cut_s
+                    ):
+                        continue
 
-            for packet in input_container.demux(streams_to_demux):
-                if packet.dts is None:
-                    continue
+                    # Normalize and offset
+                    if in_video.index not in first_dts:
+                        first_dts[in_video.index] = packet.dts
+                    packet.dts -= first_dts[in_video.index]
+                    packet.pts -= first_dts[in_video.index]
+                    if packet.dts < 0:
+                        continue
 
-                try:
-                    if packet.stream == in_video:
-                        # Cut the dead region on a GOP boundary BEFORE normalizing:
-                        # ``seg_cut_s`` is the keyframe pts in *raw* seconds (same
-                        # frame of reference as :func:`_last_keyframe_pts_seconds`),
-                        # so compare the raw pts here. Drop this corrupt segment's
-                        # video once its pts passes the keyframe cut, so the muxed
-                        # stream ends on a complete I-frame (no dangling P/B
-                        # references) and the garbage tail never lands in the
-                        # output. ``drop_segment_video`` drops it wholesale when no
-                        # clean keyframe precedes the corruption.
-                        if drop_segment_video:
-                            continue
+                    # Track max pts for offset calculation
+                    if packet.pts is not None:
+                        end_pts = packet.pts + (packet.duration or 0)
+                        if end_pts > max_video_pts:
+                            max_video_pts = end_pts
+
+                    packet.dts += cursor.video_pts_offset
+                    packet.pts += cursor.video_pts_offset
+                    packet.stream = out_video_stream
+                    output_container.mux(packet)
+
+                elif packet.stream == in_audio and out_audio_stream:
+                    for frame in packet.decode():
+                        if cursor.audio_template is None:
+                            cursor.audio_template = frame
+                        if frame.sample_rate:
+                            seg_audio_rate = frame.sample_rate
+                        # Trim: once this segment's audio already covers its
+                        # video (plus tolerance), drop the rest so a too-long
+                        # audio track can't push later segments' audio ahead
+                        # of their video.
                         if (
-                            seg_corrupt_s is not None
-                            and seg_cut_s is not None
-                            and in_video.time_base
-                            and packet.pts is not None
-                            and float(packet.pts * in_video.time_base) > seg_cut_s
+                            seg_video_target_s is not None
+                            and seg_audio_rate
+                            and seg_audio_samples / seg_audio_rate
+                            > seg_video_target_s + _AUDIO_PAD_EPSILON_SECONDS
                         ):
                             continue
+                        seg_audio_samples += frame.samples
+                        frame.pts = None
+                        for out_packet in out_audio_stream.encode(frame):
+                            output_container.mux(out_packet)
+            except (av.InvalidDataError, av.error.FFmpegError):
+                continue
 
-                        # Normalize and offset
-                        if in_video.index not in first_dts:
-                            first_dts[in_video.index] = packet.dts
-                        packet.dts -= first_dts[in_video.index]
-                        packet.pts -= first_dts[in_video.index]
-                        if packet.dts < 0:
-                            continue
-
-                        # Track max pts for offset calculation
-                        if packet.pts is not None:
-                            end_pts = packet.pts + (packet.duration or 0)
-                            if end_pts > max_video_pts:
-                                max_video_pts = end_pts
-
-                        packet.dts += video_pts_offset
-                        packet.pts += video_pts_offset
-                        packet.stream = out_video_stream
-                        output_container.mux(packet)
-
-                    elif packet.stream == in_audio and out_audio_stream:
-                        for frame in packet.decode():
-                            if audio_template is None:
-                                audio_template = frame
-                            if frame.sample_rate:
-                                seg_audio_rate = frame.sample_rate
-                            # Trim: once this segment's audio already covers its
-                            # video (plus tolerance), drop the rest so a too-long
-                            # audio track can't push later segments' audio ahead
-                            # of their video.
-                            if (
-                                seg_video_target_s is not None
-                                and seg_audio_rate
-                                and seg_audio_samples / seg_audio_rate
-                                > seg_video_target_s + _AUDIO_PAD_EPSILON_SECONDS
-                            ):
-                                continue
-                            seg_audio_samples += frame.samples
-                            frame.pts = None
-                            for out_packet in out_audio_stream.encode(frame):
-                                output_container.mux(out_packet)
-                except (av.InvalidDataError, av.error.FFmpegError):
-                    continue
-
-            # Keep cumulative audio aligned with cumulative video: pad this
-            # segment's audio with silence up to its own video duration. Only
-            # acts on a meaningful shortfall (> epsilon) and only once we have a
-            # template frame to synthesize silence from.
-            if out_audio_stream is not None and in_video is not None and seg_audio_rate:
-                seg_video_seconds = float(max_video_pts * in_video.time_base)
-                seg_audio_seconds = seg_audio_samples / seg_audio_rate
-                deficit = seg_video_seconds - seg_audio_seconds
-                if deficit > _AUDIO_PAD_EPSILON_SECONDS and audio_template is not None:
-                    logger.info(
-                        "COMBINE: padding %.1fs of silence for %s "
-                        "(audio %.1fs < video %.1fs)",
-                        deficit,
-                        os.path.basename(file_path),
-                        seg_audio_seconds,
-                        seg_video_seconds,
-                    )
-                    _encode_silence(
-                        out_audio_stream, output_container, audio_template, deficit
-                    )
-
-            video_pts_offset += max_video_pts
-
-    # Flush audio encoder
-    if out_audio_stream:
-        for out_packet in out_audio_stream.encode(None):
-            output_container.mux(out_packet)
+        # Keep cumulative audio aligned with cumulative video: pad this
+        # segment's audio with silence up to its own video duration. Only
+        # acts on a meaningful shortfall (> epsilon) and only once we have a
+        # template frame to synthesize silence from.
+        if out_audio_stream is not None and in_video is not None and seg_audio_rate:
+            seg_video_seconds = float(max_video_pts * in_video.time_base)
+            seg_audio_seconds = seg_audio_samples / seg_audio_rate
+            deficit = seg_video_seconds - seg_audio_seconds
+            if (
+                deficit > _AUDIO_PAD_EPSILON_SECONDS
+                and cursor.audio_template is not None
+            ):
+                logger.info(
+                    "COMBINE: padding %.1fs of silence for %s "
+                    "(audio %.1fs < video %.1fs)",
+                    deficit,
+                    os.path.basename(file_path),
+                    seg_audio_seconds,
+                    seg_video_seconds,
+                )
+                _encode_silence(
+                    out_audio_stream, output_container, cursor.audio_template, deficit
+                )
 
-    return True
+        cursor.video_pts_offset += max_video_pts
 
 
 async def combine_videos(
@@ -0,0 +1,308 @@
+"""Incremental combine: append each segment to ``combined.mp4`` as it lands.
+
+The regular combine (:func:`video_grouper.utils.ffmpeg_utils.combine_videos`)
+waits until every segment of the game is downloaded, then stream-copies all of
+them in one pass — for a 2-hour recording that is a long burst of I/O after the
+last download, and everything downstream waits on it. In incremental mode
+(``[PROCESSING] incremental_combine = true``) the download processor instead
+hands each segment to an :class:`IncrementalCombiner` the moment it is
+downloaded AND size-verified, so by the time the group is ready the output
+already holds every segment but the last, and :class:`CombineTask` only has to
+append that one and close the file.
+
+The combiner holds the output container open between downloads and appends
+through the same per-segment code path as the one-shot combine
+(:func:`_append_segment_copy`), so A/V alignment (silence pad / overrun trim)
+is identical. Segments are appended strictly in game order: a segment that
+finishes downloading before an earlier one simply waits until the gap fills.
+
+Finalization closes the container, which writes the ``moov`` index at the end
+of the file. The faststart relocation the one-shot combine does is skipped on
+purpose — it is a second full read+write of the file, exactly the burst this
+mode exists to avoid — and ``combined.mp4`` is a local intermediate that every
+reader opens with random access (trim re-muxes its own output with faststart).
+
+This is an optimization, never a source of truth: if an append fails or the
+appended list doesn't exactly match the segment list :class:`CombineTask`
+would combine, the partial output is discarded and the task falls back to the
+full one-shot combine. A restart loses the open container, so the partial
+output from before it is discarded too: the next verified download starts a
+fresh combiner that re-appends the segments already on disk, and if no
+download follows, :class:`CombineTask` finds no combiner and does the
+one-shot combine.
+
+Once :class:`CombineTask` has taken a group's combiner (finalize or discard),
+the combiner stays registered, closed, so a download that lands meanwhile
+can't start a second combiner on the same staging file.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from video_grouper.models import DirectoryState
+from video_grouper.utils.ffmpeg_utils import (
+    _append_segment_copy,
+    _cleanup_temp,
+    _CombineCursor,
+    _flush_combine_audio,
+    _run_in_thread_with_timeout,
+    _scaled_timeout,
+    _setup_combine_output,
+    av_open_write,
+)
+
+if TYPE_CHECKING:
+    from av.container import OutputContainer
+
+logger = logging.getLogger(__name__)
+
+# Staging suffix for the in-progress output. Ends in ``.tmp`` so the state
+# auditor's boot-time orphan sweep reaps a file left behind by a crash.
+INCREMENTAL_SUFFIX = ".incremental.tmp"
+
+# Group statuses past the combine step — a late append must not start a new
+# combiner for a group whose combined.mp4 already exists.
+_PAST_COMBINE_STATUSES = {
+    "combined",
+    "trimmed",
+    "ball_tracking_complete",
+    "pipeline_complete",
+    "complete",
+}
+
+# group_dir -> combiner. Module-level because the producer
+# (DownloadProcessor) and the consumer (CombineTask, a serialized queue item)
+# don't share an owner; both reach the combiner by group directory. Entries
+# are kept once finalizing starts (see the module docstring).
+_ACTIVE: dict[str, IncrementalCombiner] = {}
+
+
+def _norm(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class IncrementalCombiner:
+    """An open combine output that segments are appended to one at a time."""
+
+    def __init__(
+        self,
+        output_path: str,
+        camera_name: str | None = None,
+        camera_type: str | None = None,
+    ):
+        self.output_path = output_path
+        self.temp_path = output_path + INCREMENTAL_SUFFIX
+        self.camera_name = camera_name
+        self.camera_type = camera_type
+        self.appended: list[str] = []
+        self.failed = False
+        self.closed = False
+        # Set when CombineTask takes over; appends from downloads stop.
+        self.finalizing = False
+        self._lock = asyncio.Lock()
+        self._container: OutputContainer | None = None
+        self._out_video = None
+        self._out_audio = None
+        self._cursor = _CombineCursor()
+
+    def _append_sync(self, file_path: str) -> None:
+        if self._container is None:
+            # No faststart: see the module docstring.
+            self._container = av_open_write(self.temp_path)
+            self._out_video, self._out_audio = _setup_combine_output(
+                self._container, file_path, self.camera_name, self.camera_type
+            )
+        _append_segment_copy(
+            file_path,
+            self._container,
+            self._out_video,
+            self._out_audio,
+            self._cursor,
+        )
+
+    def _finalize_sync(self) -> None:
+        assert self._container is not None, "finalize before any append"
+        _flush_combine_audio(self._container, self._out_audio)
+        self._container.close()
+        self._container = None
+        os.replace(self.temp_path, self.output_path)
+
+    def _abort_sync(self) -> None:
+        if self._container is not None:
+            try:
+                self._container.close()
+            except Exception:
+                pass
+            self._container = None
+        _cleanup_temp(self.temp_path)
+
+    async def append(self, file_path: str) -> bool:
+        """Append *file_path* after the segments already in the output.
+
+        A failure poisons the combiner (the output is discarded) so the group
+        falls back to the one-shot combine.
+        """
+        async with self._lock:
+            if self.failed or self.closed:
+                return False
+            if _norm(file_path) in map(_norm, self.appended):
+                return True
+            try:
+                await _run_in_thread_with_timeout(
+                    self._append_sync,
+                    file_path,
+                    timeout=_scaled_timeout([file_path]),
+                )
+            except Exception as e:
+                logger.error(
+                    "COMBINE: incremental append of %s failed, falling back to "
+                    "a full combine: %s",
+                    os.path.basename(file_path),
+                    e,
+                )
+                self.failed = True
+                await asyncio.to_thread(self._abort_sync)
+                return False
+            self.appended.append(file_path)
+            logger.info(
+                "COMBINE: incrementally appended %s (%d segment(s) so far)",
+                os.path.basename(file_path),
+                len(self.appended),
+            )
+            return True
+
+    async def finalize(self, file_paths: list[str]) -> bool:
+        """Append whatever of *file_paths* is missing, then close the output.
+
+        Succeeds only if the output ends up holding exactly *file_paths* in
+        order; anything else (a failed append, a segment list that changed
+        under us) discards the output and returns False.
+        """
+        self.finalizing = True
+        done = [_norm(p) for p in self.appended]
+        if done != [_norm(p) for p in file_paths[: len(done)]]:
+            logger.warning(
+                "COMBINE: incremental output for %s doesn't match the segment "
+                "list; falling back to a full combine",
+                os.path.basename(self.output_path),
+            )
+            await self.abort()
+            return False
+        for file_path in file_paths[len(done) :]:
+            if not await self.append(file_path):
+                return False
+        async with self._lock:
+            if self.failed or self.closed:
+                return False
+            if [_norm(p) for p in self.appended] != [_norm(p) for p in file_paths]:
+                logger.warning(
+                    "COMBINE: incremental output for %s gained segments while "
+                    "finalizing; falling back to a full combine",
+                    os.path.basename(self.output_path),
+                )
+                self.closed = True
+                await asyncio.to_thread(self._abort_sync)
+                return False
+            self.closed = True
+            try:
+                await asyncio.to_thread(self._finalize_sync)
+            except Exception as e:
+                logger.error(
+                    "COMBINE: finalizing incremental output %s failed: %s",
+                    os.path.basename(self.output_path),
+                    e,
+                )
+                await asyncio.to_thread(self._abort_sync)
+                return False
+        return True
+
+    async def abort(self) -> None:
+        """Close and delete the partial output."""
+        async with self._lock:
+            self.closed = True
+            await asyncio.to_thread(self._abort_sync)
+
+
+def _ordered_ready_prefix(dir_state: DirectoryState) -> list[str]:
+    """Fully-downloaded segments from the start of the game up to the first gap."""
+    files = sorted(
+        (f for f in dir_state.files.values() if not f.skip),
+        key=lambda f: (f.start_time, f.file_path),
+    )
+    ready = []
+    for f in files:
+        if not dir_state.is_file_fully_downloaded(f):
+            break
+        ready.append(f.file_path)
+    return ready
+
+
+async def append_downloaded_segments(group_dir: str, output_path: str) -> None:
+    """Append every newly-contiguous downloaded segment of *group_dir*.
+
+    Called by the download processor after each verified download. Starts a
+    combiner for the group on first use, which after a restart means
+    re-appending the segments already on disk into a fresh output. Does
+    nothing once :class:`CombineTask` has taken the group's combiner.
+    """
+    dir_state = DirectoryState(group_dir)
+    if dir_state.status in _PAST_COMBINE_STATUSES or os.path.exists(output_path):
+        return
+
+    combiner = _ACTIVE.get(group_dir)
+    if combiner is None:
+        camera_name: str | None = None
+        camera_type: str | None = None
+        first_file = dir_state.get_first_file()
+        if first_file and first_file.metadata:
+            name = first_file.metadata.get("camera_name")
+            kind = first_file.metadata.get("camera_type")
+            camera_name = str(name) if name else None
+            camera_type = str(kind) if kind else None
+        combiner = IncrementalCombiner(output_path, camera_name, camera_type)
+        _ACTIVE[group_dir] = combiner
+    if combiner.failed or combiner.finalizing or combiner.closed:
+        return
+
+    for file_path in _ordered_ready_prefix(dir_state):
+        if not await combiner.append(file_path):
+            return
+
+
+async def finalize_incremental_combine(
+    group_dir: str, file_paths: list[str], output_path: str
+) -> bool:
+    """Finish *group_dir*'s incremental combine into *output_path*.
+
+    Returns False when there is no usable incremental output — the caller
+    then runs the one-shot combine. The combiner stays registered (closed),
+    so later downloads for the group don't start another one.
+    """
+    combiner = _ACTIVE.get(group_dir)
+    if combiner is None:
+        return False
+    combiner.finalizing = True
+    if combiner.failed or combiner.output_path != output_path:
+        await combiner.abort()
+        return False
+    ok = await combiner.finalize(file_paths)
+    if ok:
+        logger.info(
+            "COMBINE: finalized incremental combine of %d segment(s) to %s",
+            len(file_paths),
+            os.path.basename(output_path),
+        )
+    return ok
+
+
+async def discard_incremental_combine(group_dir: str) -> None:
+    """Drop *group_dir*'s incremental output, if any (the closed combiner
+    stays registered, as after :func:`finalize_incremental_combine`)."""
+    combiner = _ACTIVE.get(group_dir)
+    if combiner is not None:
+        combiner.finalizing = True
+        await combiner.abort()
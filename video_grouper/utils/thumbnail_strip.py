@@ -0,0 +1,245 @@
+"""Precomputed thumbnail strip for a combined game video.
+
+Every NTFY game-start/end question (and each re-send) used to call
+:func:`~video_grouper.utils.ffmpeg_utils.create_screenshot` on the combined
+video: a seek plus a decode-until-clean on an 8K HEVC stream, which costs
+seconds per prompt. Right after combine, :func:`build_thumbnail_strip` walks the
+video once, decoding ONE keyframe per ``interval_seconds`` (``skip_frame =
+NONKEY``, so no P/B frames are ever decoded), downscales it and packs the JPEGs
+into a single file next to the video::
+
+    combined.thumbs.bin    concatenated JPEG blobs
+    combined.thumbs.json   {"version", "video", "video_size", "video_mtime_ns",
+                            "interval_seconds", "max_width",
+                            "entries": [[seconds, offset, length], ...]}
+
+Any timestamp's preview is then a bisect over the index plus one ``read`` —
+milliseconds, no video access. The index is fingerprinted by the video's size
+and mtime, so a re-combined video silently invalidates its stale strip and
+callers fall back to decoding the video.
+"""
+
+from __future__ import annotations
+
+import bisect
+import io
+import json
+import logging
+import os
+
+from video_grouper.utils.ffmpeg_utils import (
+    _cleanup_temp,
+    _is_frame_corrupt,
+    _run_in_thread_with_timeout,
+    _scaled_timeout,
+    av_open_read,
+)
+
+logger = logging.getLogger(__name__)
+
+STRIP_VERSION = 1
+# One preview every this many seconds of video. 10s keeps a 2-hour game at
+# ~720 thumbnails (~40 MB at 800px / q60) and is finer than any NTFY walk step.
+THUMBNAIL_INTERVAL_SECONDS = 10.0
+# Thumbnails are sized for NTFY attachments / dashboard previews, matching the
+# 800px / quality-60 that compress_image produces for the NTFY path.
+THUMBNAIL_MAX_WIDTH = 800
+THUMBNAIL_QUALITY = 60
+
+
+def strip_paths(video_path: str) -> tuple[str, str]:
+    """``(blob_path, index_path)`` of the strip for *video_path*."""
+    stem = os.path.splitext(video_path)[0]
+    return stem + ".thumbs.bin", stem + ".thumbs.json"
+
+
+def _fingerprint(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _build_thumbnail_strip_sync(
+    video_path: str,
+    interval_seconds: float,
+    max_width: int,
+    quality: int,
+) -> int:
+    """Synchronous implementation of :func:`build_thumbnail_strip`.
+
+    Returns the number of thumbnails written.
+    """
+    fingerprint = _fingerprint(video_path)
+    if fingerprint is None:
+        raise FileNotFoundError(video_path)
+    blob_path, index_path = strip_paths(video_path)
+    blob_tmp = blob_path + ".tmp"
+    index_tmp = index_path + ".tmp"
+
+    entries: list[list[float | int]] = []
+    with av_open_read(video_path) as container, open(blob_tmp, "wb") as blob:
+        stream = container.streams.video[0]
+        time_base = stream.time_base
+        # Only keyframes are decoded: after each seek the decoder's first
+        # output is the GOP's I-frame, which is also the one frame guaranteed
+        # not to be a half-green partial decode.
+        stream.codec_context.skip_frame = "NONKEY"
+        duration = 0.0
+        if stream.duration is not None and time_base:
+            duration = float(stream.duration * time_base)
+        elif container.duration is not None:
+            duration = container.duration / 1_000_000
+
+        scale = min(1.0, max_width / stream.width) if stream.width else 1.0
+        width = max(2, int(stream.width * scale) // 2 * 2)
+        height = max(2, int(stream.height * scale) // 2 * 2)
+
+        # Unknown duration (no stream/container duration): one thumbnail at 0.
+        targets = [0.0]
+        while targets[-1] + interval_seconds < duration:
+            targets.append(targets[-1] + interval_seconds)
+
+        last_pts = None
+        for t in targets:
+            container.seek(int(t / time_base), stream=stream)
+            frame = next(iter(container.decode(stream)), None)
+            if frame is None or frame.pts is None or frame.pts == last_pts:
+                # GOP longer than the interval: this seek landed on the same
+                # keyframe as the previous one.
+                continue
+            last_pts = frame.pts
+            image = frame.reformat(width=width, height=height, format="rgb24")
+            image = image.to_image()
+            if _is_frame_corrupt(image):
+                continue
+            buf = io.BytesIO()
+            image.save(buf, "JPEG", quality=quality, optimize=True)
+            data = buf.getvalue()
+            entries.append(
+                [round(float(frame.pts * time_base), 3), blob.tell(), len(data)]
+            )
+            blob.write(data)
+
+    index = {
+        "version": STRIP_VERSION,
+        "video": os.path.basename(video_path),
+        "video_size": fingerprint[0],
+        "video_mtime_ns": fingerprint[1],
+        "interval_seconds": interval_seconds,
+        "max_width": max_width,
+        "entries": entries,
+    }
+    with open(index_tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    # Blob first, index last: the index is the commit point, and a reader
+    # never sees an index that points past the end of its blob.
+    os.replace(blob_tmp, blob_path)
+    os.replace(index_tmp, index_path)
+    return len(entries)
+
+
+async def build_thumbnail_strip(
+    video_path: str,
+    interval_seconds: float = THUMBNAIL_INTERVAL_SECONDS,
+    max_width: int = THUMBNAIL_MAX_WIDTH,
+    quality: int = THUMBNAIL_QUALITY,
+) -> bool:
+    """Build (or rebuild) the thumbnail strip for *video_path*.
+
+    Meant to run in the background right after combine; a failure only means
+    preview callers keep decoding the video on demand.
+    """
+    blob_path, index_path = strip_paths(video_path)
+    try:
+        count = await _run_in_thread_with_timeout(
+            _build_thumbnail_strip_sync,
+            video_path,
+            interval_seconds,
+            max_width,
+            quality,
+            timeout=_scaled_timeout([video_path]),
+        )
+    except Exception as e:
+        logger.error(
+            f"THUMBNAILS: failed to build strip for {os.path.basename(video_path)}: {e}"
+        )
+        _cleanup_temp(blob_path + ".tmp")
+        _cleanup_temp(index_path + ".tmp")
+        return False
+    logger.info(
+        f"THUMBNAILS: built {count} thumbnail(s) for {os.path.basename(video_path)}"
+    )
+    return True
+
+
+class ThumbnailStrip:
+    """Read side of a strip: nearest-preview lookup by timestamp."""
+
+    def __init__(self, blob_path: str, index: dict):
+        self.blob_path = blob_path
+        self.index = index
+        self._times = [e[0] for e in index["entries"]]
+
+    @classmethod
+    def open(cls, video_path: str) -> ThumbnailStrip | None:
+        """The strip for *video_path*, or None if missing or stale."""
+        blob_path, index_path = strip_paths(video_path)
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if index.get("version") != STRIP_VERSION or not index.get("entries"):
+            return None
+        if (index.get("video_size"), index.get("video_mtime_ns")) != _fingerprint(
+            video_path
+        ):
+            return None
+        return cls(blob_path, index)
+
+    @property
+    def interval_seconds(self) -> float:
+        return float(self.index.get("interval_seconds", THUMBNAIL_INTERVAL_SECONDS))
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def nearest(self, seconds: float) -> tuple[float, bytes] | None:
+        """``(thumbnail_seconds, jpeg_bytes)`` closest to *seconds*."""
+        if not self._times:
+            return None
+        i = bisect.bisect_left(self._times, seconds)
+        if i == len(self._times) or (
+            i > 0 and seconds - self._times[i - 1] <= self._times[i] - seconds
+        ):
+            i -= 1
+        t, offset, length = self.index["entries"][i]
+        try:
+            with open(self.blob_path, "rb") as f:
+                f.seek(offset)
+                data = f.read(length)
+        except OSError:
+            return None
+        if len(data) != length:
+            return None
+        return t, data
+
+    def write_jpeg(self, seconds: float, output_path: str) -> bool:
+        """Write the preview nearest *seconds* to *output_path*."""
+        found = self.nearest(seconds)
+        if found is None:
+            return False
+        with open(output_path, "wb") as f:
+            f.write(found[1])
+        return True
+
+
+def thumbnail_at(video_path: str, seconds: float) -> bytes | None:
+    """JPEG preview of *video_path* near *seconds*, or None without a fresh strip."""
+    strip = ThumbnailStrip.open(video_path)
+    if strip is None:
+        return None
+    found = strip.nearest(seconds)
+    return found[1] if found else None
@@ -12,6 +12,7 @@ from video_grouper.task_processors import (
     ClipProcessor,
     DownloadProcessor,
     NtfyProcessor,
+    PollingProcessor,
     StateAuditor,
     UploadProcessor,
     VideoProcessor,
@@ -137,6 +138,17 @@ class VideoGrouperApp:
         if self.config.pipeline.is_active():
             # Side-effect import: registers the built-in pipeline steps.
             import video_grouper.pipeline.register_steps  # noqa: F401
+            from video_grouper.inference.session_pool import get_session_pool
+
+            # One ONNX session per model for the whole process: back-to-back
+            # games reuse built + warmed sessions instead of rebuilding them.
+            get_session_pool().configure(
+                cache_dir=Path(self.storage_path) / "ort_cache"
+                if self.config.pipeline.optimized_model_cache
+                else None,
+                max_sessions=self.config.pipeline.session_pool_max_sessions,
+                rss_budget_mb=self.config.pipeline.session_pool_rss_budget_mb,
+            )
 
             # Community (unsigned, local, opt-in) plugins register next, before
             # the TTT premium loader runs later in the TTT-enabled block. Load
@@ -815,6 +827,18 @@ class VideoGrouperApp:
         for processor in self.processors:
             await processor.start()
 
+        # Build + warm the pipeline's on-disk models in the background so the
+        # first game doesn't pay for graph optimisation (best-effort).
+        if self.pipeline_processor is not None:
+            try:
+                from video_grouper.pipeline.session_warmup import (
+                    prewarm_pipeline_sessions,
+                )
+
+                prewarm_pipeline_sessions(self.config.pipeline.ordered_steps())
+            except Exception:
+                logger.warning("Failed to start ONNX session prewarm", exc_info=True)
+
         # Start optional TTT status reporter (best-effort, never blocks startup)
         await self.ttt_reporter.start()
 
@@ -858,6 +882,7 @@ class VideoGrouperApp:
                     }
                     return {
                         "queue_sizes": queue_sizes,
+                        "pollers": self.get_poll_stats(),
                         "cameras": [
                             {
                                 "name": n,
@@ -1320,6 +1345,14 @@ class VideoGrouperApp:
             sizes["clips"] = self.clip_processor.get_queue_size()
         return sizes
 
+    def get_poll_stats(self) -> dict[str, dict]:
+        """Per-poller cadence and poll-cost metrics (see PollingProcessor.poll_stats)."""
+        return {
+            p.poll_name: p.poll_stats()
+            for p in self.processors
+            if isinstance(p, PollingProcessor)
+        }
+
     def get_queue_status_summary(self):
         """Per-processor ``{queued: int, in_progress: str | None}``.
 
@@ -160,6 +160,7 @@ __TRAY_BLOCK__
 <section>
 <h2>Pipeline</h2>
 __QUEUES_BLOCK__
+__POLLERS_BLOCK__
 </section>
 
 <section>
@@ -727,6 +728,35 @@ def _render_queues_section(status: dict | None) -> str:
     return "<table><tr><th>Processor</th><th>Queue size</th></tr>" + rows + "</table>"
 
 
+def _render_pollers_section(status: dict | None) -> str:
+    pollers = (status or {}).get("pollers")
+    if not pollers:
+        return ""
+
+    def _secs(value) -> str:
+        return "—" if value is None else f"{value:.2f}s"
+
+    rows = []
+    for name, s in pollers.items():
+        rows.append(
+            "<tr>"
+            f"<td>{html.escape(str(name))}</td>"
+            f"<td>{s.get('interval_seconds', 0):.0f}s</td>"
+            f"<td>{html.escape(str(s.get('idle_streak', 0)))}</td>"
+            f"<td>{html.escape(str(s.get('polls', 0)))}</td>"
+            f"<td>{_secs(s.get('last_poll_seconds'))}</td>"
+            f"<td>{_secs(s.get('avg_poll_seconds'))}</td>"
+            f"<td>{html.escape(str(s.get('wakeups', 0)))}</td>"
+            "</tr>"
+        )
+    return (
+        "<table><tr><th>Poller</th><th>Interval</th><th>Idle polls</th>"
+        "<th>Polls</th><th>Last poll</th><th>Avg poll</th><th>Wake-ups</th></tr>"
+        + "".join(rows)
+        + "</table>"
+    )
+
+
 def _render_cameras_section(status: dict | None) -> str:
     cameras = (status or {}).get("cameras") or []
     if not cameras:
@@ -988,6 +1018,7 @@ def create_app(
             .replace("__YOUTUBE_BLOCK__", _render_youtube_section(storage))
             .replace("__TRAY_BLOCK__", _render_tray_section(storage))
             .replace("__QUEUES_BLOCK__", _render_queues_section(status))
+            .replace("__POLLERS_BLOCK__", _render_pollers_section(status))
             .replace("__CAMERAS_BLOCK__", _render_cameras_section(status))
             .replace("__GAMES_BLOCK__", _render_games_section(_scan_games(storage)))
         )
@@ -1249,6 +1280,34 @@ def create_app(
         logger.info("YouTube OAuth complete, token saved to %s", token_path)
         return RedirectResponse(url=entry["return_to"], status_code=303)
 
+    @app.get("/recordings/{name}/thumbnail.jpg")
+    async def recording_thumbnail(name: str, t: float = 0.0) -> Response:
+        """Preview frame of the recording's combined video near ``t`` seconds.
+
+        Served from the thumbnail strip precomputed after combine (see
+        ``video_grouper.utils.thumbnail_strip``) — a lookup and one read, never
+        a video decode, so the dashboard can scrub a game cheaply. 404 when
+        the recording has no (fresh) strip yet. Same path-traversal defense
+        as the reprocess endpoint.
+        """
+        if not _GAME_DIR_RE.match(name):
+            raise HTTPException(status_code=400, detail="bad recording name")
+        group_dir = (storage / name).resolve()
+        if not group_dir.is_dir() or storage.resolve() not in group_dir.parents:
+            raise HTTPException(status_code=404, detail="recording not found")
+        from video_grouper.utils.paths import get_combined_video_path
+        from video_grouper.utils.thumbnail_strip import thumbnail_at
+
+        combined_path = get_combined_video_path(str(group_dir), storage_path)
+        jpeg = thumbnail_at(combined_path, max(0.0, t))
+        if jpeg is None:
+            raise HTTPException(status_code=404, detail="no thumbnails yet")
+        return Response(
+            content=jpeg,
+            media_type="image/jpeg",
+            headers={"Cache-Control": "max-age=300"},
+        )
+
     @app.post("/recordings/{name}/reprocess")
     async def reprocess_recording(name: str, request: Request) -> Response:
         """Write ``reprocess_request.json`` to the named recording's group
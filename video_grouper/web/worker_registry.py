@@ -0,0 +1,437 @@
+"""SQLite store behind the worker API: registered workers + the task queue.
+
+One WAL-mode database at ``shared_data/workers/registry.db`` replaces the
+``registry.json`` that every request used to load and rewrite whole:
+
+- ``workers`` is keyed by the SHA-256 of the bearer token, so authenticating
+  a request is one primary-key lookup instead of a scan over every worker;
+- ``tasks`` is indexed on ``status``, so ``/next`` reads the oldest queued
+  task (rowid order = enqueue order) without touching the rest of the queue;
+- heartbeats — most of a busy fleet's traffic — are buffered in memory and
+  written in one transaction at most every ``heartbeat_flush_s`` seconds.
+  Reads through the registry see buffered values; a crash loses at most one
+  interval of liveness timestamps, never task state.
+
+Re-registration hands back the worker's existing token, so the token itself
+is kept next to its hash (the JSON registry stored it in the clear too).
+
+An existing ``registry.json`` is imported once, when the database is first
+created, and renamed to ``registry.json.migrated``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+MAX_ATTEMPTS = 3
+DEFAULT_HEARTBEAT_FLUSH_S = 2.0
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS workers (
+    token_sha256 TEXT PRIMARY KEY,
+    node_id TEXT NOT NULL UNIQUE,
+    token TEXT NOT NULL,
+    capabilities TEXT NOT NULL DEFAULT '[]',
+    version TEXT,
+    registered_at TEXT,
+    last_heartbeat REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_workers_heartbeat ON workers(last_heartbeat);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    task_type TEXT NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    status TEXT NOT NULL,
+    assigned_to TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    outputs TEXT,
+    created_at REAL,
+    claimed_at REAL,
+    completed_at REAL,
+    last_heartbeat REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+"""
+
+_TASK_COLUMNS = (
+    "task_id",
+    "task_type",
+    "payload",
+    "status",
+    "assigned_to",
+    "attempts",
+    "last_error",
+    "outputs",
+    "created_at",
+    "claimed_at",
+    "completed_at",
+    "last_heartbeat",
+)
+
+
+def registry_db_path(storage_path: str | Path) -> Path:
+    return Path(storage_path) / "workers" / "registry.db"
+
+
+def legacy_json_path(storage_path: str | Path) -> Path:
+    return Path(storage_path) / "workers" / "registry.json"
+
+
+def token_sha256(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _task_dict(row: sqlite3.Row) -> dict:
+    task = dict(row)
+    task["payload"] = json.loads(task["payload"] or "{}")
+    if task["outputs"] is not None:
+        task["outputs"] = json.loads(task["outputs"])
+    return task
+
+
+class WorkerRegistry:
+    """Thread-safe registry over one SQLite connection.
+
+    FastAPI runs the (sync) worker-API handlers on a thread pool, so every
+    method takes ``self._lock``; other processes opening the same file are
+    serialised by SQLite (WAL + ``busy_timeout``).
+    """
+
+    def __init__(
+        self,
+        storage_path: str | Path,
+        *,
+        heartbeat_flush_s: float = DEFAULT_HEARTBEAT_FLUSH_S,
+    ) -> None:
+        self.storage_path = Path(storage_path)
+        self.db_path = registry_db_path(storage_path)
+        self.heartbeat_flush_s = heartbeat_flush_s
+        self._lock = threading.RLock()
+        self._pending_tasks: dict[str, float] = {}
+        self._pending_workers: dict[str, float] = {}
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None,  # explicit BEGIN IMMEDIATE in _tx()
+            timeout=10.0,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA_SQL)
+        with self._tx() as cur:
+            # Re-checked inside the write lock: a second process opening the
+            # same fresh database must not import the JSON twice.
+            if cur.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                self._migrate_json(cur)
+                cur.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Cursor]:
+        with self._lock:
+            cur = self._conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                yield cur
+            except BaseException:
+                cur.execute("ROLLBACK")
+                raise
+            cur.execute("COMMIT")
+
+    # -- migration -----------------------------------------------------------
+
+    def _migrate_json(self, cur: sqlite3.Cursor) -> None:
+        src = legacy_json_path(self.storage_path)
+        if not src.exists():
+            return
+        try:
+            legacy = json.loads(src.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError) as exc:
+            logger.warning("WORKER_API: unreadable %s, not migrated: %s", src, exc)
+            return
+        workers = legacy.get("workers") or {}
+        for node_id, info in workers.items():
+            if not info.get("token"):
+                continue
+            cur.execute(
+                "INSERT OR REPLACE INTO workers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    token_sha256(info["token"]),
+                    node_id,
+                    info["token"],
+                    json.dumps(info.get("capabilities") or []),
+                    info.get("version"),
+                    info.get("registered_at"),
+                    info.get("last_heartbeat"),
+                ),
+            )
+        tasks = legacy.get("tasks") or {}
+        for task_id, task in tasks.items():  # dict order = FIFO order
+            outputs = task.get("outputs")
+            cur.execute(
+                f"INSERT OR REPLACE INTO tasks ({', '.join(_TASK_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_TASK_COLUMNS))})",
+                (
+                    task_id,
+                    task.get("task_type") or "",
+                    json.dumps(task.get("payload") or {}),
+                    task.get("status") or "queued",
+                    task.get("assigned_to"),
+                    int(task.get("attempts") or 0),
+                    task.get("last_error"),
+                    None if outputs is None else json.dumps(outputs),
+                    task.get("created_at"),
+                    task.get("claimed_at"),
+                    task.get("completed_at"),
+                    task.get("last_heartbeat"),
+                ),
+            )
+        src.replace(src.with_name(src.name + ".migrated"))
+        logger.info(
+            "WORKER_API: migrated %d worker(s) and %d task(s) from %s",
+            len(workers),
+            len(tasks),
+            src.name,
+        )
+
+    # -- workers -------------------------------------------------------------
+
+    def register(
+        self, node_id: str, capabilities: list[str], version: str | None
+    ) -> str:
+        """Upsert a worker and return its bearer token.
+
+        Re-registration (a worker restart) keeps the existing token.
+        """
+        with self._tx() as cur:
+            row = cur.execute(
+                "SELECT token FROM workers WHERE node_id = ?", (node_id,)
+            ).fetchone()
+            token = row["token"] if row else secrets.token_urlsafe(32)
+            cur.execute(
+                """INSERT INTO workers VALUES (?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(node_id) DO UPDATE SET
+                       capabilities=excluded.capabilities,
+                       version=excluded.version,
+                       registered_at=excluded.registered_at,
+                       last_heartbeat=excluded.last_heartbeat""",
+                (
+                    token_sha256(token),
+                    node_id,
+                    token,
+                    json.dumps(capabilities),
+                    version,
+                    datetime.now(UTC).isoformat(),
+                    time.time(),
+                ),
+            )
+            self._pending_workers.pop(node_id, None)
+        return token
+
+    def node_for_token(self, token: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT node_id FROM workers WHERE token_sha256 = ?",
+                (token_sha256(token),),
+            ).fetchone()
+        return row["node_id"] if row else None
+
+    def list_workers(self) -> list[dict]:
+        """All workers, most recently seen first."""
+        with self._lock:
+            self._maybe_flush(force=True)
+            rows = self._conn.execute(
+                "SELECT node_id, capabilities, version, last_heartbeat FROM workers "
+                "ORDER BY last_heartbeat DESC"
+            ).fetchall()
+        return [
+            {
+                "node_id": r["node_id"],
+                "capabilities": json.loads(r["capabilities"]),
+                "last_heartbeat": r["last_heartbeat"],
+                "version": r["version"],
+            }
+            for r in rows
+        ]
+
+    # -- tasks ---------------------------------------------------------------
+
+    def enqueue(self, task_type: str, payload: dict) -> str:
+        task_id = secrets.token_urlsafe(12)
+        with self._tx() as cur:
+            cur.execute(
+                "INSERT INTO tasks (task_id, task_type, payload, status, attempts, "
+                "created_at) VALUES (?, ?, ?, 'queued', 0, ?)",
+                (task_id, task_type, json.dumps(payload), time.time()),
+            )
+        return task_id
+
+    def get_task(self, task_id: str) -> dict | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            task = _task_dict(row)
+            if task_id in self._pending_tasks:
+                task["last_heartbeat"] = self._pending_tasks[task_id]
+        return task
+
+    def claim_next(self, node_id: str) -> dict | None:
+        """Claim the oldest queued task this worker can run (any task when it
+        advertises no capabilities); ``None`` when there is nothing to do."""
+        with self._tx() as cur:
+            row = cur.execute(
+                "SELECT capabilities FROM workers WHERE node_id = ?", (node_id,)
+            ).fetchone()
+            capabilities = json.loads(row["capabilities"]) if row else []
+            sql = "SELECT * FROM tasks WHERE status = 'queued'"
+            if capabilities:
+                sql += f" AND task_type IN ({', '.join('?' * len(capabilities))})"
+            row = cur.execute(sql + " ORDER BY rowid LIMIT 1", capabilities).fetchone()
+            if row is None:
+                return None
+            cur.execute(
+                "UPDATE tasks SET status = 'in_progress', assigned_to = ?, "
+                "claimed_at = ? WHERE task_id = ?",
+                (node_id, time.time(), row["task_id"]),
+            )
+        return _task_dict(row)
+
+    def _owned(
+        self, cur: sqlite3.Cursor, task_id: str, node_id: str
+    ) -> sqlite3.Row | None:
+        """The task's row if it is assigned to ``node_id``."""
+        row = cur.execute(
+            "SELECT assigned_to, attempts FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return row if row is not None and row["assigned_to"] == node_id else None
+
+    def heartbeat(self, task_id: str, node_id: str) -> bool:
+        """Record a heartbeat for ``node_id``'s task (buffered). False if the
+        task doesn't exist or belongs to another worker."""
+        with self._lock:
+            if not self._owned(self._conn.cursor(), task_id, node_id):
+                return False
+            now = time.time()
+            self._pending_tasks[task_id] = now
+            # Bump the worker too so the dashboard can show "online".
+            self._pending_workers[node_id] = now
+            self._maybe_flush()
+        return True
+
+    def complete(self, task_id: str, node_id: str, outputs: dict) -> bool:
+        with self._tx() as cur:
+            if not self._owned(cur, task_id, node_id):
+                return False
+            cur.execute(
+                "UPDATE tasks SET status = 'complete', outputs = ?, completed_at = ? "
+                "WHERE task_id = ?",
+                (json.dumps(outputs), time.time(), task_id),
+            )
+        return True
+
+    def fail(self, task_id: str, node_id: str, error: str, retry: bool) -> dict | None:
+        """Record a failure; requeue while ``retry`` and attempts remain.
+        Returns ``{"status", "attempts"}``, or None if not ``node_id``'s task."""
+        with self._tx() as cur:
+            row = self._owned(cur, task_id, node_id)
+            if row is None:
+                return None
+            attempts = row["attempts"] + 1
+            requeue = retry and attempts < MAX_ATTEMPTS
+            cur.execute(
+                "UPDATE tasks SET attempts = ?, last_error = ?, status = ?, "
+                "assigned_to = ? WHERE task_id = ?",
+                (
+                    attempts,
+                    error,
+                    "queued" if requeue else "error",
+                    None if requeue else node_id,
+                    task_id,
+                ),
+            )
+        return {"status": "queued" if requeue else "error", "attempts": attempts}
+
+    # -- heartbeat batching --------------------------------------------------
+
+    def _maybe_flush(self, force: bool = False) -> None:
+        if not (self._pending_tasks or self._pending_workers):
+            return
+        if not force and time.monotonic() - self._last_flush < self.heartbeat_flush_s:
+            return
+        tasks, workers = self._pending_tasks, self._pending_workers
+        self._pending_tasks, self._pending_workers = {}, {}
+        with self._tx() as cur:
+            cur.executemany(
+                "UPDATE tasks SET last_heartbeat = ? WHERE task_id = ?",
+                [(ts, tid) for tid, ts in tasks.items()],
+            )
+            cur.executemany(
+                "UPDATE workers SET last_heartbeat = ? WHERE node_id = ?",
+                [(ts, nid) for nid, ts in workers.items()],
+            )
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Write buffered heartbeats now."""
+        with self._lock:
+            self._maybe_flush(force=True)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._maybe_flush(force=True)
+            self._conn.close()
+            self._closed = True
+
+
+_REGISTRIES: dict[Path, WorkerRegistry] = {}
+_REGISTRIES_LOCK = threading.Lock()
+
+
+def get_registry(storage_path: str | Path) -> WorkerRegistry:
+    """The process-wide registry for ``storage_path``.
+
+    The API router and :func:`~video_grouper.web.worker_api.enqueue_task`
+    share it, so buffered heartbeats are visible to every in-process reader.
+    Buffered heartbeats are flushed at interpreter exit.
+    """
+    key = Path(storage_path).resolve()
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            registry = _REGISTRIES[key] = WorkerRegistry(key)
+            atexit.register(registry.close)
+        return registry
+
+
+def close_registry(storage_path: str | Path) -> None:
+    """Flush and close the process-wide registry for ``storage_path``."""
+    with _REGISTRIES_LOCK:
+        registry = _REGISTRIES.pop(Path(storage_path).resolve(), None)
+    if registry is not None:
+        registry.close()